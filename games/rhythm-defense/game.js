@@ -197,7 +197,7 @@ const AudioController = {
             this.triggerBeat();
             
             // Schedule next beat
-            gameState.nextBeatTime += gameState.beatInterval;
+            gameState.nextBeatTime += LevelData.nextBeatInterval();
         }
     },
     
@@ -240,6 +240,7 @@ const GridSystem = {
             { x: 7, y: 2 },
             { x: 11, y: 2 }
         ];
+        gameState.lanes = [gameState.path];
     },
     
     getCellSize() {
@@ -263,8 +264,8 @@ const GridSystem = {
     },
     
     isCellOnPath(x, y) {
-        // Check if the cell is on the enemy path
-        return gameState.path.some(point => point.x === x && point.y === y);
+        // Check if the cell is on any of the enemy lanes
+        return gameState.lanes.some(lane => lane.some(point => point.x === x && point.y === y));
     },
     
     isCellOccupied(x, y) {
@@ -727,13 +728,14 @@ const TowerSystem = {
 
 // Enemy system
 const EnemySystem = {
-    spawnEnemy(type, pathIndex = 0) {
+    spawnEnemy(type, pathIndex = 0, path = gameState.path) {
         // Create enemy object
         const enemyType = ENEMY_TYPES[type];
-        const pathPoint = gameState.path[pathIndex];
+        const pathPoint = path[pathIndex];
         
         const enemy = {
             type: enemyType,
+            path: path,
             x: pathPoint.x,
             y: pathPoint.y,
             health: enemyType.health,
@@ -807,11 +809,11 @@ const EnemySystem = {
         }
         
         // Move enemy along path
-        const currentPoint = gameState.path[enemy.pathIndex];
+        const currentPoint = enemy.path[enemy.pathIndex];
         const nextPathIndex = enemy.pathIndex + 1;
         
         // Check if we've reached the end of the path
-        if (nextPathIndex >= gameState.path.length) {
+        if (nextPathIndex >= enemy.path.length) {
             // Enemy reached the end, player loses a life
             gameState.lives--;
             
@@ -829,7 +831,7 @@ const EnemySystem = {
             return;
         }
         
-        const nextPoint = gameState.path[nextPathIndex];
+        const nextPoint = enemy.path[nextPathIndex];
         
         // Calculate direction and distance
         const dx = nextPoint.x - currentPoint.x;
@@ -934,6 +936,133 @@ const EnemySystem = {
     }
 };
 
+// Compiled level data
+// Levels are compiled by tools/beatmap_compiler.py into one little-endian
+// ArrayBuffer: a 16-byte header, a table of section offsets and lengths,
+// then 4-byte aligned typed arrays that are read in place during play
+const LevelData = {
+    MAGIC: 0x564c4452, // 'RDLV'
+    VERSION: 1,
+    HEADER_SIZE: 16,
+    
+    level: null,
+    beatIndex: 0,
+    waveStartTime: 0,
+    spawnIndex: 0,
+    spawnEnd: 0,
+    
+    async load(url) {
+        // Load a compiled level, keeping the built-in waves if there is none
+        try {
+            const response = await fetch(url);
+            if (!response.ok) {
+                return null;
+            }
+            this.level = this.parse(await response.arrayBuffer());
+        } catch (error) {
+            console.log(`Could not load level ${url}: ${error}`);
+            this.level = null;
+        }
+        
+        if (this.level) {
+            CONFIG.maxWaves = this.level.waves.length / 2;
+            gameState.beatInterval = 60000 / this.level.bpm;
+            gameState.lanes = this.level.lanes;
+            gameState.path = this.level.lanes[0];
+        }
+        return this.level;
+    },
+    
+    parse(buffer) {
+        // Create typed-array views over the sections of a compiled level
+        const view = new DataView(buffer);
+        if (buffer.byteLength < this.HEADER_SIZE ||
+            view.getUint32(0, true) !== this.MAGIC || view.getUint16(4, true) !== this.VERSION) {
+            console.log('Not a compiled Rhythm Defense level');
+            return null;
+        }
+        
+        const section = (index, ArrayType) => {
+            const entry = this.HEADER_SIZE + index * 8;
+            const offset = view.getUint32(entry, true);
+            const length = view.getUint32(entry + 4, true);
+            return new ArrayType(buffer, offset, length / ArrayType.BYTES_PER_ELEMENT);
+        };
+        
+        const laneIndex = section(5, Uint16Array);
+        const lanePoints = section(6, Uint8Array);
+        const enemyNames = new TextDecoder().decode(section(7, Uint8Array)).split('\n');
+        
+        // Lanes and enemy types are looked up once here, not per spawn
+        const lanes = [];
+        for (let lane = 0; lane + 1 < laneIndex.length; lane++) {
+            const points = [];
+            for (let i = laneIndex[lane]; i < laneIndex[lane + 1]; i++) {
+                points.push({ x: lanePoints[i * 2], y: lanePoints[i * 2 + 1] });
+            }
+            lanes.push(points);
+        }
+        
+        return {
+            bpm: view.getFloat32(8, true),
+            beats: section(0, Float32Array),
+            waves: section(1, Uint32Array),
+            spawnTimes: section(2, Uint32Array),
+            spawnTypes: section(3, Uint8Array),
+            spawnLanes: section(4, Uint8Array),
+            lanes: lanes,
+            enemyTypes: enemyNames.map(name => name.toUpperCase())
+        };
+    },
+    
+    startWave(waveNumber) {
+        // Start the spawn schedule and beat map of a wave
+        if (!this.level || waveNumber > this.level.waves.length / 2) {
+            return false;
+        }
+        
+        this.spawnIndex = this.level.waves[(waveNumber - 1) * 2];
+        this.spawnEnd = this.spawnIndex + this.level.waves[(waveNumber - 1) * 2 + 1];
+        this.waveStartTime = gameState.elapsedTime;
+        
+        // The beat map restarts with every wave
+        this.beatIndex = 0;
+        gameState.nextBeatTime = this.waveStartTime + this.nextBeatInterval();
+        return true;
+    },
+    
+    spawnDue() {
+        // Spawn every enemy whose time has come; returns how many were spawned
+        if (!this.level) {
+            return 0;
+        }
+        
+        const level = this.level;
+        const waveTime = gameState.elapsedTime - this.waveStartTime;
+        let spawned = 0;
+        while (this.spawnIndex < this.spawnEnd && level.spawnTimes[this.spawnIndex] <= waveTime) {
+            EnemySystem.spawnEnemy(
+                level.enemyTypes[level.spawnTypes[this.spawnIndex]],
+                0,
+                level.lanes[level.spawnLanes[this.spawnIndex]]
+            );
+            this.spawnIndex++;
+            spawned++;
+        }
+        return spawned;
+    },
+    
+    nextBeatInterval() {
+        // Time to the next beat; past the end of the beat map, the last tempo holds
+        const beats = this.level && this.level.beats;
+        if (beats && this.beatIndex + 1 < beats.length) {
+            gameState.beatInterval = beats[this.beatIndex + 1] - beats[this.beatIndex];
+            this.beatIndex++;
+        }
+        return gameState.beatInterval;
+    }
+};
+
 // Wave system
 const WaveSystem = {
     startWave() {
@@ -941,8 +1070,13 @@ const WaveSystem = {
         gameState.waveInProgress = true;
         gameState.enemiesRemaining = this.getWaveEnemyCount(gameState.currentWave);
         
-        // Schedule enemy spawns
-        this.scheduleEnemySpawns();
+        // Compiled levels are spawned from their schedule in update()
+        if (LevelData.startWave(gameState.currentWave)) {
+            gameState.enemiesRemaining = LevelData.spawnEnd - LevelData.spawnIndex;
+        } else {
+            // Schedule enemy spawns
+            this.scheduleEnemySpawns();
+        }
         
         console.log(`Starting wave ${gameState.currentWave}`);
     },
@@ -1043,6 +1177,9 @@ const WaveSystem = {
     update() {
         // Update wave state
         if (gameState.waveInProgress) {
+            // Spawn the enemies of a compiled level that are due
+            gameState.enemiesRemaining -= LevelData.spawnDue();
+            
             // Check if all enemies are defeated
             this.checkWaveComplete();
         }
@@ -1528,6 +1665,10 @@ function initGame() {
     RhythmSystem.init();
     UISystem.init();
     
+    // Load the compiled level; the built-in waves are used until it arrives
+    const level = new URLSearchParams(window.location.search).get('level') || 'classic';
+    LevelData.load(`levels/${encodeURIComponent(level)}.bin`);
+    
     // Add event listeners
     document.addEventListener('keydown', handleInput);
     canvas.addEventListener('mousemove', handleMouseMove);
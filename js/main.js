@@ -9,8 +9,8 @@ document.addEventListener('DOMContentLoaded', () => {
     card.classList.add('game-card');
   });
 
-  // Initialize animations
-  document.querySelectorAll('.grid > div').forEach((card, index) => {
+  // Initialize animations, except on prerendered grids, which are already painted
+  document.querySelectorAll('.grid:not([data-prerendered]) > div').forEach((card, index) => {
     setTimeout(() => {
       card.classList.add('animate-fade-in');
     }, index * 100); // Stagger the animations
@@ -0,0 +1,142 @@
+/**
+ * Arcade Hub - Game Search
+ * Answers searches from the static index in search/ (built by
+ * tools/game_search_index.py), loading only the shards a query needs
+ */
+
+const GameSearch = {
+  base: 'search/',
+  meta: null,
+  shards: {},
+
+  /**
+   * Load the index metadata once
+   * @returns {Promise<Object|null>} The metadata, or null if there is no usable index
+   */
+  load: () => {
+    if (!GameSearch.meta) {
+      GameSearch.meta = fetch(`${GameSearch.base}meta.json`, { cache: 'no-cache' })
+        .then(response => response.ok ? response.json() : null)
+        .then(meta => meta && meta.version === 1 ? meta : null)
+        .catch(() => null);
+    }
+    return GameSearch.meta;
+  },
+
+  /**
+   * Fetch one shard, once per content hash
+   * @param {Object} meta - The index metadata
+   * @param {string} kind - docs, grams, prefixes, tags or categories
+   * @param {string} key - The shard name
+   * @returns {Promise<Object|Array|null>} The shard, or null if it does not exist
+   */
+  shard: (meta, kind, key) => {
+    const hash = meta.shards[kind][key];
+    if (!hash) return Promise.resolve(null);
+    const dir = { docs: 'docs', grams: 'grams', prefixes: 'prefixes', tags: 'facets/tags', categories: 'facets' }[kind];
+    const url = `${GameSearch.base}${dir}/${kind === 'categories' ? 'categories' : key}.json?v=${hash}`;
+    if (!GameSearch.shards[url]) {
+      GameSearch.shards[url] = fetch(url).then(response => {
+        if (!response.ok) throw new Error(`Search shard ${url} failed to load`);
+        return response.json();
+      });
+      GameSearch.shards[url].catch(() => delete GameSearch.shards[url]);
+    }
+    return GameSearch.shards[url];
+  },
+
+  /**
+   * Shard key of a term, matching shard_key() in game_search_index.py
+   * @param {Object} meta - The index metadata
+   * @param {string} term - An index term
+   * @returns {string} The shard name
+   */
+  shardKey: (meta, term) => term.slice(0, meta.key_length).replace(/[^a-z0-9]/g, '_'),
+
+  /**
+   * Decode delta-encoded postings
+   * @param {Array<number>} deltas - Postings from a shard
+   * @returns {Array<number>} Sorted document ids
+   */
+  decode: (deltas) => {
+    let total = 0;
+    return deltas.map(delta => (total += delta));
+  },
+
+  /**
+   * Intersect two sorted id lists
+   * @param {Array<number>} a - Sorted ids
+   * @param {Array<number>} b - Sorted ids
+   * @returns {Array<number>} Ids in both lists
+   */
+  intersect: (a, b) => {
+    const result = [];
+    let i = 0;
+    let j = 0;
+    while (i < a.length && j < b.length) {
+      if (a[i] === b[j]) {
+        result.push(a[i]);
+        i++;
+        j++;
+      } else if (a[i] < b[j]) {
+        i++;
+      } else {
+        j++;
+      }
+    }
+    return result;
+  },
+
+  /**
+   * Search the index
+   * @param {string} query - Three or more characters match anywhere in the title,
+   *   description or a tag; shorter queries match the start of a word
+   * @param {string} category - Only games in this category ('all' or empty for any)
+   * @param {string} tag - Only games with this tag (optional)
+   * @param {number} limit - Maximum number of games to return (default: 100)
+   * @returns {Promise<Array|null>} Matching games newest first, or null when
+   *   there is nothing to search for or no index to search
+   */
+  search: async (query, category, tag, limit = 100) => {
+    query = (query || '').trim().toLowerCase();
+    if (!query && !tag) return null;
+    const meta = await GameSearch.load();
+    if (!meta) return null;
+
+    const terms = [];
+    if (query.length >= meta.gram_length) {
+      for (let i = 0; i + meta.gram_length <= query.length; i++) {
+        terms.push(['grams', query.slice(i, i + meta.gram_length)]);
+      }
+    } else if (query) {
+      terms.push(['prefixes', query]);
+    }
+    if (category && category !== 'all') terms.push(['categories', category]);
+    if (tag) terms.push(['tags', tag.toLowerCase()]);
+
+    const postings = await Promise.all(terms.map(([kind, term]) =>
+      GameSearch.shard(meta, kind, kind === 'categories' ? 'all' : GameSearch.shardKey(meta, term))
+        .then(shard => GameSearch.decode((shard && shard[term]) || []))));
+    postings.sort((a, b) => a.length - b.length);
+    const candidates = postings.reduce((ids, next) => ids.length ? GameSearch.intersect(ids, next) : ids);
+
+    const results = [];
+    for (let i = candidates.length - 1; i >= 0 && results.length < limit; i--) {
+      const id = candidates[i];
+      const shard = await GameSearch.shard(meta, 'docs', String(Math.floor(id / meta.doc_shard_size)));
+      const record = shard && shard[id % meta.doc_shard_size];
+      if (!record) continue;
+      const game = Object.fromEntries(meta.fields.map((field, index) => [field, record[index]]));
+      // All trigrams of a longer query can occur without the query itself
+      if (query.length > meta.gram_length) {
+        const texts = [game.title, game.description, ...(game.tags || [])].map(text => (text || '').toLowerCase());
+        if (!texts.some(text => text.includes(query))) continue;
+      }
+      results.push(game);
+    }
+    return results;
+  }
+};
+
+// Export for use in pages
+window.GameSearch = GameSearch;
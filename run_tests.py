@@ -4,15 +4,68 @@ Test runner script for the Arcade Hub project.
 Runs both Python and JavaScript tests.
 """
 
+import io
 import os
+import re
+import ast
 import sys
+import json
+import time
+import hashlib
+import importlib
+import statistics
+import multiprocessing
+import multiprocessing.connection
 import subprocess
 import argparse
 import unittest
+import tempfile
 import glob
+from datetime import datetime
+from contextlib import redirect_stdout, redirect_stderr
+from concurrent.futures import ProcessPoolExecutor
 
 
-def run_python_tests(verbose=False):
+ROOT_DIR = os.path.dirname(os.path.abspath(__file__))
+PYTHON_TESTS_DIR = os.path.join(ROOT_DIR, 'tests', 'python')
+TOOLS_DIR = os.path.join(ROOT_DIR, 'tools')
+JS_TESTS_DIR = os.path.join(ROOT_DIR, 'tests')
+CACHE_PATH = os.path.join(ROOT_DIR, '.test_cache.json')
+CACHE_VERSION = 1
+
+# Files every Jest test depends on besides its own imports
+JS_SHARED_INPUTS = ['package.json', 'package-lock.json', 'jest.config.js', 'tests/setup.js']
+
+HISTORY_PATH = os.path.join(ROOT_DIR, '.test_history.jsonl')
+# Runs per suite that each test's baseline is computed from
+HISTORY_WINDOW = 20
+# Runs kept in the history file before older ones are dropped
+HISTORY_MAX_RUNS = 500
+# A test is flagged as slower when it is this many standard deviations above
+# its baseline, by at least SLOWDOWN_MIN_SECONDS, with MIN_SAMPLES runs known
+SLOWDOWN_SIGMAS = 3.0
+SLOWDOWN_MIN_SECONDS = 0.05
+MIN_SAMPLES = 5
+
+
+class TimingTestResult(unittest.TextTestResult):
+    """Test result that also records how long every test took."""
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.durations = {}
+        self._started = None
+    
+    def startTest(self, test):
+        self._started = time.perf_counter()
+        super().startTest(test)
+    
+    def stopTest(self, test):
+        super().stopTest(test)
+        self.durations[test.id()] = time.perf_counter() - self._started
+
+
+def run_python_tests(verbose=False, timings=None):
     """Run all Python tests."""
     print("\n===== Running Python Tests =====")
     
@@ -21,26 +74,863 @@ def run_python_tests(verbose=False):
     start_dir = os.path.join(os.path.dirname(__file__), 'tests/python')
     suite = loader.discover(start_dir, pattern='test_*.py')
     
-    runner = unittest.TextTestRunner(verbosity=2 if verbose else 1)
+    runner = unittest.TextTestRunner(verbosity=2 if verbose else 1, resultclass=TimingTestResult)
     result = runner.run(suite)
+    if timings is not None:
+        timings.update(result.durations)
     
     return result.wasSuccessful()
 
 
-def run_js_tests(verbose=False):
-    """Run all JavaScript tests using Jest."""
-    print("\n===== Running JavaScript Tests =====")
+def _iter_test_cases(suite):
+    """Flatten a test suite into its individual test cases."""
+    for test in suite:
+        if isinstance(test, unittest.TestSuite):
+            yield from _iter_test_cases(test)
+        else:
+            yield test
+
+
+def shard_python_tests(shards, history=None):
+    """
+    Discover the Python tests and split them into shards.
     
-    # Run Jest tests
+    Tests are grouped by TestCase class, so class and module fixtures run
+    once per shard. Groups are dealt longest first onto the shard with the
+    least work so far, using the recorded durations from the timing
+    history; tests without history count as the median known duration.
+    
+    Args:
+        shards (int): Number of shards
+        history (TestHistory, optional): Timing history to schedule by
+    
+    Returns:
+        list: Lists of test names, one per non-empty shard
+    """
+    suite = unittest.TestLoader().discover(PYTHON_TESTS_DIR, pattern='test_*.py')
+    groups = {}
+    for test in _iter_test_cases(suite):
+        if type(test).__name__ == '_FailedTest':
+            # A module that failed to import; load it by name in the shard
+            # so the import error is reported there
+            name = test.id().rsplit('.', 1)[-1]
+            groups.setdefault(name, []).append(name)
+            continue
+        test_id = test.id()
+        groups.setdefault(test_id.rsplit('.', 1)[0], []).append(test_id)
+    
+    expected = history.expected_durations('python') if history else {}
+    default = statistics.median(expected.values()) if expected else 1.0
+    
+    def cost(names):
+        return sum(expected.get(name, default) for name in names)
+    
+    buckets = [[] for _ in range(max(1, shards))]
+    loads = [0.0] * len(buckets)
+    for names in sorted(groups.values(), key=cost, reverse=True):
+        target = loads.index(min(loads))
+        buckets[target].extend(names)
+        loads[target] += cost(names)
+    return [bucket for bucket in buckets if bucket]
+
+
+def _run_python_shard(test_names, verbose=False):
+    """Run one shard of Python tests in a worker, buffering its output."""
+    if PYTHON_TESTS_DIR not in sys.path:
+        sys.path.insert(0, PYTHON_TESTS_DIR)
+    stream = io.StringIO()
+    # Anything the tests print goes into the shard's buffer too
+    with redirect_stdout(stream), redirect_stderr(stream):
+        suite = unittest.TestLoader().loadTestsFromNames(test_names)
+        runner = unittest.TextTestRunner(stream=stream, verbosity=2 if verbose else 1,
+                                         resultclass=TimingTestResult)
+        result = runner.run(suite)
+    return {
+        'output': stream.getvalue(),
+        'durations': result.durations,
+        'run': result.testsRun,
+        'failures': len(result.failures),
+        'errors': len(result.errors),
+        'skipped': len(result.skipped),
+        'success': result.wasSuccessful(),
+    }
+
+
+def run_python_tests_parallel(jobs=None, verbose=False, timings=None, history=None):
+    """Run the Python tests sharded across a process pool."""
+    print("\n===== Running Python Tests =====")
+    
+    started = time.perf_counter()
+    shards = shard_python_tests(jobs or os.cpu_count() or 1, history)
+    with ProcessPoolExecutor(len(shards)) as pool:
+        results = list(pool.map(_run_python_shard, shards, [verbose] * len(shards)))
+    if timings is not None:
+        for result in results:
+            timings.update(result['durations'])
+    
+    # Print each shard's buffered output in order, then one combined summary
+    for number, result in enumerate(results, 1):
+        print(f"--- Shard {number}/{len(results)} ---")
+        print(result['output'].rstrip())
+    totals = {key: sum(result[key] for result in results) for key in ('run', 'failures', 'errors', 'skipped')}
+    success = all(result['success'] for result in results)
+    print(f"\n===== Python: ran {totals['run']} tests in {time.perf_counter() - started:.3f}s "
+          f"across {len(results)} shard{'s' if len(results) != 1 else ''} =====")
+    details = ", ".join(f"{key}={totals[key]}" for key in ('failures', 'errors', 'skipped') if totals[key])
+    print(("OK" if success else "FAILED") + (f" ({details})" if details else ""))
+    return success
+
+
+def _jest_command(verbose=False, test_files=None, report_path=None):
+    """Build the npm command that runs Jest."""
     cmd = ["npm", "test"]
     if verbose:
         cmd.append("--verbose")
+    jest_args = list(test_files or [])
+    if report_path:
+        # Per-test results, including durations, as JSON
+        jest_args += ["--json", f"--outputFile={report_path}"]
+    if jest_args:
+        cmd += ["--"] + jest_args
+    return cmd
+
+
+def _new_report_path():
+    """Return a fresh temporary path for a Jest JSON report."""
+    fd, path = tempfile.mkstemp(prefix="jest-report-", suffix=".json")
+    os.close(fd)
+    return path
+
+
+def read_jest_durations(report_path):
+    """
+    Read per-test durations from a Jest JSON report.
+    
+    Returns:
+        dict: Seconds per test, keyed "<test file> > <full test name>"
+    """
+    try:
+        with open(report_path, "r") as f:
+            report = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    finally:
+        if os.path.exists(report_path):
+            os.remove(report_path)
+    durations = {}
+    for file_result in report.get("testResults", []):
+        name = os.path.relpath(file_result.get("name", ""), ROOT_DIR).replace(os.sep, "/")
+        for test in file_result.get("assertionResults", []):
+            if test.get("duration") is not None:
+                durations[f"{name} > {test['fullName']}"] = test["duration"] / 1000.0
+    return durations
+
+
+def start_js_tests(verbose=False, test_files=None):
+    """
+    Start the Jest suite in the background, buffering its output.
+    
+    Args:
+        verbose (bool): Increase output verbosity
+        test_files (list, optional): Only run these test files
+    
+    Returns:
+        tuple: (process, output file, report path), or None if npm is not available
+    """
+    report_path = _new_report_path()
+    output = tempfile.TemporaryFile(mode="w+")
+    try:
+        process = subprocess.Popen(_jest_command(verbose, test_files, report_path),
+                                   stdout=output, stderr=subprocess.STDOUT)
+    except FileNotFoundError:
+        output.close()
+        os.remove(report_path)
+        return None
+    return process, output, report_path
+
+
+def finish_js_tests(started, timings=None):
+    """Wait for a background Jest run and print its output."""
+    print("\n===== Running JavaScript Tests =====")
+    if started is None:
+        print("Error: npm not found")
+        return False
+    process, output, report_path = started
+    returncode = process.wait()
+    with output:
+        output.seek(0)
+        print(output.read().rstrip())
+    durations = read_jest_durations(report_path)
+    if timings is not None:
+        timings.update(durations)
+    return returncode == 0
+
+
+class TestHistory:
+    """
+    Append-only history of per-test durations (.test_history.jsonl).
+    
+    Each line is one run of one suite: {"suite", "time", "durations"}.
+    A test's baseline is the mean and standard deviation of its durations
+    over the last HISTORY_WINDOW runs of its suite.
+    """
+    
+    def __init__(self, path=HISTORY_PATH):
+        self.path = path
+        self.runs = []
+        try:
+            with open(path, "r") as f:
+                for line in f:
+                    try:
+                        self.runs.append(json.loads(line))
+                    except ValueError:
+                        # Torn last line from an interrupted run
+                        continue
+        except OSError:
+            pass
+    
+    def samples(self, suite):
+        """Return the recent durations of every test in a suite."""
+        samples = {}
+        runs = [run for run in self.runs if run.get("suite") == suite][-HISTORY_WINDOW:]
+        for run in runs:
+            for test, duration in run.get("durations", {}).items():
+                samples.setdefault(test, []).append(duration)
+        return samples
+    
+    def expected_durations(self, suite):
+        """Return the mean recent duration of every test in a suite."""
+        return {test: statistics.fmean(values) for test, values in self.samples(suite).items()}
+    
+    def slowdowns(self, suite, durations):
+        """
+        Find tests that ran significantly slower than their baseline.
+        
+        Returns:
+            list: (test, duration, baseline mean, baseline stdev) tuples, worst first
+        """
+        samples = self.samples(suite)
+        flagged = []
+        for test, duration in durations.items():
+            values = samples.get(test, [])
+            if len(values) < MIN_SAMPLES:
+                continue
+            mean = statistics.fmean(values)
+            stdev = statistics.pstdev(values)
+            # Very stable tests would flag on noise alone, so allow at least 10%
+            spread = max(stdev, 0.1 * mean)
+            if duration - mean >= SLOWDOWN_MIN_SECONDS and duration > mean + SLOWDOWN_SIGMAS * spread:
+                flagged.append((test, duration, mean, stdev))
+        return sorted(flagged, key=lambda item: item[1] - item[2], reverse=True)
+    
+    def record(self, suite, durations):
+        """Append one run of a suite to the history."""
+        run = {
+            "suite": suite,
+            "time": datetime.now().isoformat(timespec="seconds"),
+            "durations": {test: round(duration, 6) for test, duration in sorted(durations.items())},
+        }
+        self.runs.append(run)
+        if len(self.runs) > HISTORY_MAX_RUNS:
+            # Rewrite the file with only the most recent runs
+            self.runs = self.runs[-(HISTORY_MAX_RUNS // 2):]
+            fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(self.path), prefix=".tmp-")
+            with os.fdopen(fd, "w") as f:
+                for entry in self.runs:
+                    f.write(json.dumps(entry) + "\n")
+            os.replace(temp_path, self.path)
+        else:
+            with open(self.path, "a") as f:
+                f.write(json.dumps(run) + "\n")
+
+
+def report_timings(history, suite, durations, slowest=5):
+    """
+    Print the slowest tests and any slowdowns, then add the run to the history.
+    
+    Args:
+        history (TestHistory): The timing history
+        suite (str): "python" or "js"
+        durations (dict): Seconds per test for this run
+        slowest (int): Number of slowest tests to list (0 for none)
+    """
+    label = "Python" if suite == "python" else "JavaScript"
+    if slowest:
+        print(f"\nSlowest {label} tests:")
+        for test, duration in sorted(durations.items(), key=lambda item: item[1], reverse=True)[:slowest]:
+            print(f"  {duration:7.3f}s  {test}")
+    for test, duration, mean, stdev in history.slowdowns(suite, durations):
+        print(f"! Slower than usual: {test} took {duration:.3f}s (baseline {mean:.3f}s ± {stdev:.3f}s)")
+    history.record(suite, durations)
+
+
+class TestCache:
+    """
+    Record of the inputs of every test module at its last green run.
+    
+    Each Python test module and Jest test file maps to the content hashes
+    of the files it imported or loaded. File hashes are cached by size and
+    modification time, so checking for changes only re-reads files that
+    were touched.
+    """
+    
+    def __init__(self, path=CACHE_PATH):
+        self.path = path
+        self.data = {'version': CACHE_VERSION, 'files': {}, 'python': {}, 'js': {}}
+        try:
+            with open(path, 'r') as f:
+                data = json.load(f)
+            if data.get('version') == CACHE_VERSION:
+                self.data = data
+        except (OSError, ValueError):
+            pass
+    
+    def save(self):
+        """Write the cache atomically."""
+        fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(self.path), prefix='.tmp-')
+        with os.fdopen(fd, 'w') as f:
+            json.dump(self.data, f, indent=1, sort_keys=True)
+        os.replace(temp_path, self.path)
+    
+    def file_hash(self, path):
+        """Return the content hash of a repository file, or None if it is missing."""
+        try:
+            stat = os.stat(os.path.join(ROOT_DIR, path))
+        except OSError:
+            return None
+        cached = self.data['files'].get(path)
+        if cached and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+            return cached[2]
+        with open(os.path.join(ROOT_DIR, path), 'rb') as f:
+            digest = hashlib.sha256(f.read()).hexdigest()
+        self.data['files'][path] = [stat.st_mtime_ns, stat.st_size, digest]
+        return digest
+    
+    def is_current(self, kind, name):
+        """Return True if a test passed last time and none of its inputs changed."""
+        inputs = self.data[kind].get(name)
+        if inputs is None:
+            return False
+        return all(self.file_hash(path) == digest for path, digest in inputs.items())
+    
+    def record(self, kind, name, inputs, passed):
+        """Remember the inputs of a passing test; forget a failing one."""
+        if passed:
+            self.data[kind][name] = {path: self.file_hash(path) for path in sorted(inputs)}
+        else:
+            self.data[kind].pop(name, None)
+    
+    def prune(self, kind, names):
+        """Drop tests that no longer exist."""
+        for name in set(self.data[kind]) - set(names):
+            del self.data[kind][name]
+
+
+def python_test_modules():
+    """Return the names of the Python test modules."""
+    return sorted(os.path.splitext(os.path.basename(path))[0]
+                  for path in glob.glob(os.path.join(PYTHON_TESTS_DIR, 'test_*.py')))
+
+
+def _repo_path(path):
+    """Return a path relative to the repository if it is a tracked input, else None."""
+    try:
+        path = os.path.abspath(os.fsdecode(path))
+    except TypeError:
+        return None
+    if not path.startswith(ROOT_DIR + os.sep):
+        return None
+    relative = os.path.relpath(path, ROOT_DIR)
+    parts = relative.split(os.sep)
+    if parts[0] in ('.git', 'node_modules', 'coverage') or '__pycache__' in parts \
+            or relative == os.path.basename(CACHE_PATH):
+        return None
+    return relative.replace(os.sep, '/')
+
+
+def _run_tracked_module(module_name, verbose=False):
+    """
+    Run one Python test module in a fresh process, recording its inputs.
+    
+    Every repository file the module imports or opens for reading is
+    recorded through an audit hook.
+    """
+    opened = set()
+    write_flags = os.O_WRONLY | os.O_RDWR | os.O_APPEND | os.O_CREAT
+    
+    def hook(event, args):
+        if event == 'open' and not isinstance(args[0], int) and not (args[2] or 0) & write_flags:
+            path = _repo_path(args[0])
+            if path:
+                opened.add(path)
+    
+    sys.addaudithook(hook)
+    result = _run_python_shard([module_name], verbose)
+    for name, module in list(sys.modules.items()):
+        if name in ('__main__', '__mp_main__'):
+            # The test runner itself
+            continue
+        path = _repo_path(getattr(module, '__file__', None) or '')
+        if path:
+            opened.add(path)
+    # Files the tests created and removed again are not inputs
+    result['inputs'] = sorted(path for path in opened if os.path.isfile(os.path.join(ROOT_DIR, path)))
+    result['module'] = module_name
+    return result
+
+
+def _tracked_module_worker(module_name, verbose, connection):
+    """Process target: run a tracked test module and send back its result."""
+    connection.send(_run_tracked_module(module_name, verbose))
+    connection.close()
+
+
+def _run_isolated(module_names, workers, verbose=False):
+    """
+    Run each test module in its own process, at most `workers` at a time.
+    
+    The runner has not imported any test code, so forking it is as clean
+    as spawning a new interpreter and much faster. The processes are not
+    daemonic, so tests can start processes of their own.
+    
+    Returns:
+        list: Results in the order of `module_names`
+    """
+    methods = multiprocessing.get_all_start_methods()
+    context = multiprocessing.get_context('fork' if 'fork' in methods else 'spawn')
+    pending = list(module_names)
+    running = {}
+    results = {}
+    while pending or running:
+        while pending and len(running) < workers:
+            name = pending.pop(0)
+            receiver, sender = context.Pipe(duplex=False)
+            process = context.Process(target=_tracked_module_worker, args=(name, verbose, sender))
+            process.start()
+            sender.close()
+            running[receiver] = (process, name)
+        for receiver in multiprocessing.connection.wait(list(running)):
+            process, name = running.pop(receiver)
+            try:
+                results[name] = receiver.recv()
+            except EOFError:
+                results[name] = {'module': name, 'output': f"Error: test process exited with code "
+                                 f"{process.exitcode}", 'run': 0, 'failures': 0, 'errors': 1,
+                                 'skipped': 0, 'success': False, 'inputs': []}
+            receiver.close()
+            process.join()
+    return [results[name] for name in module_names]
+
+
+def js_test_files():
+    """Return the Jest test files, relative to the repository."""
+    return sorted(os.path.relpath(path, ROOT_DIR).replace(os.sep, '/')
+                  for path in glob.glob(os.path.join(JS_TESTS_DIR, '**', '*.test.js'), recursive=True))
+
+
+_JS_RELATIVE_PATH = re.compile(r"""['"](\.{1,2}/[^'"\s]+)['"]""")
+
+
+def js_dependencies(test_file):
+    """
+    Find the files a Jest test loads.
+    
+    Follows relative require()/import specifiers and relative path literals
+    (e.g. a fs.readFileSync of '../index.html') from the test file and,
+    recursively, from the JavaScript files it loads.
+    """
+    inputs = set(path for path in JS_SHARED_INPUTS if os.path.exists(os.path.join(ROOT_DIR, path)))
+    pending = [test_file]
+    while pending:
+        path = pending.pop()
+        if path in inputs:
+            continue
+        inputs.add(path)
+        if not path.endswith('.js'):
+            continue
+        with open(os.path.join(ROOT_DIR, path), 'r') as f:
+            source = f.read()
+        directory = os.path.dirname(os.path.join(ROOT_DIR, path))
+        for specifier in _JS_RELATIVE_PATH.findall(source):
+            for candidate in (specifier, specifier + '.js'):
+                target = os.path.normpath(os.path.join(directory, candidate))
+                if os.path.isfile(target):
+                    relative = _repo_path(target)
+                    if relative:
+                        pending.append(relative)
+                    break
+    return inputs
+
+
+def run_changed_tests(run_python=True, run_js=True, jobs=None, verbose=False, timings=None, history=None):
+    """
+    Run only the tests whose inputs changed since their last green run.
+    
+    Python test modules each run in a fresh worker process so their
+    imports and file reads can be recorded; modules run in parallel
+    across `jobs` workers, longest first according to the timing history.
+    
+    Args:
+        run_python (bool): Consider the Python tests
+        run_js (bool): Consider the Jest tests
+        jobs (int, optional): Number of worker processes
+        verbose (bool): Increase output verbosity
+        timings (dict, optional): {"python": {}, "js": {}} filled with test durations
+        history (TestHistory, optional): Timing history to schedule by
+    
+    Returns:
+        bool: True if every test that ran passed
+    """
+    cache = TestCache()
+    success = True
+    
+    js_files = js_test_files() if run_js else []
+    js_selected = [path for path in js_files if not cache.is_current('js', path)]
+    js = start_js_tests(verbose, js_selected) if js_selected else None
+    
+    if run_python:
+        print("\n===== Running Python Tests =====")
+        modules = python_test_modules()
+        selected = [name for name in modules if not cache.is_current('python', name)]
+        print(f"{len(selected)} of {len(modules)} test modules changed since their last green run")
+        if selected:
+            started = time.perf_counter()
+            workers = min(len(selected), jobs or os.cpu_count() or 1)
+            if history:
+                expected = history.expected_durations('python')
+                order = sorted(selected, key=lambda name: sum(
+                    duration for test, duration in expected.items() if test.startswith(name + '.')), reverse=True)
+            else:
+                order = selected
+            results = _run_isolated(order, workers, verbose)
+            results.sort(key=lambda result: selected.index(result['module']))
+            for result in results:
+                print(f"--- {result['module']} ---")
+                print(result['output'].rstrip())
+                cache.record('python', result['module'], result['inputs'], result['success'])
+                if timings is not None:
+                    timings['python'].update(result['durations'])
+            success = all(result['success'] for result in results)
+            print(f"\n===== Python: ran {sum(result['run'] for result in results)} tests in "
+                  f"{time.perf_counter() - started:.3f}s =====")
+            print("OK" if success else "FAILED")
+        cache.prune('python', modules)
+    
+    if run_js:
+        if js_selected:
+            js_success = finish_js_tests(js, timings['js'] if timings is not None else None)
+            # Jest reports one result for the whole run
+            for path in js_selected:
+                cache.record('js', path, js_dependencies(path), js_success)
+            success = js_success and success
+        else:
+            print("\n===== Running JavaScript Tests =====")
+            print(f"0 of {len(js_files)} test files changed since their last green run")
+        cache.prune('js', js_files)
+    
+    cache.save()
+    return success
+
+
+WATCH_DIRS = ['tools', 'tests', 'js', 'games']
+WATCH_INTERVAL = 0.05
+# Wait until files have been quiet this long, so one save is one run
+WATCH_DEBOUNCE = 0.05
+
+
+def _snapshot(directories):
+    """Return (mtime, size) for every file under the watched directories."""
+    files = {}
+    pending = [os.path.join(ROOT_DIR, directory) for directory in directories]
+    while pending:
+        directory = pending.pop()
+        try:
+            entries = list(os.scandir(directory))
+        except OSError:
+            continue
+        for entry in entries:
+            if entry.name.startswith('.') or entry.name in ('__pycache__', 'node_modules'):
+                continue
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    pending.append(entry.path)
+                else:
+                    stat = entry.stat()
+                    files[os.path.relpath(entry.path, ROOT_DIR).replace(os.sep, '/')] = \
+                        (stat.st_mtime_ns, stat.st_size)
+            except OSError:
+                continue
+    return files
+
+
+def _python_modules():
+    """Map the module names of the tools and Python tests to their paths."""
+    modules = {}
+    for directory in (TOOLS_DIR, PYTHON_TESTS_DIR):
+        for path in glob.glob(os.path.join(directory, '*.py')):
+            modules[os.path.splitext(os.path.basename(path))[0]] = path
+    return modules
+
+
+def _import_graph(modules):
+    """Return, for every module, the set of tools/test modules it imports."""
+    graph = {}
+    for name, path in modules.items():
+        try:
+            with open(path, 'r') as f:
+                tree = ast.parse(f.read(), path)
+        except (OSError, SyntaxError, ValueError):
+            graph[name] = set()
+            continue
+        imported = set()
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Import):
+                imported.update(alias.name.split('.')[0] for alias in node.names)
+            elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+                imported.add(node.module.split('.')[0])
+        graph[name] = imported & set(modules)
+    return graph
+
+
+def _dependents(graph, changed):
+    """Return the changed modules plus every module that imports them, directly or not."""
+    affected = set(changed)
+    grew = True
+    while grew:
+        grew = False
+        for name, imported in graph.items():
+            if name not in affected and imported & affected:
+                affected.add(name)
+                grew = True
+    return affected
+
+
+def _warm_worker(connection):
+    """
+    Process target: keep the tools and test modules imported and fork a
+    fresh child for every test run.
+    
+    Each request is (modules to reload, test modules to run, verbose).
+    Changed modules and everything importing them are re-imported here
+    first, so the forked child starts with every module current and only
+    has to run the tests.
+    """
+    for directory in (TOOLS_DIR, PYTHON_TESTS_DIR):
+        if directory not in sys.path:
+            sys.path.insert(0, directory)
+    
+    def load(names):
+        for name in sorted(names):
+            try:
+                importlib.import_module(name)
+            except BaseException:
+                # Reported by the test run that imports it
+                sys.modules.pop(name, None)
+    
+    load(_python_modules())
+    while True:
+        try:
+            request = connection.recv()
+        except EOFError:
+            return
+        if request is None:
+            return
+        stale, test_names, verbose = request
+        for name in stale:
+            sys.modules.pop(name, None)
+        load(stale)
+        
+        pid = os.fork()
+        if pid == 0:
+            # The child reports straight to the runner
+            try:
+                connection.send(_run_python_shard(test_names, verbose))
+                os._exit(0)
+            except BaseException:
+                os._exit(1)
+        _, status = os.waitpid(pid, 0)
+        if status != 0:
+            connection.send({'output': f"Error: test process exited with status {status}",
+                             'durations': {}, 'run': 0, 'failures': 0, 'errors': 1,
+                             'skipped': 0, 'success': False})
+
+
+def _affected_python_tests(changed_paths, cache, graph):
+    """
+    Select the Python test modules affected by a set of changed files.
+    
+    A test module is affected when it changed itself, when it imports a
+    changed module (directly or not), or when a changed file is one of
+    the inputs recorded for it by the last --changed run.
+    """
+    changed_modules = {os.path.splitext(os.path.basename(path))[0] for path in changed_paths
+                       if path.endswith('.py') and path.startswith(('tools/', 'tests/python/'))}
+    affected_modules = _dependents(graph, changed_modules)
+    selected = []
+    for name in python_test_modules():
+        inputs = cache.data['python'].get(name, {})
+        if name in affected_modules or any(path in inputs for path in changed_paths):
+            selected.append(name)
+    return selected, affected_modules
+
+
+def watch_tests(run_python=True, run_js=True, verbose=False, slowest=5):
+    """
+    Watch the tools, tests, js and games directories and re-run affected tests.
+    
+    Python tests run in children forked from a warm worker that already
+    has the tools and test modules imported. JavaScript is handed to one
+    persistent `jest --watch` process, which watches and debounces the
+    JS files itself and only re-runs the tests related to a change.
+    """
+    if not hasattr(os, 'fork'):
+        print("Error: --watch needs a platform with os.fork")
+        return False
+    
+    history = TestHistory()
+    timings = {'python': {}, 'js': {}}
+    # Bring the dependency cache up to date first, so later runs can select precisely
+    if run_python:
+        run_changed_tests(True, False, None, verbose, timings, history)
+        if timings['python']:
+            report_timings(history, 'python', timings['python'], slowest)
+    
+    jest = None
+    if run_js:
+        print("\n===== Starting Jest in watch mode =====")
+        try:
+            jest = subprocess.Popen(["npm", "test", "--", "--watch"])
+        except FileNotFoundError:
+            print("Error: npm not found")
+    
+    connection = worker = None
+    if run_python:
+        context = multiprocessing.get_context('fork')
+        connection, worker_connection = context.Pipe()
+        worker = context.Process(target=_warm_worker, args=(worker_connection,), daemon=False)
+        worker.start()
+    
+    print("\nWatching tools/, tests/, js/ and games/ for changes (Ctrl+C to stop)")
+    files = _snapshot(WATCH_DIRS)
+    modules = _python_modules()
+    graph = _import_graph(modules)
+    try:
+        while True:
+            time.sleep(WATCH_INTERVAL)
+            current = _snapshot(WATCH_DIRS)
+            if current == files:
+                continue
+            # Debounce: wait until the files stop changing
+            while True:
+                time.sleep(WATCH_DEBOUNCE)
+                latest = _snapshot(WATCH_DIRS)
+                if latest == current:
+                    break
+                current = latest
+            changed = sorted(path for path in set(files) | set(current) if files.get(path) != current.get(path))
+            files = current
+            
+            # Only Python sources make the worker reload; any file can be a test input
+            python_changed = [path for path in changed if path.startswith(('tools/', 'tests/python/'))]
+            js_changed = [path for path in changed if path not in python_changed]
+            print(f"\n===== {datetime.now():%H:%M:%S} changed: {', '.join(changed)} =====")
+            if js_changed and jest:
+                print("JavaScript changes are picked up by the Jest watcher")
+            if not run_python:
+                continue
+            
+            if any(path.endswith('.py') for path in python_changed):
+                modules = _python_modules()
+                graph = _import_graph(modules)
+            # Tests that read files under js/ or games/ (such as game.js) are selected by their recorded inputs
+            selected, stale = _affected_python_tests(changed, TestCache(), graph)
+            if not selected:
+                print("No Python tests affected")
+                continue
+            started = time.perf_counter()
+            connection.send((sorted(stale & set(modules)), selected, verbose))
+            result = connection.recv()
+            print(result['output'].rstrip())
+            print(f"===== Python: ran {result['run']} tests from {len(selected)} module"
+                  f"{'s' if len(selected) != 1 else ''} in {time.perf_counter() - started:.3f}s =====")
+            if result['durations']:
+                report_timings(history, 'python', result['durations'], slowest)
+    except KeyboardInterrupt:
+        print("\nStopped watching")
+    finally:
+        if worker:
+            try:
+                connection.send(None)
+            except OSError:
+                pass
+            worker.join(timeout=1)
+            if worker.is_alive():
+                worker.terminate()
+        if jest and jest.poll() is None:
+            jest.terminate()
+            jest.wait()
+    return True
+
+
+def run_benchmarks(quick=False, baseline=None, threshold=None):
+    """
+    Run the tool benchmarks and compare them with earlier results.
+    
+    Results are written to .bench/<commit>.json; see tools/benchmarks.py.
+    
+    Args:
+        quick (bool): Skip the production-sized fixtures
+        baseline (str, optional): Results file of an earlier commit
+        threshold (float, optional): Allowed relative slowdown
+    
+    Returns:
+        bool: True if no benchmark regressed, False otherwise
+    """
+    if TOOLS_DIR not in sys.path:
+        sys.path.insert(0, TOOLS_DIR)
+    import benchmarks
+    
+    print("\n===== Running Benchmarks =====")
+    try:
+        previous = benchmarks.load_results(baseline) if baseline else None
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}")
+        return False
+    results = benchmarks.run_benchmarks(quick=quick, progress=lambda key, result: print(
+        benchmarks.format_result(key, result), flush=True))
+    output = os.path.join(benchmarks.BENCH_DIR, f"{results['commit'] or 'results'}.json")
+    benchmarks.write_results(results, output)
+    print(f"Results written to {os.path.relpath(output, ROOT_DIR)}")
+    
+    if previous is None:
+        return True
+    if threshold is None:
+        threshold = benchmarks.DEFAULT_THRESHOLD
+    regressions = benchmarks.compare_results(results, previous, threshold)
+    for regression in regressions:
+        print(f"! Regression: {benchmarks.format_regression(*regression)}")
+    if not regressions:
+        print(f"No regressions against {baseline} (threshold {threshold:.0%})")
+    return not regressions
+
+
+def run_js_tests(verbose=False, timings=None):
+    """Run all JavaScript tests using Jest."""
+    print("\n===== Running JavaScript Tests =====")
+    
+    # Run Jest tests
+    report_path = _new_report_path()
+    cmd = _jest_command(verbose, report_path=report_path)
     
     try:
         result = subprocess.run(cmd, check=True)
         return result.returncode == 0
     except subprocess.CalledProcessError:
         return False
+    finally:
+        durations = read_jest_durations(report_path)
+        if timings is not None:
+            timings.update(durations)
 
 
 def main():
@@ -49,20 +939,63 @@ def main():
     parser.add_argument("--python-only", action="store_true", help="Run only Python tests")
     parser.add_argument("--js-only", action="store_true", help="Run only JavaScript tests")
     parser.add_argument("-v", "--verbose", action="store_true", help="Increase output verbosity")
+    parser.add_argument("--parallel", action="store_true",
+                        help="Run the JS and Python suites at the same time and shard the Python tests")
+    parser.add_argument("-j", "--jobs", type=int, help="Number of Python shards in parallel mode (default: CPU count)")
+    parser.add_argument("--changed", action="store_true",
+                        help="Only run tests whose source files changed since their last green run")
+    parser.add_argument("--slowest", type=int, default=5, metavar="N",
+                        help="List the N slowest tests of each suite (0 to disable)")
+    parser.add_argument("--watch", action="store_true",
+                        help="Keep running and re-run the affected tests whenever a file changes")
+    parser.add_argument("--bench", action="store_true", help="Run the tool benchmarks instead of the tests")
+    parser.add_argument("--quick", action="store_true", help="Skip the production-sized fixtures in --bench")
+    parser.add_argument("--baseline", metavar="RESULTS",
+                        help="Benchmark results to compare against, e.g. .bench/<commit>.json")
+    parser.add_argument("--threshold", type=float,
+                        help="Allowed relative benchmark slowdown before it counts as a regression (default: 0.2)")
     args = parser.parse_args()
     
-    # Track success of all test runs
-    success = True
+    if args.bench:
+        sys.exit(0 if run_benchmarks(args.quick, args.baseline, args.threshold) else 1)
+    
+    run_python = args.python_only or not args.js_only
+    run_js = args.js_only or not args.python_only
+    
+    if args.watch:
+        sys.exit(0 if watch_tests(run_python, run_js, args.verbose, args.slowest) else 1)
+    
+    # Per-test durations of this run, reported and added to the history at the end
+    history = TestHistory()
+    timings = {"python": {}, "js": {}}
     
-    # Run Python tests if requested or if no specific test type is requested
-    if args.python_only or (not args.python_only and not args.js_only):
-        python_success = run_python_tests(args.verbose)
-        success = success and python_success
+    if args.changed:
+        success = run_changed_tests(run_python, run_js, args.jobs, args.verbose, timings, history)
+    elif args.parallel:
+        # Jest runs in the background while the Python shards run
+        js = start_js_tests(args.verbose) if run_js else None
+        success = True
+        if run_python:
+            success = run_python_tests_parallel(args.jobs, args.verbose, timings["python"], history) and success
+        if run_js:
+            success = finish_js_tests(js, timings["js"]) and success
+    else:
+        # Track success of all test runs
+        success = True
+        
+        # Run Python tests if requested or if no specific test type is requested
+        if run_python:
+            python_success = run_python_tests(args.verbose, timings["python"])
+            success = success and python_success
+        
+        # Run JavaScript tests if requested or if no specific test type is requested
+        if run_js:
+            js_success = run_js_tests(args.verbose, timings["js"])
+            success = success and js_success
     
-    # Run JavaScript tests if requested or if no specific test type is requested
-    if args.js_only or (not args.python_only and not args.js_only):
-        js_success = run_js_tests(args.verbose)
-        success = success and js_success
+    for suite, durations in timings.items():
+        if durations:
+            report_timings(history, suite, durations, args.slowest)
     
     # Return appropriate exit code
     sys.exit(0 if success else 1)
@@ -0,0 +1,154 @@
+import os
+import sys
+import gzip
+import json
+import shutil
+import tempfile
+import unittest
+
+# Add the tools directory to the path so we can import the modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../tools')))
+
+import asset_optimizer
+
+
+PAGE = """<!DOCTYPE html>
+<html>
+<head>
+    <!-- Styles -->
+    <link rel="stylesheet" href="/css/style.css">
+</head>
+<body>
+    <p>Hello   <b>world</b></p>
+    <pre>  keep
+    this</pre>
+    <div x-show="count > 1" @click="open = !open">x</div>
+    <script src="game.js?v=1"></script>
+    <script>
+        // Inline script
+        const total = 1 + 2
+    </script>
+</body>
+</html>
+"""
+
+STYLE_RULE = """/* Site styles */
+@media screen and (max-width: 600px) {
+    .card :hover, .a > .b {
+        margin : 0 auto;
+        width: calc(100% - 2px);
+    }
+}
+"""
+STYLE = STYLE_RULE * 20
+
+SCRIPT_BLOCK = """// Game
+const answer = 42
+++count
+const re = /[/]\\//g, half = answer / 2 / 1;
+const label = `score: ${ {value: answer}.value + `!${ half }` }`;
+return a - -b + +c
+"""
+SCRIPT = SCRIPT_BLOCK * 20
+
+
+class TestAssetOptimizer(unittest.TestCase):
+    """Tests for the asset_optimizer.py build pipeline."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.site = os.path.join(self.temp_dir, 'site')
+        self.output = os.path.join(self.temp_dir, 'dist')
+        self.write('games/snake/index.html', PAGE)
+        self.write('games/snake/game.js', SCRIPT)
+        self.write('games/snake/unused.js', 'var a = 1;\n')
+        self.write('css/style.css', STYLE)
+        self.write('index.html', '<html><body><a href="games/snake/">Snake</a></body></html>')
+
+    def tearDown(self):
+        """Tear down test fixtures."""
+        shutil.rmtree(self.temp_dir)
+
+    def write(self, name, content):
+        path = os.path.join(self.site, name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w') as f:
+            f.write(content)
+
+    def read(self, name):
+        with open(os.path.join(self.output, name)) as f:
+            return f.read()
+
+    def build(self):
+        return asset_optimizer.build(self.site, self.output, workers=1)
+
+    def test_minifiers(self):
+        """Test that only comments and insignificant whitespace are removed."""
+        self.assertEqual(asset_optimizer.minify_css(STYLE_RULE),
+                         '@media screen and (max-width:600px){.card :hover,.a>.b{margin :0 auto;'
+                         'width:calc(100% - 2px)}}')
+        self.assertEqual(asset_optimizer.minify_js(SCRIPT_BLOCK),
+                         'const answer=42\n++count\nconst re=/[/]\\//g,half=answer/2/1;'
+                         'const label=`score: ${{value:answer}.value+`!${half}`}`;return a- -b+ +c')
+        html = asset_optimizer.minify_html(PAGE, 'games/snake/index.html')
+        self.assertTrue(html.startswith('<!DOCTYPE html><html><head><link rel="stylesheet" href="/css/style.css">'
+                                        '</head><body>'))
+        self.assertIn('<p>Hello <b>world</b></p>', html)
+        self.assertIn('<pre>  keep\n    this</pre>', html)
+        self.assertIn('<div x-show="count > 1" @click="open = !open">x</div>', html)
+        self.assertIn('<script>const total=1+2</script>', html)
+        self.assertNotIn('Styles', html)
+
+    def test_hashes_referenced_assets_and_rewrites_pages(self):
+        """Test hashed names, rewritten references, compressed siblings and cache headers."""
+        result = self.build()
+        self.assertEqual(result['built'], 5)
+        style = result['hashed'][0]
+        self.assertRegex(style, r'^css/style\.[0-9a-f]{8}\.css$')
+        self.assertEqual(len(result['hashed']), 2)
+        game = os.path.basename(result['hashed'][1])
+
+        page = self.read('games/snake/index.html')
+        self.assertIn(f'href="/{style}"', page)
+        self.assertIn(f'src="{game}?v=1"', page)
+        self.assertTrue(os.path.exists(os.path.join(self.output, 'games/snake/unused.js')))
+        with gzip.open(os.path.join(self.output, style + '.gz'), 'rt') as f:
+            self.assertEqual(f.read(), self.read(style))
+        self.assertIn(f'for = "/{style}"', self.read(asset_optimizer.HEADERS_FILE))
+        self.assertIn('immutable', result['headers'])
+
+    def test_incremental_rebuild(self):
+        """Test that only changed files and the pages referencing them are rebuilt."""
+        first = self.build()
+        self.assertEqual(self.build()['built'], 0)
+
+        self.write('css/style.css', STYLE + '.extra { color: red; }\n')
+        second = self.build()
+        self.assertEqual(second['built'], 2)
+        self.assertEqual(second['removed'], 2)
+        self.assertFalse(os.path.exists(os.path.join(self.output, first['hashed'][0])))
+        self.assertIn(second['hashed'][0], self.read('games/snake/index.html'))
+
+        os.remove(os.path.join(self.output, 'index.html'))
+        self.assertEqual(self.build()['built'], 1)
+        with open(os.path.join(self.output, asset_optimizer.MANIFEST_FILE)) as f:
+            self.assertEqual(len(json.load(f)['files']), 5)
+
+    def test_netlify_toml_block_is_replaced(self):
+        """Test that the headers block replaces the previous build's block."""
+        path = os.path.join(self.temp_dir, 'netlify.toml')
+        with open(path, 'w') as f:
+            f.write('[build]\n  publish = "dist"\n')
+        asset_optimizer.update_netlify_toml(path, asset_optimizer.headers_block(['css/a.1.css']))
+        asset_optimizer.update_netlify_toml(path, asset_optimizer.headers_block(['css/a.2.css']))
+        with open(path) as f:
+            config = f.read()
+        self.assertTrue(config.startswith('[build]\n  publish = "dist"\n\n'))
+        self.assertEqual(config.count(asset_optimizer.HEADERS_BEGIN), 1)
+        self.assertNotIn('a.1.css', config)
+        self.assertIn('for = "/css/a.2.css"', config)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,125 @@
+import os
+import sys
+import json
+import zlib
+import struct
+import shutil
+import tempfile
+import unittest
+
+# Add the tools directory to the path so we can import the modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../tools')))
+
+import beatmap_compiler
+import wave_simulator
+
+
+LEVEL = {
+    'title': 'Two Lanes',
+    'bpm': 120,
+    'tempo': [{'beat': 4, 'bpm': 240}],
+    'lanes': [[[0, 3], [3, 3], [3, 5]], [[0, 0], [5, 0]]],
+    'waves': [
+        {'spawns': [{'enemy': 'runner', 'beat': 6, 'lane': 1},
+                    {'enemy': 'tank', 'time': 100},
+                    {'enemy': 'flyer', 'beat': 2}]},
+        {'generate': 3},
+    ],
+}
+
+
+class TestBeatmapCompiler(unittest.TestCase):
+    """Tests for the beatmap_compiler.py binary level compiler."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.params = wave_simulator.load_game_config()
+
+    def tearDown(self):
+        """Tear down test fixtures."""
+        shutil.rmtree(self.temp_dir)
+
+    def write_level(self, name, source):
+        with open(os.path.join(self.temp_dir, name + '.json'), 'w') as f:
+            json.dump(source, f)
+
+    def test_round_trip(self):
+        """Test that a compiled level decodes back to its beats, spawns and lanes."""
+        data = beatmap_compiler.compile_level(LEVEL, self.params)
+        self.assertEqual(data[:4], beatmap_compiler.MAGIC)
+        self.assertEqual(len(data) % beatmap_compiler.ALIGNMENT, 0)
+        self.assertEqual(beatmap_compiler.validate_level(data, self.params['enemies']), [])
+
+        level = beatmap_compiler.read_level(data)
+        self.assertEqual(level['bpm'], 120)
+        self.assertEqual(level['enemies'], ['runner', 'tank', 'flyer'])
+        self.assertEqual(level['lanes'], [[(0, 3), (3, 3), (3, 5)], [(0, 0), (5, 0)]])
+        # 500 ms beats up to beat 4, then 250 ms beats
+        self.assertEqual(level['beats'][:7], [0, 500, 1000, 1500, 2000, 2250, 2500])
+        self.assertEqual(level['waves'][0], [(100, 'tank', 0), (1000, 'flyer', 0), (2500, 'runner', 1)])
+        self.assertEqual(level['waves'][1], [(delay, enemy, 0) for enemy, delay in wave_simulator.wave_config(3)])
+        # The beat map lasts until the slowest enemy of the last spawn has walked the longest lane
+        self.assertGreaterEqual(level['beats'][-1], 8000 + 5 / 0.8 * 1000)
+
+        for index, (name, code) in enumerate(beatmap_compiler.SECTIONS):
+            offset, length = struct.unpack_from('<II', data, beatmap_compiler.HEADER.size + 8 * index)
+            self.assertEqual(offset % beatmap_compiler.ALIGNMENT, 0, name)
+
+    def test_default_level_mirrors_the_game(self):
+        """Test that a level of generated waves matches getWaveConfig and the game's tempo and path."""
+        level = beatmap_compiler.read_level(beatmap_compiler.compile_level({'waves': 10}, self.params))
+        self.assertEqual(level['bpm'], self.params['bpm'])
+        self.assertEqual(level['lanes'], [[tuple(point) for point in self.params['path']]])
+        self.assertEqual(len(level['waves']), 10)
+        for wave, spawns in enumerate(level['waves'], 1):
+            self.assertEqual(spawns, [(delay, enemy, 0) for enemy, delay in wave_simulator.wave_config(wave)])
+        self.assertEqual(level['beats'][1], 60000 / self.params['bpm'])
+
+    def test_validator_rejects_broken_levels(self):
+        """Test the checks on corrupt, truncated and inconsistent levels and invalid sources."""
+        data = beatmap_compiler.compile_level(LEVEL, self.params)
+        self.assertEqual(beatmap_compiler.validate_level(b'RDLV'), ['too short for a level header'])
+        self.assertEqual(beatmap_compiler.validate_level(b'XXXX' + data[4:]), ['not a Rhythm Defense level'])
+        corrupt = bytearray(data)
+        corrupt[-8] ^= 0xFF
+        self.assertEqual(beatmap_compiler.validate_level(bytes(corrupt)), ['checksum mismatch'])
+
+        # A well-formed file whose first wave runs backwards and uses an unknown lane
+        times_offset = struct.unpack_from('<I', data, beatmap_compiler.HEADER.size + 8 * 2)[0]
+        lanes_offset = struct.unpack_from('<I', data, beatmap_compiler.HEADER.size + 8 * 4)[0]
+        broken = bytearray(data)
+        struct.pack_into('<I', broken, times_offset, 5000)
+        broken[lanes_offset] = 7
+        struct.pack_into('<I', broken, 12, zlib.crc32(bytes(broken[beatmap_compiler.HEADER.size:])))
+        self.assertEqual(beatmap_compiler.validate_level(bytes(broken)),
+                         ['wave 1: spawn times must not decrease', 'wave 1: spawn on an unknown lane'])
+        self.assertEqual(beatmap_compiler.validate_level(data, ['runner']),
+                         ["unknown enemy 'tank'", "unknown enemy 'flyer'"])
+
+        for source in ({'waves': []}, {'waves': [{'spawns': [{'enemy': 'dragon', 'time': 0}]}]},
+                       {'waves': [{'spawns': [{'enemy': 'runner', 'time': 0, 'lane': 1}]}]},
+                       {'bpm': 0, 'waves': 1}, {'lanes': [[[0, 0]]], 'waves': 1}):
+            self.assertRaises(ValueError, beatmap_compiler.compile_level, source, self.params)
+
+    def test_compile_levels_writes_changed_files(self):
+        """Test compiling a levels directory, skipping unchanged output and reporting bad sources."""
+        self.write_level('classic', {'waves': 2})
+        self.write_level('duet', LEVEL)
+        summary = beatmap_compiler.compile_levels(self.temp_dir)
+        self.assertEqual(sorted(summary), ['classic', 'duet'])
+        self.assertEqual((summary['classic']['waves'], summary['classic']['spawns']), (2, 16))
+        self.assertTrue(summary['duet']['changed'])
+        with open(os.path.join(self.temp_dir, 'duet.bin'), 'rb') as f:
+            self.assertEqual(f.read(), beatmap_compiler.compile_level(LEVEL, self.params))
+
+        self.assertFalse(beatmap_compiler.compile_levels(self.temp_dir)['duet']['changed'])
+
+        self.write_level('broken', {'waves': [{'spawns': []}]})
+        with self.assertRaises(ValueError) as context:
+            beatmap_compiler.compile_levels(self.temp_dir, ['broken'])
+        self.assertIn('broken: wave 1 has no spawns', str(context.exception))
+
+
+if __name__ == '__main__':
+    unittest.main()
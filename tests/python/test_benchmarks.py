@@ -0,0 +1,71 @@
+import os
+import sys
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+
+# Add the tools directory to the path so we can import the modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../tools')))
+
+import benchmarks
+import game_idea_generator
+
+
+class TestBenchmarks(unittest.TestCase):
+    """Tests for the benchmarks.py harness."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.fixture_dir = patch.object(benchmarks, 'FIXTURE_DIR', os.path.join(self.temp_dir, 'fixtures'))
+        self.fixture_dir.start()
+
+    def tearDown(self):
+        """Tear down test fixtures."""
+        self.fixture_dir.stop()
+        shutil.rmtree(self.temp_dir)
+
+    def test_measure(self):
+        """Test that a measurement has ordered percentiles and traced memory."""
+        result = benchmarks.measure(lambda: bytearray(100_000), min_iterations=10, budget=0)
+        self.assertEqual(result['iterations'], 10)
+        self.assertLessEqual(result['p50'], result['p90'])
+        self.assertLessEqual(result['p90'], result['p99'])
+        self.assertLessEqual(result['p99'], result['max'])
+        self.assertGreater(result['ops_per_second'], 0)
+        self.assertGreaterEqual(result['peak_memory'], 100_000)
+
+    def test_run_and_round_trip(self):
+        """Test running benchmarks on small fixtures and reading the results back."""
+        concepts = game_idea_generator.GAME_CONCEPTS
+        with patch.dict(benchmarks.BENCHMARKS, {'generate_game_idea': ([10], benchmarks._bench_generate_game_idea),
+                                                'update_game_registry': ([10], benchmarks._bench_update_game_registry)}):
+            results = benchmarks.run_benchmarks(['generate_game_idea', 'update_game_registry', 'format_game_proposal'],
+                                                budget=0)
+        self.assertIs(game_idea_generator.GAME_CONCEPTS, concepts)
+        self.assertEqual(set(results['results']),
+                         {'generate_game_idea[10]', 'update_game_registry[10]', 'format_game_proposal'})
+
+        path = os.path.join(self.temp_dir, 'results.json')
+        benchmarks.write_results(results, path)
+        self.assertEqual(benchmarks.load_results(path), results)
+
+    def test_compare_results(self):
+        """Test that only growth beyond the threshold counts as a regression."""
+        def results(p50, peak_memory):
+            return {'results': {'bench[10]': {'p50': p50, 'peak_memory': peak_memory}}}
+
+        baseline = results(0.010, 100_000)
+        self.assertEqual(benchmarks.compare_results(results(0.011, 110_000), baseline, 0.2), [])
+        self.assertEqual(benchmarks.compare_results(results(0.013, 100_000), baseline, 0.2),
+                         [('bench[10]', 'p50', 0.010, 0.013)])
+        self.assertEqual(benchmarks.compare_results(results(0.010, 200_000), baseline, 0.2),
+                         [('bench[10]', 'peak_memory', 100_000, 200_000)])
+        # Sub-noise timings and benchmarks missing from the baseline are ignored
+        self.assertEqual(benchmarks.compare_results(results(0.00002, 100_000), results(0.00001, 100_000)), [])
+        self.assertEqual(benchmarks.compare_results(results(1.0, 100_000), {'results': {}}), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,96 @@
+import os
+import sys
+import shutil
+import tempfile
+import unittest
+
+# Add the tools directory to the path so we can import the modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../tools')))
+
+import concept_catalog
+
+
+def _concept(number, category, difficulty, tags, weight=None):
+    concept = {
+        "title": f"Concept {number}",
+        "category": category,
+        "description": f"Description {number}",
+        "mechanics": [f"Mechanic {number}"],
+        "difficulty": difficulty,
+        "tags": tags,
+    }
+    if weight is not None:
+        concept["weight"] = weight
+    return concept
+
+
+class TestConceptCatalog(unittest.TestCase):
+    """Tests for the concept_catalog.py on-disk catalog."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.temp_dir, 'concepts.jsonl')
+        self.concepts = [
+            _concept(0, 'arcade', 'easy', ['retro', 'shooter']),
+            _concept(1, 'puzzle', 'medium', ['retro']),
+            _concept(2, 'arcade', 'hard', ['music'], weight=2.5),
+            _concept(3, 'arcade', 'easy', ['music', 'retro']),
+        ]
+        concept_catalog.write_catalog(self.concepts, self.path)
+        self.catalog = concept_catalog.ConceptCatalog(self.path)
+
+    def tearDown(self):
+        """Tear down test fixtures."""
+        self.catalog.close()
+        shutil.rmtree(self.temp_dir)
+
+    def test_lazy_open(self):
+        """Test that nothing is read until the catalog is used."""
+        catalog = concept_catalog.ConceptCatalog(os.path.join(self.temp_dir, 'missing.jsonl'))
+        with self.assertRaises(concept_catalog.CatalogError):
+            len(catalog)
+
+    def test_sequence_access(self):
+        """Test decoding concepts by position."""
+        self.assertEqual(len(self.catalog), 4)
+        concept = self.catalog[2]
+        self.assertIsInstance(concept, concept_catalog.Concept)
+        self.assertEqual(concept['title'], 'Concept 2')
+        self.assertEqual(concept.weight, 2.5)
+        self.assertEqual(self.catalog[-1].to_dict(), self.concepts[3])
+        self.assertEqual([c.title for c in self.catalog[1:3]], ['Concept 1', 'Concept 2'])
+        with self.assertRaises(IndexError):
+            self.catalog[4]
+
+    def test_interned_strings(self):
+        """Test that decoded categories and tags share one string object."""
+        self.assertIs(self.catalog[0].category, self.catalog[3].category)
+        self.assertIs(self.catalog[0].tags[0], self.catalog[1].tags[0])
+
+    def test_positions_from_index(self):
+        """Test filtering from the index columns."""
+        self.assertEqual(list(self.catalog.positions()), [0, 1, 2, 3])
+        self.assertEqual(list(self.catalog.positions('arcade')), [0, 2, 3])
+        self.assertEqual(list(self.catalog.positions('arcade', 'easy')), [0, 3])
+        self.assertEqual(list(self.catalog.positions(tag='retro')), [0, 1, 3])
+        self.assertEqual(list(self.catalog.positions('arcade', 'easy', 'music')), [3])
+        self.assertEqual(list(self.catalog.positions('strategy')), [])
+        self.assertEqual(list(self.catalog.positions(tag='unknown')), [])
+        self.assertEqual(self.catalog.weight(2), 2.5)
+        self.assertFalse(self.catalog.uniform_weights)
+
+    def test_stale_index_is_rebuilt(self):
+        """Test that editing the catalog invalidates its index."""
+        len(self.catalog)
+        self.catalog.close()
+        with open(self.path, 'a') as f:
+            f.write('{"title": "New", "category": "strategy", "difficulty": "hard", "tags": []}\n')
+        catalog = concept_catalog.ConceptCatalog(self.path)
+        self.assertEqual(len(catalog), 5)
+        self.assertEqual(list(catalog.positions('strategy')), [4])
+        catalog.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,90 @@
+import os
+import sys
+import unittest
+
+# Add the tools directory to the path so we can import the modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../tools')))
+
+import concept_synthesis
+from game_idea_generator import format_game_proposal
+
+
+def _concept(title, category, mechanics, tags, difficulty='medium'):
+    return {"title": title, "category": category, "description": f"About {title}.",
+            "mechanics": mechanics, "difficulty": difficulty, "tags": tags}
+
+
+CONCEPTS = [
+    _concept('Star Hopper', 'arcade',
+             ['Jump between asteroids', 'Collect stardust for points', 'Avoid falling comets'],
+             ['arcade', 'space', 'retro']),
+    _concept('Space Miner', 'arcade',
+             ['Drill asteroids for ore', 'Upgrade the mining ship', 'Fuel runs out over time'],
+             ['arcade', 'space', 'upgrades'], 'hard'),
+    _concept('Word Garden', 'puzzle',
+             ['Spell words from letter seeds', 'Longer words grow rarer flowers', 'Water plants every turn'],
+             ['puzzle', 'words', 'casual'], 'easy'),
+]
+
+
+class TestConceptSynthesis(unittest.TestCase):
+    """Tests for the concept_synthesis.py recombination engine."""
+
+    def test_feature_space(self):
+        """Test the bitset vectors and their cosine similarity."""
+        space = concept_synthesis.FeatureSpace(CONCEPTS)
+        self.assertEqual(len(space.mechanics), 9)
+        self.assertEqual(space.mechanic_sources[:4], [0, 0, 0, 1])
+        self.assertEqual(space.coherence[0][0], 1.0)
+        # Two shared tags out of three each
+        self.assertAlmostEqual(space.coherence[0][1], 2 / 3)
+        self.assertEqual(space.coherence[0][2], 0.0)
+        self.assertAlmostEqual(concept_synthesis._cosine(0b1100, 0b0110), 0.5)
+
+    def test_synthesized_ideas(self):
+        """Test that ideas recombine concepts and are ready to format."""
+        stats = {}
+        ideas = concept_synthesis.synthesize_game_ideas(CONCEPTS, top_k=3, mechanics_per_idea=3, stats=stats)
+        self.assertTrue(stats['exhaustive'])
+        self.assertEqual(stats['evaluated'], 84)
+        self.assertEqual(len(ideas), 3)
+
+        scores = [idea['score'] for idea in ideas]
+        self.assertEqual(scores, sorted(scores, reverse=True))
+        self.assertEqual(len({tuple(sorted(idea['sources'])) for idea in ideas}), 3)
+        for idea in ideas:
+            self.assertGreaterEqual(len(idea['sources']), 2)
+            self.assertEqual(len(idea['mechanics']), 3)
+            self.assertGreater(idea['novelty'], 0)
+        # The two space games fit together better than either does with the word game
+        self.assertEqual(sorted(ideas[0]['sources']), ['Space Miner', 'Star Hopper'])
+        self.assertEqual(ideas[0]['difficulty'], 'hard')
+
+        proposal = format_game_proposal(ideas[0])
+        self.assertTrue(proposal.startswith(f"# Game Proposal: {ideas[0]['title']}"))
+
+    def test_novelty_is_measured_against_the_catalog(self):
+        """Test that an idea duplicating a catalog concept outside the sources is not novel."""
+        combination = (0, 3)
+        space = concept_synthesis.FeatureSpace(CONCEPTS[:2])
+        novelty = concept_synthesis._score_combinations(space, [combination], 1, 0.5)[1][0][1]
+        self.assertGreater(novelty, 0)
+
+        duplicate = _concept('Rock Jumper', 'arcade', ['Jump between asteroids', 'Drill asteroids for ore'],
+                             ['arcade', 'space', 'retro', 'upgrades'])
+        space = concept_synthesis.FeatureSpace(CONCEPTS[:2], CONCEPTS + [duplicate])
+        self.assertEqual(len(space.concept_vectors), 4)
+        self.assertEqual(len(space.mechanics), 6)
+        novelty = concept_synthesis._score_combinations(space, [combination], 1, 0.5)[1][0][1]
+        self.assertAlmostEqual(novelty, 0.0)
+
+    def test_sampled_search_is_reproducible(self):
+        """Test that a seeded sampled search returns the same ideas."""
+        first = concept_synthesis.synthesize_game_ideas(CONCEPTS, top_k=2, budget=30, seed=5, workers=1)
+        second = concept_synthesis.synthesize_game_ideas(CONCEPTS, top_k=2, budget=30, seed=5, workers=1)
+        self.assertEqual(first, second)
+        self.assertEqual(concept_synthesis.synthesize_game_ideas(CONCEPTS[:1]), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
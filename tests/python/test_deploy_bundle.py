@@ -0,0 +1,118 @@
+import os
+import sys
+import json
+import shutil
+import tempfile
+import unittest
+
+# Add the tools directory to the path so we can import the modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../tools')))
+
+import deploy_bundle
+
+
+class TestDeployBundle(unittest.TestCase):
+    """Tests for the deploy_bundle.py publish directory builder."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.site = os.path.join(self.temp_dir, 'site')
+        self.output = os.path.join(self.temp_dir, 'bundle')
+        self.write('index.html', '<html>home</html>')
+        self.write('games/snake/index.html', '<html>snake</html>')
+        self.write('games/snake/shared.js', 'var shared = 1;')
+        self.write('games/memory/shared.js', 'var shared = 1;')
+        self.write('games/memory/README.md', '# Memory')
+        self.write('tools/games/snake/index.html', '<html>old snake</html>')
+        self.write('tests/test_site.py', 'pass')
+        self.write('coverage/lcov.info', 'TN:')
+        self.write('.git/HEAD', 'ref')
+        self.write('package.json', '{}')
+
+    def tearDown(self):
+        """Tear down test fixtures."""
+        shutil.rmtree(self.temp_dir)
+
+    def write(self, name, content):
+        path = os.path.join(self.site, name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w') as f:
+            f.write(content)
+
+    def bundle(self, **kwargs):
+        return deploy_bundle.bundle(self.site, self.output, **kwargs)
+
+    def published(self, name):
+        return os.path.join(self.output, deploy_bundle.SITE_DIR, name)
+
+    def test_only_servable_files_are_published(self):
+        """Test the exclude patterns and reading the publish directory from netlify.toml."""
+        self.assertEqual(deploy_bundle.list_publish_files(self.site),
+                         ['games/memory/shared.js', 'games/snake/index.html', 'games/snake/shared.js', 'index.html'])
+        self.assertTrue(deploy_bundle.is_excluded('games/snake/notes.md'))
+        self.assertFalse(deploy_bundle.is_excluded('games/tools/index.html'))
+        self.assertTrue(deploy_bundle.is_excluded('tools'))
+
+        netlify_toml = os.path.join(self.temp_dir, 'netlify.toml')
+        with open(netlify_toml, 'w') as f:
+            f.write('[dev]\n  publish = "nope"\n[build]\n  publish = "/site" # comment\n')
+        self.assertEqual(deploy_bundle.publish_dir(netlify_toml), self.site)
+        self.assertEqual(deploy_bundle.publish_dir(os.path.join(self.temp_dir, 'missing.toml')), self.temp_dir)
+
+    def test_identical_files_share_one_blob(self):
+        """Test that duplicates are hard links to a single blob in the store."""
+        summary = self.bundle()
+        self.assertEqual((summary['files'], summary['blobs'], summary['duplicates']), (4, 3, 1))
+        first = os.stat(self.published('games/snake/shared.js'))
+        second = os.stat(self.published('games/memory/shared.js'))
+        self.assertEqual((first.st_ino, first.st_dev), (second.st_ino, second.st_dev))
+        self.assertEqual(first.st_nlink, 3)
+        with open(self.published('index.html')) as f:
+            self.assertEqual(f.read(), '<html>home</html>')
+
+        with open(os.path.join(self.output, deploy_bundle.MANIFEST_FILE)) as f:
+            files = json.load(f)['files']
+        self.assertEqual(files['/index.html'], deploy_bundle.file_digest(os.path.join(self.site, 'index.html')))
+        self.assertEqual(files['/games/snake/shared.js'], files['/games/memory/shared.js'])
+
+        # Editing a source file must not reach into the store
+        self.write('index.html', '<html>edited</html>')
+        with open(self.published('index.html')) as f:
+            self.assertEqual(f.read(), '<html>home</html>')
+
+    def test_rebundles_only_touch_changes(self):
+        """Test the stat cache, relinking, removals, store cleanup and the upload list."""
+        first = self.bundle()
+        self.assertEqual(first['upload'], 3)
+        first_manifest = os.path.join(self.temp_dir, 'deployed.json')
+        shutil.copy(os.path.join(self.output, deploy_bundle.MANIFEST_FILE), first_manifest)
+        again = self.bundle()
+        self.assertEqual((again['hashed'], again['relinked'], again['upload']), (0, 0, 0))
+
+        self.write('games/snake/index.html', '<html>snake 2</html>')
+        os.remove(os.path.join(self.site, 'games/memory/shared.js'))
+        summary = self.bundle()
+        self.assertEqual((summary['hashed'], summary['relinked'], summary['removed']), (1, 1, 1))
+        self.assertEqual(summary['upload'], 1)
+        self.assertFalse(os.path.exists(self.published('games/memory')))
+        store = os.path.join(self.output, deploy_bundle.STORE_DIR)
+        self.assertEqual(sum(len(names) for _, _, names in os.walk(store)), 3)
+
+        self.write('games/snake/extra.js', 'var shared = 1;')
+        summary = self.bundle(since=first_manifest)
+        with open(os.path.join(self.output, deploy_bundle.UPLOAD_FILE)) as f:
+            upload = json.load(f)
+        self.assertEqual(summary['upload'], 1)
+        self.assertEqual(upload['blobs'][0]['paths'], ['/games/snake/index.html'])
+
+    def test_output_inside_the_publish_tree_is_skipped(self):
+        """Test that bundling into the publish tree does not bundle the bundle."""
+        self.output = os.path.join(self.site, 'out')
+        self.assertEqual(self.bundle()['files'], 4)
+        self.assertEqual(self.bundle()['files'], 4)
+        self.assertTrue(os.path.exists(self.published('games/snake/index.html')))
+
+
+if __name__ == '__main__':
+    unittest.main()
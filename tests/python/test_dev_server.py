@@ -0,0 +1,146 @@
+import os
+import sys
+import gzip
+import shutil
+import socket
+import asyncio
+import tempfile
+import threading
+import unittest
+import http.client
+
+# Add the tools directory to the path so we can import the modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../tools')))
+
+import dev_server
+
+
+NETLIFY_TOML = """[build]
+  publish = "/"
+  command = ""
+
+[dev]
+  framework = "#static"
+
+[[redirects]]
+  from = "/old/:name"
+  to = "/games/:name"
+  status = 301
+
+[[redirects]]
+  from = "/*"
+  to = "/index.html"
+  status = 200
+  force = false
+"""
+
+
+class TestDevServer(unittest.TestCase):
+    """Tests for the dev_server.py Netlify stand-in."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.write('netlify.toml', NETLIFY_TOML)
+        self.write('index.html', '<html>home</html>')
+        self.write('about.html', '<html>about</html>')
+        self.write('css/style.css', 'body { color: red; }\n' * 100)
+        self.big = os.urandom(dev_server.SENDFILE_THRESHOLD + 1000)
+        self.write('images/big.bin', self.big, 'wb')
+
+        config = dev_server.load_netlify_config(os.path.join(self.temp_dir, 'netlify.toml'))
+        self.server = dev_server.DevServer(config, quiet=True)
+        self.loop = asyncio.new_event_loop()
+        self.listener = self.loop.run_until_complete(self.server.start('127.0.0.1', 0))
+        self.port = self.listener.sockets[0].getsockname()[1]
+        self.thread = threading.Thread(target=self.loop.run_forever)
+        self.thread.start()
+
+    def tearDown(self):
+        """Tear down test fixtures."""
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join()
+        self.listener.close()
+        self.loop.run_until_complete(self.listener.wait_closed())
+        self.loop.close()
+        shutil.rmtree(self.temp_dir)
+
+    def write(self, name, content, mode='w'):
+        path = os.path.join(self.temp_dir, name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, mode) as f:
+            f.write(content)
+
+    def request(self, path, headers=None, connection=None):
+        connection = connection or http.client.HTTPConnection('127.0.0.1', self.port, timeout=5)
+        connection.request('GET', path, headers=headers or {})
+        response = connection.getresponse()
+        return response, response.read()
+
+    def test_config_and_rules(self):
+        """Test that netlify.toml is read and rules are shadowed by files unless forced."""
+        config = dev_server.load_netlify_config(os.path.join(self.temp_dir, 'netlify.toml'))
+        self.assertEqual(config['publish'], self.temp_dir)
+        self.assertEqual(dev_server._parse_toml_fallback(NETLIFY_TOML)['redirects'][1]['to'], '/index.html')
+        redirects = config['redirects']
+        self.assertEqual(dev_server.match_redirect(redirects, '/old/snake', False), ('/games/snake', 301))
+        self.assertEqual(dev_server.match_redirect(redirects, '/a/b', False), ('/index.html', 200))
+        self.assertIsNone(dev_server.match_redirect(redirects, '/about.html', True))
+
+    def test_rewrites_and_edge_function(self):
+        """Test files, pretty URLs, the SPA rewrite, redirects and the /edge stand-in."""
+        self.assertEqual(self.request('/')[1], b'<html>home</html>')
+        self.assertEqual(self.request('/about')[1], b'<html>about</html>')
+        response, body = self.request('/games/unknown/route')
+        self.assertEqual((response.status, body), (200, b'<html>home</html>'))
+        self.assertEqual(self.request('/../netlify.toml')[1], b'<html>home</html>')
+        response, _ = self.request('/old/snake')
+        self.assertEqual((response.status, response.getheader('Location')), (301, '/games/snake'))
+        response, _ = self.request('/edge')
+        self.assertEqual((response.status, response.getheader('Location')), (302, '/edge/not-australia'))
+        response, _ = self.request('/edge', {'X-Country': 'AU'})
+        self.assertEqual(response.getheader('Location'), '/edge/australia')
+
+    def test_conditional_requests_and_gzip(self):
+        """Test ETag/Last-Modified revalidation and compressed text."""
+        response, body = self.request('/css/style.css', {'Accept-Encoding': 'gzip'})
+        self.assertEqual(response.getheader('Content-Encoding'), 'gzip')
+        self.assertEqual(gzip.decompress(body), b'body { color: red; }\n' * 100)
+        etag, last_modified = response.getheader('ETag'), response.getheader('Last-Modified')
+        self.assertEqual(self.request('/css/style.css', {'If-None-Match': etag})[0].status, 304)
+        self.assertEqual(self.request('/css/style.css', {'If-Modified-Since': last_modified})[0].status, 304)
+        self.assertEqual(self.request('/css/style.css', {'If-None-Match': '"stale"'})[0].status, 200)
+
+        # Edits invalidate the cached copy
+        self.write('css/style.css', 'body { color: blue; }\n')
+        self.assertEqual(self.request('/css/style.css')[1], b'body { color: blue; }\n')
+
+    def test_keep_alive_and_sendfile(self):
+        """Test several requests over one connection, including a file sent with sendfile."""
+        connection = http.client.HTTPConnection('127.0.0.1', self.port, timeout=5)
+        sockets = set()
+        for path in ('/', '/images/big.bin', '/about'):
+            response, body = self.request(path, connection=connection)
+            self.assertEqual(response.status, 200)
+            sockets.add(id(connection.sock))
+        self.assertEqual(len(sockets), 1)
+        self.assertEqual(self.request('/images/big.bin', connection=connection)[1], self.big)
+        connection.close()
+
+    def test_bad_content_length_is_rejected(self):
+        """Test that an invalid or negative Content-Length gets a 400 and closes the connection."""
+        for length in (b'abc', b'-5', b'1_0'):
+            with socket.create_connection(('127.0.0.1', self.port), timeout=5) as sock:
+                sock.sendall(b'POST / HTTP/1.1\r\nHost: localhost\r\nContent-Length: ' + length + b'\r\n\r\n')
+                response = b''
+                while True:
+                    data = sock.recv(4096)
+                    if not data:
+                        break
+                    response += data
+            self.assertTrue(response.startswith(b'HTTP/1.1 400 '), length)
+        self.assertEqual(self.request('/')[0].status, 200)
+
+
+if __name__ == '__main__':
+    unittest.main()
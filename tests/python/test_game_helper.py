@@ -1,5 +1,8 @@
 import os
 import sys
+import json
+import shutil
+import tempfile
 import unittest
 from unittest.mock import patch, MagicMock
 
@@ -27,12 +30,14 @@ class TestGameHelper(unittest.TestCase):
         
     def tearDown(self):
         """Tear down test fixtures."""
-        # Clean up any test files or directories created
-        pass
+        # Drop template packs cached while open() was mocked
+        if not isinstance(game_helper, MagicMock):
+            game_helper.scaffold_templates.load_template_pack.cache_clear()
         
+    @patch('thumbnail_generator.generate_thumbnails')
     @patch('os.makedirs')
     @patch('builtins.open', new_callable=unittest.mock.mock_open)
-    def test_create_game_scaffold(self, mock_open, mock_makedirs):
+    def test_create_game_scaffold(self, mock_open, mock_makedirs, mock_thumbnails):
         """Test creating a new game scaffold."""
         # Skip if the module is mocked
         if isinstance(game_helper, MagicMock):
@@ -47,24 +52,112 @@ class TestGameHelper(unittest.TestCase):
         # Assert that files were created
         mock_open.assert_called()
         
-    @patch('builtins.open', new_callable=unittest.mock.mock_open, read_data='{}')
-    def test_update_game_registry(self, mock_open):
+        # Assert that the thumbnail card is drawn and its hash recorded
+        mock_thumbnails.assert_called_once_with(
+            [{"id": self.test_game_id, "title": self.test_game_title, "category": self.test_category}], "images", 1)
+        
+    def test_create_game_scaffolds_batch(self):
+        """Test creating scaffolds from a CSV manifest."""
+        # Skip if the module is mocked
+        if isinstance(game_helper, MagicMock):
+            self.skipTest("game_helper module not available")
+        
+        temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, temp_dir)
+        games_dir = os.path.join(temp_dir, 'games')
+        manifest_path = os.path.join(temp_dir, 'manifest.csv')
+        with open(manifest_path, 'w') as f:
+            f.write('game_id,title,category\n')
+            for i in range(20):
+                f.write(f'game-{i},Game {i},puzzle\n')
+        
+        images_dir = os.path.join(temp_dir, 'images')
+        summary = game_helper.create_game_scaffolds_batch(manifest_path, games_dir, workers=4, images_dir=images_dir)
+        
+        self.assertEqual(summary['created'], 20)
+        self.assertEqual(summary['thumbnails'], 20)
+        self.assertTrue(os.path.exists(os.path.join(images_dir, 'game-7.png')))
+        self.assertEqual(summary['failed'], 0)
+        self.assertEqual(len(summary['games']), 20)
+        self.assertIn('seconds', summary['games'][0])
+        with open(os.path.join(games_dir, 'game-7', 'game.js')) as f:
+            self.assertIn("gameId: 'game-7'", f.read())
+        
+        # Running it again fails validation because the directories exist
+        self.assertIsNone(game_helper.create_game_scaffolds_batch(manifest_path, games_dir))
+        
+    def test_update_game_registry(self):
         """Test updating the game registry."""
         # Skip if the module is mocked
         if isinstance(game_helper, MagicMock):
             self.skipTest("game_helper module not available")
-            
+        
+        temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, temp_dir)
+        index_html = os.path.join(temp_dir, 'index.html')
+        registry_path = os.path.join(temp_dir, 'data', 'registry.jsonl')
+        with open(index_html, 'w') as f:
+            f.write('<div x-data="{ games: [\n        ], filter: \'all\' }"></div>')
+        
         # Call the function to test
-        game_helper.update_game_registry(
+        result = game_helper.update_game_registry(
             self.test_game_id, 
             self.test_game_title, 
             "A test game description", 
             self.test_category, 
-            tags=["test", "puzzle"]
+            tags=["test", "puzzle"],
+            registry_path=registry_path,
+            index_html_path=index_html
         )
         
-        # Assert that the registry file was opened
-        mock_open.assert_called()
+        # Assert that the game was written to index.html
+        self.assertTrue(result)
+        with open(index_html) as f:
+            content = f.read()
+        self.assertIn("id: 'test-game'", content)
+        self.assertIn("tags: ['test', 'puzzle']", content)
+        self.assertIn("image: 'images/test-game.png'", content)
+
+        # Updating the details keeps a hand-set image
+        game_registry = game_helper.game_registry
+        game_registry.register_games([{"op": "upsert", "game": game_registry.make_game_entry(
+            self.test_game_id, self.test_game_title, "Old", self.test_category, image="images/custom.jpg")}],
+            registry_path, index_html)
+        self.assertTrue(game_helper.update_game_registry(
+            self.test_game_id, "Renamed", "New", self.test_category,
+            registry_path=registry_path, index_html_path=index_html))
+        game = game_registry.GameRegistry(registry_path).get(self.test_game_id)
+        self.assertEqual((game["title"], game["image"]), ("Renamed", "images/custom.jpg"))
+
+    def test_register_games_batch(self):
+        """Test registering a manifest of games in one pass."""
+        # Skip if the module is mocked
+        if isinstance(game_helper, MagicMock):
+            self.skipTest("game_helper module not available")
+        
+        temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, temp_dir)
+        index_html = os.path.join(temp_dir, 'index.html')
+        registry_path = os.path.join(temp_dir, 'data', 'registry.jsonl')
+        manifest_path = os.path.join(temp_dir, 'manifest.json')
+        with open(index_html, 'w') as f:
+            f.write('<div x-data="{ games: [\n        ], filter: \'all\' }"></div>')
+        games = [
+            {"id": f"game-{i}", "title": f"Game {i}", "description": "Batch game",
+             "category": "arcade", "tags": ["batch"]}
+            for i in range(50)
+        ]
+        with open(manifest_path, 'w') as f:
+            json.dump(games, f)
+        
+        self.assertTrue(game_helper.register_games_batch(manifest_path, registry_path, index_html))
+        with open(index_html) as f:
+            self.assertEqual(f.read().count("description: 'Batch game'"), 50)
+        
+        # Invalid manifests are rejected before anything is written
+        with open(manifest_path, 'w') as f:
+            json.dump([games[0], games[0]], f)
+        self.assertFalse(game_helper.register_games_batch(manifest_path, registry_path, index_html))
 
 
 if __name__ == '__main__':
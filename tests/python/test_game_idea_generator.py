@@ -1,6 +1,12 @@
 import os
 import sys
+import json
+import random
+import shutil
+import tarfile
+import tempfile
 import unittest
+from collections.abc import Sequence
 from unittest.mock import patch, MagicMock
 
 # Add the tools directory to the path so we can import the modules
@@ -66,12 +72,130 @@ class TestGameIdeaGenerator(unittest.TestCase):
             
         # Assert that game concepts are defined
         self.assertTrue(hasattr(game_idea_generator, 'GAME_CONCEPTS'))
-        self.assertIsInstance(game_idea_generator.GAME_CONCEPTS, list)
+        self.assertIsInstance(game_idea_generator.GAME_CONCEPTS, Sequence)
         
         # Check if our test category exists in at least one concept
         categories = [concept['category'] for concept in game_idea_generator.GAME_CONCEPTS]
         self.assertIn(self.test_category, categories)
 
+    def test_generate_game_idea_is_reproducible_with_seed(self):
+        """Test that seeded generation returns the same idea."""
+        # Skip if the module is mocked
+        if isinstance(game_idea_generator, MagicMock):
+            self.skipTest("game_idea_generator module not available")
+        
+        first = [game_idea_generator.generate_game_idea(seed=s)['title'] for s in range(20)]
+        second = [game_idea_generator.generate_game_idea(seed=s)['title'] for s in range(20)]
+        self.assertEqual(first, second)
+        
+    def test_generate_game_idea_filters_and_fallback(self):
+        """Test filtering by category, complexity and tag, and the fallback."""
+        # Skip if the module is mocked
+        if isinstance(game_idea_generator, MagicMock):
+            self.skipTest("game_idea_generator module not available")
+        
+        for seed in range(10):
+            idea = game_idea_generator.generate_game_idea('arcade', 'medium', seed=seed)
+            self.assertEqual((idea['category'], idea['difficulty']), ('arcade', 'medium'))
+            idea = game_idea_generator.generate_game_idea(tag='music', seed=seed)
+            self.assertIn('music', idea['tags'])
+        
+        # No puzzle concept is "hard", so any concept may be returned
+        idea = game_idea_generator.generate_game_idea('puzzle', 'complex', seed=1)
+        self.assertIn(idea['title'], [c['title'] for c in game_idea_generator.GAME_CONCEPTS])
+        
+    def test_weighted_sampling(self):
+        """Test that concept weights shape the distribution."""
+        # Skip if the module is mocked
+        if isinstance(game_idea_generator, MagicMock):
+            self.skipTest("game_idea_generator module not available")
+        
+        concepts = [
+            {"title": "Common", "category": "arcade", "difficulty": "easy", "tags": [], "weight": 9.0},
+            {"title": "Rare", "category": "arcade", "difficulty": "easy", "tags": [], "weight": 1.0},
+            {"title": "Never", "category": "arcade", "difficulty": "easy", "tags": [], "weight": 0.0},
+        ]
+        index = game_idea_generator.ConceptIndex(concepts)
+        rng = random.Random(42)
+        titles = [index.sample(rng=rng)['title'] for _ in range(5000)]
+        self.assertNotIn('Never', titles)
+        self.assertAlmostEqual(titles.count('Common') / len(titles), 0.9, delta=0.03)
+        
+    def test_sample_game_ideas_without_replacement(self):
+        """Test that sampled ideas are distinct."""
+        # Skip if the module is mocked
+        if isinstance(game_idea_generator, MagicMock):
+            self.skipTest("game_idea_generator module not available")
+        
+        ideas = game_idea_generator.sample_game_ideas(3, category='arcade', seed=7)
+        titles = [idea['title'] for idea in ideas]
+        self.assertEqual(len(titles), len(set(titles)))
+        self.assertTrue(all(idea['category'] == 'arcade' for idea in ideas))
+        
+        everything = game_idea_generator.sample_game_ideas(100, seed=7)
+        self.assertEqual(len(everything), len(game_idea_generator.GAME_CONCEPTS))
+
+    def test_save_proposal_does_not_overwrite(self):
+        """Test that default proposal names never collide."""
+        # Skip if the module is mocked
+        if isinstance(game_idea_generator, MagicMock):
+            self.skipTest("game_idea_generator module not available")
+        
+        temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, temp_dir)
+        paths = {game_idea_generator.save_proposal(f"proposal {i}", directory=temp_dir) for i in range(5)}
+        self.assertEqual(len(paths), 5)
+        self.assertEqual(len(os.listdir(temp_dir)), 5)
+        
+    def test_generate_proposals_streaming(self):
+        """Test bulk generation to a directory and to archives."""
+        # Skip if the module is mocked
+        if isinstance(game_idea_generator, MagicMock):
+            self.skipTest("game_idea_generator module not available")
+        
+        temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, temp_dir)
+        
+        stats = game_idea_generator.generate_proposals(25, seed=3, directory=os.path.join(temp_dir, 'out'))
+        self.assertEqual(stats['count'], 25)
+        self.assertEqual(len(os.listdir(os.path.join(temp_dir, 'out'))), 25)
+        
+        jsonl_path = os.path.join(temp_dir, 'proposals.jsonl')
+        game_idea_generator.generate_proposals(40, category='arcade', seed=3, archive_path=jsonl_path)
+        with open(jsonl_path) as f:
+            records = [json.loads(line) for line in f]
+        self.assertEqual(len(records), 40)
+        self.assertTrue(all(r['category'] == 'arcade' for r in records))
+        self.assertTrue(records[0]['proposal'].startswith('# Game Proposal:'))
+        
+        tar_path = os.path.join(temp_dir, 'proposals.tar.gz')
+        game_idea_generator.generate_proposals(10, seed=3, archive_path=tar_path)
+        with tarfile.open(tar_path) as archive:
+            self.assertEqual(len(archive.getnames()), 10)
+
+    def test_generate_proposals_dedupe(self):
+        """Test that deduped runs skip proposals already in the directory."""
+        # Skip if the module is mocked
+        if isinstance(game_idea_generator, MagicMock):
+            self.skipTest("game_idea_generator module not available")
+        
+        temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, temp_dir)
+        
+        stats = game_idea_generator.generate_proposals(1000, seed=3, directory=temp_dir, dedupe=True)
+        self.assertLessEqual(stats['count'], len(game_idea_generator.GAME_CONCEPTS))
+        self.assertGreater(stats['rejected'], 0)
+        titles = set()
+        for name in os.listdir(temp_dir):
+            if name.endswith('.md'):
+                with open(os.path.join(temp_dir, name)) as f:
+                    titles.add(f.readline())
+        self.assertEqual(len(titles), stats['count'])
+        
+        # Everything is already indexed, so a second run finds nothing new
+        stats = game_idea_generator.generate_proposals(5, seed=4, directory=temp_dir, dedupe=True)
+        self.assertEqual(stats['count'], 0)
+
 
 if __name__ == '__main__':
     unittest.main()
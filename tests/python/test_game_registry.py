@@ -0,0 +1,237 @@
+import os
+import sys
+import json
+import shutil
+import tempfile
+import unittest
+from multiprocessing import Pool
+
+# Add the tools directory to the path so we can import the modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../tools')))
+
+import game_registry
+
+
+SAMPLE_INDEX_HTML = """<div x-data="{
+        games: [
+            { 
+                id: 'snake', 
+                title: 'Snake Game', 
+                description: 'Classic snake game with modern visuals', 
+                image: 'images/snake.jpg',
+                category: 'game',
+                tags: ['arcade', 'classic']
+            },
+            { 
+                id: 'memory', 
+                title: 'Memory Match', 
+                description: 'Test your memory with this card matching game', 
+                image: 'images/memory.jpg',
+                category: 'game',
+                tags: ['puzzle', 'brain']
+            }
+        ],
+        filter: 'all'
+    }">
+"""
+
+
+def _register_one(args):
+    """Register a single game from a worker process."""
+    registry_path, index_html, number = args
+    entry = game_registry.make_game_entry(f'game-{number}', f'Game {number}', 'Parallel', 'arcade')
+    game_registry.register_games([{'op': 'upsert', 'game': entry}], registry_path, index_html)
+
+
+class TestGameRegistry(unittest.TestCase):
+    """Tests for the game_registry.py store."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.index_html = os.path.join(self.temp_dir, 'index.html')
+        self.registry_path = os.path.join(self.temp_dir, 'data', 'registry.jsonl')
+        with open(self.index_html, 'w') as f:
+            f.write(SAMPLE_INDEX_HTML)
+
+    def tearDown(self):
+        """Tear down test fixtures."""
+        shutil.rmtree(self.temp_dir)
+
+    def test_parse_games_array(self):
+        """Test parsing the Alpine.js games array."""
+        games = game_registry.parse_games_array(SAMPLE_INDEX_HTML)
+        self.assertEqual([g['id'] for g in games], ['snake', 'memory'])
+        self.assertEqual(games[0]['tags'], ['arcade', 'classic'])
+
+    def test_render_round_trip(self):
+        """Test that rendering the parsed games keeps index.html apart from the entry markers."""
+        registry = game_registry.load_registry(self.registry_path, self.index_html)
+        game_registry.write_index_html(registry, self.index_html)
+        with open(self.index_html) as f:
+            page = f.read()
+        self.assertEqual(game_registry.parse_games_array(page), game_registry.parse_games_array(SAMPLE_INDEX_HTML))
+        self.assertIn("        games: [\n            /* registry:games */\n            /* game:snake */\n", page)
+        self.assertIn("            },\n            /* /registry:games */\n        ],\n        filter: 'all'", page)
+
+        game_registry.write_index_html(registry, self.index_html)
+        with open(self.index_html) as f:
+            self.assertEqual(f.read(), page)
+
+    def test_upsert_remove_and_lookup(self):
+        """Test updating, adding and removing games."""
+        registry = game_registry.load_registry(self.registry_path, self.index_html)
+
+        self.assertFalse(registry.upsert(game_registry.make_game_entry(
+            'snake', 'Snake II', 'Longer snake', 'arcade', ['arcade'])))
+        self.assertTrue(registry.upsert(game_registry.make_game_entry(
+            'tetris', "Tetris's Revenge", 'Blocks', 'puzzle', ['puzzle'])))
+        self.assertTrue(registry.remove('memory'))
+        self.assertFalse(registry.remove('memory'))
+
+        self.assertEqual(registry.get('snake')['title'], 'Snake II')
+        self.assertIsNone(registry.get('memory'))
+        self.assertEqual([g['id'] for g in registry.games()], ['tetris', 'snake'])
+
+        game_registry.write_index_html(registry, self.index_html)
+        with open(self.index_html) as f:
+            games = game_registry.parse_games_array(f.read())
+        self.assertEqual([g['title'] for g in games], ["Tetris's Revenge", 'Snake II'])
+
+    def test_reload_replays_log_after_checkpoint(self):
+        """Test that a reopened registry sees writes made after the checkpoint."""
+        registry = game_registry.load_registry(self.registry_path, self.index_html)
+        registry.upsert(game_registry.make_game_entry('pong', 'Pong', 'Paddles', 'arcade'))
+
+        reopened = game_registry.GameRegistry(self.registry_path)
+        self.assertEqual(len(reopened), 3)
+        self.assertEqual(reopened.get('pong')['title'], 'Pong')
+
+    def test_compact(self):
+        """Test that compaction keeps only live records."""
+        registry = game_registry.load_registry(self.registry_path, self.index_html)
+        for i in range(10):
+            registry.upsert(game_registry.make_game_entry('snake', f'Snake {i}', 'x', 'arcade'))
+        registry.compact()
+        registry.checkpoint()
+
+        reopened = game_registry.GameRegistry(self.registry_path)
+        self.assertEqual(reopened.get('snake')['title'], 'Snake 9')
+        self.assertEqual(reopened.ids(), ['memory', 'snake'])
+        with open(self.registry_path) as f:
+            self.assertEqual(len(f.readlines()), 2)
+
+    def test_concurrent_registrations_are_not_lost(self):
+        """Test that parallel register calls all end up in index.html."""
+        with Pool(4) as pool:
+            pool.map(_register_one, [(self.registry_path, self.index_html, i) for i in range(20)])
+
+        with open(self.index_html) as f:
+            games = game_registry.parse_games_array(f.read())
+        self.assertEqual(len(games), 22)
+        self.assertFalse(os.path.exists(game_registry.journal_path_for(self.registry_path)))
+
+    def test_commit_replays_interrupted_journal(self):
+        """Test that a journal left by a crashed commit is applied next time."""
+        journal_path = game_registry.journal_path_for(self.registry_path)
+        os.makedirs(os.path.dirname(journal_path))
+        entry = game_registry.make_game_entry('pong', 'Pong', 'Paddles', 'arcade')
+        with open(journal_path + '.draining', 'w') as f:
+            f.write('{"op": "upsert", "game": %s}\n' % json.dumps(entry))
+
+        counts = game_registry.commit_pending(self.registry_path, self.index_html)
+        self.assertEqual(counts['added'], 1)
+        self.assertIn('pong', game_registry.GameRegistry(self.registry_path))
+
+    def test_invalid_operations_never_block_the_journal(self):
+        """Test that bad operations are refused when queued and set aside when already journaled."""
+        with self.assertRaises(game_registry.RegistryError):
+            game_registry.register_games([{'op': 'upsert', 'game': {'id': ''}}], self.registry_path, self.index_html)
+        self.assertFalse(os.path.exists(game_registry.journal_path_for(self.registry_path)))
+
+        journal_path = game_registry.journal_path_for(self.registry_path)
+        os.makedirs(os.path.dirname(journal_path))
+        with open(journal_path + '.draining', 'w') as f:
+            f.write('{"op": "upsert", "game": {"id": ""}}\nnot json\n')
+        entry = game_registry.make_game_entry('pong', 'Pong', 'Paddles', 'arcade')
+        game_registry.register_games([{'op': 'upsert', 'game': entry}], self.registry_path, self.index_html)
+        self.assertIn('pong', game_registry.GameRegistry(self.registry_path))
+        self.assertFalse(os.path.exists(journal_path + '.draining'))
+        with open(game_registry.rejected_path_for(self.registry_path)) as f:
+            self.assertEqual(f.read(), '{"op": "upsert", "game": {"id": ""}}\nnot json\n')
+
+    def test_failed_commit_is_rolled_back(self):
+        """Test that a failed commit leaves nothing behind for the next commit to apply."""
+        game_registry.load_registry(self.registry_path, self.index_html)
+        log_size = os.path.getsize(self.registry_path)
+        os.rename(self.index_html, self.index_html + '.bak')
+        ghost = game_registry.make_game_entry('ghost', 'Ghost', 'Boo', 'arcade')
+        with self.assertRaises(FileNotFoundError):
+            game_registry.register_games([{'op': 'upsert', 'game': ghost}], self.registry_path, self.index_html)
+        self.assertEqual(os.path.getsize(self.registry_path), log_size)
+
+        # Another caller's batch that was drained by the failed commit learns about the failure
+        journal_path = game_registry.journal_path_for(self.registry_path)
+        with open(journal_path, 'w') as f:
+            f.write('{"op": "upsert", "game": %s, "batch": "other"}\n' % json.dumps(ghost))
+        with self.assertRaises(FileNotFoundError):
+            game_registry.commit_pending(self.registry_path, self.index_html)
+        with self.assertRaises(game_registry.RegistryError):
+            game_registry.commit_pending(self.registry_path, self.index_html, 'other')
+
+        os.rename(self.index_html + '.bak', self.index_html)
+        entry = game_registry.make_game_entry('pong', 'Pong', 'Paddles', 'arcade')
+        game_registry.register_games([{'op': 'upsert', 'game': entry}], self.registry_path, self.index_html)
+        registry = game_registry.GameRegistry(self.registry_path)
+        self.assertEqual(registry.ids(), ['memory', 'snake', 'pong'])
+
+    def test_callers_get_their_own_counts(self):
+        """Test that a batch applied by another caller's commit still reports its own outcome."""
+        pong = game_registry.make_game_entry('pong', 'Pong', 'Paddles', 'arcade')
+        mine = game_registry.enqueue_operations(
+            [{'op': 'remove', 'id': 'memory'}, {'op': 'remove', 'id': 'ghost'}], self.registry_path)
+        theirs = game_registry.enqueue_operations([{'op': 'upsert', 'game': pong}], self.registry_path)
+
+        # The other caller commits first and gets only its own counts
+        self.assertEqual(game_registry.commit_pending(self.registry_path, self.index_html, theirs),
+                         {'added': 1, 'updated': 0, 'removed': 0, 'missing': 0})
+        self.assertEqual(game_registry.commit_pending(self.registry_path, self.index_html, mine),
+                         {'added': 0, 'updated': 0, 'removed': 1, 'missing': 1})
+        with open(game_registry.outcomes_path_for(self.registry_path)) as f:
+            self.assertEqual(json.load(f), {})
+
+    def test_commits_patch_only_changed_entries(self):
+        """Test that patching single entries gives the same page and checkpoint as rebuilding them."""
+        tricky = game_registry.make_game_entry('tri*/cky', 'Line\nbreak', "It's /* game:snake */", 'puzzle')
+        batches = [
+            [{'op': 'upsert', 'game': game_registry.make_game_entry('pong', 'Pong', 'Paddles', 'arcade')}],
+            [{'op': 'upsert', 'game': tricky}],
+            [{'op': 'upsert', 'game': game_registry.make_game_entry('snake', 'Snake II', 'Longer', 'arcade')}],
+            [{'op': 'remove', 'id': 'memory'}, {'op': 'remove', 'id': 'ghost'}],
+            [{'op': 'remove', 'id': 'snake'},
+             {'op': 'upsert', 'game': game_registry.make_game_entry('snake', 'Snake III', 'Back', 'arcade')}],
+            [{'op': 'upsert', 'game': game_registry.make_game_entry('pong', 'Pong 2', 'Paddles', 'arcade')}],
+        ]
+        for batch in batches:
+            game_registry.register_games(batch, self.registry_path, self.index_html)
+        with open(self.index_html) as f:
+            patched = f.read()
+
+        registry = game_registry.GameRegistry(self.registry_path)
+        self.assertEqual(registry.ids(), ['pong', 'tri*/cky', 'snake'])
+        self.assertEqual(registry.get('tri*/cky')['title'], 'Line\nbreak')
+        game_registry.write_index_html(registry, self.index_html)
+        with open(self.index_html) as f:
+            self.assertEqual(f.read(), patched)
+        self.assertEqual([g['title'] for g in game_registry.parse_games_array(patched)],
+                         ['Snake III', 'Line\nbreak', 'Pong 2'])
+
+        # Every commit appended one checkpoint segment; the log tail is never replayed
+        with open(game_registry.index_path_for(self.registry_path)) as f:
+            self.assertEqual(len(f.readlines()), 1 + len(batches))
+        self.assertEqual(registry._dirty, {})
+        self.assertEqual(game_registry.patch_games_array(patched, registry, [('pong', 'updated')]), patched)
+
+
+if __name__ == '__main__':
+    unittest.main()
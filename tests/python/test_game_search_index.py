@@ -0,0 +1,107 @@
+import os
+import sys
+import json
+import shutil
+import tempfile
+import unittest
+
+# Add the tools directory to the path so we can import the modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../tools')))
+
+import game_search_index
+
+
+def make_game(i, **fields):
+    game = {'id': f'game-{i}', 'title': f'Game {i}', 'description': f'Number {i} of the test games',
+            'image': f'images/game-{i}.png', 'category': 'game' if i % 2 else 'app', 'tags': [f'tag{i % 3}']}
+    game.update(fields)
+    return game
+
+
+class TestGameSearchIndex(unittest.TestCase):
+    """Tests for the game_search_index.py index builder."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.games = [make_game(i) for i in range(10)]
+        self.games.append(make_game(10, title='Snake Deluxe', description='Classic snake, now in colour',
+                                    tags=['Arcade', 'classic']))
+
+    def tearDown(self):
+        """Tear down test fixtures."""
+        shutil.rmtree(self.temp_dir)
+
+    def ids(self, *args, **kwargs):
+        return [game['id'] for game in game_search_index.search(*args, directory=self.temp_dir, **kwargs)]
+
+    def linear(self, query, category=None):
+        """The substring scan the index replaces."""
+        query = query.lower()
+        return [game['id'] for game in reversed(self.games)
+                if (category is None or game['category'] == category)
+                and any(query in text for text in game_search_index.game_texts(game))]
+
+    def test_postings_encoding(self):
+        """Test the delta encoding and the shard keys."""
+        self.assertEqual(game_search_index.encode_postings([3, 4, 10]), [3, 1, 6])
+        self.assertEqual(game_search_index.decode_postings([3, 1, 6]), [3, 4, 10])
+        self.assertEqual(game_search_index.shard_key('sn'), 'sn')
+        self.assertEqual(game_search_index.shard_key(' é-'), '__')
+        terms = game_search_index.game_terms(self.games[-1])
+        self.assertIn('e d', terms['grams'])
+        self.assertNotIn('xe c', terms['grams'])
+        self.assertEqual(terms['tags'], {'arcade', 'classic'})
+        self.assertTrue({'s', 'sn', 'de', 'c', 'co'} <= terms['prefixes'])
+
+    def test_search_matches_substring_scan(self):
+        """Test that queries of three or more characters find what a substring scan finds."""
+        game_search_index.build_index(self.games, self.temp_dir)
+        for query in ['game', 'ame 1', 'GAME 1', 'snake', 'nake,', 'ber 7 of', 'lassi', 'tag2', 'zzz', 'e d']:
+            self.assertEqual(self.ids(query), self.linear(query), query)
+        self.assertEqual(self.ids('numb', category='game'), self.linear('numb', 'game'))
+        self.assertEqual(self.ids('sn'), ['game-10'])
+        self.assertEqual(self.ids('', tag='arcade'), ['game-10'])
+        self.assertEqual(self.ids('game', limit=2), ['game-9', 'game-8'])
+        # Static servers running as another user must be able to read the shards
+        for name in ['meta.json', game_search_index.STATE_FILE, 'docs/0.json']:
+            self.assertEqual(os.stat(os.path.join(self.temp_dir, name)).st_mode & 0o777, 0o644, name)
+
+    def test_incremental_updates(self):
+        """Test that changes only rewrite the shards they touch and match a full rebuild."""
+        summary = game_search_index.build_index(self.games, self.temp_dir)
+        self.assertTrue(summary['full'])
+        self.assertEqual(game_search_index.build_index(self.games, self.temp_dir)['shards'], 0)
+
+        self.games[3]['title'] = 'Quartz Quest'
+        del self.games[5]
+        self.games.append(make_game(11))
+        summary = game_search_index.build_index(self.games, self.temp_dir)
+        self.assertEqual((summary['added'], summary['updated'], summary['removed']), (1, 1, 1))
+        self.assertFalse(summary['full'])
+        self.assertEqual(self.ids('quartz'), ['game-3'])
+        self.assertEqual(self.ids('game 5'), [])
+        self.assertEqual(self.ids('game'), self.linear('game'))
+
+        with open(os.path.join(self.temp_dir, 'meta.json')) as f:
+            meta = json.load(f)
+        self.assertEqual(meta['count'], 11)
+        self.assertIn('qu', meta['shards']['grams'])
+        self.assertEqual(set(meta['shards']['grams']),
+                         {name[:-5] for name in os.listdir(os.path.join(self.temp_dir, 'grams'))})
+
+    def test_removed_ids_are_compacted(self):
+        """Test that a full rebuild renumbers once removed games outnumber live ones."""
+        game_search_index.build_index(self.games, self.temp_dir)
+        kept = self.games[-3:]
+        summary = game_search_index.build_index(kept, self.temp_dir)
+        self.assertTrue(summary['full'])
+        with open(os.path.join(self.temp_dir, game_search_index.STATE_FILE)) as f:
+            state = json.load(f)
+        self.assertEqual(state['ids'], {'game-8': 0, 'game-9': 1, 'game-10': 2})
+        self.assertEqual(self.ids('test'), ['game-9', 'game-8'])
+        self.assertEqual(len(os.listdir(os.path.join(self.temp_dir, 'docs'))), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,114 @@
+import os
+import sys
+import json
+import shutil
+import tempfile
+import threading
+import unittest
+import urllib.request
+from unittest.mock import patch
+
+# Add the tools directory to the path so we can import the modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../tools')))
+
+import highscore_service
+
+
+class TestHighScoreService(unittest.TestCase):
+    """Tests for the highscore_service.py store and API."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.store = highscore_service.HighScoreStore(self.temp_dir)
+
+    def tearDown(self):
+        """Tear down test fixtures."""
+        self.store.close()
+        shutil.rmtree(self.temp_dir)
+
+    def reopen(self):
+        self.store.close()
+        self.store = highscore_service.HighScoreStore(self.temp_dir)
+
+    def test_same_rules_as_the_browser(self):
+        """Test validation, initials, the bounded board and tie order."""
+        self.assertFalse(self.store.save_score('', 'ABC', 10))
+        self.assertFalse(self.store.save_score('snake', '', 10))
+        self.assertFalse(self.store.save_score('snake', 'ABC', '10'))
+        self.assertFalse(self.store.save_score('snake', 'ABC', True))
+
+        for initials, score in [('abcd', 50), ('bob', 70), ('cat', 50), ('dan', 10)]:
+            self.assertTrue(self.store.save_score('snake', initials, score, 3))
+        scores = self.store.get_scores('snake')
+        self.assertEqual([(s['initials'], s['score']) for s in scores], [('BOB', 70), ('ABC', 50), ('CAT', 50)])
+        self.assertTrue(scores[0]['date'].endswith('Z'))
+
+        self.assertFalse(self.store.is_high_score('snake', 50, 3))
+        self.assertTrue(self.store.is_high_score('snake', 51, 3))
+        self.assertFalse(self.store.is_high_score('snake', 50, 2))
+        self.assertTrue(self.store.is_high_score('snake', 1, 10))
+        self.assertTrue(self.store.is_high_score('unknown', 0))
+        self.assertEqual(self.store.get_scores('unknown'), [])
+
+    def test_restart_replays_log_and_snapshot(self):
+        """Test that boards survive restarts, compaction and a torn final record."""
+        for score in range(30):
+            self.store.save_score('snake', 'abc', score)
+        self.store.save_score('tetris', 'xyz', 5, 20)
+        expected = {game: self.store.get_scores(game) for game in ('snake', 'tetris')}
+        self.reopen()
+        self.assertEqual({game: self.store.get_scores(game) for game in expected}, expected)
+
+        self.store.compact()
+        self.store.save_score('snake', 'new', 100)
+        self.store.flush()
+        expected['snake'] = self.store.get_scores('snake')
+        log_path = self.store._log_path(self.store._generation)
+        self.store.close()
+        with open(log_path, 'ab') as f:
+            f.write(b'{"g":"snake","i":"TOR')
+        self.store = highscore_service.HighScoreStore(self.temp_dir)
+        self.assertEqual({game: self.store.get_scores(game) for game in expected}, expected)
+        self.assertEqual(sorted(os.listdir(self.temp_dir)), ['scores.00000001.log', 'snapshot.json'])
+
+    def test_batched_fsync(self):
+        """Test that scores are synced in batches rather than one by one."""
+        with patch.object(highscore_service.os, 'fsync') as fsync:
+            store = highscore_service.HighScoreStore(os.path.join(self.temp_dir, 'batched'),
+                                                     fsync_interval=60, fsync_batch=100)
+            for score in range(250):
+                store.save_score('snake', 'abc', score, 1000)
+            self.assertEqual(fsync.call_count, 2)
+            store.close()
+            self.assertEqual(fsync.call_count, 3)
+
+    def test_http_api(self):
+        """Test saving, listing and checking scores over HTTP."""
+        server = highscore_service.ThreadingHTTPServer(('127.0.0.1', 0), highscore_service.HighScoreHandler)
+        server.store = self.store
+        server.quiet = True
+        thread = threading.Thread(target=server.serve_forever)
+        thread.start()
+        base = f'http://127.0.0.1:{server.server_address[1]}/api/highscores'
+
+        def call(path, payload=None):
+            data = json.dumps(payload).encode('utf-8') if payload is not None else None
+            with urllib.request.urlopen(urllib.request.Request(base + path, data)) as response:
+                return json.load(response)
+
+        try:
+            self.assertEqual(call('/snake', {'initials': 'ab', 'score': 42}), {'saved': True})
+            self.assertEqual(call('', [{'gameId': 'snake', 'initials': 'cd', 'score': 7},
+                                       {'gameId': 'snake', 'score': 1}]), {'saved': 1, 'invalid': 1})
+            self.assertEqual([s['score'] for s in call('/snake')], [42, 7])
+            self.assertEqual(call('/snake?limit=1')[0]['initials'], 'AB')
+            self.assertEqual(call('/snake/check?score=3&maxScores=2'), {'isHighScore': False})
+        finally:
+            server.shutdown()
+            server.server_close()
+            thread.join()
+
+
+if __name__ == '__main__':
+    unittest.main()
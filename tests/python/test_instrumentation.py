@@ -0,0 +1,97 @@
+import io
+import os
+import sys
+import json
+import time
+import shutil
+import tempfile
+import argparse
+import unittest
+import contextlib
+
+# Add the tools directory to the path so we can import the modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../tools')))
+
+import instrumentation
+
+
+class Pipeline:
+    """Stand-in for a tool with an outer phase that calls an inner one."""
+
+    @staticmethod
+    def inner():
+        time.sleep(0.02)
+
+    @staticmethod
+    def outer():
+        Pipeline.inner()
+        time.sleep(0.01)
+
+
+PHASES = [("outer phase", Pipeline, "outer"), ("inner phase", Pipeline, "inner")]
+
+
+class TestInstrumentation(unittest.TestCase):
+    """Tests for the instrumentation.py CLI flags."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.parser = argparse.ArgumentParser()
+        instrumentation.add_arguments(self.parser)
+
+    def tearDown(self):
+        """Tear down test fixtures."""
+        shutil.rmtree(self.temp_dir)
+
+    def test_no_flags_leaves_code_untouched(self):
+        """Test that without flags no function is wrapped."""
+        original = Pipeline.__dict__["inner"]
+        with instrumentation.instrument(self.parser.parse_args([]), "tool", PHASES):
+            self.assertIs(Pipeline.__dict__["inner"], original)
+
+    def test_timings_attribute_innermost_phase(self):
+        """Test that nested phases are not counted twice and wrappers are removed."""
+        original = Pipeline.__dict__["inner"]
+        path = os.path.join(self.temp_dir, 'metrics.json')
+        args = self.parser.parse_args(['--metrics-json', path])
+        with instrumentation.instrument(args, "tool", PHASES):
+            self.assertIsNot(Pipeline.__dict__["inner"], original)
+            Pipeline.outer()
+        self.assertIs(Pipeline.__dict__["inner"], original)
+
+        with open(path) as f:
+            metrics = json.load(f)
+        phases = metrics['phases']
+        self.assertEqual(phases['outer phase']['calls'], 1)
+        self.assertGreaterEqual(phases['inner phase']['seconds'], 0.02)
+        self.assertLess(phases['outer phase']['seconds'], 0.02)
+        self.assertLessEqual(phases['outer phase']['seconds'] + phases['inner phase']['seconds'],
+                             metrics['wall_seconds'])
+
+    def test_profile_and_memory_reports(self):
+        """Test that --profile dumps stats and --trace-memory reports a peak."""
+        path = os.path.join(self.temp_dir, 'tool.prof')
+        args = self.parser.parse_args(['--profile-output', path, '--trace-memory', '--top', '3'])
+        stderr = io.StringIO()
+        with contextlib.redirect_stderr(stderr):
+            with instrumentation.instrument(args, "tool"):
+                data = [bytearray(1000) for _ in range(100)]
+        self.assertTrue(os.path.exists(path))
+        report = stderr.getvalue()
+        self.assertIn("Profile: stats written to", report)
+        self.assertIn("Memory: peak", report)
+        self.assertEqual(len(data), 100)
+
+    def test_profile_flag_leaves_the_subcommand_alone(self):
+        """Test that --profile before a subcommand does not take it as its file name."""
+        subparsers = self.parser.add_subparsers(dest='command')
+        subparsers.add_parser('register')
+        args = self.parser.parse_args(['--profile', 'register'])
+        self.assertTrue(args.profile)
+        self.assertEqual(args.command, 'register')
+        self.assertIsNone(args.profile_output)
+
+
+if __name__ == '__main__':
+    unittest.main()
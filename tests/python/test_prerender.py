@@ -0,0 +1,145 @@
+import os
+import sys
+import shutil
+import tempfile
+import unittest
+
+# Add the tools directory to the path so we can import the modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../tools')))
+
+import prerender
+import game_registry
+
+
+SAMPLE_INDEX_HTML = """<div x-data="{
+        games: [
+        ],
+        filter: 'all'
+    }">
+    <div class="grid grid-cols-1 md:grid-cols-2 gap-6 card-list">
+        <!-- prerender:games -->
+        <p>stale</p>
+        <!-- /prerender:games -->
+    </div>
+</div>
+"""
+
+
+class TestPrerender(unittest.TestCase):
+    """Tests for the prerender.py grid renderer and stylesheet builder."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.index_html = os.path.join(self.temp_dir, 'index.html')
+        self.registry_path = os.path.join(self.temp_dir, 'data', 'registry.jsonl')
+        with open(self.index_html, 'w') as f:
+            f.write(SAMPLE_INDEX_HTML)
+        os.makedirs(os.path.join(self.temp_dir, 'js'))
+        with open(os.path.join(self.temp_dir, 'js', 'main.js'), 'w') as f:
+            f.write("button.className = 'absolute hover:text-gray-600 md:hover:bg-white/20';\n")
+        os.makedirs(os.path.join(self.temp_dir, 'css'))
+        with open(os.path.join(self.temp_dir, 'css', 'style.css'), 'w') as f:
+            f.write('.pb-2\\/3 { padding-bottom: 66.666%; }\n.card-list { color: red; }\n')
+
+    def tearDown(self):
+        """Tear down test fixtures."""
+        shutil.rmtree(self.temp_dir)
+
+    def read(self, name):
+        with open(os.path.join(self.temp_dir, name)) as f:
+            return f.read()
+
+    def test_utilities(self):
+        """Test that utilities resolve to Tailwind's values and anything else is ignored."""
+        css, utilities = prerender.generate_stylesheet(
+            ['md:flex-row', 'flex-col', 'hover:bg-primary/90', 'bg-white', '-translate-y-1/2', 'space-x-4',
+             'mx-auto', '-mt-2', 'text-sm', 'the', 'score;', 'pb-2/3', 'hover:unknown', 'mt-13'])
+        self.assertEqual(utilities, ['-mt-2', '-translate-y-1/2', 'bg-white', 'flex-col', 'hover:bg-primary/90',
+                                     'md:flex-row', 'mx-auto', 'space-x-4', 'text-sm'])
+        self.assertIn('.hover\\:bg-primary\\/90:hover { background-color: rgb(99 102 241 / 0.9); }', css)
+        self.assertIn('.-translate-y-1\\/2 { --tw-translate-y: -50%;', css)
+        self.assertIn('.space-x-4 > :not([hidden]) ~ :not([hidden]) { margin-left: 1rem; }', css)
+        self.assertIn('.text-sm { font-size: 0.875rem; line-height: 1.25rem; }', css)
+        self.assertIn('@media (min-width: 768px) {\n  .md\\:flex-row { flex-direction: row; }\n}', css)
+        # Later rules win: hover after the base colour, breakpoints after everything else
+        self.assertLess(css.index('.bg-white '), css.index('.hover\\:bg-primary'))
+        self.assertLess(css.index('.flex-col '), css.index('.md\\:flex-row'))
+
+    def test_cards_are_escaped(self):
+        """Test that registry text cannot break out of the card markup."""
+        game = {'id': "it's", 'title': '<b>"Bold"</b>', 'description': 'A & B', 'image': 'images/x.png',
+                'category': 'app', 'tags': ['<t>']}
+        card = prerender.render_card(game)
+        self.assertIn('x-show="shows(\'it\\\'s\')"', card)
+        self.assertIn('<h2 class="text-xl font-bold mb-2">&lt;b&gt;&quot;Bold&quot;&lt;/b&gt;</h2>', card)
+        self.assertIn('>A &amp; B</p>', card)
+        self.assertIn('>&lt;t&gt;</span>', card)
+        self.assertIn('srcset="images/x-200w.png 200w, images/x.png 400w, images/x-800w.png 800w"', card)
+        self.assertIn('bg-green-100 text-green-800', card)
+        self.assertIn('loading="lazy"', card)
+        self.assertNotIn('loading="lazy"', prerender.render_card(dict(game, image='images/x.jpg'), eager=True))
+
+    def test_registry_changes_rerender_the_grid(self):
+        """Test that registering games re-renders the grid and the stylesheet of marked pages."""
+        games = [game_registry.make_game_entry(f'game-{i}', f'Game {i}', 'Test game', 'game', ['arcade'])
+                 for i in range(5)]
+        game_registry.register_games([{'op': 'upsert', 'game': game} for game in games],
+                                     self.registry_path, self.index_html)
+        page = self.read('index.html')
+        self.assertNotIn('stale', page)
+        self.assertEqual(page.count('data-game-id='), 5)
+        self.assertLess(page.index('data-game-id="game-4"'), page.index('data-game-id="game-0"'))
+        self.assertEqual(page.count('loading="lazy"'), 5 - prerender.EAGER_CARDS)
+        self.assertEqual(len(game_registry.parse_games_array(page)), 5)
+
+        game_registry.register_games([{'op': 'remove', 'id': 'game-2'}], self.registry_path, self.index_html)
+        self.assertNotIn('game-2', self.read('index.html'))
+        self.assertIn('.bg-blue-100 {', self.read(os.path.join('css', 'tailwind.css')))
+
+    def test_single_changes_patch_cards_and_keep_the_stylesheet(self):
+        """Test that a registration re-renders only changed cards and rebuilds CSS only for new utilities."""
+        games = [game_registry.make_game_entry(f'game-{i}', f'Game {i}', 'Test game', 'game', ['arcade'])
+                 for i in range(5)]
+        game_registry.register_games([{'op': 'upsert', 'game': game} for game in games],
+                                     self.registry_path, self.index_html)
+        class_cache = os.path.join(self.temp_dir, prerender.CLASS_CACHE)
+        os.utime(class_cache, (0, 0))
+
+        for batch in ([{'op': 'upsert', 'game': dict(games[0], title='Game Zero')}],
+                      [{'op': 'remove', 'id': 'game-3'}],
+                      [{'op': 'upsert', 'game': game_registry.make_game_entry('new', 'New', 'Fresh', 'game')}]):
+            game_registry.register_games(batch, self.registry_path, self.index_html)
+        # A full stylesheet build would have recorded the new class names
+        self.assertEqual(os.stat(class_cache).st_mtime, 0)
+        page = self.read('index.html')
+        self.assertEqual(page.count('loading="lazy"'), 5 - prerender.EAGER_CARDS)
+        self.assertIn('Game Zero', page)
+        self.assertNotIn('game-3', page)
+
+        registry = game_registry.GameRegistry(self.registry_path)
+        self.assertEqual(prerender.replace_grid(page, registry.games()), page)
+        self.assertEqual(prerender.patch_grid(page, registry, [('game-1', 'updated')])[0], page)
+
+        # An app card needs the green badge, which the stylesheet lacks so far
+        self.assertNotIn('.bg-green-100 {', self.read(os.path.join('css', 'tailwind.css')))
+        calc = game_registry.make_game_entry('calc', 'Calc', 'Sums', 'app')
+        game_registry.register_games([{'op': 'upsert', 'game': calc}], self.registry_path, self.index_html)
+        self.assertIn('.bg-green-100 {', self.read(os.path.join('css', 'tailwind.css')))
+
+    def test_stylesheet_reports_unknown_classes(self):
+        """Test that the stylesheet covers index.html and js/, and unstyled classes are reported."""
+        with open(self.index_html, 'a') as f:
+            f.write('<span class="pb-2/3 mb-4 fancy-thing"></span>\n')
+        summary = prerender.build_stylesheet(self.temp_dir)
+        self.assertTrue(summary['changed'])
+        self.assertEqual(summary['unknown'], ['fancy-thing'])
+        css = self.read(os.path.join('css', 'tailwind.css'))
+        self.assertIn('.md\\:hover\\:bg-white\\/20:hover {', css)
+        self.assertIn('.grid-cols-1 {', css)
+        self.assertNotIn('.pb-2', css)
+        self.assertFalse(prerender.build_stylesheet(self.temp_dir)['changed'])
+
+
+if __name__ == '__main__':
+    unittest.main()
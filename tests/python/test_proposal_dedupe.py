@@ -0,0 +1,128 @@
+import os
+import sys
+import shutil
+import tempfile
+import unittest
+
+# Add the tools directory to the path so we can import the modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../tools')))
+
+import proposal_dedupe
+
+
+PROPOSAL = """# Game Proposal: Star Hopper
+
+## Overview
+**Category:** arcade
+**Difficulty:** easy
+
+## Description
+Jump between drifting asteroids, collect stardust and avoid the comets
+that sweep across the screen faster with every level you clear.
+"""
+
+OTHER_PROPOSAL = """# Game Proposal: Word Garden
+
+## Overview
+**Category:** puzzle
+**Difficulty:** medium
+
+## Description
+Grow a garden by spelling words from letter seeds; longer words bloom
+into rarer flowers that unlock new letters for the next round.
+"""
+
+
+class TestProposalDedupe(unittest.TestCase):
+    """Tests for the proposal_dedupe.py near-duplicate index."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.temp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        """Tear down test fixtures."""
+        shutil.rmtree(self.temp_dir)
+
+    def _write(self, name, text):
+        with open(os.path.join(self.temp_dir, name), 'w') as f:
+            f.write(text)
+
+    def test_similarity(self):
+        """Test that near-identical proposals score high and different ones low."""
+        signature = proposal_dedupe.minhash_signature(PROPOSAL)
+        edited = proposal_dedupe.minhash_signature(PROPOSAL.replace('Star Hopper', 'Star Skipper'))
+        other = proposal_dedupe.minhash_signature(OTHER_PROPOSAL)
+        self.assertEqual(proposal_dedupe.estimated_similarity(signature, signature), 1.0)
+        self.assertGreater(proposal_dedupe.estimated_similarity(signature, edited), 0.7)
+        self.assertLess(proposal_dedupe.estimated_similarity(signature, other), 0.2)
+
+    def test_find_similar(self):
+        """Test that only the near-duplicate is found."""
+        index = proposal_dedupe.ProposalIndex(self.temp_dir, persist=False)
+        index.add('star.md', PROPOSAL)
+        self.assertEqual([name for name, _ in index.find_similar(PROPOSAL)], ['star.md'])
+        self.assertTrue(index.is_duplicate(PROPOSAL))
+        self.assertFalse(index.is_duplicate(OTHER_PROPOSAL))
+        self.assertFalse(os.path.exists(index.path))
+
+    def test_index_persists_and_syncs_new_files(self):
+        """Test that signatures are reloaded and only unseen files are read."""
+        self._write('star.md', PROPOSAL)
+        index = proposal_dedupe.ProposalIndex(self.temp_dir)
+        self.assertEqual(index.sync(), 1)
+        self.assertEqual(index.sync(), 0)
+
+        self._write('word.md', OTHER_PROPOSAL)
+        reloaded = proposal_dedupe.ProposalIndex(self.temp_dir)
+        self.assertIn('star.md', reloaded)
+        self.assertEqual(reloaded.sync(), 1)
+        self.assertEqual(len(proposal_dedupe.ProposalIndex(self.temp_dir)), 2)
+
+        # A torn final record is ignored
+        with open(reloaded.path, 'ab') as f:
+            f.write(b'\x05\x00abc')
+        self.assertEqual(len(proposal_dedupe.ProposalIndex(self.temp_dir)), 2)
+
+    def test_sync_drops_deleted_and_rereads_edited_files(self):
+        """Test that deleted proposals stop matching and edited ones are re-hashed."""
+        self._write('star.md', PROPOSAL)
+        self._write('word.md', OTHER_PROPOSAL)
+        index = proposal_dedupe.ProposalIndex(self.temp_dir)
+        self.assertEqual(index.sync(), 2)
+
+        os.remove(os.path.join(self.temp_dir, 'star.md'))
+        self._write('word.md', OTHER_PROPOSAL + '\nA bonus round of anagrams every fifth level.\n')
+        os.utime(os.path.join(self.temp_dir, 'word.md'), ns=(1, 1))
+        self.assertEqual(index.sync(), 1)
+        self.assertFalse(index.is_duplicate(PROPOSAL))
+        self.assertNotIn('star.md', index)
+
+        reloaded = proposal_dedupe.ProposalIndex(self.temp_dir)
+        self.assertEqual(len(reloaded), 1)
+        self.assertFalse(reloaded.is_duplicate(PROPOSAL))
+        self.assertEqual(reloaded.sync(), 0)
+        self.assertEqual([name for name, _ in reloaded.find_similar(OTHER_PROPOSAL, threshold=0.5)], ['word.md'])
+        # Half the records were dead, so the file only holds the live signature
+        self.assertEqual(os.path.getsize(index.path),
+                         4 + proposal_dedupe._RECORD.size + len('word.md') + proposal_dedupe.NUM_PERMUTATIONS * 8)
+
+    def test_dedupe_filter_rerolls(self):
+        """Test that duplicates are skipped and the stream stops when exhausted."""
+        index = proposal_dedupe.ProposalIndex(self.temp_dir, persist=False)
+        dedupe = proposal_dedupe.DedupeFilter(index, max_rerolls=2)
+        stream = [({}, PROPOSAL), ({}, PROPOSAL), ({}, OTHER_PROPOSAL), ({}, PROPOSAL), ({}, PROPOSAL),
+                  ({}, PROPOSAL)]
+
+        accepted = []
+        for number, (_, proposal) in enumerate(dedupe.filter(stream, count=5)):
+            accepted.append(proposal)
+            dedupe.record(f'{number}.md')
+        self.assertEqual(accepted, [PROPOSAL, OTHER_PROPOSAL])
+        self.assertEqual(dedupe.rejected, 4)
+        self.assertTrue(dedupe.exhausted)
+        self.assertEqual(len(index), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,128 @@
+import os
+import sys
+import json
+import time
+import shutil
+import tempfile
+import unittest
+
+# Add the tools directory to the path so we can import the modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../tools')))
+
+import proposal_search
+from game_idea_generator import format_game_proposal
+
+
+def _idea(title, category, description, mechanics, tags):
+    return {"title": title, "category": category, "description": description,
+            "mechanics": mechanics, "tags": tags}
+
+
+class TestProposalSearch(unittest.TestCase):
+    """Tests for the proposal_search.py search index."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.temp_dir = tempfile.mkdtemp()
+        self._write('001_star_hopper.md', _idea(
+            'Star Hopper', 'arcade', 'Jump between drifting asteroids.',
+            ['Collect stardust', 'Avoid comets'], ['space', 'retro']))
+        self._write('002_word_garden.md', _idea(
+            'Word Garden', 'puzzle', 'Grow a garden by spelling words.',
+            ['Spell words from letter seeds'], ['words', 'casual']))
+        self._write('003_space_chess.md', _idea(
+            'Space Chess', 'strategy', 'Chess on a ring of planets.',
+            ['Move fleets between planets'], ['space', 'turn-based']))
+        with open(os.path.join(self.temp_dir, 'README.md'), 'w') as f:
+            f.write('# Game Proposals\n')
+
+    def tearDown(self):
+        """Tear down test fixtures."""
+        shutil.rmtree(self.temp_dir)
+
+    def _write(self, name, idea):
+        with open(os.path.join(self.temp_dir, name), 'w') as f:
+            f.write(format_game_proposal(idea))
+
+    def test_parse_proposal(self):
+        """Test parsing the sections written by format_game_proposal."""
+        with open(os.path.join(self.temp_dir, '001_star_hopper.md')) as f:
+            proposal = proposal_search.parse_proposal(f.read())
+        self.assertEqual(proposal['title'], 'Star Hopper')
+        self.assertEqual(proposal['category'], 'arcade')
+        self.assertEqual(proposal['mechanics'], ['Collect stardust', 'Avoid comets'])
+        self.assertEqual(proposal['tags'], ['space', 'retro'])
+        self.assertIsNone(proposal_search.parse_proposal('# Game Proposals\n'))
+
+    def test_ranked_search_and_facets(self):
+        """Test full-text ranking, facet filters and facet counts."""
+        index = proposal_search.open_index(self.temp_dir)
+        self.assertEqual(len(index), 4)
+
+        result = index.search('space planets')
+        self.assertEqual([name for name, _, _ in result['results']],
+                         ['003_space_chess.md', '001_star_hopper.md'])
+        self.assertEqual(result['total'], 2)
+
+        result = index.search('space', category='arcade')
+        self.assertEqual([title for _, title, _ in result['results']], ['Star Hopper'])
+
+        result = index.search(tag='space', facets=True)
+        self.assertEqual(result['total'], 2)
+        self.assertEqual(dict(result['facets']['tag'])['space'], 2)
+        self.assertEqual(dict(result['facets']['category']), {'arcade': 1, 'strategy': 1})
+
+    def test_incremental_refresh(self):
+        """Test that only new, changed and deleted files are picked up."""
+        proposal_search.open_index(self.temp_dir)
+        index = proposal_search.ProposalSearchIndex(self.temp_dir)
+        self.assertTrue(index.load())
+        self.assertEqual(index.refresh(), {'added': 0, 'updated': 0, 'removed': 0, 'unchanged': 4})
+
+        # Touching a file without changing it does not re-index it
+        path = os.path.join(self.temp_dir, '002_word_garden.md')
+        os.utime(path, ns=(time.time_ns(), time.time_ns() + 10**9))
+        self.assertEqual(index.refresh()['updated'], 0)
+
+        self._write('002_word_garden.md', _idea(
+            'Word Orchard', 'puzzle', 'Grow an orchard by spelling words.',
+            ['Spell words from letter seeds'], ['words']))
+        os.remove(os.path.join(self.temp_dir, '003_space_chess.md'))
+        stats = index.refresh()
+        self.assertEqual((stats['updated'], stats['removed']), (1, 1))
+        self.assertEqual(index.search('garden')['total'], 0)
+        self.assertEqual(index.search('orchard')['results'][0][1], 'Word Orchard')
+        self.assertEqual(index.search(tag='space')['total'], 1)
+
+        # Dead documents do not count towards a term's document frequency
+        scores = index.search('words')['results']
+        index.compact()
+        self.assertEqual(index.dead, 0)
+        self.assertEqual(index.search('words')['results'], scores)
+        self.assertEqual(index.search('orchard')['results'][0][1], 'Word Orchard')
+        self.assertEqual(index.search(category='puzzle')['total'], 1)
+
+    def test_cache_is_plain_json(self):
+        """Test that the cache round-trips as JSON and broken caches are rebuilt."""
+        index = proposal_search.open_index(self.temp_dir)
+        index.refresh()
+        with open(index.path) as f:
+            self.assertEqual(json.load(f)['version'], proposal_search.INDEX_VERSION)
+        reloaded = proposal_search.ProposalSearchIndex(self.temp_dir)
+        self.assertTrue(reloaded.load())
+        self.assertEqual(reloaded.files, index.files)
+        self.assertEqual(reloaded.search('space', facets=True), index.search('space', facets=True))
+
+        with open(index.path) as f:
+            state = json.load(f)
+        state['postings']['space'][0] = [99, 100]
+        with open(index.path, 'w') as f:
+            json.dump(state, f)
+        broken = proposal_search.ProposalSearchIndex(self.temp_dir)
+        self.assertFalse(broken.load())
+        self.assertEqual(len(broken), 0)
+        self.assertEqual(proposal_search.open_index(self.temp_dir).search('space')['total'], 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
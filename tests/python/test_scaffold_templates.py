@@ -0,0 +1,114 @@
+import os
+import sys
+import shutil
+import tempfile
+import unittest
+
+# Add the tools directory to the path so we can import the modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../tools')))
+
+import scaffold_templates
+
+
+class TestScaffoldTemplates(unittest.TestCase):
+    """Tests for the scaffold_templates.py template packs."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.templates_dir = os.path.join(self.temp_dir, 'templates')
+        self.games_dir = os.path.join(self.temp_dir, 'games')
+        shutil.copytree(scaffold_templates.TEMPLATES_DIR, self.templates_dir)
+        self.values = {'game_id': 'tetris', 'title': 'Tetris', 'category': 'puzzle', 'created': '2025-01-01'}
+
+    def tearDown(self):
+        """Tear down test fixtures."""
+        scaffold_templates.load_template_pack.cache_clear()
+        shutil.rmtree(self.temp_dir)
+
+    def _create_game(self, game_id='tetris'):
+        values = dict(self.values, game_id=game_id)
+        files = scaffold_templates.render_pack('default', values, self.templates_dir)
+        game_dir = os.path.join(self.games_dir, game_id)
+        os.makedirs(game_dir)
+        for name, content in files.items():
+            with open(os.path.join(game_dir, name), 'w') as f:
+                f.write(content)
+        scaffold_templates.write_metadata(game_dir, values, 'default', files)
+        return game_dir
+
+    def _change_header(self, text):
+        scaffold_templates.load_template_pack.cache_clear()
+        with open(os.path.join(self.templates_dir, 'shared', 'header.html'), 'w') as f:
+            f.write(text)
+
+    def test_render_default_pack(self):
+        """Test that the default pack renders every scaffold file."""
+        files = scaffold_templates.render_pack('default', self.values, self.templates_dir)
+        self.assertEqual(sorted(files), sorted(scaffold_templates.SCAFFOLD_FILES))
+        self.assertIn('<h1>Tetris</h1>', files['index.html'])
+        self.assertIn("gameId: 'tetris'", files['game.js'])
+        self.assertIn('// Created: 2025-01-01', files['game.js'])
+
+    def test_category_pack_falls_back_to_default(self):
+        """Test that a category pack only needs the files it overrides."""
+        os.makedirs(os.path.join(self.templates_dir, 'puzzle'))
+        with open(os.path.join(self.templates_dir, 'puzzle', 'style.css'), 'w') as f:
+            f.write('/* Puzzle styles for ${title} */\n')
+
+        pack = scaffold_templates.pack_for_category('puzzle', self.templates_dir)
+        self.assertEqual(pack, 'puzzle')
+        self.assertEqual(scaffold_templates.pack_for_category('arcade', self.templates_dir), 'default')
+
+        files = scaffold_templates.render_pack(pack, self.values, self.templates_dir)
+        self.assertEqual(files['style.css'], '/* Puzzle styles for Tetris */\n')
+        self.assertIn('<h1>Tetris</h1>', files['index.html'])
+
+    def test_refresh_only_writes_changed_files(self):
+        """Test that refresh skips files whose rendered content is unchanged."""
+        game_dir = self._create_game()
+        summary = scaffold_templates.refresh_games(self.games_dir, self.templates_dir)
+        self.assertEqual(summary['written'], [])
+        self.assertEqual(summary['unchanged'], 3)
+
+        self._change_header('<header><h1>${title} (new)</h1></header>\n')
+        summary = scaffold_templates.refresh_games(self.games_dir, self.templates_dir)
+        self.assertEqual(summary['written'], [os.path.join('tetris', 'index.html')])
+        with open(os.path.join(game_dir, 'index.html')) as f:
+            self.assertIn('<h1>Tetris (new)</h1>', f.read())
+
+    def test_refresh_keeps_hand_edited_files(self):
+        """Test that refresh leaves edited files alone unless forced."""
+        game_dir = self._create_game()
+        os.makedirs(os.path.join(self.games_dir, 'hand-written'))
+        with open(os.path.join(game_dir, 'index.html'), 'a') as f:
+            f.write('<!-- edited -->\n')
+
+        self._change_header('<header>${title}</header>\n')
+        summary = scaffold_templates.refresh_games(self.games_dir, self.templates_dir)
+        self.assertEqual(summary['modified'], [os.path.join('tetris', 'index.html')])
+        self.assertEqual(summary['skipped'], ['hand-written'])
+
+        summary = scaffold_templates.refresh_games(self.games_dir, self.templates_dir, force=True)
+        self.assertEqual(summary['written'], [os.path.join('tetris', 'index.html')])
+
+    def test_refresh_restores_missing_and_forced_files(self):
+        """Test that refresh looks at the files on disk even when the template output is unchanged."""
+        game_dir = self._create_game()
+        os.remove(os.path.join(game_dir, 'style.css'))
+        with open(os.path.join(game_dir, 'index.html'), 'a') as f:
+            f.write('<!-- edited -->\n')
+
+        summary = scaffold_templates.refresh_games(self.games_dir, self.templates_dir)
+        self.assertEqual(summary['written'], [os.path.join('tetris', 'style.css')])
+        self.assertEqual(summary['modified'], [os.path.join('tetris', 'index.html')])
+        self.assertTrue(os.path.exists(os.path.join(game_dir, 'style.css')))
+
+        summary = scaffold_templates.refresh_games(self.games_dir, self.templates_dir, force=True)
+        self.assertEqual(summary['written'], [os.path.join('tetris', 'index.html')])
+        with open(os.path.join(game_dir, 'index.html')) as f:
+            self.assertNotIn('edited', f.read())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,114 @@
+import os
+import sys
+import json
+import zlib
+import shutil
+import struct
+import tempfile
+import unittest
+
+# Add the tools directory to the path so we can import the modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../tools')))
+
+import thumbnail_generator
+
+
+def read_png(data):
+    """Decode the 8-bit RGB PNGs written by thumbnail_generator into (width, height, rows)."""
+    assert data.startswith(b'\x89PNG\r\n\x1a\n')
+    pos, chunks = 8, {}
+    while pos < len(data):
+        length, kind = struct.unpack('>I4s', data[pos:pos + 8])
+        body = data[pos + 8:pos + 8 + length]
+        crc, = struct.unpack('>I', data[pos + 8 + length:pos + 12 + length])
+        assert crc == zlib.crc32(kind + body)
+        chunks[kind] = body
+        pos += 12 + length
+    width, height = struct.unpack('>II', chunks[b'IHDR'][:8])
+    raw = zlib.decompress(chunks[b'IDAT'])
+    stride = width * 3 + 1
+    return width, height, [raw[y * stride + 1:(y + 1) * stride] for y in range(height)]
+
+
+class TestThumbnailGenerator(unittest.TestCase):
+    """Tests for the thumbnail_generator.py card renderer."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.games = [{'id': f'game-{i}', 'title': f'Game {i}', 'category': category}
+                      for i, category in enumerate(['arcade', 'puzzle', 'strategy', 'educational', 'app'] * 2)]
+
+    def tearDown(self):
+        """Tear down test fixtures."""
+        shutil.rmtree(self.temp_dir)
+
+    def test_png_encoding(self):
+        """Test that cards decode to the requested size and pixels."""
+        canvas = thumbnail_generator.Canvas(4, 2, (0, 0, 0), (0, 0, 0))
+        canvas.rect(1, 0, 3, 1, (255, 0, 0))
+        width, height, rows = read_png(canvas.png())
+        self.assertEqual((width, height), (4, 2))
+        self.assertEqual(rows[0], bytes([0, 0, 0, 255, 0, 0, 255, 0, 0, 0, 0, 0]))
+        self.assertEqual(rows[1], bytes(12))
+
+        design = thumbnail_generator.design_card(self.games[0])
+        for size in thumbnail_generator.WIDTHS:
+            width, height, rows = read_png(thumbnail_generator.render_card(design, size).png())
+            self.assertEqual((width, height), (size, size * 3 // 4))
+            self.assertEqual(len(rows[-1]), size * 3)
+
+    def test_cards_are_deterministic_and_themed(self):
+        """Test that a card only depends on the game and its category theme."""
+        first = thumbnail_generator.render_card(thumbnail_generator.design_card(self.games[0]), 200).png()
+        again = thumbnail_generator.render_card(thumbnail_generator.design_card(dict(self.games[0])), 200).png()
+        renamed = thumbnail_generator.render_card(
+            thumbnail_generator.design_card(dict(self.games[0], title='Other')), 200).png()
+        self.assertEqual(first, again)
+        self.assertNotEqual(first, renamed)
+        self.assertIs(thumbnail_generator.theme_for('game'), thumbnail_generator.THEMES['arcade'])
+        self.assertIs(thumbnail_generator.theme_for('unknown'), thumbnail_generator.THEMES['arcade'])
+        self.assertEqual(thumbnail_generator.wrap_text('A VERY LONG TITLE HERE', 8, 2), ['A VERY', 'LONG...'])
+        self.assertEqual(thumbnail_generator.wrap_text('ABCDEFGHIJ', 4, 3), ['ABCD', 'EFGH', 'IJ'])
+
+    def test_only_changed_cards_are_redrawn(self):
+        """Test the hash state file, including the parallel path."""
+        summary = thumbnail_generator.generate_thumbnails(self.games, self.temp_dir, workers=2)
+        self.assertEqual((summary['rendered'], summary['skipped']), (10, 0))
+        self.assertEqual(len([name for name in os.listdir(self.temp_dir) if name.endswith('.png')]), 30)
+        self.assertEqual(thumbnail_generator.generate_thumbnails(self.games, self.temp_dir, workers=1)['rendered'], 0)
+
+        self.games[3]['title'] = 'Renamed'
+        os.remove(os.path.join(self.temp_dir, 'game-5-800w.png'))
+        summary = thumbnail_generator.generate_thumbnails(self.games, self.temp_dir, workers=1)
+        self.assertEqual(summary['rendered'], 2)
+        self.assertEqual(thumbnail_generator.generate_thumbnails(self.games, self.temp_dir, force=True)['rendered'], 10)
+
+    def test_subset_runs_keep_the_other_cards_state(self):
+        """Test that drawing some games never makes the next full run redraw the rest."""
+        thumbnail_generator.generate_thumbnails(self.games, self.temp_dir, workers=1)
+        self.games[0]['title'] = 'Renamed'
+        self.assertEqual(thumbnail_generator.generate_thumbnails(self.games[:1], self.temp_dir, workers=1)['rendered'], 1)
+        self.assertEqual(thumbnail_generator.generate_thumbnails(self.games[:1], self.temp_dir, force=True)['rendered'], 1)
+        self.assertEqual(thumbnail_generator.generate_thumbnails(self.games, self.temp_dir, workers=1)['rendered'], 0)
+
+        # Only a run over the whole registry forgets removed games
+        thumbnail_generator.generate_thumbnails(self.games[:4], self.temp_dir, workers=1, prune=True)
+        with open(os.path.join(self.temp_dir, thumbnail_generator.STATE_FILE)) as f:
+            self.assertEqual(sorted(json.load(f)), [game['id'] for game in self.games[:4]])
+
+    def test_missing_images_are_replaced(self):
+        """Test that games with missing or empty images are pointed at their card."""
+        os.makedirs(os.path.join(self.temp_dir, 'images'))
+        for name, content in [('empty.jpg', b''), ('real.jpg', b'\xff\xd8')]:
+            with open(os.path.join(self.temp_dir, 'images', name), 'wb') as f:
+                f.write(content)
+        games = [{'id': 'a', 'image': 'images/empty.jpg'}, {'id': 'b', 'image': 'images/real.jpg'},
+                 {'id': 'c', 'image': 'images/gone.jpg'}, {'id': 'd', 'image': 'images/d.png'}]
+        operations = thumbnail_generator.missing_images(games, self.temp_dir)
+        self.assertEqual([(op['game']['id'], op['game']['image']) for op in operations],
+                         [('a', 'images/a.png'), ('c', 'images/c.png')])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,123 @@
+import os
+import sys
+import random
+import shutil
+import tempfile
+import unittest
+
+# Add the tools directory to the path so we can import the modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../tools')))
+
+import wave_simulator
+
+
+SAMPLE_GAME_JS = """const CONFIG = {
+    gameId: 'rhythm-defense',
+    gridWidth: 12,
+    bpm: 90, // Beats per minute
+    initialResources: 60,
+    maxWaves: 3
+};
+
+const TOWER_TYPES = {
+    BEAM: { id: 'beam', cost: 20, damage: 12.5, range: 4, color: '#3B82F6' },
+    PULSE: { id: 'pulse', cost: 30, damage: 8, range: 2 },
+    SHIELD: { id: 'shield', cost: 25, damage: 0, range: 1 }
+};
+
+const ENEMY_TYPES = {
+    RUNNER: { id: 'runner', health: 30, speed: 2 },
+    TANK: { id: 'tank', health: 80, speed: 0.8 },
+    FLYER: { id: 'flyer', health: 40, speed: 1.5 }
+};
+
+let gameState = {
+    lives: 10,
+    beatInterval: 60000 / CONFIG.bpm
+};
+
+function setupPath() {
+    gameState.path = [
+        { x: 0, y: 3 },
+        { x: 3, y: 3 },
+        { x: 3, y: 5 }
+    ];
+}
+"""
+
+
+class TestWaveSimulator(unittest.TestCase):
+    """Tests for the wave_simulator.py Rhythm Defense balance simulator."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.game_js = os.path.join(self.temp_dir, 'game.js')
+        with open(self.game_js, 'w') as f:
+            f.write(SAMPLE_GAME_JS)
+        self.params = wave_simulator.load_game_config(self.game_js)
+
+    def tearDown(self):
+        """Tear down test fixtures."""
+        shutil.rmtree(self.temp_dir)
+
+    def test_config_and_waves_mirror_game_js(self):
+        """Test reading game.js and the wave composition of getWaveConfig."""
+        self.assertEqual((self.params['bpm'], self.params['initial_resources'], self.params['max_waves']), (90, 60, 3))
+        self.assertEqual(self.params['lives'], 10)
+        self.assertEqual(self.params['towers']['beam'], {'cost': 20, 'damage': 12.5, 'range': 4})
+        self.assertEqual(self.params['enemies']['tank'], {'health': 80, 'speed': 0.8})
+        self.assertEqual(self.params['path'], [[0, 3], [3, 3], [3, 5]])
+        self.assertIsNone(wave_simulator.load_game_config(os.path.join(self.temp_dir, 'missing.js')))
+        self.assertEqual(wave_simulator.load_game_config()['bpm'], 120)
+
+        self.assertEqual(wave_simulator.wave_enemy_count(4), 13)
+        self.assertEqual({enemy for enemy, delay in wave_simulator.wave_config(2)}, {'runner'})
+        spawns = wave_simulator.wave_config(5)
+        self.assertEqual(len(spawns), 15)
+        self.assertEqual([i for i, (enemy, delay) in enumerate(spawns) if enemy == 'tank'], [0, 5, 10])
+        self.assertEqual([i for i, (enemy, delay) in enumerate(spawns) if enemy == 'flyer'], [7, 14])
+        self.assertEqual(spawns[3][1], 6000)
+
+    def test_undefended_path_loses(self):
+        """Test that every enemy leaks without towers and the game ends when the lives run out."""
+        params = dict(self.params, layout=[])
+        result = wave_simulator.simulate(params, random.Random(0))
+        self.assertFalse(result['won'])
+        self.assertEqual([wave['lives_lost'] for wave in result['waves']], [7, 3])
+        self.assertEqual(result['waves'][0]['leaked'], 7 * 30)
+        self.assertEqual(result['waves'][0]['killed'], 0)
+
+    def test_defended_path_wins_and_earns(self):
+        """Test kills, kill rewards, tower costs and the wave bonus."""
+        params = wave_simulator.set_param(self.params, 'pulse.damage', 100)
+        params = dict(params, layout=[['pulse', 2, 4], ['beam', 0, 3], ['pulse', 4, 4]])
+        result = wave_simulator.simulate(params, random.Random(0))
+        self.assertTrue(result['won'])
+        self.assertEqual([wave['killed'] for wave in result['waves']], [7, 9, 11])
+        # 60 - 30 - 20 + 7 runners * 3; the second pulse is bought with the wave bonus
+        self.assertEqual(result['waves'][0]['resources'], 31)
+        self.assertEqual(result['waves'][1]['resources'], 31 + 10 - 30 + 9 * 3)
+        self.assertRaises(KeyError, wave_simulator.set_param, params, 'beam.speed', 1)
+        self.assertRaises(KeyError, wave_simulator.set_param, params, 'tempo', 1)
+
+    def test_sweeps_are_reproducible_across_workers(self):
+        """Test the parameter grid, the summaries and that a process pool gives the same results."""
+        param_sets = wave_simulator.parameter_grid(self.params, {'bpm': [60, 90, 120, 240], 'beam.damage': [0, 40]})
+        self.assertEqual(len(param_sets), 8)
+        self.assertEqual(param_sets[3][0], {'bpm': 90, 'beam.damage': 40})
+        self.assertEqual(param_sets[3][1]['towers']['beam']['damage'], 40)
+        self.assertEqual(self.params['towers']['beam']['damage'], 12.5)
+
+        serial = wave_simulator.evaluate(param_sets, trials=4, workers=1)
+        self.assertEqual(wave_simulator.evaluate(param_sets, trials=4, workers=2), serial)
+        for result in serial:
+            self.assertLessEqual(len(result['curve']), 3)
+            self.assertEqual(result['curve'][0]['reached'], 1.0)
+            self.assertEqual(result['win_rate'] == 1.0, result['waves_cleared'] == 3)
+        # Four times the tempo fires the towers four times as often
+        self.assertGreaterEqual(serial[7]['waves_cleared'], serial[1]['waves_cleared'])
+
+
+if __name__ == '__main__':
+    unittest.main()
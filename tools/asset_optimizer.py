@@ -0,0 +1,761 @@
+#!/usr/bin/env python
+"""
+Asset Optimizer for Arcade Hub
+
+Builds a deployable copy of the site into an output directory (`dist/`
+by default):
+
+- CSS, JS and HTML are minified, including inline <script> and <style>
+  blocks. The minifiers only remove what cannot change behaviour:
+  comments and whitespace. JS keeps a line break wherever automatic
+  semicolon insertion could depend on it, and HTML keeps one whitespace
+  character wherever the page could render it.
+- CSS and JS files referenced from an HTML page are renamed with a hash
+  of their contents (`css/style.3f2a1b9c.css`), and every page is
+  rewritten to point at the new names, so they can be cached forever.
+- Text files get precompressed `.gz` siblings, and `.br` siblings with
+  --brotli when the brotli package is installed.
+- A `[[headers]]` block marking the hashed files as immutable is written
+  for netlify.toml.
+
+Builds are incremental. A manifest in the output directory records, for
+each source file, its size, mtime and hash and the files built from it,
+so unchanged files are neither re-read nor rebuilt. Changed files are
+built in parallel with a process pool.
+"""
+
+import os
+import re
+import sys
+import gzip
+import json
+import time
+import hashlib
+import argparse
+import posixpath
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    import brotli
+except ImportError:  # Optional, only needed for --brotli
+    brotli = None
+
+
+SITE_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_OUTPUT = os.path.join(SITE_ROOT, "dist")
+# Directories of the site that are deployed, next to the top-level *.html pages
+SITE_DIRS = ["css", "js", "games", "images", "public", "search"]
+MANIFEST_FILE = ".asset-manifest.json"
+HEADERS_FILE = "netlify-headers.toml"
+MANIFEST_VERSION = 1
+# Referenced files with these extensions get content-hashed names
+HASHED_EXTENSIONS = {".css", ".js"}
+COMPRESSIBLE_EXTENSIONS = {".html", ".css", ".js", ".svg", ".json", ".txt", ".xml", ".md"}
+# Smaller files are not worth a compressed sibling
+MIN_COMPRESS_BYTES = 256
+HASH_LENGTH = 8
+# Below this many files to build, a process pool costs more than it saves
+_PARALLEL_THRESHOLD = 8
+
+HEADERS_BEGIN = "# BEGIN asset_optimizer headers"
+HEADERS_END = "# END asset_optimizer headers"
+IMMUTABLE = "public, max-age=31536000, immutable"
+
+
+# --- CSS ---
+
+_CSS_TOKEN = re.compile(r'"(?:[^"\\\n]|\\.)*"|\'(?:[^\'\\\n]|\\.)*\'|/\*.*?\*/|\s+|[^"\'/\s{};,>~:()]+|.', re.S)
+# A space next to these is never significant in CSS. "(" is not here:
+# "and (max-width: 600px)" needs its space, or "and(" becomes a function.
+_CSS_TIGHT_BEFORE = set("{};,>~:(")
+_CSS_TIGHT_AFTER = set("{};,>~)")
+
+
+def minify_css(source):
+    """
+    Remove comments and insignificant whitespace from a stylesheet.
+
+    Args:
+        source (str): The stylesheet
+
+    Returns:
+        str: The minified stylesheet
+    """
+    out = []
+    last = ""
+    space = False
+    for token in _CSS_TOKEN.findall(source):
+        if token.isspace() or token.startswith("/*"):
+            space = space or bool(out)
+            continue
+        if space and last not in _CSS_TIGHT_BEFORE and token[0] not in _CSS_TIGHT_AFTER:
+            out.append(" ")
+        space = False
+        if token == "}" and last == ";":
+            out.pop()
+        out.append(token)
+        last = token[-1]
+    return "".join(out)
+
+
+# --- JS ---
+
+_JS_WORD = re.compile(r"[A-Za-z0-9_$\\\u0080-\uffff]+")
+_JS_SPACE = re.compile(r"\s+")
+# A "/" after these starts a regular expression rather than a division
+_REGEX_AFTER = set("(,=:[!&|?{};+-*%<>~^")
+_REGEX_KEYWORDS = {"return", "typeof", "case", "do", "else", "in", "of", "new", "delete", "void",
+                   "throw", "instanceof", "yield", "await"}
+# A line break after or before these can never end a statement, so it can go
+_JS_JOIN_AFTER = set("{([,;=:?&|")
+_JS_JOIN_BEFORE = set("})],;.=:?&|")
+
+
+def _is_word_char(char):
+    return char.isalnum() or char in "_$\\" or ord(char) > 127
+
+
+def _js_needs_space(before, after):
+    """Return True if removing the space between two characters would change the code."""
+    if _is_word_char(before) and _is_word_char(after):
+        return True
+    return (before == after and before in "+-") or (before == "/" and after in "/*") \
+        or (before.isdigit() and after == ".") or (before, after) in (("-", ">"), ("<", "!"))
+
+
+def _js_literal_end(source, start):
+    """Return the index just past a quoted string starting at `start`."""
+    quote = source[start]
+    i = start + 1
+    while i < len(source):
+        char = source[i]
+        if char == "\\":
+            i += 2
+            continue
+        if char == quote or char == "\n":
+            return i + 1
+        i += 1
+    return len(source)
+
+
+def _js_template_end(source, start):
+    """
+    Scan a template literal chunk starting at `start` (a backtick or the
+    "}" closing a substitution).
+
+    Returns:
+        tuple: (end, substitution) where substitution is True if the chunk ends with "${"
+    """
+    i = start + 1
+    while i < len(source):
+        char = source[i]
+        if char == "\\":
+            i += 2
+            continue
+        if char == "`":
+            return i + 1, False
+        if char == "$" and source.startswith("{", i + 1):
+            return i + 2, True
+        i += 1
+    return len(source), False
+
+
+def _js_regex_end(source, start):
+    """Return the index just past a regex literal starting at `start`, or None if it isn't one."""
+    i = start + 1
+    in_class = False
+    while i < len(source):
+        char = source[i]
+        if char == "\\":
+            i += 2
+            continue
+        if char == "\n":
+            return None
+        if in_class:
+            in_class = char != "]"
+        elif char == "[":
+            in_class = True
+        elif char == "/":
+            i += 1
+            while i < len(source) and source[i].isalpha():
+                i += 1
+            return i
+        i += 1
+    return None
+
+
+def minify_js(source):
+    """
+    Remove comments and insignificant whitespace from a script.
+
+    Strings, template literals and regular expressions are kept as they
+    are. Line breaks are only removed where they cannot end a statement,
+    so automatic semicolon insertion works as in the original.
+
+    Args:
+        source (str): The script
+
+    Returns:
+        str: The minified script
+    """
+    out = []
+    last = ""       # Last character written
+    last_word = ""  # Last token written, if it was a word
+    pending = ""    # Whitespace skipped since then: "", " " or "\n"
+    substitutions = []  # Brace depth at each open "${" of a template literal
+    depth = 0
+
+    if source.startswith("#!"):
+        end = source.find("\n") + 1 or len(source)
+        out.append(source[:end].rstrip("\n"))
+        last, pending, source = out[-1][-1], "\n", source[end:]
+
+    def emit(token, word=False):
+        nonlocal last, last_word, pending
+        if pending and out:
+            if pending == "\n" and last not in _JS_JOIN_AFTER and token[0] not in _JS_JOIN_BEFORE:
+                out.append("\n")
+            elif _js_needs_space(last, token[0]):
+                out.append(" ")
+        pending = ""
+        out.append(token)
+        last = token[-1]
+        last_word = token if word else ""
+
+    i = 0
+    n = len(source)
+    while i < n:
+        char = source[i]
+        if char.isspace():
+            end = _JS_SPACE.match(source, i).end()
+            pending = "\n" if pending == "\n" or "\n" in source[i:end] else " "
+            i = end
+        elif char == "/" and source.startswith("/", i + 1):
+            end = source.find("\n", i)
+            i = n if end == -1 else end
+        elif char == "/" and source.startswith("*", i + 1):
+            end = source.find("*/", i + 2)
+            end = n if end == -1 else end + 2
+            pending = "\n" if pending == "\n" or "\n" in source[i:end] else " "
+            i = end
+        elif char in "'\"":
+            end = _js_literal_end(source, i)
+            emit(source[i:end])
+            i = end
+        elif char == "`" or (char == "}" and substitutions and substitutions[-1] == depth):
+            if char == "}":
+                substitutions.pop()
+            end, substitution = _js_template_end(source, i)
+            if substitution:
+                substitutions.append(depth)
+            emit(source[i:end])
+            i = end
+        elif char == "/" and (not last or last in _REGEX_AFTER or last_word in _REGEX_KEYWORDS):
+            end = _js_regex_end(source, i)
+            if end is None:
+                emit(char)
+                i += 1
+            else:
+                emit(source[i:end])
+                i = end
+        elif _is_word_char(char):
+            end = _JS_WORD.match(source, i).end()
+            emit(source[i:end], word=True)
+            i = end
+        else:
+            if char == "{":
+                depth += 1
+            elif char == "}":
+                depth -= 1
+            emit(char)
+            i += 1
+    return "".join(out)
+
+
+# --- HTML ---
+
+_TAG_NAME = re.compile(r"<(/?)([A-Za-z][A-Za-z0-9:-]*)")
+_ATTRIBUTE = re.compile(r"""\s*([^\s"'<>/=]+)(?:\s*=\s*("[^"]*"|'[^']*'|[^\s"'=<>`]+))?""")
+_HTML_SPACE = re.compile(r"\s+")
+_URL_SCHEME = re.compile(r"[A-Za-z][A-Za-z0-9+.-]*:")
+# Elements whose contents are not markup
+_RAW_ELEMENTS = {"script", "style", "pre", "textarea"}
+_JS_TYPES = {"", "text/javascript", "application/javascript", "module"}
+_URL_ATTRIBUTES = {"src", "href"}
+
+
+def _tag_end(source, start):
+    """Return the index just past the ">" closing a tag, skipping quoted attribute values."""
+    quote = None
+    for i in range(start + 1, len(source)):
+        char = source[i]
+        if quote:
+            if char == quote:
+                quote = None
+        elif char in "\"'":
+            quote = char
+        elif char == ">":
+            return i + 1
+    return len(source)
+
+
+def _parse_tag(tag):
+    """
+    Split a tag into its parts.
+
+    Returns:
+        tuple: (closing, name, attributes, self_closing) where attributes is
+            a list of (name, raw value or None), or None if the tag is malformed
+    """
+    match = _TAG_NAME.match(tag)
+    attributes = []
+    pos = match.end()
+    while True:
+        attribute = _ATTRIBUTE.match(tag, pos)
+        if not attribute or attribute.end() == pos:
+            break
+        attributes.append(attribute.groups())
+        pos = attribute.end()
+    rest = tag[pos:-1].strip()
+    if rest not in ("", "/"):
+        return None
+    return match.group(1), match.group(2), attributes, rest == "/"
+
+
+def _site_path(url, page):
+    """
+    Resolve a URL found in a page to a path relative to the site root.
+
+    Args:
+        url (str): The src or href value
+        page (str): The page's path relative to the site root
+
+    Returns:
+        str: The site path, or None for external, empty or escaping URLs
+    """
+    path = re.split(r"[?#]", url, maxsplit=1)[0]
+    if not path or url.startswith("//") or _URL_SCHEME.match(url):
+        return None
+    if path.startswith("/"):
+        path = posixpath.normpath(path.lstrip("/"))
+    else:
+        path = posixpath.normpath(posixpath.join(posixpath.dirname(page), path))
+    return None if path.startswith("..") or path == "." else path
+
+
+def _rename_url(url, name):
+    """Replace the file name of a URL, keeping its directory, query and fragment."""
+    path, suffix = re.match(r"([^?#]*)(.*)", url, re.S).groups()
+    return path[:path.rfind("/") + 1] + name + suffix
+
+
+def minify_html(source, page="index.html", renames=None, references=None):
+    """
+    Minify a page and point its references at renamed files.
+
+    Comments are removed, whitespace runs are collapsed to one character
+    (and dropped entirely outside <body>), tags are rewritten with single
+    spaces between attributes, and inline scripts and styles are
+    minified. <pre> and <textarea> contents are kept as they are.
+
+    Args:
+        source (str): The page
+        page (str): The page's path relative to the site root
+        renames (dict, optional): Maps site paths to their new file paths
+        references (set, optional): Filled with the site paths of every
+            local src and href in the page
+
+    Returns:
+        str: The minified page
+    """
+    renames = renames or {}
+    out = []
+    in_body = "<body" not in source.lower()
+    i = 0
+    n = len(source)
+
+    def text(chunk):
+        chunk = _HTML_SPACE.sub(lambda m: "\n" if "\n" in m.group() else " ", chunk)
+        if not in_body and chunk.isspace():
+            return
+        if chunk[:1].isspace() and out and out[-1][-1:].isspace():
+            chunk = chunk[1:]
+        if chunk:
+            out.append(chunk)
+
+    while i < n:
+        start = source.find("<", i)
+        if start == -1:
+            text(source[i:])
+            break
+        if start > i:
+            text(source[i:start])
+        if source.startswith("<!--", start):
+            end = source.find("-->", start + 4)
+            end = n if end == -1 else end + 3
+            if source.startswith("<!--[if", start):
+                out.append(source[start:end])
+            i = end
+            continue
+        if source.startswith("<!", start):
+            end = source.find(">", start)
+            end = n if end == -1 else end + 1
+            out.append(source[start:end])
+            i = end
+            continue
+        if not _TAG_NAME.match(source, start):
+            text("<")
+            i = start + 1
+            continue
+
+        end = _tag_end(source, start)
+        tag = source[start:end]
+        parsed = _parse_tag(tag)
+        i = end
+        if parsed is None:
+            out.append(tag)
+            continue
+        closing, name, attributes, self_closing = parsed
+        name = name.lower()
+        if name == "body":
+            in_body = not closing
+
+        parts = ["<", closing, name]
+        for attribute, value in attributes:
+            if value is not None and attribute.lower() in _URL_ATTRIBUTES:
+                quote = value[0] if value[0] in "\"'" else ""
+                url = value[1:-1] if quote else value
+                path = _site_path(url, page)
+                if path is not None:
+                    if references is not None:
+                        references.add(path)
+                    if path in renames:
+                        value = quote + _rename_url(url, posixpath.basename(renames[path])) + quote
+            parts.append(f" {attribute}" if value is None else f" {attribute}={value}")
+        parts.append("/>" if self_closing else ">")
+        out.append("".join(parts))
+
+        if name in _RAW_ELEMENTS and not closing and not self_closing:
+            close = re.compile(rf"</{name}\s*>", re.I).search(source, i)
+            content_end = close.start() if close else n
+            content = source[i:content_end]
+            types = {value.strip("\"'").lower() for attribute, value in attributes
+                     if attribute.lower() == "type" and value}
+            if name == "script" and types <= _JS_TYPES:
+                content = minify_js(content)
+            elif name == "style":
+                content = minify_css(content)
+            out.append(content)
+            i = content_end
+    return "".join(out)
+
+
+# --- Building ---
+
+def content_hash(data):
+    """Return the short content hash used in file names."""
+    return hashlib.sha256(data).hexdigest()[:HASH_LENGTH]
+
+
+def hashed_name(path, data):
+    """
+    Return the content-hashed version of a path.
+
+    Args:
+        path (str): A site path like "css/style.css"
+        data (bytes): The file contents
+
+    Returns:
+        str: e.g. "css/style.3f2a1b9c.css"
+    """
+    stem, ext = posixpath.splitext(path)
+    return f"{stem}.{content_hash(data)}{ext}"
+
+
+def list_site_files(source_root):
+    """
+    List the deployed files of the site.
+
+    Args:
+        source_root (str): The site root
+
+    Returns:
+        list: Site paths (relative, with "/" separators), sorted
+    """
+    files = [name for name in os.listdir(source_root)
+             if name.endswith(".html") and os.path.isfile(os.path.join(source_root, name))]
+    for directory in SITE_DIRS:
+        for dirpath, dirnames, filenames in os.walk(os.path.join(source_root, directory)):
+            dirnames[:] = [d for d in dirnames if not d.startswith(".") and d != "__pycache__"]
+            rel_dir = os.path.relpath(dirpath, source_root).replace(os.sep, "/")
+            files.extend(f"{rel_dir}/{name}" for name in filenames if not name.startswith("."))
+    return sorted(files)
+
+
+def _write_atomic(path, data):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.tmp{os.getpid()}"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+def _build_file(task):
+    """
+    Build one file of the site. Runs in a worker process.
+
+    Args:
+        task (tuple): (source_root, output_dir, path, hashed, renames, use_brotli)
+
+    Returns:
+        dict: The manifest entry for the file
+    """
+    source_root, output_dir, path, hashed, renames, use_brotli = task
+    with open(os.path.join(source_root, path), "rb") as f:
+        original = f.read()
+    entry = {"sha256": hashlib.sha256(original).hexdigest(), "hashed": hashed, "renames": renames}
+
+    ext = posixpath.splitext(path)[1].lower()
+    data = original
+    try:
+        if ext == ".html":
+            references = set()
+            data = minify_html(original.decode("utf-8"), path, renames, references).encode("utf-8")
+            entry["references"] = sorted(references)
+        elif ext == ".css":
+            data = minify_css(original.decode("utf-8")).encode("utf-8")
+        elif ext == ".js":
+            data = minify_js(original.decode("utf-8")).encode("utf-8")
+    except UnicodeDecodeError:
+        data = original
+
+    output = hashed_name(path, data) if hashed else path
+    _write_atomic(os.path.join(output_dir, output), data)
+    entry.update(output=output, outputs=[output], original=len(original), minified=len(data))
+
+    if ext in COMPRESSIBLE_EXTENSIONS and len(data) >= MIN_COMPRESS_BYTES:
+        compressors = [(".gz", "gzip", lambda d: gzip.compress(d, 9, mtime=0))]
+        if use_brotli:
+            compressors.append((".br", "brotli", lambda d: brotli.compress(d, quality=11)))
+        for suffix, key, compress in compressors:
+            compressed = compress(data)
+            if len(compressed) < len(data):
+                _write_atomic(os.path.join(output_dir, output + suffix), compressed)
+                entry["outputs"].append(output + suffix)
+                entry[key] = len(compressed)
+    return entry
+
+
+def _read_manifest(path, options):
+    """Load the previous build's manifest, or an empty one if it is missing or was built differently."""
+    try:
+        with open(path) as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if manifest.get("version") != MANIFEST_VERSION or manifest.get("options") != options:
+        return {}
+    return manifest
+
+
+def headers_block(outputs):
+    """
+    Render the netlify.toml [[headers]] rules for content-hashed files.
+
+    Args:
+        outputs (list): Site paths of the hashed files
+
+    Returns:
+        str: The block, between BEGIN and END marker comments
+    """
+    lines = [HEADERS_BEGIN]
+    for output in sorted(outputs):
+        lines += ["[[headers]]", f'  for = "/{output}"', "  [headers.values]",
+                  f'    Cache-Control = "{IMMUTABLE}"', ""]
+    lines.append(HEADERS_END)
+    return "\n".join(lines) + "\n"
+
+
+def update_netlify_toml(path, block):
+    """
+    Put a headers block into netlify.toml, replacing the one from the previous build.
+
+    Args:
+        path (str): Path to netlify.toml
+        block (str): The output of headers_block()
+    """
+    with open(path) as f:
+        config = f.read()
+    start = config.find(HEADERS_BEGIN)
+    end = config.find(HEADERS_END)
+    if start != -1 and end != -1:
+        config = config[:start] + block + config[end + len(HEADERS_END):].lstrip("\n")
+    else:
+        config = config.rstrip("\n") + "\n\n" + block
+    with open(path, "w") as f:
+        f.write(config)
+
+
+def build(source_root=SITE_ROOT, output_dir=DEFAULT_OUTPUT, workers=None, use_brotli=False, force=False):
+    """
+    Build the optimized site, rebuilding only what changed since the last build.
+
+    Args:
+        source_root (str): The site root
+        output_dir (str): Where to write the built site
+        workers (int, optional): Worker processes (defaults to the CPU count)
+        use_brotli (bool): Also write .br files (needs the brotli package)
+        force (bool): Rebuild every file
+
+    Returns:
+        dict: Build statistics ("files", "built", "removed", "original",
+            "minified", "gzip", "brotli", "hashed", "seconds"), or None on error
+    """
+    started = time.perf_counter()
+    if use_brotli and brotli is None:
+        print("Error: --brotli needs the brotli package (pip install brotli)")
+        return None
+    source_root = os.path.abspath(source_root)
+    output_dir = os.path.abspath(output_dir)
+    if not os.path.isdir(source_root):
+        print(f"Error: Site root '{source_root}' not found")
+        return None
+    if output_dir == source_root or not os.path.relpath(source_root, output_dir).startswith(".."):
+        print(f"Error: Output directory '{output_dir}' must not contain the site")
+        return None
+
+    options = {"brotli": use_brotli, "hash_length": HASH_LENGTH}
+    manifest_path = os.path.join(output_dir, MANIFEST_FILE)
+    previous = {} if force else _read_manifest(manifest_path, options).get("files", {})
+    paths = [path for path in list_site_files(source_root)
+             if not (os.path.join(source_root, path) + os.sep).startswith(output_dir + os.sep)]
+
+    # Unchanged files (same size and mtime) are trusted without reading them
+    stats = {}
+    unchanged = set()
+    for path in paths:
+        info = os.stat(os.path.join(source_root, path))
+        stats[path] = (info.st_mtime_ns, info.st_size)
+        entry = previous.get(path)
+        if entry and (entry["mtime_ns"], entry["size"]) == stats[path] and \
+                all(os.path.exists(os.path.join(output_dir, output)) for output in entry["outputs"]):
+            unchanged.add(path)
+
+    # Which files pages reference decides which files get hashed names
+    pages = [path for path in paths if path.endswith(".html")]
+    page_references = {}
+    for page in pages:
+        if page in unchanged:
+            page_references[page] = previous[page]["references"]
+        else:
+            references = set()
+            with open(os.path.join(source_root, page), encoding="utf-8", errors="replace") as f:
+                minify_html(f.read(), page, None, references)
+            page_references[page] = sorted(references)
+    path_set = set(paths)
+    hashed = {path for references in page_references.values() for path in references
+              if path in path_set and posixpath.splitext(path)[1].lower() in HASHED_EXTENSIONS}
+
+    def tasks(group, renames_for):
+        for path in group:
+            renames = renames_for(path)
+            entry = previous.get(path)
+            if path in unchanged and entry["hashed"] == (path in hashed) and entry["renames"] == renames:
+                continue
+            yield (source_root, output_dir, path, path in hashed, renames, use_brotli)
+
+    files = {path: previous[path] for path in unchanged}
+    assets = [path for path in paths if path not in page_references]
+    asset_tasks = list(tasks(assets, lambda path: {}))
+    built = 0
+    workers = workers or os.cpu_count() or 1
+    pool = ProcessPoolExecutor(workers) if workers > 1 and len(asset_tasks) + len(pages) >= _PARALLEL_THRESHOLD \
+        else None
+
+    def run(batch):
+        nonlocal built
+        results = pool.map(_build_file, batch) if pool else map(_build_file, batch)
+        for task, entry in zip(batch, results):
+            files[task[2]] = entry
+            built += 1
+
+    try:
+        run(asset_tasks)
+        # Pages are built once the hashed names of what they reference are known
+        run(list(tasks(pages, lambda page: {
+            path: files[path]["output"] for path in page_references[page] if path in hashed})))
+    finally:
+        if pool:
+            pool.shutdown()
+
+    for path in paths:
+        files[path]["mtime_ns"], files[path]["size"] = stats[path]
+
+    # Drop what earlier builds wrote that this build no longer produces
+    current_outputs = {output for entry in files.values() for output in entry["outputs"]}
+    removed = 0
+    for entry in previous.values():
+        for output in entry["outputs"]:
+            if output not in current_outputs:
+                try:
+                    os.remove(os.path.join(output_dir, output))
+                    removed += 1
+                except FileNotFoundError:
+                    pass
+
+    hashed_outputs = sorted(files[path]["output"] for path in hashed)
+    block = headers_block(hashed_outputs)
+    _write_atomic(os.path.join(output_dir, HEADERS_FILE), block.encode("utf-8"))
+    manifest = {"version": MANIFEST_VERSION, "options": options, "files": files}
+    _write_atomic(manifest_path, json.dumps(manifest, indent=1, sort_keys=True).encode("utf-8"))
+
+    totals = {key: sum(entry.get(key, entry["minified"]) for entry in files.values())
+              for key in ("gzip", "brotli")}
+    return {
+        "files": len(files),
+        "built": built,
+        "removed": removed,
+        "original": sum(entry["original"] for entry in files.values()),
+        "minified": sum(entry["minified"] for entry in files.values()),
+        "gzip": totals["gzip"],
+        "brotli": totals["brotli"] if use_brotli else None,
+        "hashed": hashed_outputs,
+        "headers": block,
+        "seconds": time.perf_counter() - started,
+    }
+
+
+def main():
+    """Main entry point for the script."""
+    parser = argparse.ArgumentParser(description="Minify, precompress and content-hash the Arcade Hub site")
+    parser.add_argument("--source", default=SITE_ROOT, help="Site root to build from")
+    parser.add_argument("--output", "-o", default=DEFAULT_OUTPUT, help="Where to write the built site")
+    parser.add_argument("--workers", "-j", type=int, help="Worker processes (default: CPU count)")
+    parser.add_argument("--brotli", action="store_true", help="Also write .br files (needs the brotli package)")
+    parser.add_argument("--force", "-f", action="store_true", help="Rebuild every file")
+    parser.add_argument("--netlify-toml", metavar="FILE",
+                        help="Also write the cache headers block into this netlify.toml")
+    args = parser.parse_args()
+
+    result = build(args.source, args.output, args.workers, args.brotli, args.force)
+    if result is None:
+        sys.exit(1)
+
+    def kb(size):
+        return f"{size / 1024:.1f} KB"
+
+    print(f"Built {result['built']} of {result['files']} files into {args.output} in {result['seconds']:.2f}s"
+          + (f" ({result['removed']} stale files removed)" if result["removed"] else ""))
+    print(f"Size: {kb(result['original'])} -> {kb(result['minified'])} minified, {kb(result['gzip'])} gzip"
+          + (f", {kb(result['brotli'])} brotli" if result["brotli"] is not None else ""))
+    for output in result["hashed"]:
+        print(f"  /{output}")
+    if args.netlify_toml:
+        update_netlify_toml(args.netlify_toml, result["headers"])
+        print(f"Cache headers written to {args.netlify_toml}")
+    else:
+        print(f"Cache headers for netlify.toml: {os.path.join(args.output, HEADERS_FILE)}")
+
+
+if __name__ == "__main__":
+    main()
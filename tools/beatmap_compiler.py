@@ -0,0 +1,444 @@
+#!/usr/bin/env python
+"""
+Beat-Map Compiler for Rhythm Defense
+
+Compiles Rhythm Defense levels from JSON into a compact binary file that
+the game loads with one fetch() and reads through typed-array views. The
+game does not parse, build objects or compute beat timing during play.
+
+A level source, games/rhythm-defense/levels/<name>.json, looks like:
+
+    {
+        "title": "Classic",
+        "bpm": 120,
+        "tempo": [{"beat": 64, "bpm": 140}],
+        "lanes": [[[0, 3], [3, 3], [3, 5]]],
+        "waves": [
+            {"generate": 1},
+            {"spawns": [{"enemy": "tank", "beat": 0, "lane": 0},
+                        {"enemy": "runner", "time": 1500}]}
+        ]
+    }
+
+Everything but "waves" is optional and defaults to the game's CONFIG and
+path. "waves" may also be a number: that many waves from the game's own
+rules, like getWaveConfig. A spawn is placed either by "time" in ms or on
+a "beat" of the tempo map. Both count from the start of the wave.
+
+The compiled <name>.bin is little-endian. It starts with a 16-byte header
+(magic "RDLV", format version, section count, base bpm and a CRC-32 of
+everything after the header), followed by a table with the byte offset and
+length of each section. Sections are 4-byte aligned and each one is a
+single typed array:
+
+    beats        Float32  ms of every beat from the start of a wave (beat 0 is 0)
+    waves        Uint32   first spawn and spawn count of every wave
+    spawn_times  Uint32   ms from the start of the wave, ascending per wave
+    spawn_types  Uint8    index into enemy_names
+    spawn_lanes  Uint8    index into the lanes
+    lane_index   Uint16   first point of every lane, plus the total
+    lane_points  Uint8    x, y of every lane point
+    enemy_names  UTF-8    enemy type ids, one per line
+"""
+
+import os
+import sys
+import json
+import glob
+import math
+import zlib
+import struct
+import argparse
+import itertools
+
+import wave_simulator
+
+
+SITE_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+LEVELS_DIR = os.path.join(SITE_ROOT, "games", "rhythm-defense", "levels")
+LEVEL_EXTENSION = ".bin"
+MAGIC = b"RDLV"
+FORMAT_VERSION = 1
+HEADER = struct.Struct("<4sHHfI")
+SECTION_ENTRY = struct.Struct("<II")
+ALIGNMENT = 4
+
+# Section name, struct format code of its elements ("" for text)
+SECTIONS = [
+    ("beats", "f"),
+    ("waves", "I"),
+    ("spawn_times", "I"),
+    ("spawn_types", "B"),
+    ("spawn_lanes", "B"),
+    ("lane_index", "H"),
+    ("lane_points", "B"),
+    ("enemy_names", ""),
+]
+# Beats past the end of the longest wave, so the beat map never runs out mid-wave
+TAIL_BEATS = 8
+
+
+def beat_times(bpm, changes):
+    """
+    Yield the time of every beat, without end.
+
+    Args:
+        bpm (float): Tempo from beat 0
+        changes (list): {"beat", "bpm"} tempo changes
+
+    Yields:
+        float: ms of beat 0, 1, 2, ...
+    """
+    tempos = {change["beat"]: change["bpm"] for change in changes}
+    time = 0.0
+    for beat in itertools.count():
+        bpm = tempos.get(beat, bpm)
+        yield time
+        time += 60000.0 / bpm
+
+
+def _check_tempo(bpm, where):
+    if not isinstance(bpm, (int, float)) or bpm <= 0:
+        raise ValueError(f"{where}: bpm must be a positive number")
+
+
+def _wave_spawns(wave, number, params, beat_time):
+    """Return the (time, enemy, lane) spawns of one wave of a level source."""
+    if isinstance(wave, int):
+        wave = {"generate": wave}
+    if "generate" in wave:
+        if not isinstance(wave["generate"], int) or wave["generate"] < 1:
+            raise ValueError(f"wave {number}: generate takes a wave number from 1")
+        return [(float(delay), enemy, 0) for enemy, delay in wave_simulator.wave_config(wave["generate"], params)]
+    spawns = []
+    for spawn in wave.get("spawns", []):
+        if "beat" in spawn:
+            time = beat_time(spawn["beat"])
+        elif "time" in spawn:
+            time = spawn["time"]
+        else:
+            raise ValueError(f"wave {number}: a spawn needs a \"time\" or a \"beat\"")
+        if not isinstance(time, (int, float)) or time < 0:
+            raise ValueError(f"wave {number}: spawn times must not be negative")
+        spawns.append((float(time), spawn.get("enemy"), spawn.get("lane", 0)))
+    if not spawns:
+        raise ValueError(f"wave {number} has no spawns")
+    return sorted(spawns, key=lambda spawn: spawn[0])
+
+
+def compile_level(source, params):
+    """
+    Compile a level source into the binary level format.
+
+    Args:
+        source (dict): Parsed level JSON
+        params (dict): Game parameters from wave_simulator.load_game_config
+
+    Returns:
+        bytes: The compiled level
+
+    Raises:
+        ValueError: If the level is invalid
+    """
+    bpm = source.get("bpm", params["bpm"])
+    _check_tempo(bpm, "bpm")
+    changes = source.get("tempo", [])
+    for change in changes:
+        if not isinstance(change.get("beat"), int) or change["beat"] < 0:
+            raise ValueError("tempo: beat must be a non-negative integer")
+        _check_tempo(change.get("bpm"), f"tempo at beat {change['beat']}")
+
+    lanes = source.get("lanes") or [params["path"]]
+    for number, lane in enumerate(lanes):
+        if len(lane) < 2 or not all(len(point) == 2 and all(isinstance(c, int) and 0 <= c < 256 for c in point)
+                                    for point in lane):
+            raise ValueError(f"lane {number} needs at least two [x, y] points in 0-255")
+
+    waves = source.get("waves")
+    if isinstance(waves, int):
+        waves = list(range(1, waves + 1))
+    if not waves:
+        raise ValueError("a level needs at least one wave")
+
+    beats = []
+    ticker = beat_times(bpm, changes)
+
+    def beat_time(beat):
+        if not isinstance(beat, int) or beat < 0:
+            raise ValueError("spawn beats must be non-negative integers")
+        while len(beats) <= beat:
+            beats.append(next(ticker))
+        return beats[beat]
+
+    enemies = list(params["enemies"])
+    schedule = [_wave_spawns(wave, number, params, beat_time) for number, wave in enumerate(waves, 1)]
+    for number, spawns in enumerate(schedule, 1):
+        for time, enemy, lane in spawns:
+            if enemy not in enemies:
+                raise ValueError(f"wave {number}: unknown enemy '{enemy}'")
+            if not isinstance(lane, int) or not 0 <= lane < len(lanes):
+                raise ValueError(f"wave {number}: unknown lane {lane}")
+            if time >= 2 ** 32:
+                raise ValueError(f"wave {number}: spawn time {time} is too late")
+
+    # Enough beats for the last enemy of the longest wave to walk the longest lane
+    longest = max(sum(math.hypot(x1 - x0, y1 - y0) for (x0, y0), (x1, y1) in zip(lane, lane[1:]))
+                  for lane in lanes)
+    slowest = min(params["enemies"][enemy]["speed"] for spawns in schedule for _, enemy, _ in spawns)
+    if slowest <= 0:
+        raise ValueError("enemy speeds must be positive")
+    end = max(spawns[-1][0] for spawns in schedule) + longest / slowest * 1000
+    while not beats or beats[-1] < end:
+        beats.append(next(ticker))
+    beats += itertools.islice(ticker, TAIL_BEATS)
+
+    wave_table = []
+    spawn_times = []
+    spawn_types = []
+    spawn_lanes = []
+    for spawns in schedule:
+        wave_table += [len(spawn_times), len(spawns)]
+        for time, enemy, lane in spawns:
+            spawn_times.append(int(round(time)))
+            spawn_types.append(enemies.index(enemy))
+            spawn_lanes.append(lane)
+    lane_index = [0]
+    lane_points = []
+    for lane in lanes:
+        for x, y in lane:
+            lane_points += [x, y]
+        lane_index.append(lane_index[-1] + len(lane))
+
+    arrays = {
+        "beats": beats,
+        "waves": wave_table,
+        "spawn_times": spawn_times,
+        "spawn_types": spawn_types,
+        "spawn_lanes": spawn_lanes,
+        "lane_index": lane_index,
+        "lane_points": lane_points,
+    }
+    payloads = []
+    for name, code in SECTIONS:
+        if code:
+            payloads.append(struct.pack(f"<{len(arrays[name])}{code}", *arrays[name]))
+        else:
+            payloads.append("\n".join(enemies).encode("utf-8"))
+
+    offset = HEADER.size + SECTION_ENTRY.size * len(SECTIONS)
+    table = b""
+    body = b""
+    for payload in payloads:
+        padding = -(offset + len(body)) % ALIGNMENT
+        body += b"\0" * padding
+        table += SECTION_ENTRY.pack(offset + len(body), len(payload))
+        body += payload
+    body += b"\0" * (-(offset + len(body)) % ALIGNMENT)
+    rest = table + body
+    return HEADER.pack(MAGIC, FORMAT_VERSION, len(SECTIONS), bpm, zlib.crc32(rest)) + rest
+
+
+def read_level(data):
+    """
+    Decode a compiled level.
+
+    Args:
+        data (bytes): The compiled level
+
+    Returns:
+        dict: "bpm", "beats" (ms), "enemies" (type ids), "lanes" (lists of
+            (x, y)) and "waves" (lists of (time, enemy id, lane) spawns)
+
+    Raises:
+        ValueError: If the data is not a level this version can read
+    """
+    if len(data) < HEADER.size:
+        raise ValueError("too short for a level header")
+    magic, version, section_count, bpm, crc = HEADER.unpack_from(data)
+    if magic != MAGIC:
+        raise ValueError("not a Rhythm Defense level")
+    if version != FORMAT_VERSION:
+        raise ValueError(f"format version {version}, expected {FORMAT_VERSION}")
+    if section_count < len(SECTIONS) or len(data) < HEADER.size + SECTION_ENTRY.size * section_count:
+        raise ValueError("section table is truncated")
+    if zlib.crc32(data[HEADER.size:]) != crc:
+        raise ValueError("checksum mismatch")
+
+    arrays = {}
+    for index, (name, code) in enumerate(SECTIONS):
+        offset, length = SECTION_ENTRY.unpack_from(data, HEADER.size + SECTION_ENTRY.size * index)
+        size = struct.calcsize(code) if code else 1
+        if offset % ALIGNMENT or length % size or offset + length > len(data):
+            raise ValueError(f"section {name} is misaligned or out of bounds")
+        if code:
+            arrays[name] = list(struct.unpack_from(f"<{length // size}{code}", data, offset))
+        else:
+            arrays[name] = data[offset:offset + length].decode("utf-8").split("\n")
+
+    enemies = arrays["enemy_names"]
+    points = arrays["lane_points"]
+    index = arrays["lane_index"]
+    lanes = [[(points[2 * i], points[2 * i + 1]) for i in range(start, stop)]
+             for start, stop in zip(index, index[1:])]
+    waves = []
+    table = arrays["waves"]
+    for first, count in zip(table[::2], table[1::2]):
+        if first + count > len(arrays["spawn_times"]):
+            raise ValueError("wave table points past the spawns")
+        waves.append([(arrays["spawn_times"][i], enemies[arrays["spawn_types"][i]]
+                       if arrays["spawn_types"][i] < len(enemies) else None, arrays["spawn_lanes"][i])
+                      for i in range(first, first + count)])
+    return {"bpm": bpm, "beats": arrays["beats"], "enemies": enemies, "lanes": lanes, "waves": waves,
+            "spawn_count": len(arrays["spawn_times"])}
+
+
+def validate_level(data, enemies=None):
+    """
+    Check a compiled level.
+
+    Args:
+        data (bytes): The compiled level
+        enemies (iterable, optional): Enemy type ids the game knows
+
+    Returns:
+        list: Error messages, empty if the level is valid
+    """
+    try:
+        level = read_level(data)
+    except (ValueError, struct.error, UnicodeDecodeError) as e:
+        return [str(e)]
+
+    errors = []
+    beats = level["beats"]
+    if not beats or beats[0] != 0:
+        errors.append("the beat map must start at 0 ms")
+    if any(later <= earlier for earlier, later in zip(beats, beats[1:])):
+        errors.append("beat times must increase")
+    if not level["waves"]:
+        errors.append("the level has no waves")
+    if sum(len(spawns) for spawns in level["waves"]) != level["spawn_count"]:
+        errors.append("the wave table does not cover every spawn exactly once")
+    if any(len(lane) < 2 for lane in level["lanes"]) or not level["lanes"]:
+        errors.append("every lane needs at least two points")
+    for enemy in level["enemies"]:
+        if enemies is not None and enemy not in enemies:
+            errors.append(f"unknown enemy '{enemy}'")
+    for number, spawns in enumerate(level["waves"], 1):
+        if not spawns:
+            errors.append(f"wave {number} has no spawns")
+        elif beats and spawns[-1][0] > beats[-1]:
+            errors.append(f"wave {number} outlasts the beat map")
+        if any(later[0] < earlier[0] for earlier, later in zip(spawns, spawns[1:])):
+            errors.append(f"wave {number}: spawn times must not decrease")
+        if any(enemy is None for _, enemy, _ in spawns):
+            errors.append(f"wave {number}: spawn of an unknown enemy type")
+        if any(lane >= len(level["lanes"]) for _, _, lane in spawns):
+            errors.append(f"wave {number}: spawn on an unknown lane")
+    return errors
+
+
+def compile_levels(levels_dir=LEVELS_DIR, names=None, game_js=wave_simulator.GAME_JS):
+    """
+    Compile level sources to .bin files next to them.
+
+    Args:
+        levels_dir (str): Directory with the <name>.json level sources
+        names (list, optional): Only these levels
+        game_js (str): game.js to take enemy types and defaults from
+
+    Returns:
+        dict: Level name to {"bytes", "waves", "spawns", "beats", "changed"}
+
+    Raises:
+        ValueError: If game.js, a source or a compiled level is invalid
+    """
+    params = wave_simulator.load_game_config(game_js)
+    if params is None:
+        raise ValueError(f"could not read the game configuration from {game_js}")
+    if names is None:
+        names = sorted(os.path.splitext(os.path.basename(path))[0]
+                       for path in glob.glob(os.path.join(levels_dir, "*.json")))
+
+    summary = {}
+    for name in names:
+        source_path = os.path.join(levels_dir, name + ".json")
+        try:
+            with open(source_path, "r") as f:
+                source = json.load(f)
+            data = compile_level(source, params)
+        except OSError:
+            raise ValueError(f"{name}: level source {source_path} not found")
+        except (ValueError, TypeError, KeyError, AttributeError, struct.error) as e:
+            raise ValueError(f"{name}: {e}")
+        errors = validate_level(data, params["enemies"])
+        if errors:
+            raise ValueError(f"{name}: {'; '.join(errors)}")
+
+        output_path = os.path.join(levels_dir, name + LEVEL_EXTENSION)
+        try:
+            with open(output_path, "rb") as f:
+                changed = f.read() != data
+        except OSError:
+            changed = True
+        if changed:
+            tmp_path = f"{output_path}.tmp{os.getpid()}"
+            with open(tmp_path, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, output_path)
+        level = read_level(data)
+        summary[name] = {"bytes": len(data), "waves": len(level["waves"]), "spawns": level["spawn_count"],
+                         "beats": len(level["beats"]), "changed": changed}
+    return summary
+
+
+def main():
+    """Main entry point for the script."""
+    parser = argparse.ArgumentParser(description="Compile Rhythm Defense levels to binary beat maps")
+    parser.add_argument("--levels-dir", "-d", default=LEVELS_DIR, help="Directory of the level sources")
+    parser.add_argument("--game-js", default=wave_simulator.GAME_JS, help="Path to the Rhythm Defense game.js")
+    subparsers = parser.add_subparsers(dest="command", help="Command to run")
+
+    build_parser = subparsers.add_parser("build", help="Compile level sources")
+    build_parser.add_argument("names", nargs="*", help="Only these levels (default: every <name>.json)")
+
+    check_parser = subparsers.add_parser("check", help="Validate compiled levels")
+    check_parser.add_argument("files", nargs="*", help="Compiled levels (default: every .bin in the levels directory)")
+    args = parser.parse_args()
+
+    if args.command == "build":
+        try:
+            summary = compile_levels(args.levels_dir, args.names or None, args.game_js)
+        except ValueError as e:
+            print(f"Error: {e}")
+            sys.exit(1)
+        for name, level in summary.items():
+            state = "compiled" if level["changed"] else "up to date"
+            print(f"✓ {name}{LEVEL_EXTENSION} {state}: {level['waves']} waves, {level['spawns']} spawns, "
+                  f"{level['beats']} beats ({level['bytes']:,} bytes)")
+    elif args.command == "check":
+        params = wave_simulator.load_game_config(args.game_js)
+        files = args.files or sorted(glob.glob(os.path.join(args.levels_dir, "*" + LEVEL_EXTENSION)))
+        failed = False
+        for path in files:
+            try:
+                with open(path, "rb") as f:
+                    data = f.read()
+            except OSError:
+                print(f"Error: Level '{path}' not found")
+                failed = True
+                continue
+            errors = validate_level(data, params["enemies"] if params else None)
+            if errors:
+                failed = True
+                for error in errors:
+                    print(f"Error: {os.path.basename(path)}: {error}")
+            else:
+                print(f"✓ {os.path.basename(path)} is valid")
+        if failed:
+            sys.exit(1)
+    else:
+        parser.print_help()
+
+
+if __name__ == "__main__":
+    main()
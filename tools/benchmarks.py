@@ -0,0 +1,444 @@
+#!/usr/bin/env python
+"""
+Benchmarks for the Arcade Hub Development Tools
+
+Measures the tool functions against synthetic fixtures at production
+sizes: registries with 10, 1,000 and 100,000 games and concept catalogs
+with up to 1,000,000 concepts. For every benchmark and size it records
+latency percentiles, throughput and the peak memory allocated by a
+single call (traced with tracemalloc in a separate pass, so tracing does
+not distort the timings).
+
+Results are written as JSON and can be compared against the results of
+another commit; a benchmark regresses when its median latency or peak
+memory grows by more than the threshold.
+
+Fixtures are generated once and kept in .bench/fixtures, since the
+largest take a while to build.
+"""
+
+import io
+import os
+import sys
+import json
+import time
+import random
+import shutil
+import platform
+import argparse
+import tempfile
+import itertools
+import subprocess
+import tracemalloc
+from contextlib import contextmanager, redirect_stdout
+from datetime import datetime, timezone
+
+import game_helper
+import game_registry
+import concept_catalog
+import game_idea_generator
+
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BENCH_DIR = os.path.join(ROOT_DIR, ".bench")
+FIXTURE_DIR = os.path.join(BENCH_DIR, "fixtures")
+# Bump when the synthetic fixtures change, so stale ones are rebuilt
+FIXTURE_VERSION = 2
+RESULTS_VERSION = 1
+
+REGISTRY_SIZES = [10, 1_000, 100_000]
+CATALOG_SIZES = [10, 1_000, 100_000, 1_000_000]
+PROPOSAL_DIR_SIZES = [10, 1_000]
+QUICK_LIMIT = 1_000
+
+DEFAULT_THRESHOLD = 0.2
+# Each benchmark runs at least MIN_ITERATIONS times and keeps going until
+# TIME_BUDGET seconds have passed or MAX_ITERATIONS calls were made
+MIN_ITERATIONS = 5
+MAX_ITERATIONS = 2_000
+TIME_BUDGET = 1.0
+MEMORY_ITERATIONS = 3
+# Timings this small are dominated by noise, so they never count as regressions
+NOISE_FLOOR = 50e-6
+
+_TAGS = ["retro", "casual", "puzzle", "shooter", "music", "rhythm", "strategy", "multiplayer",
+         "physics", "platformer", "matching", "educational", "space", "survival", "cards", "words"]
+_WORDS = ["player", "blocks", "enemies", "waves", "score", "timer", "grid", "colors", "jump",
+          "collect", "avoid", "build", "match", "rotate", "shoot", "defend", "level", "bonus"]
+
+
+@contextmanager
+def _working_directory(path):
+    """Temporarily change the working directory (the tools resolve paths from it)."""
+    previous = os.getcwd()
+    os.chdir(path)
+    try:
+        yield
+    finally:
+        os.chdir(previous)
+
+
+def _synthetic_concept(rng, number):
+    """Return one deterministic synthetic game concept."""
+    return {
+        "title": f"Concept {number}",
+        "category": rng.choice(game_helper.CATEGORIES),
+        "description": " ".join(rng.choice(_WORDS) for _ in range(8)).capitalize() + ".",
+        "mechanics": [" ".join(rng.choice(_WORDS) for _ in range(5)).capitalize() for _ in range(3)],
+        "difficulty": rng.choice(["easy", "medium", "hard"]),
+        "tags": rng.sample(_TAGS, 3),
+    }
+
+
+def _synthetic_game(number):
+    """Return one synthetic registry entry."""
+    return game_registry.make_game_entry(f"game-{number}", f"Game {number}",
+                                         f"Synthetic benchmark game number {number}.",
+                                         game_helper.CATEGORIES[number % len(game_helper.CATEGORIES)],
+                                         [_TAGS[number % len(_TAGS)], _TAGS[(number * 7) % len(_TAGS)]])
+
+
+def catalog_fixture(size):
+    """
+    Return the path of a synthetic concept catalog with `size` concepts.
+
+    Args:
+        size (int): Number of concepts
+
+    Returns:
+        str: Path of the JSONL catalog (its index is built alongside)
+    """
+    path = os.path.join(FIXTURE_DIR, f"catalog-v{FIXTURE_VERSION}-{size}.jsonl")
+    # The index is written last, so an interrupted build is redone
+    if not os.path.exists(concept_catalog.index_path_for(path)):
+        rng = random.Random(size)
+        concept_catalog.write_catalog((_synthetic_concept(rng, n) for n in range(size)), path)
+    return path
+
+
+def registry_fixture(size):
+    """
+    Return the directory of a synthetic registry with `size` games.
+
+    The directory holds data/registry.jsonl (with its index checkpoint) and
+    an index.html rendered from it, laid out like the repository.
+
+    Args:
+        size (int): Number of games
+
+    Returns:
+        str: The fixture directory
+    """
+    directory = os.path.join(FIXTURE_DIR, f"registry-v{FIXTURE_VERSION}-{size}")
+    if not os.path.exists(directory):
+        building = directory + ".tmp"
+        shutil.rmtree(building, ignore_errors=True)
+        os.makedirs(os.path.join(building, "data"))
+        registry = game_registry.GameRegistry(os.path.join(building, "data", "registry.jsonl"))
+        registry.apply([{"op": "upsert", "game": _synthetic_game(n)} for n in range(size)])
+        registry.checkpoint()
+        with open(os.path.join(building, "index.html"), "w") as f:
+            f.write("<html>\n<script>\n    Alpine.data('hub', () => ({\n        games: [],\n    }));\n"
+                    "</script>\n</html>\n")
+        game_registry.write_index_html(registry, os.path.join(building, "index.html"))
+        os.replace(building, directory)
+    return directory
+
+
+def _bench_create_game_scaffold(size, workdir):
+    numbers = itertools.count()
+
+    def call():
+        game_helper.create_game_scaffold(f"bench-{next(numbers)}", "Bench Game", "puzzle")
+    return call
+
+
+def _bench_update_game_registry(size, workdir):
+    shutil.copytree(registry_fixture(size), workdir, dirs_exist_ok=True)
+    registry_path = os.path.join(workdir, "data", "registry.jsonl")
+    index_html_path = os.path.join(workdir, "index.html")
+    numbers = itertools.count(size)
+
+    def call():
+        number = next(numbers)
+        game_helper.update_game_registry(f"game-{number}", f"Game {number}", "A new benchmark game.",
+                                         "arcade", ["retro"], registry_path, index_html_path)
+    return call
+
+
+def _bench_generate_game_idea(size, workdir):
+    game_idea_generator.GAME_CONCEPTS = concept_catalog.ConceptCatalog(catalog_fixture(size))
+    rng = random.Random(size)
+    filters = itertools.cycle([(None, None, None), ("puzzle", None, None),
+                               ("arcade", "complex", None), (None, None, "retro")])
+
+    def call():
+        category, complexity, tag = next(filters)
+        game_idea_generator.generate_game_idea(category, complexity, tag, rng=rng)
+    return call
+
+
+def _bench_format_game_proposal(size, workdir):
+    idea = _synthetic_concept(random.Random(0), 0)
+
+    def call():
+        game_idea_generator.format_game_proposal(idea)
+    return call
+
+
+def _bench_save_proposal(size, workdir):
+    directory = os.path.join(workdir, "proposals")
+    os.makedirs(directory)
+    for number in range(size):
+        with open(os.path.join(directory, f"game_proposal_existing_{number}.md"), "w") as f:
+            f.write("# Game Proposal\n")
+    proposal = game_idea_generator.format_game_proposal(_synthetic_concept(random.Random(0), 0))
+
+    def call():
+        game_idea_generator.save_proposal(proposal, directory=directory)
+    return call
+
+
+# name -> (sizes, setup); setup(size, workdir) returns the callable to time
+BENCHMARKS = {
+    "create_game_scaffold": ([None], _bench_create_game_scaffold),
+    "update_game_registry": (REGISTRY_SIZES, _bench_update_game_registry),
+    "generate_game_idea": (CATALOG_SIZES, _bench_generate_game_idea),
+    "format_game_proposal": ([None], _bench_format_game_proposal),
+    "save_proposal": (PROPOSAL_DIR_SIZES, _bench_save_proposal),
+}
+
+
+def _percentile(ordered, fraction):
+    """Nearest-rank percentile of an already sorted list."""
+    return ordered[min(len(ordered) - 1, max(0, round(fraction * len(ordered)) - 1))]
+
+
+def measure(call, min_iterations=MIN_ITERATIONS, max_iterations=MAX_ITERATIONS, budget=TIME_BUDGET):
+    """
+    Time repeated calls and trace the memory they allocate.
+
+    The first call is timed on its own (it usually pays for opening files
+    and building caches) and excluded from the percentiles. Memory is
+    traced right after it, while calls that change state (like adding to
+    a registry) still see the same fixture on every run.
+
+    Args:
+        call (callable): The operation to measure
+        min_iterations (int): Fewest timed calls
+        max_iterations (int): Most timed calls
+        budget (float): Seconds after which no further calls are started
+
+    Returns:
+        dict: Latency percentiles (seconds), throughput and peak memory
+    """
+    started = time.perf_counter()
+    call()
+    first_call = time.perf_counter() - started
+
+    tracemalloc.start()
+    try:
+        peak = 0
+        # Tracing slows calls down several times, so slow calls are traced once
+        for _ in range(1 if first_call > budget else MEMORY_ITERATIONS):
+            tracemalloc.reset_peak()
+            baseline = tracemalloc.get_traced_memory()[0]
+            call()
+            peak = max(peak, tracemalloc.get_traced_memory()[1] - baseline)
+    finally:
+        tracemalloc.stop()
+
+    samples = []
+    deadline = time.perf_counter() + budget
+    while len(samples) < max_iterations and (len(samples) < min_iterations or time.perf_counter() < deadline):
+        started = time.perf_counter()
+        call()
+        samples.append(time.perf_counter() - started)
+
+    ordered = sorted(samples)
+    total = sum(samples)
+    return {
+        "iterations": len(samples),
+        "first_call": first_call,
+        "mean": total / len(samples),
+        "p50": _percentile(ordered, 0.50),
+        "p90": _percentile(ordered, 0.90),
+        "p99": _percentile(ordered, 0.99),
+        "max": ordered[-1],
+        "ops_per_second": len(samples) / total if total else 0.0,
+        "peak_memory": peak,
+    }
+
+
+def benchmark_key(name, size):
+    """Return the results key of one benchmark at one size."""
+    return name if size is None else f"{name}[{size}]"
+
+
+def _git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT_DIR, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_benchmarks(names=None, quick=False, budget=TIME_BUDGET, progress=None):
+    """
+    Run benchmarks against their fixtures.
+
+    Args:
+        names (list, optional): Benchmarks to run (defaults to all)
+        quick (bool): Skip the sizes above QUICK_LIMIT
+        budget (float): Seconds to spend timing each benchmark and size
+        progress (callable, optional): Called with (key, result) after each one
+
+    Returns:
+        dict: Machine-readable results, ready for write_results
+    """
+    results = {}
+    saved_concepts = game_idea_generator.GAME_CONCEPTS
+    try:
+        for name in names or BENCHMARKS:
+            sizes, setup = BENCHMARKS[name]
+            for size in sizes:
+                if quick and size is not None and size > QUICK_LIMIT:
+                    continue
+                workdir = tempfile.mkdtemp(prefix="bench-")
+                try:
+                    # The tools print progress, which is not what is being measured
+                    with _working_directory(workdir), redirect_stdout(io.StringIO()):
+                        result = measure(setup(size, workdir), budget=budget)
+                finally:
+                    shutil.rmtree(workdir, ignore_errors=True)
+                result["size"] = size
+                results[benchmark_key(name, size)] = result
+                if progress:
+                    progress(benchmark_key(name, size), result)
+    finally:
+        game_idea_generator.GAME_CONCEPTS = saved_concepts
+
+    return {
+        "version": RESULTS_VERSION,
+        "commit": _git_commit(),
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "quick": quick,
+        "results": results,
+    }
+
+
+def write_results(results, path):
+    """Write benchmark results as JSON."""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(results, f, indent=2)
+        f.write("\n")
+
+
+def load_results(path):
+    """Read benchmark results written by write_results."""
+    with open(path, "r") as f:
+        results = json.load(f)
+    if results.get("version") != RESULTS_VERSION:
+        raise ValueError(f"{path} holds benchmark results in an unsupported format")
+    return results
+
+
+def compare_results(current, baseline, threshold=DEFAULT_THRESHOLD):
+    """
+    Find benchmarks that got slower or hungrier than a baseline.
+
+    Only benchmarks present in both results are compared, on their median
+    latency and peak memory.
+
+    Args:
+        current (dict): Results of this run
+        baseline (dict): Results to compare against
+        threshold (float): Allowed relative growth, e.g. 0.2 for 20%
+
+    Returns:
+        list: (key, metric, baseline value, current value) per regression
+    """
+    regressions = []
+    for key, result in current["results"].items():
+        previous = baseline["results"].get(key)
+        if previous is None:
+            continue
+        if result["p50"] > max(previous["p50"], NOISE_FLOOR) * (1 + threshold):
+            regressions.append((key, "p50", previous["p50"], result["p50"]))
+        if result["peak_memory"] > previous["peak_memory"] * (1 + threshold) \
+                and result["peak_memory"] - previous["peak_memory"] > 4096:
+            regressions.append((key, "peak_memory", previous["peak_memory"], result["peak_memory"]))
+    return regressions
+
+
+def format_result(key, result):
+    """Format one benchmark result as a table row."""
+    return (f"{key:<32} p50 {result['p50'] * 1000:9.3f} ms  p90 {result['p90'] * 1000:9.3f} ms  "
+            f"p99 {result['p99'] * 1000:9.3f} ms  {result['ops_per_second']:10.1f} ops/s  "
+            f"peak {result['peak_memory'] / 1024:9.1f} KiB")
+
+
+def format_regression(key, metric, before, after):
+    """Format one regression found by compare_results."""
+    if metric == "peak_memory":
+        values = f"{before / 1024:.1f} KiB -> {after / 1024:.1f} KiB"
+    else:
+        values = f"{before * 1000:.3f} ms -> {after * 1000:.3f} ms"
+    return f"{key} {metric}: {values} ({after / before - 1:+.0%})" if before else f"{key} {metric}: {values}"
+
+
+def main():
+    """Main entry point for the script."""
+    parser = argparse.ArgumentParser(description="Benchmark the Arcade Hub tools")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = subparsers.add_parser("run", help="Run the benchmarks")
+    run_parser.add_argument("names", nargs="*", metavar="name",
+                            help=f"Benchmarks to run (default: all of {', '.join(BENCHMARKS)})")
+    run_parser.add_argument("--quick", action="store_true", help=f"Skip sizes above {QUICK_LIMIT:,}")
+    run_parser.add_argument("--budget", type=float, default=TIME_BUDGET,
+                            help="Seconds to spend timing each benchmark and size")
+    run_parser.add_argument("--output", "-o", help="Where to write the JSON results")
+    run_parser.add_argument("--baseline", help="Results to compare against")
+    run_parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                            help="Allowed relative slowdown before a benchmark regresses (default: 0.2)")
+
+    compare_parser = subparsers.add_parser("compare", help="Compare two result files")
+    compare_parser.add_argument("baseline", help="Results of the earlier commit")
+    compare_parser.add_argument("current", help="Results of the later commit")
+    compare_parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                                help="Allowed relative slowdown before a benchmark regresses (default: 0.2)")
+
+    args = parser.parse_args()
+    unknown = [name for name in getattr(args, "names", []) if name not in BENCHMARKS]
+    if unknown:
+        parser.error(f"unknown benchmark: {', '.join(unknown)}")
+
+    try:
+        if args.command == "compare":
+            regressions = compare_results(load_results(args.current), load_results(args.baseline), args.threshold)
+        else:
+            baseline = load_results(args.baseline) if args.baseline else None
+            results = run_benchmarks(args.names, args.quick, args.budget,
+                                     progress=lambda key, result: print(format_result(key, result), flush=True))
+            output = args.output or os.path.join(BENCH_DIR, f"{results['commit'] or 'results'}.json")
+            write_results(results, output)
+            print(f"Results written to {output}")
+            regressions = compare_results(results, baseline, args.threshold) if baseline else []
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}")
+        sys.exit(2)
+
+    for regression in regressions:
+        print(f"! Regression: {format_regression(*regression)}")
+    if regressions:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,335 @@
+#!/usr/bin/env python
+"""
+Concept Catalog for the Arcade Hub Game Idea Generator
+
+Game concepts are stored one per line in a JSONL file. A binary index file
+next to it (`<catalog>.idx`) holds fixed-width columns for every concept
+(byte offset, length, category, difficulty and weight) plus per-tag
+posting lists. Both files are memory-mapped: opening a catalog costs the
+same whatever its size, a concept is only decoded when it is accessed, and
+filters are answered from the columns without decoding any JSON.
+
+The index is rebuilt automatically when it is missing or older than the
+JSONL file.
+"""
+
+import os
+import sys
+import json
+import mmap
+import struct
+import tempfile
+import hashlib
+from array import array
+from collections.abc import Sequence
+
+
+DEFAULT_CATALOG_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "game_concepts.jsonl")
+
+INDEX_MAGIC = b"GCIX"
+INDEX_VERSION = 1
+# magic, version, flags, concept count, tag count, vocabulary size, jsonl size, jsonl mtime
+INDEX_HEADER = struct.Struct("<4sHHIIIQq")
+FLAG_UNIFORM_WEIGHTS = 1
+
+
+class CatalogError(Exception):
+    """Raised when a concept catalog or its index cannot be read."""
+
+
+class Concept:
+    """
+    A single game concept decoded from the catalog.
+
+    Supports item access (concept["title"]) so it can be used wherever a
+    concept dict is expected.
+    """
+
+    __slots__ = ("title", "category", "description", "mechanics", "difficulty", "tags", "weight")
+
+    def __init__(self, title, category, description, mechanics, difficulty, tags, weight=1.0):
+        self.title = title
+        self.category = category
+        self.description = description
+        self.mechanics = mechanics
+        self.difficulty = difficulty
+        self.tags = tags
+        self.weight = weight
+
+    def __getitem__(self, key):
+        try:
+            return getattr(self, key)
+        except (AttributeError, TypeError):
+            raise KeyError(key)
+
+    def get(self, key, default=None):
+        return getattr(self, key, default) if key in self.__slots__ else default
+
+    def to_dict(self):
+        """Return the concept as a plain dict."""
+        concept = {key: getattr(self, key) for key in self.__slots__}
+        if concept["weight"] == 1.0:
+            del concept["weight"]
+        return concept
+
+    def __repr__(self):
+        return f"Concept({self.title!r}, {self.category!r}, {self.difficulty!r})"
+
+
+def _align(offset):
+    """Round an offset up to the next multiple of 8."""
+    return (offset + 7) & ~7
+
+
+def index_path_for(catalog_path):
+    """Return the path of the binary index that belongs to a catalog."""
+    return catalog_path + ".idx"
+
+
+def write_catalog(concepts, catalog_path):
+    """
+    Write concepts to a JSONL catalog and build its index.
+
+    Args:
+        concepts (iterable): Concept dicts
+        catalog_path (str): Path of the JSONL file to write
+
+    Returns:
+        str: Path of the index file
+    """
+    directory = os.path.dirname(catalog_path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(catalog_path, "w", buffering=1024 * 1024) as f:
+        for concept in concepts:
+            if isinstance(concept, Concept):
+                concept = concept.to_dict()
+            f.write(json.dumps(concept, ensure_ascii=False) + "\n")
+    return build_index(catalog_path)
+
+
+def build_index(catalog_path, index_path=None):
+    """
+    Scan a JSONL catalog once and write its binary index.
+
+    Args:
+        catalog_path (str): Path to the JSONL catalog
+        index_path (str, optional): Where to write the index
+
+    Returns:
+        str: Path of the index file
+    """
+    index_path = index_path or index_path_for(catalog_path)
+    vocab = {"categories": {}, "difficulties": {}, "tags": {}}
+    offsets, lengths = array("Q"), array("I")
+    categories, difficulties, weights = array("H"), array("H"), array("f")
+    postings = []
+
+    def code(kind, value):
+        table = vocab[kind]
+        if value not in table:
+            table[value] = len(table)
+            if kind == "tags":
+                postings.append(array("I"))
+        return table[value]
+
+    stat = os.stat(catalog_path)
+    with open(catalog_path, "rb") as f:
+        offset = 0
+        for line in f:
+            if line.strip():
+                try:
+                    concept = json.loads(line)
+                except ValueError:
+                    raise CatalogError(f"Corrupt concept at byte {offset} of {catalog_path}")
+                position = len(offsets)
+                offsets.append(offset)
+                lengths.append(len(line))
+                categories.append(code("categories", concept["category"]))
+                difficulties.append(code("difficulties", concept["difficulty"]))
+                weights.append(float(concept.get("weight", 1.0)))
+                for tag in dict.fromkeys(concept.get("tags", [])):
+                    postings[code("tags", tag)].append(position)
+            offset += len(line)
+
+    vocab_bytes = json.dumps({kind: list(table) for kind, table in vocab.items()}).encode("utf-8")
+    flags = FLAG_UNIFORM_WEIGHTS if all(w == 1.0 for w in weights) else 0
+
+    # Tag postings: a (start, count) pair per tag into one flat position array
+    tag_ranges, flat_postings = array("I"), array("I")
+    for positions in postings:
+        tag_ranges.extend((len(flat_postings), len(positions)))
+        flat_postings.extend(positions)
+
+    header = INDEX_HEADER.pack(INDEX_MAGIC, INDEX_VERSION, flags, len(offsets), len(postings),
+                               len(vocab_bytes), stat.st_size, stat.st_mtime_ns)
+    directory = os.path.dirname(index_path) or "."
+    fd, temp_path = tempfile.mkstemp(dir=directory, prefix=".tmp-")
+    with os.fdopen(fd, "wb") as f:
+        f.write(header)
+        f.write(vocab_bytes)
+        for column in (offsets, lengths, categories, difficulties, weights, tag_ranges, flat_postings):
+            f.write(b"\0" * (_align(f.tell()) - f.tell()))
+            column.tofile(f)
+    os.replace(temp_path, index_path)
+    return index_path
+
+
+class ConceptCatalog(Sequence):
+    """
+    Lazily loaded, memory-mapped concept catalog.
+
+    Behaves like a read-only sequence of Concept records. Nothing is read
+    until the catalog is first used.
+    """
+
+    def __init__(self, path=DEFAULT_CATALOG_PATH):
+        self.path = path
+        self._loaded = False
+
+    def _index_is_current(self, index_path):
+        try:
+            with open(index_path, "rb") as f:
+                header = INDEX_HEADER.unpack(f.read(INDEX_HEADER.size))
+        except (OSError, struct.error):
+            return False
+        stat = os.stat(self.path)
+        magic, version, _, _, _, _, size, mtime = header
+        return magic == INDEX_MAGIC and version == INDEX_VERSION and size == stat.st_size and mtime == stat.st_mtime_ns
+
+    def _locate_index(self):
+        """Return a current index for the catalog, rebuilding it if needed."""
+        index_path = index_path_for(self.path)
+        if self._index_is_current(index_path):
+            return index_path
+        try:
+            return build_index(self.path, index_path)
+        except PermissionError:
+            # Read-only checkout: keep the index in the temp directory instead
+            digest = hashlib.sha1(os.path.abspath(self.path).encode("utf-8")).hexdigest()[:16]
+            index_path = os.path.join(tempfile.gettempdir(), f"game_concepts-{digest}.idx")
+            if self._index_is_current(index_path):
+                return index_path
+            return build_index(self.path, index_path)
+
+    def _load(self):
+        if self._loaded:
+            return
+        if not os.path.exists(self.path):
+            raise CatalogError(f"Concept catalog {self.path} not found")
+        index_path = self._locate_index()
+
+        with open(self.path, "rb") as f:
+            self._data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if os.path.getsize(self.path) else b""
+        with open(index_path, "rb") as f:
+            self._index = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        _, _, flags, count, tag_count, vocab_size, _, _ = INDEX_HEADER.unpack_from(self._index, 0)
+        offset = INDEX_HEADER.size
+        vocab = json.loads(self._index[offset:offset + vocab_size])
+        offset += vocab_size
+
+        # Interned vocabulary shared by every decoded concept
+        self.categories = [sys.intern(value) for value in vocab["categories"]]
+        self.difficulties = [sys.intern(value) for value in vocab["difficulties"]]
+        self.tags = [sys.intern(value) for value in vocab["tags"]]
+        self._category_codes = {value: i for i, value in enumerate(self.categories)}
+        self._difficulty_codes = {value: i for i, value in enumerate(self.difficulties)}
+        self._tag_codes = {value: i for i, value in enumerate(self.tags)}
+        self._interned = {value: value for value in self.categories + self.difficulties + self.tags}
+
+        view = memoryview(self._index)
+        columns = []
+        for typecode, length in (("Q", count), ("I", count), ("H", count), ("H", count),
+                                 ("f", count), ("I", 2 * tag_count), ("I", None)):
+            offset = _align(offset)
+            if length is None:
+                length = (len(view) - offset) // 4
+            size = length * struct.calcsize(typecode)
+            columns.append(view[offset:offset + size].cast(typecode))
+            offset += size
+        (self._offsets, self._lengths, self._categories, self._difficulties,
+         self._weights, self._tag_ranges, self._postings) = columns
+
+        self._count = count
+        self.uniform_weights = bool(flags & FLAG_UNIFORM_WEIGHTS)
+        self._loaded = True
+
+    def close(self):
+        """Release the memory maps."""
+        if self._loaded:
+            for column in (self._offsets, self._lengths, self._categories, self._difficulties,
+                           self._weights, self._tag_ranges, self._postings):
+                column.release()
+            self._index.close()
+            if self._data:
+                self._data.close()
+            self._loaded = False
+
+    def __len__(self):
+        self._load()
+        return self._count
+
+    def __getitem__(self, position):
+        self._load()
+        if isinstance(position, slice):
+            return [self[i] for i in range(*position.indices(self._count))]
+        if position < 0:
+            position += self._count
+        if not 0 <= position < self._count:
+            raise IndexError("concept index out of range")
+        start = self._offsets[position]
+        raw = json.loads(self._data[start:start + self._lengths[position]])
+        intern = self._interned
+        return Concept(
+            raw["title"],
+            intern.get(raw["category"], raw["category"]),
+            raw.get("description", ""),
+            raw.get("mechanics", []),
+            intern.get(raw["difficulty"], raw["difficulty"]),
+            [intern.get(tag, tag) for tag in raw.get("tags", [])],
+            raw.get("weight", 1.0),
+        )
+
+    def __iter__(self):
+        for position in range(len(self)):
+            yield self[position]
+
+    def weight(self, position):
+        """Return the sampling weight of a concept without decoding it."""
+        self._load()
+        return self._weights[position]
+
+    def positions(self, category=None, difficulty=None, tag=None):
+        """
+        Return the positions of the concepts matching the filters.
+
+        Answered from the index columns; no concept is decoded.
+
+        Returns:
+            Sequence of int: Matching positions in catalog order
+        """
+        self._load()
+        if category is None and difficulty is None and tag is None:
+            return range(self._count)
+
+        category_code = self._category_codes.get(category, -1) if category is not None else None
+        difficulty_code = self._difficulty_codes.get(difficulty, -1) if difficulty is not None else None
+        if category_code == -1 or difficulty_code == -1:
+            return array("I")
+
+        if tag is not None:
+            tag_code = self._tag_codes.get(tag)
+            if tag_code is None:
+                return array("I")
+            start, length = self._tag_ranges[2 * tag_code], self._tag_ranges[2 * tag_code + 1]
+            candidates = self._postings[start:start + length]
+        else:
+            candidates = range(self._count)
+
+        categories, difficulties = self._categories, self._difficulties
+        return array("I", (
+            p for p in candidates
+            if (category_code is None or categories[p] == category_code)
+            and (difficulty_code is None or difficulties[p] == difficulty_code)
+        ))
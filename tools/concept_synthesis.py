@@ -0,0 +1,375 @@
+#!/usr/bin/env python
+"""
+Concept Synthesis for the Arcade Hub Game Idea Generator
+
+Builds new game ideas by recombining the mechanics and tags of existing
+concepts. Every combination of mechanics drawn from at least two concepts
+is a candidate, scored for:
+
+- novelty: how far it is from its closest existing concept
+- coherence: how well the concepts it borrows from fit together
+
+Mechanics and concepts are encoded as bag-of-words/tag feature vectors.
+Because the features are binary, each vector is a Python int used as a
+bitset, and cosine similarity becomes popcount(a & b) / sqrt(|a| * |b|),
+computed in a handful of machine instructions per comparison. Candidates
+that can no longer reach the current top-k are skipped before the
+catalog comparison, and large search spaces are split across a process
+pool.
+"""
+
+import os
+import math
+import heapq
+import random
+import itertools
+from concurrent.futures import ProcessPoolExecutor
+
+
+MECHANICS_PER_IDEA = 4
+DEFAULT_BUDGET = 1_000_000
+NOVELTY_WEIGHT = 0.5
+MAX_TAGS = 4
+
+# Below this many candidates a process pool costs more than it saves
+_PARALLEL_THRESHOLD = 50_000
+# Sampled runs are split into a fixed number of seeded chunks, so a seed
+# gives the same ideas whatever the number of workers
+_SAMPLE_CHUNKS = 32
+# Candidates kept per task for every idea asked for, so the final pick can
+# skip ideas that borrow from the same concepts as a better one
+_CANDIDATES_PER_IDEA = 4
+
+_STOP_WORDS = frozenset(
+    "a an and are as at based be by can each for from in into is it more of on or "
+    "the their them to with".split()
+)
+_DIFFICULTY_ORDER = {"easy": 0, "medium": 1, "hard": 2}
+
+
+def _tokens(text):
+    """Return the content words of a mechanic description."""
+    words = "".join(c if c.isalnum() else " " for c in text.lower()).split()
+    return [word for word in words if word not in _STOP_WORDS]
+
+
+def _cosine(a, b):
+    """Cosine similarity of two binary feature vectors stored as int bitsets."""
+    if not a or not b:
+        return 0.0
+    return (a & b).bit_count() / math.sqrt(a.bit_count() * b.bit_count())
+
+
+class FeatureSpace:
+    """
+    Bitset feature vectors for a set of source concepts.
+
+    Args:
+        concepts (list): Concept dicts with mechanics and tags
+        reference_concepts (list, optional): Catalog that novelty is measured
+            against, in addition to the sources
+    """
+
+    def __init__(self, concepts, reference_concepts=None):
+        self.concepts = concepts
+        self.features = {}
+        self.mechanics = []          # unique mechanic texts
+        self.mechanic_sources = []   # index of the concept each mechanic came from
+        self.mechanic_vectors = []
+        self.tag_vectors = []
+        self.concept_vectors = []
+
+        seen = set()
+        for position, concept in enumerate(concepts):
+            tag_vector = self._tag_vector(concept)
+            vector = tag_vector
+            for mechanic in concept.get("mechanics", []):
+                mechanic_vector = self._mechanic_vector(mechanic)
+                vector |= mechanic_vector
+                if mechanic not in seen:
+                    seen.add(mechanic)
+                    self.mechanics.append(mechanic)
+                    self.mechanic_sources.append(position)
+                    self.mechanic_vectors.append(mechanic_vector)
+            self.tag_vectors.append(tag_vector)
+            self.concept_vectors.append(vector)
+
+        # Catalog concepts after the sources, so source indices stay valid;
+        # duplicate vectors cannot change the closest match and are skipped
+        known = set(self.concept_vectors)
+        for concept in reference_concepts or ():
+            vector = self._tag_vector(concept)
+            for mechanic in concept.get("mechanics", []):
+                vector |= self._mechanic_vector(mechanic)
+            if vector and vector not in known:
+                known.add(vector)
+                self.concept_vectors.append(vector)
+
+        # Pairwise tag similarity of the sources, looked up for every candidate
+        self.coherence = [[1.0 if i == j else _cosine(a, b) for j, b in enumerate(self.tag_vectors)]
+                          for i, a in enumerate(self.tag_vectors)]
+        self.concept_sizes = [vector.bit_count() for vector in self.concept_vectors]
+
+    def _bit(self, feature):
+        if feature not in self.features:
+            self.features[feature] = len(self.features)
+        return 1 << self.features[feature]
+
+    def _tag_vector(self, concept):
+        vector = 0
+        for tag in concept.get("tags", []):
+            vector |= self._bit("tag:" + tag)
+        return vector
+
+    def _mechanic_vector(self, mechanic):
+        vector = 0
+        for token in _tokens(mechanic):
+            vector |= self._bit(token)
+        return vector
+
+
+def _score_combinations(space, combinations, top_k, novelty_weight):
+    """
+    Score candidate mechanic combinations and keep the best.
+
+    Args:
+        space (FeatureSpace): The source concepts
+        combinations (iterable): Tuples of mechanic indices
+        top_k (int): Number of candidates to keep
+        novelty_weight (float): Weight of novelty against coherence
+
+    Returns:
+        tuple: (number of candidates evaluated, list of
+        (score, novelty, coherence, mechanic indices) tuples)
+    """
+    sources_of = space.mechanic_sources
+    mechanic_vectors = space.mechanic_vectors
+    tag_vectors = space.tag_vectors
+    coherence_table = space.coherence
+    concept_vectors = space.concept_vectors
+    concept_sizes = space.concept_sizes
+    coherence_weight = 1.0 - novelty_weight
+    all_concepts = range(len(concept_vectors))
+
+    heap = []
+    kept = set()
+    floor = -1.0
+    evaluated = 0
+    for combination in combinations:
+        evaluated += 1
+        sources = [sources_of[m] for m in combination]
+        distinct = list(dict.fromkeys(sources))
+        if len(distinct) < 2:
+            # Mechanics from a single concept are not a recombination
+            continue
+
+        total = 0.0
+        pairs = 0
+        for a in range(len(sources)):
+            row = coherence_table[sources[a]]
+            for b in range(a + 1, len(sources)):
+                total += row[sources[b]]
+                pairs += 1
+        coherence = total / pairs
+        base = coherence_weight * coherence
+        if base + novelty_weight <= floor:
+            continue
+
+        vector = 0
+        for m in combination:
+            vector |= mechanic_vectors[m]
+        for source in distinct:
+            vector |= tag_vectors[source]
+        size = vector.bit_count()
+
+        # The source concepts are usually the closest ones, so check them first
+        # and stop as soon as the candidate can no longer make the cut
+        closest = 0.0
+        pruned = False
+        for concept in itertools.chain(distinct, all_concepts):
+            similarity = (vector & concept_vectors[concept]).bit_count() / math.sqrt(size * concept_sizes[concept])
+            if similarity > closest:
+                closest = similarity
+                if base + novelty_weight * (1.0 - closest) <= floor:
+                    pruned = True
+                    break
+        if pruned:
+            continue
+
+        novelty = 1.0 - closest
+        score = base + novelty_weight * novelty
+        key = tuple(sorted(combination))
+        if key in kept:
+            continue
+        if len(heap) < top_k:
+            heapq.heappush(heap, (score, novelty, coherence, key))
+            kept.add(key)
+        else:
+            kept.discard(heapq.heappushpop(heap, (score, novelty, coherence, key))[3])
+            kept.add(key)
+        if len(heap) == top_k:
+            floor = heap[0][0]
+    return evaluated, heap
+
+
+_worker_space = None
+
+
+def _init_worker(space):
+    global _worker_space
+    _worker_space = space
+
+
+def _run_task(task):
+    """Score one slice of the search space inside a worker process."""
+    kind, argument, draws, size, top_k, novelty_weight = task
+    space = _worker_space
+    count = len(space.mechanics)
+    if kind == "prefix":
+        # Every combination whose lowest mechanic index is `argument`
+        combinations = ((argument,) + rest
+                        for rest in itertools.combinations(range(argument + 1, count), size - 1))
+    else:
+        combinations = _sample_combinations(random.Random(argument), count, size, draws)
+    return _score_combinations(space, combinations, top_k, novelty_weight)
+
+
+def _sample_combinations(rng, count, size, draws):
+    """
+    Yield `draws` random combinations of `size` distinct indices below `count`.
+
+    Draws indices directly and rejects the rare repeats, which is several
+    times faster than random.sample for the small sizes used here.
+    """
+    random_ = rng.random
+    slots = range(size)
+    produced = 0
+    while produced < draws:
+        combination = [int(random_() * count) for _ in slots]
+        if len(set(combination)) == size:
+            produced += 1
+            yield combination
+
+
+def _title(space, sources):
+    """Name a recombined idea after the concepts it borrows from."""
+    first = space.concepts[sources[0]]["title"].split()
+    last = space.concepts[sources[1]]["title"].split()
+    title = " ".join(first[:1] + last[-1:])
+    existing = {concept["title"] for concept in space.concepts}
+    if title in existing or first[:1] == last[-1:]:
+        title = f"{space.concepts[sources[0]]['title']} {last[-1]}"
+    return title
+
+
+def _make_idea(space, score, novelty, coherence, combination):
+    """Turn a scored combination into a game idea dict."""
+    mechanics = [space.mechanics[m] for m in combination]
+    sources = list(dict.fromkeys(space.mechanic_sources[m] for m in combination))
+    concepts = [space.concepts[s] for s in sources]
+
+    categories = [concept["category"] for concept in concepts]
+    category = max(dict.fromkeys(categories), key=categories.count)
+    difficulty = max((concept.get("difficulty", "medium") for concept in concepts),
+                     key=lambda value: _DIFFICULTY_ORDER.get(value, 1))
+    tag_counts = {}
+    for concept in concepts:
+        for tag in concept.get("tags", []):
+            tag_counts[tag] = tag_counts.get(tag, 0) + 1
+    tags = sorted(tag_counts, key=lambda tag: -tag_counts[tag])[:MAX_TAGS]
+
+    titles = [concept["title"] for concept in concepts]
+    article = "An" if category[:1] in "aeiou" else "A"
+    description = (f"{article} {category} game that combines {', '.join(titles[:-1])} and {titles[-1]}. "
+                   f"{concepts[0].get('description', '')}").strip()
+    return {
+        "title": _title(space, sources),
+        "category": category,
+        "description": description,
+        "mechanics": mechanics,
+        "difficulty": difficulty,
+        "tags": tags,
+        "sources": titles,
+        "novelty": round(novelty, 4),
+        "coherence": round(coherence, 4),
+        "score": round(score, 4),
+    }
+
+
+def synthesize_game_ideas(concepts, top_k=5, mechanics_per_idea=MECHANICS_PER_IDEA,
+                          budget=DEFAULT_BUDGET, workers=None, seed=None,
+                          novelty_weight=NOVELTY_WEIGHT, stats=None, reference_concepts=None):
+    """
+    Recombine the mechanics of existing concepts into new game ideas.
+
+    Every combination of `mechanics_per_idea` mechanics is evaluated when
+    there are at most `budget` of them; otherwise `budget` combinations
+    are sampled at random.
+
+    Args:
+        concepts (list): Source concept dicts
+        top_k (int): Number of ideas to return
+        mechanics_per_idea (int): Mechanics combined into each idea
+        budget (int): Maximum number of combinations to evaluate
+        workers (int, optional): Worker processes (defaults to the CPU count)
+        seed (int, optional): Seed for a reproducible sample
+        novelty_weight (float): Weight of novelty against coherence (0-1)
+        stats (dict, optional): Filled in with the number of combinations evaluated
+        reference_concepts (list, optional): Catalog to measure novelty against
+            (defaults to the source concepts alone)
+
+    Returns:
+        list: Game idea dicts, best first, ready for format_game_proposal
+    """
+    space = FeatureSpace(list(concepts), reference_concepts)
+    count = len(space.mechanics)
+    if count < mechanics_per_idea or len(space.concepts) < 2:
+        return []
+
+    total = math.comb(count, mechanics_per_idea)
+    exhaustive = total <= budget
+    evaluations = total if exhaustive else budget
+    workers = workers or os.cpu_count() or 1
+    if evaluations < _PARALLEL_THRESHOLD:
+        workers = 1
+
+    keep = top_k * _CANDIDATES_PER_IDEA
+    if exhaustive:
+        tasks = [("prefix", first, None, mechanics_per_idea, keep, novelty_weight)
+                 for first in range(count - mechanics_per_idea + 1)]
+    else:
+        rng = random.Random(seed)
+        tasks = []
+        for chunk in range(_SAMPLE_CHUNKS):
+            draws = budget // _SAMPLE_CHUNKS + (1 if chunk < budget % _SAMPLE_CHUNKS else 0)
+            tasks.append(("sample", rng.getrandbits(64), draws, mechanics_per_idea, keep, novelty_weight))
+
+    evaluated = 0
+    candidates = []
+    if workers == 1:
+        _init_worker(space)
+        results = map(_run_task, tasks)
+    else:
+        pool = ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(space,))
+        results = pool.map(_run_task, tasks)
+    try:
+        for task_evaluated, best in results:
+            evaluated += task_evaluated
+            candidates.extend(best)
+    finally:
+        if workers > 1:
+            pool.shutdown()
+
+    if stats is not None:
+        stats["evaluated"] = evaluated
+        stats["exhaustive"] = exhaustive
+
+    # Best candidate per set of source concepts, so the ideas differ from each other
+    chosen = {}
+    for candidate in sorted(candidates, reverse=True):
+        sources = frozenset(space.mechanic_sources[m] for m in candidate[3])
+        if sources not in chosen:
+            chosen[sources] = candidate
+            if len(chosen) == top_k:
+                break
+    return [_make_idea(space, *candidate) for candidate in chosen.values()]
@@ -0,0 +1,309 @@
+#!/usr/bin/env python
+"""
+Deploy Bundler for Arcade Hub
+
+Builds a minimal publish directory out of the publish tree in netlify.toml.
+Paths that are never served (tools, tests, coverage reports, registry data,
+docs, Python and Markdown files, package metadata and anything hidden) are
+left out, which also drops stray copies like tools/games/.
+
+Every file is stored once in a content-addressed store under its SHA-1, the
+digest Netlify's deploy API uses, and the publish directory is made of hard
+links into the store, so identical files take the space of one.
+manifest.json maps every published path to its digest, and upload.json
+lists the blobs the previous deploy did not have. Only those need to be
+uploaded.
+
+Bundles are incremental: a stat cache keeps files whose size and mtime did
+not change from being hashed again, and only changed paths are relinked.
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import fnmatch
+import hashlib
+import argparse
+
+
+SITE_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+NETLIFY_TOML = os.path.join(SITE_ROOT, "netlify.toml")
+DEFAULT_OUTPUT = os.path.join(SITE_ROOT, "bundle")
+SITE_DIR = "site"
+STORE_DIR = "objects"
+MANIFEST_FILE = "manifest.json"
+UPLOAD_FILE = "upload.json"
+STAT_CACHE_FILE = ".stat-cache.json"
+MANIFEST_VERSION = 1
+CHUNK_SIZE = 1 << 20
+
+# gitignore-style patterns: a leading "/" anchors a pattern to the publish
+# root, other patterns match a file or directory name anywhere
+EXCLUDE_PATTERNS = [
+    ".*", "__pycache__", "node_modules",
+    "*.py", "*.pyc", "*.md", "*.prof", "*.lock", "*.jsonl",
+    "/tools", "/tests", "/coverage", "/data", "/docs", "/proposals", "/netlify", "/dist", "/bundle",
+    "/package.json", "/package-lock.json", "/jest.config.js", "/requirements.txt", "/renovate.json",
+    "/netlify.toml", "/netlify-headers.toml",
+]
+
+
+def publish_dir(netlify_toml=NETLIFY_TOML):
+    """
+    Read the publish directory from the [build] section of netlify.toml.
+
+    Args:
+        netlify_toml (str): Path to netlify.toml
+
+    Returns:
+        str: Absolute path of the publish directory (the site root by default)
+    """
+    root = os.path.dirname(os.path.abspath(netlify_toml))
+    section = None
+    try:
+        with open(netlify_toml, "r") as f:
+            for line in f:
+                line = line.split("#", 1)[0].strip()
+                if line.startswith("["):
+                    section = line.strip("[]").strip()
+                elif section == "build" and line.startswith("publish") and "=" in line:
+                    value = line.split("=", 1)[1].strip().strip("\"'")
+                    return os.path.normpath(os.path.join(root, value.lstrip("/")))
+    except OSError:
+        pass
+    return root
+
+
+def is_excluded(path, patterns=EXCLUDE_PATTERNS):
+    """
+    Check a publish-relative path against exclude patterns.
+
+    Args:
+        path (str): Path relative to the publish root, with "/" separators
+        patterns (list): gitignore-style patterns
+
+    Returns:
+        bool: True if the path is not deployed
+    """
+    name = path.rsplit("/", 1)[-1]
+    for pattern in patterns:
+        if pattern.startswith("/"):
+            if fnmatch.fnmatchcase(path, pattern[1:]):
+                return True
+        elif fnmatch.fnmatchcase(name, pattern):
+            return True
+    return False
+
+
+def list_publish_files(source_root, patterns=EXCLUDE_PATTERNS, skip=()):
+    """
+    List the files of a publish tree that are deployed.
+
+    Args:
+        source_root (str): The publish root
+        patterns (list): Exclude patterns
+        skip (iterable): Absolute directories to leave out, such as the output
+
+    Returns:
+        list: Publish paths (relative, with "/" separators), sorted
+    """
+    skip = {os.path.abspath(path) for path in skip}
+    files = []
+    for dirpath, dirnames, filenames in os.walk(source_root):
+        rel_dir = os.path.relpath(dirpath, source_root).replace(os.sep, "/")
+        prefix = "" if rel_dir == "." else rel_dir + "/"
+        dirnames[:] = sorted(d for d in dirnames
+                             if not is_excluded(prefix + d, patterns)
+                             and os.path.abspath(os.path.join(dirpath, d)) not in skip)
+        files.extend(prefix + name for name in filenames if not is_excluded(prefix + name, patterns))
+    return sorted(files)
+
+
+def file_digest(path):
+    """Return the SHA-1 hex digest of a file."""
+    digest = hashlib.sha1()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def store_path(output_dir, digest):
+    """Return where a blob lives in the content-addressed store."""
+    return os.path.join(output_dir, STORE_DIR, digest[:2], digest[2:])
+
+
+def _read_json(path, default):
+    try:
+        with open(path, "r") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return default
+
+
+def _write_json(path, data):
+    tmp_path = f"{path}.tmp{os.getpid()}"
+    with open(tmp_path, "w") as f:
+        json.dump(data, f, indent=1, sort_keys=True)
+    os.replace(tmp_path, path)
+
+
+def _store_blob(source_path, blob_path):
+    """Copy a file into the store; a copy, so later edits of the source cannot change the blob."""
+    os.makedirs(os.path.dirname(blob_path), exist_ok=True)
+    tmp_path = f"{blob_path}.tmp{os.getpid()}"
+    shutil.copyfile(source_path, tmp_path)
+    os.chmod(tmp_path, 0o444)
+    os.replace(tmp_path, blob_path)
+
+
+def _link(blob_path, target):
+    """Point a publish path at a blob with a hard link, or a copy across file systems."""
+    os.makedirs(os.path.dirname(target), exist_ok=True)
+    tmp_path = f"{target}.tmp{os.getpid()}"
+    try:
+        os.link(blob_path, tmp_path)
+    except OSError:
+        shutil.copyfile(blob_path, tmp_path)
+    os.replace(tmp_path, target)
+
+
+def _remove_empty_dirs(top):
+    for dirpath, dirnames, filenames in os.walk(top, topdown=False):
+        if dirpath != top and not os.listdir(dirpath):
+            os.rmdir(dirpath)
+
+
+def bundle(source_root, output_dir=DEFAULT_OUTPUT, patterns=EXCLUDE_PATTERNS, since=None):
+    """
+    Bring the publish directory, store and manifest up to date.
+
+    Args:
+        source_root (str): The publish root to bundle
+        output_dir (str): Bundle directory holding site/, objects/ and the manifests
+        patterns (list): Exclude patterns
+        since (str, optional): Manifest of the last deploy; defaults to the
+            manifest of the previous bundle
+
+    Returns:
+        dict: Counts of "files", "blobs", "duplicates", "hashed" files,
+            "relinked" and "removed" paths, "upload" blobs and their
+            "upload_bytes", the "bytes" and "unique_bytes" of the site and
+            the "seconds" taken
+    """
+    started = time.time()
+    manifest_path = os.path.join(output_dir, MANIFEST_FILE)
+    site_dir = os.path.join(output_dir, SITE_DIR)
+    previous = _read_json(manifest_path, {}).get("files", {})
+    deployed = _read_json(since, {}).get("files", {}) if since else previous
+    stat_cache = _read_json(os.path.join(output_dir, STAT_CACHE_FILE), {})
+    os.makedirs(output_dir, exist_ok=True)
+
+    files = {}
+    new_cache = {}
+    sizes = {}
+    hashed = 0
+    sources = {}
+    for path in list_publish_files(source_root, patterns, skip=[output_dir]):
+        source_path = os.path.join(source_root, path)
+        stat = os.stat(source_path)
+        key = [stat.st_size, stat.st_mtime_ns]
+        cached = stat_cache.get(path)
+        if cached and cached[:2] == key:
+            digest = cached[2]
+        else:
+            digest = file_digest(source_path)
+            hashed += 1
+        files["/" + path] = digest
+        new_cache[path] = key + [digest]
+        sizes[digest] = stat.st_size
+        sources.setdefault(digest, source_path)
+
+    for digest, source_path in sources.items():
+        if not os.path.exists(store_path(output_dir, digest)):
+            _store_blob(source_path, store_path(output_dir, digest))
+
+    relinked = 0
+    for path, digest in files.items():
+        target = os.path.join(site_dir, path[1:])
+        if previous.get(path) == digest and os.path.exists(target):
+            continue
+        _link(store_path(output_dir, digest), target)
+        relinked += 1
+    removed = [path for path in previous if path not in files]
+    for path in removed:
+        target = os.path.join(site_dir, path[1:])
+        if os.path.exists(target):
+            os.remove(target)
+    if removed:
+        _remove_empty_dirs(site_dir)
+
+    # Blobs no published path refers to any more
+    store = os.path.join(output_dir, STORE_DIR)
+    for dirpath, dirnames, filenames in os.walk(store):
+        for name in filenames:
+            if os.path.basename(dirpath) + name not in sizes:
+                os.remove(os.path.join(dirpath, name))
+    _remove_empty_dirs(store)
+
+    have = set(deployed.values())
+    upload = {}
+    for path, digest in sorted(files.items()):
+        if digest not in have:
+            upload.setdefault(digest, []).append(path)
+    _write_json(os.path.join(output_dir, UPLOAD_FILE), {
+        "blobs": [{"sha1": digest, "size": sizes[digest], "paths": paths} for digest, paths in upload.items()],
+        "bytes": sum(sizes[digest] for digest in upload),
+    })
+    _write_json(manifest_path, {"version": MANIFEST_VERSION, "files": files})
+    _write_json(os.path.join(output_dir, STAT_CACHE_FILE), new_cache)
+
+    return {
+        "files": len(files),
+        "blobs": len(sizes),
+        "duplicates": len(files) - len(sizes),
+        "hashed": hashed,
+        "relinked": relinked,
+        "removed": len(removed),
+        "upload": len(upload),
+        "upload_bytes": sum(sizes[digest] for digest in upload),
+        "bytes": sum(sizes[digest] for digest in files.values()),
+        "unique_bytes": sum(sizes.values()),
+        "seconds": time.time() - started,
+    }
+
+
+def main():
+    """Main entry point for the script."""
+    parser = argparse.ArgumentParser(description="Build a deduplicated publish directory for deployment")
+    parser.add_argument("--source", help="Publish tree to bundle (default: the publish directory in netlify.toml)")
+    parser.add_argument("--netlify-toml", default=NETLIFY_TOML, help="Path to netlify.toml")
+    parser.add_argument("--output", "-o", default=DEFAULT_OUTPUT, help="Bundle directory")
+    parser.add_argument("--exclude", "-x", action="append", default=[], metavar="PATTERN",
+                        help="Also leave out paths matching this pattern (repeatable)")
+    parser.add_argument("--since", help="Manifest of the last deploy, to list the blobs it lacks")
+    args = parser.parse_args()
+
+    source_root = args.source or publish_dir(args.netlify_toml)
+    if not os.path.isdir(source_root):
+        print(f"Error: Publish directory '{source_root}' not found")
+        sys.exit(1)
+    if args.since and not os.path.exists(args.since):
+        print(f"Error: Manifest '{args.since}' not found")
+        sys.exit(1)
+
+    summary = bundle(source_root, args.output, EXCLUDE_PATTERNS + args.exclude, args.since)
+    print(f"✓ Bundled {summary['files']} files ({summary['bytes']:,} bytes) into "
+          f"{os.path.join(args.output, SITE_DIR)} in {summary['seconds']:.2f}s")
+    print(f"  {summary['blobs']} unique blobs ({summary['unique_bytes']:,} bytes), "
+          f"{summary['duplicates']} duplicates hard-linked")
+    print(f"  {summary['hashed']} files hashed, {summary['relinked']} paths linked, "
+          f"{summary['removed']} removed")
+    print(f"  {summary['upload']} blobs to upload ({summary['upload_bytes']:,} bytes), "
+          f"listed in {os.path.join(args.output, UPLOAD_FILE)}")
+
+
+if __name__ == "__main__":
+    main()
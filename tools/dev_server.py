@@ -0,0 +1,490 @@
+#!/usr/bin/env python
+"""
+Local Development Server for Arcade Hub
+
+Serves the site the way the Netlify deployment does, so load tests
+measure the site instead of the server:
+
+- the publish directory from netlify.toml (`publish = "/"`: the repository root)
+- the [[redirects]] rules, including the `/*` -> `/index.html` 200 rewrite,
+  which only applies when no file matches (unless `force = true`)
+- a stand-in for the `/edge` edge function (netlify/edge-functions/rewrite.js),
+  which redirects to /edge/australia or /edge/not-australia by country.
+  The country comes from the X-Country request header or --country.
+
+The server is a single asyncio event loop. HTTP/1.1 connections are kept
+alive and pipelined requests are answered in order. Small files are kept
+in an in-memory LRU cache together with their gzip-compressed form. Files
+above the cache limit are sent with os.sendfile straight from the page
+cache. Every response carries an ETag and Last-Modified header, and
+conditional requests are answered with 304 Not Modified.
+"""
+
+import os
+import re
+import sys
+import gzip
+import stat
+import time
+import asyncio
+import argparse
+import mimetypes
+from collections import OrderedDict
+from email.utils import formatdate, parsedate_to_datetime
+from urllib.parse import unquote, urlsplit
+
+try:
+    import tomllib
+except ImportError:  # Python < 3.11
+    tomllib = None
+
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CONFIG_PATH = os.path.join(ROOT_DIR, "netlify.toml")
+
+DEFAULT_PORT = 8888
+DEFAULT_CACHE_BYTES = 64 * 1024 * 1024
+# Larger files are not cached; they are sent with os.sendfile instead
+SENDFILE_THRESHOLD = 256 * 1024
+# Text smaller than this is not worth compressing
+GZIP_MIN_BYTES = 512
+MAX_HEADER_BYTES = 64 * 1024
+KEEP_ALIVE_TIMEOUT = 15
+
+SERVER_NAME = "arcade-hub-dev"
+TEXT_TYPES = ("text/", "application/javascript", "application/json", "application/xml", "image/svg+xml")
+EDGE_PATH = "/edge"
+
+REASONS = {200: "OK", 301: "Moved Permanently", 302: "Found", 304: "Not Modified", 400: "Bad Request",
+           404: "Not Found", 405: "Method Not Allowed", 431: "Request Header Fields Too Large"}
+
+mimetypes.add_type("application/javascript", ".js")
+mimetypes.add_type("application/json", ".json")
+mimetypes.add_type("image/svg+xml", ".svg")
+mimetypes.add_type("text/markdown", ".md")
+
+
+def _parse_toml_fallback(text):
+    """Parse the subset of TOML used by netlify.toml (tables, arrays of tables, scalars)."""
+    config = {}
+    table = config
+    for line in text.splitlines():
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        if line.startswith("[["):
+            table = {}
+            config.setdefault(line.strip("[]").strip(), []).append(table)
+        elif line.startswith("["):
+            table = config.setdefault(line.strip("[]").strip(), {})
+        elif "=" in line:
+            key, value = (part.strip() for part in line.split("=", 1))
+            if value.startswith('"'):
+                value = value[1:value.index('"', 1)]
+                table[key] = value
+                continue
+            value = value.split("#", 1)[0].strip()
+            if value in ("true", "false"):
+                value = value == "true"
+            elif re.fullmatch(r"-?\d+", value):
+                value = int(value)
+            table[key] = value
+    return config
+
+
+def load_netlify_config(path=CONFIG_PATH):
+    """
+    Read the parts of netlify.toml the server understands.
+
+    Args:
+        path (str): Path to netlify.toml
+
+    Returns:
+        dict: "publish" directory (absolute) and a list of "redirects"
+    """
+    base = os.path.dirname(os.path.abspath(path))
+    config = {}
+    if os.path.exists(path):
+        with open(path, "rb") as f:
+            data = f.read()
+        config = tomllib.loads(data.decode("utf-8")) if tomllib else _parse_toml_fallback(data.decode("utf-8"))
+
+    publish = config.get("build", {}).get("publish", "")
+    redirects = []
+    for rule in config.get("redirects", []):
+        redirects.append({
+            "from": rule["from"],
+            "to": rule["to"],
+            "status": int(rule.get("status", 301)),
+            "force": bool(rule.get("force", False)),
+            "pattern": _rule_pattern(rule["from"]),
+        })
+    return {"publish": os.path.normpath(os.path.join(base, publish.lstrip("/"))), "redirects": redirects}
+
+
+def _rule_pattern(source):
+    """Compile a Netlify redirect source (with :placeholders and a * splat) to a regex."""
+    parts = []
+    for token in re.split(r"(:\w+|\*)", source.rstrip("/") or "/"):
+        if token == "*":
+            parts.append(r"(?P<splat>.*)")
+        elif token.startswith(":"):
+            parts.append(rf"(?P<{token[1:]}>[^/]+)")
+        else:
+            parts.append(re.escape(token))
+    return re.compile("".join(parts) + "/?")
+
+
+def match_redirect(redirects, path, file_exists):
+    """
+    Find the redirect rule that applies to a request path.
+
+    Rules are tried in order. Unforced rules are shadowed by existing files,
+    as on Netlify.
+
+    Args:
+        redirects (list): Rules from load_netlify_config
+        path (str): The decoded request path
+        file_exists (bool): Whether a file is served at this path
+
+    Returns:
+        tuple: (target path, status), or None if no rule applies
+    """
+    for rule in redirects:
+        if file_exists and not rule["force"]:
+            continue
+        match = rule["pattern"].fullmatch(path)
+        if match:
+            values = match.groupdict()
+            target = re.sub(r":(\w+)", lambda m: values.get(m.group(1), m.group(0)), rule["to"])
+            return target, rule["status"]
+    return None
+
+
+class CachedFile:
+    """A file held in memory, with its validators and compressed form."""
+
+    __slots__ = ("mtime_ns", "size", "content_type", "etag", "last_modified", "body", "gzipped")
+
+    def __init__(self, info, content_type, body):
+        self.mtime_ns = info.st_mtime_ns
+        self.size = info.st_size
+        self.content_type = content_type
+        self.etag = f'"{info.st_mtime_ns:x}-{info.st_size:x}"'
+        self.last_modified = formatdate(info.st_mtime, usegmt=True)
+        self.body = body
+        self.gzipped = None
+
+    @property
+    def weight(self):
+        return len(self.body) + (len(self.gzipped) if self.gzipped else 0)
+
+
+class FileCache:
+    """
+    LRU cache of file contents, bounded by total size.
+
+    Entries are validated against the file's mtime and size on every
+    lookup, so edits are picked up immediately.
+
+    Args:
+        max_bytes (int): Most bytes of file content to keep
+    """
+
+    def __init__(self, max_bytes=DEFAULT_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+
+    def get(self, path, info):
+        """Return the cached file if it is still current, else None."""
+        entry = self._entries.get(path)
+        if entry is None or entry.mtime_ns != info.st_mtime_ns or entry.size != info.st_size:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(path)
+        self.hits += 1
+        return entry
+
+    def put(self, path, entry):
+        """Add or replace a file, evicting the least recently used ones."""
+        self.discard(path)
+        self._entries[path] = entry
+        self.size += entry.weight
+        while self.size > self.max_bytes and self._entries:
+            _, evicted = self._entries.popitem(last=False)
+            self.size -= evicted.weight
+
+    def grow(self, extra):
+        """Account for data added to a cached entry (its gzip form)."""
+        self.size += extra
+
+    def discard(self, path):
+        entry = self._entries.pop(path, None)
+        if entry is not None:
+            self.size -= entry.weight
+
+
+def _is_text(content_type):
+    return content_type.startswith(TEXT_TYPES)
+
+
+def _not_modified(headers, etag, mtime):
+    """Evaluate If-None-Match / If-Modified-Since against a file."""
+    if_none_match = headers.get("if-none-match")
+    if if_none_match is not None:
+        candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        return "*" in candidates or etag in candidates or etag[:-1] + '-gzip"' in candidates
+    if_modified_since = headers.get("if-modified-since")
+    if if_modified_since:
+        try:
+            return int(mtime) <= parsedate_to_datetime(if_modified_since).timestamp()
+        except (TypeError, ValueError):
+            return False
+    return False
+
+
+class DevServer:
+    """
+    Asyncio HTTP server that mirrors the Netlify deployment.
+
+    Args:
+        config (dict): Configuration from load_netlify_config
+        cache_bytes (int): Size of the in-memory file cache
+        country (str, optional): Country code for the /edge function stand-in
+        quiet (bool): Don't log requests
+    """
+
+    def __init__(self, config, cache_bytes=DEFAULT_CACHE_BYTES, country=None, quiet=False):
+        self.root = os.path.realpath(config["publish"])
+        self.redirects = config["redirects"]
+        self.cache = FileCache(cache_bytes)
+        self.country = country
+        self.quiet = quiet
+        self.requests = 0
+        self._date = (0, "")
+        self._containment = {}
+
+    def _http_date(self):
+        now = int(time.time())
+        if self._date[0] != now:
+            self._date = (now, formatdate(now, usegmt=True))
+        return self._date[1]
+
+    def resolve(self, path):
+        """
+        Map a request path to a file under the publish directory.
+
+        Tries the path itself, then `<path>/index.html` and `<path>.html`
+        (Netlify's pretty URLs). Hidden files and anything outside the
+        publish directory are never served.
+
+        Returns:
+            tuple: (file path, os.stat_result), or (None, None)
+        """
+        relative = os.path.normpath(path.lstrip("/"))
+        if relative.startswith("..") or os.path.isabs(relative) or \
+                any(part.startswith(".") and part != "." for part in relative.split(os.sep)):
+            return None, None
+        base = self.root + os.sep + relative if relative != "." else self.root
+        for candidate in (base, base + os.sep + "index.html", base + ".html"):
+            try:
+                info = os.stat(candidate)
+            except (OSError, ValueError):
+                continue
+            if stat.S_ISREG(info.st_mode) and self._inside_root(candidate):
+                return candidate, info
+        return None, None
+
+    def _inside_root(self, path):
+        """Check that a path does not leave the publish directory through a symlink."""
+        inside = self._containment.get(path)
+        if inside is None:
+            inside = self._containment[path] = os.path.realpath(path).startswith(self.root + os.sep)
+        return inside
+
+    def _edge_function(self, headers):
+        """Stand-in for netlify/edge-functions/rewrite.js."""
+        country = (headers.get("x-country") or self.country or "").upper()
+        return "/edge/australia" if country == "AU" else "/edge/not-australia"
+
+    def _load(self, path, info):
+        entry = self.cache.get(path, info)
+        if entry is None and info.st_size <= SENDFILE_THRESHOLD:
+            with open(path, "rb") as f:
+                body = f.read()
+            content_type = mimetypes.guess_type(path)[0] or "application/octet-stream"
+            if _is_text(content_type):
+                content_type += "; charset=utf-8"
+            entry = CachedFile(info, content_type, body)
+            self.cache.put(path, entry)
+        return entry
+
+    def respond(self, method, target, headers):
+        """
+        Work out the response to one request.
+
+        Returns:
+            tuple: (status, header list, body bytes or None, file path to
+            send with sendfile or None)
+        """
+        path = unquote(urlsplit(target).path) or "/"
+        if method not in ("GET", "HEAD"):
+            return 405, [("Allow", "GET, HEAD")], b"Method Not Allowed\n", None
+
+        if path.rstrip("/") == EDGE_PATH:
+            return 302, [("Location", self._edge_function(headers))], b"", None
+
+        file_path, info = self.resolve(path)
+        status = 200
+        rule = match_redirect(self.redirects, path, file_path is not None)
+        if rule:
+            destination, status = rule
+            if status in (301, 302, 303, 307, 308) or destination.startswith(("http://", "https://")):
+                return status, [("Location", destination)], b"", None
+            file_path, info = self.resolve(destination)
+        if file_path is None:
+            status = 404
+            file_path, info = self.resolve("/404.html")
+            if file_path is None:
+                return 404, [("Content-Type", "text/plain; charset=utf-8")], b"Not Found\n", None
+
+        entry = self._load(file_path, info)
+        etag = entry.etag if entry else f'"{info.st_mtime_ns:x}-{info.st_size:x}"'
+        response_headers = [("Cache-Control", "public, max-age=0, must-revalidate")]
+        if status == 200 and _not_modified(headers, etag, info.st_mtime):
+            return 304, response_headers + [("ETag", etag)], b"", None
+
+        last_modified = entry.last_modified if entry else formatdate(info.st_mtime, usegmt=True)
+        response_headers.append(("Last-Modified", last_modified))
+        if entry is None:
+            # Large file: headers now, contents straight from the file
+            content_type = mimetypes.guess_type(file_path)[0] or "application/octet-stream"
+            response_headers += [("ETag", etag), ("Content-Type", content_type),
+                                 ("Content-Length", str(info.st_size))]
+            return status, response_headers, None, file_path
+
+        body = entry.body
+        if _is_text(entry.content_type) and len(body) >= GZIP_MIN_BYTES:
+            response_headers.append(("Vary", "Accept-Encoding"))
+            if "gzip" in headers.get("accept-encoding", ""):
+                if entry.gzipped is None:
+                    entry.gzipped = gzip.compress(body, 6, mtime=0)
+                    self.cache.grow(len(entry.gzipped))
+                body = entry.gzipped
+                etag = etag[:-1] + '-gzip"'
+                response_headers.append(("Content-Encoding", "gzip"))
+        response_headers += [("ETag", etag), ("Content-Type", entry.content_type)]
+        return status, response_headers, body, None
+
+    def _head(self, status, headers, length, keep_alive):
+        lines = [f"HTTP/1.1 {status} {REASONS.get(status, '')}", f"Date: {self._http_date()}",
+                 f"Server: {SERVER_NAME}"]
+        lines += [f"{name}: {value}" for name, value in headers]
+        if length is not None:
+            lines.append(f"Content-Length: {length}")
+        lines.append("Connection: keep-alive" if keep_alive else "Connection: close")
+        return ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1")
+
+    async def handle(self, reader, writer):
+        """Serve the requests of one connection until it is closed."""
+        loop = asyncio.get_running_loop()
+        try:
+            while True:
+                # A timer instead of wait_for, which would start a task per request
+                idle = loop.call_later(KEEP_ALIVE_TIMEOUT, writer.transport.abort)
+                try:
+                    raw = await reader.readuntil(b"\r\n\r\n")
+                except asyncio.LimitOverrunError:
+                    writer.write(self._head(431, [], 0, False))
+                    break
+                except (asyncio.IncompleteReadError, ConnectionError):
+                    break
+                finally:
+                    idle.cancel()
+
+                lines = raw.decode("latin-1").split("\r\n")
+                try:
+                    method, target, version = lines[0].split(" ")
+                except ValueError:
+                    writer.write(self._head(400, [], 0, False))
+                    break
+                headers = {}
+                for line in lines[1:]:
+                    name, _, value = line.partition(":")
+                    if name:
+                        headers[name.strip().lower()] = value.strip()
+                length = headers.get("content-length") or "0"
+                if not (length.isascii() and length.isdigit()):
+                    writer.write(self._head(400, [], 0, False))
+                    break
+                if int(length):
+                    await reader.readexactly(int(length))
+
+                connection = headers.get("connection", "").lower()
+                keep_alive = connection != "close" if version == "HTTP/1.1" else connection == "keep-alive"
+                status, response_headers, body, file_path = self.respond(method, target, headers)
+                self.requests += 1
+                if not self.quiet:
+                    print(f"{status} {method} {target}", flush=True)
+
+                if file_path is None:
+                    head = self._head(status, response_headers, len(body), keep_alive)
+                    # One write, so headers and body leave in a single send
+                    writer.write(head + body if method != "HEAD" else head)
+                else:
+                    writer.write(self._head(status, response_headers, None, keep_alive))
+                    if method != "HEAD":
+                        await writer.drain()
+                        with open(file_path, "rb") as f:
+                            await loop.sendfile(writer.transport, f)
+                # Only wait for the socket when the kernel buffer is full
+                if writer.transport.get_write_buffer_size() > 64 * 1024:
+                    await writer.drain()
+                if not keep_alive:
+                    break
+            await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def start(self, host="127.0.0.1", port=DEFAULT_PORT):
+        """Start listening and return the asyncio server."""
+        return await asyncio.start_server(self.handle, host, port, limit=MAX_HEADER_BYTES,
+                                          reuse_address=True)
+
+
+def main():
+    """Main entry point for the script."""
+    parser = argparse.ArgumentParser(description="Serve Arcade Hub locally like the Netlify deployment")
+    parser.add_argument("--host", default="127.0.0.1", help="Address to listen on")
+    parser.add_argument("--port", "-p", type=int, default=DEFAULT_PORT, help=f"Port (default: {DEFAULT_PORT})")
+    parser.add_argument("--config", default=CONFIG_PATH, help="netlify.toml to mirror")
+    parser.add_argument("--cache-mb", type=int, default=DEFAULT_CACHE_BYTES // (1024 * 1024),
+                        help="Size of the in-memory file cache in MB")
+    parser.add_argument("--country", help="Country code seen by the /edge function (e.g. AU)")
+    parser.add_argument("--quiet", "-q", action="store_true", help="Don't log requests (for load tests)")
+    args = parser.parse_args()
+
+    server = DevServer(load_netlify_config(args.config), args.cache_mb * 1024 * 1024, args.country, args.quiet)
+
+    async def serve():
+        listener = await server.start(args.host, args.port)
+        print(f"Serving {server.root} at http://{args.host}:{args.port}/ (Ctrl+C to stop)", flush=True)
+        async with listener:
+            await listener.serve_forever()
+
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        print(f"\nServed {server.requests} requests")
+    except OSError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -6,13 +6,67 @@ This script provides utilities for game development and management tasks.
 """
 
 import os
+import sys
+import csv
 import json
+import time
 import shutil
 import argparse
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
 
+import game_registry
+import scaffold_templates
+import instrumentation
+import thumbnail_generator
+import game_search_index
 
-def create_game_scaffold(game_id, title, category):
+
+CATEGORIES = ["arcade", "puzzle", "strategy", "educational"]
+
+
+def render_scaffold(game_id, title, created=None, category=None, pack=None):
+    """
+    Render the files of a new game scaffold from a template pack.
+    
+    Args:
+        game_id (str): The unique identifier for the game
+        title (str): The display title of the game
+        created (str, optional): Creation date for the game.js header (defaults to today)
+        category (str, optional): The primary category, used to pick the template pack
+        pack (str, optional): Template pack to use instead of the category's pack
+    
+    Returns:
+        tuple: (values, pack, files) where files maps file name to contents
+    """
+    values = {
+        "game_id": game_id,
+        "title": title,
+        "category": category or "",
+        "created": created or datetime.now().strftime('%Y-%m-%d'),
+    }
+    pack = pack or scaffold_templates.pack_for_category(category)
+    return values, pack, scaffold_templates.render_pack(pack, values)
+
+
+def write_scaffold(game_dir, values, pack, files):
+    """
+    Write rendered scaffold files and their metadata into a game directory.
+    
+    Args:
+        game_dir (str): The game directory to create
+        values (dict): Template variables used for rendering
+        pack (str): Name of the template pack used
+        files (dict): Mapping of file name to file contents
+    """
+    os.makedirs(game_dir, exist_ok=True)
+    for name, content in files.items():
+        with open(os.path.join(game_dir, name), "w") as f:
+            f.write(content)
+    scaffold_templates.write_metadata(game_dir, values, pack, files)
+
+
+def create_game_scaffold(game_id, title, category, pack=None):
     """
     Create a new game scaffold with the basic file structure.
     
@@ -20,6 +74,7 @@ def create_game_scaffold(game_id, title, category):
         game_id (str): The unique identifier for the game (used for directory name)
         title (str): The display title of the game
         category (str): The primary category (arcade, puzzle, strategy, educational)
+        pack (str, optional): Template pack to use instead of the category's pack
     
     Returns:
         bool: True if successful, False otherwise
@@ -29,7 +84,7 @@ def create_game_scaffold(game_id, title, category):
         print("Error: game_id, title, and category are required")
         return False
     
-    if category not in ["arcade", "puzzle", "strategy", "educational"]:
+    if category not in CATEGORIES:
         print(f"Error: category must be one of: arcade, puzzle, strategy, educational")
         return False
     
@@ -39,174 +94,166 @@ def create_game_scaffold(game_id, title, category):
         print(f"Error: Game directory {game_dir} already exists")
         return False
     
-    os.makedirs(game_dir, exist_ok=True)
+    try:
+        write_scaffold(game_dir, *render_scaffold(game_id, title, category=category, pack=pack))
+    except scaffold_templates.TemplatePackError as e:
+        print(f"Error: {e}")
+        return False
     
-    # Create HTML file
-    html_content = f"""<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>{title} - Arcade Hub</title>
-    <link rel="stylesheet" href="/css/style.css">
-    <link rel="stylesheet" href="style.css">
-</head>
-<body>
-    <header>
-        <a href="/" class="back-button">← Back to Arcade Hub</a>
-        <h1>{title}</h1>
-    </header>
-    
-    <main>
-        <!-- Game container -->
-        <div id="game-container">
-            <!-- Game canvas or elements go here -->
-        </div>
-        
-        <!-- Controls explanation -->
-        <div class="controls-info">
-            <h2>How to Play</h2>
-            <p>Explain the controls and basic rules here.</p>
-        </div>
-    </main>
-    
-    <!-- Include the shared high score system -->
-    <script src="/js/main.js"></script>
-    <!-- Include your game script -->
-    <script src="game.js"></script>
-</body>
-</html>
-"""
+    # Draw a thumbnail card; thumbnail_generator.py redraws it if the title changes
+    thumbnail_generator.generate_thumbnails([{"id": game_id, "title": title, "category": category}], "images", 1)
     
-    with open(os.path.join(game_dir, "index.html"), "w") as f:
-        f.write(html_content)
-    
-    # Create JavaScript file
-    js_content = f"""// {title} Game
-// Created: {datetime.now().strftime('%Y-%m-%d')}
-
-// Game configuration
-const CONFIG = {{
-    // Game-specific settings
-    gameId: '{game_id}',
-    title: '{title}',
-    difficulty: 'medium'
-}};
-
-// Game state
-let gameState = {{
-    // Variables to track game state
-    score: 0,
-    isRunning: false,
-    level: 1
-}};
-
-// Game initialization
-function initGame() {{
-    console.log('Initializing {title}...');
-    // Setup code
-    
-    // Add event listeners
-    document.addEventListener('keydown', handleInput);
-    
-    // Start the game
-    startGame();
-}}
-
-// Start the game
-function startGame() {{
-    gameState.isRunning = true;
-    gameState.score = 0;
-    gameState.level = 1;
-    
-    // Start the game loop
-    requestAnimationFrame(gameLoop);
-}}
-
-// Main game loop
-function gameLoop() {{
-    if (!gameState.isRunning) return;
-    
-    update();
-    render();
-    
-    requestAnimationFrame(gameLoop);
-}}
-
-// Update game state
-function update() {{
-    // Update logic
-}}
-
-// Render game
-function render() {{
-    // Drawing code
-}}
-
-// Event handlers
-function handleInput(event) {{
-    // Input handling
-    console.log('Key pressed:', event.key);
-}}
-
-// High score integration
-function checkHighScore(score) {{
-    if (HighScores.isHighScore(CONFIG.gameId, score)) {{
-        HighScores.showHighScoreForm(CONFIG.gameId, score);
-    }}
-}}
-
-// Initialize the game when the page loads
-window.addEventListener('load', initGame);
-"""
+    print(f"✓ Game scaffold created successfully in {game_dir}")
+    print(f"✓ Thumbnail created at: images/{game_id}.png")
     
-    with open(os.path.join(game_dir, "game.js"), "w") as f:
-        f.write(js_content)
-    
-    # Create CSS file
-    css_content = f"""/* Styles for {title} */
-
-#game-container {{
-    width: 100%;
-    max-width: 800px;
-    height: 500px;
-    margin: 0 auto;
-    background-color: #f0f0f0;
-    border: 2px solid #333;
-    border-radius: 8px;
-    position: relative;
-    overflow: hidden;
-}}
-
-.controls-info {{
-    max-width: 800px;
-    margin: 20px auto;
-    padding: 15px;
-    background-color: #fff;
-    border-radius: 8px;
-    box-shadow: 0 2px 4px rgba(0,0,0,0.1);
-}}
-
-/* Add your game-specific styles below */
-"""
+    return True
+
+
+def load_scaffold_manifest(manifest_path, games_dir="games"):
+    """
+    Load and validate a batch scaffolding manifest.
     
-    with open(os.path.join(game_dir, "style.css"), "w") as f:
-        f.write(css_content)
+    The manifest is either a JSON list of objects or a CSV file with a
+    header row; both need game_id (or id), title and category fields.
+    Every entry is validated before any directory is created.
     
-    # Create placeholder for thumbnail
-    placeholder_dir = "images"
-    os.makedirs(placeholder_dir, exist_ok=True)
+    Args:
+        manifest_path (str): Path to the .json or .csv manifest
+        games_dir (str): Directory the games will be created in
     
-    # We're not creating an actual image here, just noting that it's needed
-    print(f"✓ Game scaffold created successfully in {game_dir}")
-    print(f"! Don't forget to add a thumbnail image at: images/{game_id}.jpg")
+    Returns:
+        list: Validated (game_id, title, category) tuples, or None if invalid
+    """
+    try:
+        with open(manifest_path, "r", newline="") as f:
+            if manifest_path.lower().endswith(".csv"):
+                rows = list(csv.DictReader(f))
+            else:
+                rows = json.load(f)
+                if isinstance(rows, dict):
+                    rows = rows.get("games")
+    except FileNotFoundError:
+        print(f"Error: manifest {manifest_path} not found")
+        return None
+    except (ValueError, csv.Error) as e:
+        print(f"Error: manifest {manifest_path} could not be parsed: {e}")
+        return None
+    
+    if not isinstance(rows, list):
+        print("Error: manifest must be a list of games")
+        return None
+    
+    games = []
+    errors = []
+    seen_ids = set()
+    for position, row in enumerate(rows, start=1):
+        if not isinstance(row, dict):
+            errors.append(f"entry {position} is not an object")
+            continue
+        game_id = (row.get("game_id") or row.get("id") or "").strip()
+        title = (row.get("title") or "").strip()
+        category = (row.get("category") or "").strip()
+        if not game_id or not title or not category:
+            errors.append(f"entry {position} needs game_id, title and category")
+        elif category not in CATEGORIES:
+            errors.append(f"entry {position} ({game_id}) has invalid category '{category}'")
+        elif game_id in seen_ids:
+            errors.append(f"entry {position} duplicates game id '{game_id}'")
+        elif os.path.exists(os.path.join(games_dir, game_id)):
+            errors.append(f"entry {position}: game directory {os.path.join(games_dir, game_id)} already exists")
+        else:
+            seen_ids.add(game_id)
+            games.append((game_id, title, category))
+    
+    if errors:
+        for error in errors:
+            print(f"Error: {error}")
+        return None
+    return games
+
+
+def _create_scaffold_timed(game_dir, game_id, title, category, created):
+    """Render and write one scaffold, returning a summary record."""
+    started = time.perf_counter()
+    record = {"game_id": game_id, "path": game_dir, "ok": True}
+    try:
+        write_scaffold(game_dir, *render_scaffold(game_id, title, created, category))
+    except (OSError, scaffold_templates.TemplatePackError) as e:
+        record["ok"] = False
+        record["error"] = str(e)
+    record["seconds"] = round(time.perf_counter() - started, 6)
+    return record
+
+
+def create_game_scaffolds_batch(manifest_path, games_dir="games", workers=None, images_dir="images"):
+    """
+    Create every game scaffold listed in a manifest using a thread pool.
     
-    return True
+    The thumbnail cards of the created games are drawn afterwards, in
+    worker processes (see thumbnail_generator.generate_thumbnails).
+    
+    Args:
+        manifest_path (str): Path to the .json or .csv manifest
+        games_dir (str): Directory to create the games in
+        workers (int, optional): Number of worker threads (and thumbnail processes)
+        images_dir (str): Directory to write the thumbnails to
+    
+    Returns:
+        dict: Summary with per-game timing, or None if the manifest is invalid
+    """
+    games = load_scaffold_manifest(manifest_path, games_dir)
+    if games is None:
+        return None
+    
+    created = datetime.now().strftime('%Y-%m-%d')
+    started = time.perf_counter()
+    os.makedirs(games_dir, exist_ok=True)
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        results = list(executor.map(
+            lambda game: _create_scaffold_timed(os.path.join(games_dir, game[0]), *game, created),
+            games))
+    
+    created_games = [{"id": game_id, "title": title, "category": category}
+                     for (game_id, title, category), result in zip(games, results) if result["ok"]]
+    thumbnails = thumbnail_generator.generate_thumbnails(created_games, images_dir, workers)
+    
+    return {
+        "total": len(results),
+        "created": sum(1 for r in results if r["ok"]),
+        "failed": sum(1 for r in results if not r["ok"]),
+        "thumbnails": thumbnails["rendered"],
+        "seconds": round(time.perf_counter() - started, 6),
+        "games": results,
+    }
+
+
+def refresh_search_index(registry_path=game_registry.REGISTRY_PATH,
+                         index_html_path=game_registry.INDEX_HTML_PATH):
+    """
+    Bring the search index next to index.html up to date with the registry.
+    
+    Nothing is done for sites without a search/ index.
+    
+    Args:
+        registry_path (str): Path to the registry store
+        index_html_path (str): Path to index.html
+    """
+    directory = os.path.join(os.path.dirname(index_html_path), "search")
+    if not os.path.exists(os.path.join(directory, game_search_index.META_FILE)):
+        return
+    summary = game_search_index.build_from_registry(registry_path, directory)
+    print(f"✓ Search index updated ({summary['shards']} shard(s) written)")
 
 
-def update_game_registry(game_id, title, description, category, tags=None):
+def update_game_registry(game_id, title, description, category, tags=None,
+                         registry_path=game_registry.REGISTRY_PATH,
+                         index_html_path=game_registry.INDEX_HTML_PATH):
     """
-    Update the game registry in index.html with a new game entry.
+    Update the game registry with a new or changed game entry.
+    
+    The entry is upserted into the registry store and the games array in
+    index.html is regenerated from it, so registering an existing game id
+    updates that game instead of adding a duplicate.
     
     Args:
         game_id (str): The unique identifier for the game
@@ -214,6 +261,8 @@ def update_game_registry(game_id, title, description, category, tags=None):
         description (str): Short description of the game
         category (str): The primary category
         tags (list): List of tags for the game
+        registry_path (str): Path to the registry store
+        index_html_path (str): Path to index.html
     
     Returns:
         bool: True if successful, False otherwise
@@ -221,81 +270,252 @@ def update_game_registry(game_id, title, description, category, tags=None):
     if tags is None:
         tags = []
     
-    # Read the current index.html file
+    entry = game_registry.make_game_entry(game_id, title, description, category, tags)
+    # Let the registry keep a hand-set image of an existing game
+    del entry["image"]
     try:
-        with open("../index.html", "r") as f:
-            content = f.read()
+        counts = game_registry.register_games([{"op": "upsert", "game": entry}],
+                                              registry_path, index_html_path)
     except FileNotFoundError:
         print("Error: index.html not found")
         return False
+    except game_registry.RegistryError as e:
+        print(f"Error: {e}")
+        return False
+    
+    if counts["updated"] and not counts["added"]:
+        print(f"✓ Game '{title}' updated in the registry in index.html")
+    else:
+        print(f"✓ Game '{title}' added to the registry in index.html")
+    refresh_search_index(registry_path, index_html_path)
+    return True
+
+
+def load_registry_manifest(manifest_path):
+    """
+    Load and validate a batch registration manifest.
+    
+    The manifest is a JSON list of games (or an object with a "games" list),
+    each with id, title, description, category and optional tags.
+    
+    Args:
+        manifest_path (str): Path to the manifest file
     
-    # Check if games array exists in Alpine.js data
-    if "games: [" not in content:
-        print("Error: games array not found in index.html")
+    Returns:
+        list: Registry entries, or None if the manifest is invalid
+    """
+    try:
+        with open(manifest_path, "r") as f:
+            manifest = json.load(f)
+    except FileNotFoundError:
+        print(f"Error: manifest {manifest_path} not found")
+        return None
+    except ValueError as e:
+        print(f"Error: manifest {manifest_path} is not valid JSON: {e}")
+        return None
+    
+    if isinstance(manifest, dict):
+        manifest = manifest.get("games")
+    if not isinstance(manifest, list):
+        print("Error: manifest must be a list of games")
+        return None
+    
+    entries = []
+    errors = []
+    seen_ids = set()
+    for position, game in enumerate(manifest, start=1):
+        if not isinstance(game, dict):
+            errors.append(f"entry {position} is not an object")
+            continue
+        missing = [key for key in ("id", "title", "description", "category") if not game.get(key)]
+        if missing:
+            errors.append(f"entry {position} is missing: {', '.join(missing)}")
+            continue
+        if game["category"] not in CATEGORIES:
+            errors.append(f"entry {position} ({game['id']}) has invalid category '{game['category']}'")
+            continue
+        if game["id"] in seen_ids:
+            errors.append(f"entry {position} duplicates game id '{game['id']}'")
+            continue
+        seen_ids.add(game["id"])
+        entry = game_registry.make_game_entry(
+            game["id"], game["title"], game["description"], game["category"],
+            game.get("tags", []), game.get("image"))
+        if not game.get("image"):
+            # Let the registry keep a hand-set image of an existing game
+            del entry["image"]
+        entries.append(entry)
+    
+    if errors:
+        for error in errors:
+            print(f"Error: {error}")
+        return None
+    return entries
+
+
+def register_games_batch(manifest_path,
+                         registry_path=game_registry.REGISTRY_PATH,
+                         index_html_path=game_registry.INDEX_HTML_PATH):
+    """
+    Register every game in a manifest with a single rewrite of index.html.
+    
+    Args:
+        manifest_path (str): Path to the JSON manifest
+        registry_path (str): Path to the registry store
+        index_html_path (str): Path to index.html
+    
+    Returns:
+        bool: True if successful, False otherwise
+    """
+    entries = load_registry_manifest(manifest_path)
+    if entries is None:
         return False
     
-    # Create new game object in Alpine.js format
-    game_entry = f"""            {{ 
-                id: '{game_id}', 
-                title: '{title}', 
-                description: '{description}', 
-                image: 'images/{game_id}.jpg',
-                category: '{category}',
-                tags: {json.dumps(tags).replace('"', "'")}
-            }}"""
-    
-    # Find the position to insert the new game
-    games_start = content.find("games: [")
-    if games_start == -1:
-        print("Error: Could not find games array in index.html")
+    try:
+        counts = game_registry.register_games([{"op": "upsert", "game": entry} for entry in entries],
+                                              registry_path, index_html_path)
+    except FileNotFoundError:
+        print("Error: index.html not found")
+        return False
+    except game_registry.RegistryError as e:
+        print(f"Error: {e}")
         return False
     
-    # Find the position after the opening bracket
-    games_content_start = games_start + len("games: [")
+    print(f"✓ Registered {len(entries)} games "
+          f"({counts['added']} added, {counts['updated']} updated) in index.html")
+    refresh_search_index(registry_path, index_html_path)
+    return True
+
+
+def remove_game_from_registry(game_id,
+                              registry_path=game_registry.REGISTRY_PATH,
+                              index_html_path=game_registry.INDEX_HTML_PATH):
+    """
+    Remove a game from the registry and from index.html.
     
-    # Add a comma after the new entry if there are existing games
-    if content[games_content_start:].strip():
-        game_entry = game_entry + ","
+    Args:
+        game_id (str): The unique identifier for the game
+        registry_path (str): Path to the registry store
+        index_html_path (str): Path to index.html
     
-    # Create the new content
-    new_content = content[:games_content_start] + "\n" + game_entry + content[games_content_start:]
+    Returns:
+        bool: True if successful, False otherwise
+    """
+    try:
+        counts = game_registry.register_games([{"op": "remove", "id": game_id}],
+                                              registry_path, index_html_path)
+    except FileNotFoundError:
+        print("Error: index.html not found")
+        return False
+    except game_registry.RegistryError as e:
+        print(f"Error: {e}")
+        return False
     
-    # Write the updated content back to the file
-    with open("../index.html", "w") as f:
-        f.write(new_content)
+    if counts["missing"]:
+        print(f"Error: Game '{game_id}' is not in the registry")
+        return False
     
-    print(f"✓ Game '{title}' added to the registry in index.html")
+    print(f"✓ Game '{game_id}' removed from the registry in index.html")
+    refresh_search_index(registry_path, index_html_path)
     return True
 
 
+def _instrumented_phases():
+    """Functions timed as phases by --timings."""
+    this = sys.modules[__name__]
+    return [
+        ("read manifest", this, "load_scaffold_manifest"),
+        ("read manifest", this, "load_registry_manifest"),
+        ("render template", scaffold_templates, "render_pack"),
+        ("write files", this, "write_scaffold"),
+        ("draw thumbnails", thumbnail_generator, "write_thumbnails"),
+        ("refresh scaffolds", scaffold_templates, "refresh_game"),
+        ("queue operations", game_registry, "enqueue_operations"),
+        ("read registry", game_registry, "load_registry"),
+        ("apply changes", game_registry.GameRegistry, "apply"),
+        ("render index.html", game_registry, "render_games_array"),
+        ("write index.html", game_registry, "write_index_html"),
+        ("checkpoint registry", game_registry.GameRegistry, "checkpoint"),
+        ("update search index", game_search_index, "build_index"),
+    ]
+
+
 def main():
     """Main entry point for the script."""
     parser = argparse.ArgumentParser(description="Game Helper Tool for Arcade Hub")
+    instrumentation.add_arguments(parser)
     subparsers = parser.add_subparsers(dest="command", help="Command to run")
     
     # Create game scaffold command
     create_parser = subparsers.add_parser("create", help="Create a new game scaffold")
     create_parser.add_argument("game_id", help="Unique identifier for the game (used for directory name)")
     create_parser.add_argument("title", help="Display title of the game")
-    create_parser.add_argument("category", choices=["arcade", "puzzle", "strategy", "educational"], 
+    create_parser.add_argument("category", choices=CATEGORIES, 
                               help="Primary category of the game")
+    create_parser.add_argument("--pack", help="Template pack to use (defaults to the category's pack)")
+    
+    # Refresh scaffolds command
+    refresh_parser = subparsers.add_parser("refresh", help="Re-render game scaffolds after a template change")
+    refresh_parser.add_argument("--games-dir", default="games", help="Directory containing the games")
+    refresh_parser.add_argument("--force", action="store_true", help="Also overwrite files that were edited by hand")
+    
+    # Create scaffolds from a manifest command
+    batch_parser = subparsers.add_parser("create-batch", help="Create game scaffolds from a JSON or CSV manifest")
+    batch_parser.add_argument("manifest", help="Manifest file (.json list or .csv with game_id,title,category)")
+    batch_parser.add_argument("--games-dir", default="games", help="Directory to create the games in")
+    batch_parser.add_argument("--workers", type=int, help="Number of worker threads")
+    batch_parser.add_argument("--images-dir", default="images", help="Directory to write the thumbnails to")
     
     # Register game command
-    register_parser = subparsers.add_parser("register", help="Register a game in the main.js registry")
-    register_parser.add_argument("game_id", help="Unique identifier for the game")
-    register_parser.add_argument("title", help="Display title of the game")
-    register_parser.add_argument("description", help="Short description of the game")
-    register_parser.add_argument("category", choices=["arcade", "puzzle", "strategy", "educational"], 
+    register_parser = subparsers.add_parser("register", help="Register or update a game in the registry")
+    register_parser.add_argument("game_id", nargs="?", help="Unique identifier for the game")
+    register_parser.add_argument("title", nargs="?", help="Display title of the game")
+    register_parser.add_argument("description", nargs="?", help="Short description of the game")
+    register_parser.add_argument("category", nargs="?", choices=CATEGORIES, 
                                help="Primary category of the game")
     register_parser.add_argument("--tags", nargs="+", default=[], 
                                help="Tags for the game (space-separated)")
+    register_parser.add_argument("--batch", metavar="MANIFEST",
+                               help="Register every game in a JSON manifest in a single pass")
+    
+    # Remove game command
+    remove_parser = subparsers.add_parser("remove", help="Remove a game from the registry")
+    remove_parser.add_argument("game_id", help="Unique identifier for the game")
     
     args = parser.parse_args()
     
+    with instrumentation.instrument(args, "game_helper", _instrumented_phases()):
+        run_command(args, parser, register_parser)
+
+
+def run_command(args, parser, register_parser):
+    """Run the command selected on the command line."""
     if args.command == "create":
-        create_game_scaffold(args.game_id, args.title, args.category)
+        create_game_scaffold(args.game_id, args.title, args.category, args.pack)
+    elif args.command == "refresh":
+        summary = scaffold_templates.refresh_games(args.games_dir, force=args.force)
+        for path in summary["written"]:
+            print(f"✓ Updated {path}")
+        for path in summary["modified"]:
+            print(f"! Skipped {path} (edited by hand, use --force to overwrite)")
+        print(f"Refreshed {summary['games']} games: {len(summary['written'])} files written, "
+              f"{summary['unchanged']} unchanged")
+    elif args.command == "create-batch":
+        summary = create_game_scaffolds_batch(args.manifest, args.games_dir, args.workers, args.images_dir)
+        if summary is None:
+            sys.exit(1)
+        print(json.dumps(summary, indent=2))
+        if summary["failed"]:
+            sys.exit(1)
     elif args.command == "register":
-        update_game_registry(args.game_id, args.title, args.description, args.category, args.tags)
+        if args.batch:
+            register_games_batch(args.batch)
+        elif not (args.game_id and args.title and args.description and args.category):
+            register_parser.error("game_id, title, description and category are required without --batch")
+        else:
+            update_game_registry(args.game_id, args.title, args.description, args.category, args.tags)
+    elif args.command == "remove":
+        remove_game_from_registry(args.game_id)
     else:
         parser.print_help()
 
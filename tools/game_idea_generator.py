@@ -6,117 +6,290 @@ This script generates game ideas using AI assistance.
 Currently a placeholder for future development.
 """
 
+import io
 import os
+import sys
 import json
+import time
+import heapq
 import random
+import tarfile
 import argparse
+from array import array
 from datetime import datetime
 
+import instrumentation
+import proposal_dedupe
+from concept_catalog import Concept, ConceptCatalog, DEFAULT_CATALOG_PATH
+from proposal_dedupe import DedupeFilter, ProposalIndex, DEFAULT_THRESHOLD
+from concept_synthesis import synthesize_game_ideas
+
+
+# Game concepts live in tools/data/game_concepts.jsonl and are only read
+# (memory-mapped, one concept at a time) when first used
+GAME_CONCEPTS = ConceptCatalog(DEFAULT_CATALOG_PATH)
+
+
+# Map user-facing complexity levels to concept difficulty
+COMPLEXITY_TO_DIFFICULTY = {
+    "simple": "easy",
+    "medium": "medium",
+    "complex": "hard"
+}
+
+# Most concepts that synthesis recombines in one run
+MAX_SYNTHESIS_SOURCES = 200
+
+
+class AliasTable:
+    """
+    Walker/Vose alias table for O(1) weighted sampling.
+    
+    Building the table is O(n); every sample after that costs one random
+    number and one comparison, independent of the number of items.
+    """
+    
+    def __init__(self, items, weights):
+        self.items = items
+        count = len(items)
+        total = float(sum(weights))
+        if count == 0 or total <= 0:
+            raise ValueError("alias table needs at least one positive weight")
+        
+        scaled = [w * count / total for w in weights]
+        self.probability = array("d", [0.0]) * count
+        self.alias = array("I", [0]) * count
+        small = [i for i, p in enumerate(scaled) if p < 1.0]
+        large = [i for i, p in enumerate(scaled) if p >= 1.0]
+        while small and large:
+            low, high = small.pop(), large.pop()
+            self.probability[low] = scaled[low]
+            self.alias[low] = high
+            scaled[high] -= 1.0 - scaled[low]
+            (small if scaled[high] < 1.0 else large).append(high)
+        for i in small + large:
+            self.probability[i] = 1.0
+    
+    def __len__(self):
+        return len(self.items)
+    
+    def sample(self, rng=random):
+        """Draw one item using the given random number generator."""
+        u = rng.random() * len(self.items)
+        column = int(u)
+        if u - column < self.probability[column]:
+            return self.items[column]
+        return self.items[self.alias[column]]
+
+
+class ConceptIndex:
+    """
+    Precomputed (category, difficulty, tag) index over a concept catalog.
+    
+    Every concept is registered under each combination of its category,
+    difficulty and tags, with None acting as a wildcard, so a filtered
+    lookup is a single dict access. For an on-disk ConceptCatalog the
+    combinations are resolved from its index columns the first time they
+    are queried instead. Alias tables for each combination are built on
+    first use and reused for every later draw; catalogs where every weight
+    is 1 are sampled uniformly without a table.
+    """
+    
+    def __init__(self, concepts):
+        self.concepts = concepts
+        self._positions = {}
+        self._tables = {}
+        self._is_catalog = isinstance(concepts, ConceptCatalog)
+        if self._is_catalog:
+            return
+        
+        for position, concept in enumerate(concepts):
+            tags = [None] + list(concept.get("tags", []))
+            for category in (None, concept["category"]):
+                for difficulty in (None, concept["difficulty"]):
+                    for tag in tags:
+                        self._positions.setdefault((category, difficulty, tag), []).append(position)
+    
+    def _matching(self, key):
+        positions = self._positions.get(key)
+        if positions is None:
+            if not self._is_catalog:
+                return ()
+            positions = self._positions[key] = self.concepts.positions(*key)
+        return positions
+    
+    def _weight(self, position):
+        if self._is_catalog:
+            return self.concepts.weight(position)
+        return self.concepts[position].get("weight", 1.0)
+    
+    def count(self, category=None, difficulty=None, tag=None):
+        """Return the number of concepts matching the filters."""
+        return len(self._matching((category, difficulty, tag)))
+
+    def matching(self, category=None, difficulty=None, tag=None):
+        """Return every concept matching the filters, in catalog order."""
+        return [self.concepts[p] for p in self._matching((category, difficulty, tag))]
+    
+    def _table(self, key):
+        if key not in self._tables:
+            positions = self._matching(key)
+            if self._is_catalog and self.concepts.uniform_weights:
+                self._tables[key] = None
+            else:
+                self._tables[key] = AliasTable(positions, [self._weight(p) for p in positions])
+        return self._tables[key]
+    
+    def sample(self, category=None, difficulty=None, tag=None, rng=random):
+        """
+        Draw one concept matching the filters, weighted by its "weight".
+        
+        Returns:
+            dict: The concept, or None if nothing matches
+        """
+        key = (category, difficulty, tag)
+        positions = self._matching(key)
+        if not positions:
+            return None
+        table = self._table(key)
+        if table is None:
+            return self.concepts[positions[int(rng.random() * len(positions))]]
+        return self.concepts[table.sample(rng)]
+    
+    def sample_many(self, count, category=None, difficulty=None, tag=None, rng=random):
+        """
+        Draw up to `count` distinct concepts matching the filters.
+        
+        Uses weighted random keys (Efraimidis-Spirakis), so each draw
+        without replacement respects the concept weights.
+        
+        Returns:
+            list: The sampled concepts, at most as many as match
+        """
+        positions = [p for p in self._matching((category, difficulty, tag)) if self._weight(p) > 0]
+        if count >= len(positions):
+            chosen = list(positions)
+            rng.shuffle(chosen)
+        else:
+            keyed = ((rng.random() ** (1.0 / self._weight(p)), p) for p in positions)
+            chosen = [p for _, p in heapq.nlargest(count, keyed)]
+        return [self.concepts[p] for p in chosen]
+
+
+_concept_index = None
+
+
+def get_concept_index(concepts=None):
+    """
+    Return the index for a concept catalog, building it on first use.
+    
+    Args:
+        concepts (Sequence, optional): The catalog to index (defaults to GAME_CONCEPTS)
+    
+    Returns:
+        ConceptIndex: The index
+    """
+    global _concept_index
+    if concepts is None:
+        concepts = GAME_CONCEPTS
+    if _concept_index is None or _concept_index.concepts is not concepts \
+            or len(_concept_index.concepts) != _concept_index.count():
+        _concept_index = ConceptIndex(concepts)
+    return _concept_index
+
+
+def _as_dict(concept):
+    """Return a concept as a plain dict (catalog records are slotted objects)."""
+    return concept.to_dict() if isinstance(concept, Concept) else concept
 
-# Sample game concepts to demonstrate functionality
-GAME_CONCEPTS = [
-    {
-        "title": "Color Matcher",
-        "category": "puzzle",
-        "description": "Match falling colored blocks to create patterns and score points.",
-        "mechanics": [
-            "Colored blocks fall from the top of the screen",
-            "Player can move and rotate blocks",
-            "Matching 3 or more blocks of the same color removes them",
-            "Creating patterns yields bonus points"
-        ],
-        "difficulty": "medium",
-        "tags": ["puzzle", "matching", "casual"]
-    },
-    {
-        "title": "Space Defender",
-        "category": "arcade",
-        "description": "Defend your planet from waves of alien invaders.",
-        "mechanics": [
-            "Player controls a spaceship at the bottom of the screen",
-            "Aliens move in patterns and shoot projectiles",
-            "Power-ups appear randomly",
-            "Increasing difficulty with each wave"
-        ],
-        "difficulty": "medium",
-        "tags": ["arcade", "shooter", "retro"]
-    },
-    {
-        "title": "Word Wizard",
-        "category": "educational",
-        "description": "Form words from letter tiles to cast spells and defeat enemies.",
-        "mechanics": [
-            "Letter tiles appear on a grid",
-            "Player forms words by connecting adjacent letters",
-            "Longer words create more powerful spells",
-            "Enemies attack based on a timer"
-        ],
-        "difficulty": "hard",
-        "tags": ["educational", "word", "strategy"]
-    },
-    {
-        "title": "Resource Empire",
-        "category": "strategy",
-        "description": "Build and manage a resource empire, balancing production and consumption.",
-        "mechanics": [
-            "Players start with basic resources",
-            "Build structures to convert resources",
-            "Manage supply chains and efficiency",
-            "Compete against AI opponents for limited resources"
-        ],
-        "difficulty": "hard",
-        "tags": ["strategy", "management", "simulation"]
-    },
-    {
-        "title": "Rhythm Runner",
-        "category": "arcade",
-        "description": "Run, jump, and slide to the beat of the music.",
-        "mechanics": [
-            "Character automatically runs forward",
-            "Player must time jumps and slides to the music",
-            "Obstacles appear in rhythm with the beat",
-            "Score multiplier increases with successful timing"
-        ],
-        "difficulty": "medium",
-        "tags": ["arcade", "music", "rhythm"]
-    }
-]
 
+def _filters(category, complexity):
+    """Translate the public filters into an index key."""
+    return category or None, COMPLEXITY_TO_DIFFICULTY.get(complexity) if complexity else None
 
-def generate_game_idea(category=None, complexity=None):
+
+def generate_game_idea(category=None, complexity=None, tag=None, seed=None, rng=None):
     """
     Generate a game idea based on optional filters.
     
     Args:
         category (str, optional): Filter by game category
         complexity (str, optional): Filter by game complexity
+        tag (str, optional): Filter by tag
+        seed (int, optional): Seed for a reproducible pick
+        rng (random.Random, optional): Random number generator to draw from
     
     Returns:
         dict: A game idea concept
     """
-    # Filter game concepts based on category and complexity
-    filtered_concepts = GAME_CONCEPTS
-    
-    if category:
-        filtered_concepts = [c for c in filtered_concepts if c["category"] == category]
+    if rng is None:
+        rng = random.Random(seed) if seed is not None else random
+    index = get_concept_index()
+    category, difficulty = _filters(category, complexity)
     
-    if complexity:
-        # Map complexity to difficulty
-        difficulty_map = {
-            "simple": "easy",
-            "medium": "medium",
-            "complex": "hard"
-        }
-        difficulty = difficulty_map.get(complexity, None)
-        if difficulty:
-            filtered_concepts = [c for c in filtered_concepts if c["difficulty"] == difficulty]
+    idea = index.sample(category, difficulty, tag, rng)
     
     # If no concepts match the filters, return a random one from all concepts
-    if not filtered_concepts:
-        return random.choice(GAME_CONCEPTS)
+    if idea is None:
+        idea = index.sample(rng=rng)
+    return _as_dict(idea)
+
+
+def sample_game_ideas(count, category=None, complexity=None, tag=None, seed=None, rng=None):
+    """
+    Generate several distinct game ideas (sampling without replacement).
     
-    # Return a random concept from the filtered list
-    return random.choice(filtered_concepts)
+    Args:
+        count (int): Number of ideas to generate
+        category (str, optional): Filter by game category
+        complexity (str, optional): Filter by game complexity
+        tag (str, optional): Filter by tag
+        seed (int, optional): Seed for a reproducible selection
+        rng (random.Random, optional): Random number generator to draw from
+    
+    Returns:
+        list: Up to `count` game idea concepts
+    """
+    if rng is None:
+        rng = random.Random(seed) if seed is not None else random
+    index = get_concept_index()
+    category, difficulty = _filters(category, complexity)
+    
+    if not index.count(category, difficulty, tag):
+        category, difficulty, tag = None, None, None
+    return [_as_dict(idea) for idea in index.sample_many(count, category, difficulty, tag, rng)]
+
+
+def synthesize_ideas(count, category=None, complexity=None, tag=None, seed=None, workers=None):
+    """
+    Create new game ideas by recombining the mechanics of catalog concepts.
+    
+    Up to MAX_SYNTHESIS_SOURCES concepts matching the filters are drawn
+    (weighted) and their mechanics recombined; see concept_synthesis.
+    Novelty is measured against every concept matching the filters, not
+    only the drawn ones.
+    
+    Args:
+        count (int): Number of ideas to create
+        category (str, optional): Filter source concepts by category
+        complexity (str, optional): Filter source concepts by complexity
+        tag (str, optional): Filter source concepts by tag
+        seed (int, optional): Seed for a reproducible run
+        workers (int, optional): Worker processes for scoring
+    
+    Returns:
+        list: Up to `count` game ideas, best first
+    """
+    index = get_concept_index()
+    key = _filters(category, complexity) + (tag,)
+    sources = sample_game_ideas(MAX_SYNTHESIS_SOURCES, category, complexity, tag, seed)
+    if len(sources) < 2 or not index.count(*key):
+        # Nothing to recombine within the filters, so draw from the whole catalog
+        key = (None, None, None)
+        if len(sources) < 2:
+            sources = sample_game_ideas(MAX_SYNTHESIS_SOURCES, seed=seed)
+    catalog = [_as_dict(idea) for idea in index.matching(*key)]
+    return synthesize_game_ideas(sources, top_k=count, seed=seed, workers=workers, reference_concepts=catalog)
 
 
 def format_game_proposal(game_idea):
@@ -165,31 +338,57 @@ Casual gamers interested in {game_idea["category"]} games.
     return proposal
 
 
-def save_proposal(proposal, filename=None):
+def _create_unique_file(directory, stem, extension=".md"):
+    """
+    Create a new file without overwriting an existing one.
+    
+    Tries `stem + extension` first, then appends _1, _2, ... The file is
+    created with O_EXCL, so concurrent runs never pick the same name.
+    
+    Returns:
+        tuple: (path, file object opened for writing)
+    """
+    suffix = 0
+    while True:
+        name = f"{stem}{'_' + str(suffix) if suffix else ''}{extension}"
+        path = os.path.join(directory, name)
+        try:
+            fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o644)
+        except FileExistsError:
+            suffix += 1
+            continue
+        return path, os.fdopen(fd, "w")
+
+
+def save_proposal(proposal, filename=None, directory="proposals"):
     """
     Save a game proposal to a file.
     
     Args:
         proposal (str): The formatted proposal
         filename (str, optional): The filename to save to
+        directory (str, optional): The directory to save to
     
     Returns:
         str: The path to the saved file
     """
     # Create proposals directory if it doesn't exist
-    os.makedirs("proposals", exist_ok=True)
+    os.makedirs(directory, exist_ok=True)
     
-    # Generate filename if not provided
+    # Generate a collision-free filename if not provided
     if not filename:
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        filename = f"game_proposal_{timestamp}.md"
+        filepath, f = _create_unique_file(directory, f"game_proposal_{timestamp}")
+        with f:
+            f.write(proposal)
+        return filepath
     
     # Ensure filename has .md extension
     if not filename.endswith(".md"):
         filename += ".md"
     
     # Full path to the proposal file
-    filepath = os.path.join("proposals", filename)
+    filepath = os.path.join(directory, filename)
     
     # Write the proposal to the file
     with open(filepath, "w") as f:
@@ -198,20 +397,262 @@ def save_proposal(proposal, filename=None):
     return filepath
 
 
+def iter_game_ideas(count, category=None, complexity=None, tag=None, seed=None):
+    """
+    Lazily generate a stream of game ideas.
+    
+    Args:
+        count (int): Number of ideas to generate (None for an endless stream)
+        category (str, optional): Filter by game category
+        complexity (str, optional): Filter by game complexity
+        tag (str, optional): Filter by tag
+        seed (int, optional): Seed for a reproducible stream
+    
+    Yields:
+        dict: Game idea concepts
+    """
+    rng = random.Random(seed) if seed is not None else random
+    generated = 0
+    while count is None or generated < count:
+        yield generate_game_idea(category, complexity, tag, rng=rng)
+        generated += 1
+
+
+def iter_proposals(game_ideas):
+    """
+    Format a stream of game ideas as markdown proposals.
+    
+    Yields:
+        tuple: (game idea, formatted proposal)
+    """
+    for game_idea in game_ideas:
+        yield game_idea, format_game_proposal(game_idea)
+
+
+def _slugify(title):
+    """Turn a title into a file-name friendly slug."""
+    return "".join(c if c.isalnum() else "_" for c in title.lower()).strip("_") or "proposal"
+
+
+def write_proposals_to_directory(proposals, directory="proposals", on_write=None):
+    """
+    Write a stream of proposals as individual markdown files.
+    
+    File names combine the run timestamp, a sequence number and the title
+    slug, and are created exclusively, so runs never overwrite each other.
+    
+    Args:
+        proposals (iterable): (game idea, proposal) pairs
+        directory (str): The directory to write to
+        on_write (callable, optional): Called with (file name, game idea, proposal)
+            after each proposal is written
+    
+    Returns:
+        int: Number of proposals written
+    """
+    os.makedirs(directory, exist_ok=True)
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    written = 0
+    for game_idea, proposal in proposals:
+        stem = f"game_proposal_{timestamp}_{written:06d}_{_slugify(game_idea['title'])}"
+        path, f = _create_unique_file(directory, stem)
+        with f:
+            f.write(proposal)
+        written += 1
+        if on_write:
+            on_write(os.path.basename(path), game_idea, proposal)
+    return written
+
+
+def write_proposals_to_archive(proposals, archive_path, on_write=None):
+    """
+    Stream proposals into a single JSONL or tar archive.
+    
+    Proposals are written as they are generated, so memory use does not
+    grow with the number of proposals.
+    
+    Args:
+        proposals (iterable): (game idea, proposal) pairs
+        archive_path (str): Path ending in .jsonl, .tar, .tar.gz or .tgz
+        on_write (callable, optional): Called with (entry name, game idea, proposal)
+            after each proposal is written
+    
+    Returns:
+        int: Number of proposals written
+    """
+    directory = os.path.dirname(archive_path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    written = 0
+    
+    if archive_path.endswith(".jsonl"):
+        with open(archive_path, "w", buffering=1024 * 1024) as f:
+            for game_idea, proposal in proposals:
+                record = {
+                    "id": written,
+                    "title": game_idea["title"],
+                    "category": game_idea["category"],
+                    "proposal": proposal,
+                }
+                f.write(json.dumps(record) + "\n")
+                written += 1
+                if on_write:
+                    on_write(f"{archive_path}#{record['id']}", game_idea, proposal)
+        return written
+    
+    if archive_path.endswith((".tar.gz", ".tgz")):
+        mode = "w:gz"
+    elif archive_path.endswith(".tar"):
+        mode = "w"
+    else:
+        raise ValueError("archive must end in .jsonl, .tar, .tar.gz or .tgz")
+    
+    mtime = time.time()
+    with tarfile.open(archive_path, mode) as archive:
+        for game_idea, proposal in proposals:
+            data = proposal.encode("utf-8")
+            info = tarfile.TarInfo(f"game_proposal_{written:06d}_{_slugify(game_idea['title'])}.md")
+            info.size = len(data)
+            info.mtime = mtime
+            archive.addfile(info, io.BytesIO(data))
+            written += 1
+            if on_write:
+                on_write(f"{archive_path}#{info.name}", game_idea, proposal)
+    return written
+
+
+def generate_proposals(count, category=None, complexity=None, tag=None, seed=None,
+                       directory="proposals", archive_path=None,
+                       dedupe=False, threshold=DEFAULT_THRESHOLD, max_rerolls=20,
+                       synthesize=False, workers=None):
+    """
+    Generate, format and write `count` proposals in one streaming pass.
+    
+    Args:
+        count (int): Number of proposals to generate
+        category (str, optional): Filter by game category
+        complexity (str, optional): Filter by game complexity
+        tag (str, optional): Filter by tag
+        seed (int, optional): Seed for a reproducible run
+        directory (str): Directory for individual files (when no archive is given)
+        archive_path (str, optional): Write everything to this JSONL/tar archive instead
+        dedupe (bool): Re-roll proposals too similar to ones already in `directory`
+            (or earlier in this run)
+        threshold (float): Similarity at which a proposal counts as a duplicate
+        max_rerolls (int): Give up after this many duplicates in a row
+        synthesize (bool): Recombine mechanics into new ideas instead of
+            picking existing concepts
+        workers (int, optional): Worker processes for synthesis
+    
+    Returns:
+        dict: Number written and rejected, destination, elapsed seconds and
+        proposals per second
+    """
+    started = time.perf_counter()
+    on_write = None
+    dedupe_filter = None
+    if dedupe:
+        # Archive runs check against the directory but don't add to its index
+        index = ProposalIndex(directory, persist=not archive_path)
+        index.sync()
+        dedupe_filter = DedupeFilter(index, threshold, max_rerolls)
+        on_write = dedupe_filter.record
+    
+    if synthesize:
+        game_ideas = synthesize_ideas(count, category, complexity, tag, seed, workers)
+    else:
+        game_ideas = iter_game_ideas(None if dedupe else count, category, complexity, tag, seed)
+    proposals = iter_proposals(game_ideas)
+    if dedupe_filter:
+        proposals = dedupe_filter.filter(proposals, count)
+    
+    if archive_path:
+        written = write_proposals_to_archive(proposals, archive_path, on_write)
+    else:
+        written = write_proposals_to_directory(proposals, directory, on_write)
+    elapsed = time.perf_counter() - started
+    return {
+        "count": written,
+        "rejected": dedupe_filter.rejected if dedupe_filter else 0,
+        "destination": archive_path or directory,
+        "seconds": elapsed,
+        "per_second": written / elapsed if elapsed > 0 else float("inf"),
+    }
+
+
+def _instrumented_phases():
+    """Functions timed as phases by --timings."""
+    this = sys.modules[__name__]
+    return [
+        ("open concept catalog", this, "get_concept_index"),
+        ("pick ideas", this, "generate_game_idea"),
+        ("pick ideas", this, "sample_game_ideas"),
+        ("synthesize ideas", this, "synthesize_game_ideas"),
+        ("format proposals", this, "format_game_proposal"),
+        ("index existing proposals", ProposalIndex, "sync"),
+        ("hash proposals", proposal_dedupe, "minhash_signature"),
+        ("check duplicates", ProposalIndex, "find_similar"),
+        ("write files", this, "save_proposal"),
+        ("write files", this, "write_proposals_to_directory"),
+        ("write files", this, "write_proposals_to_archive"),
+    ]
+
+
 def main():
     """Main entry point for the script."""
     parser = argparse.ArgumentParser(description="Game Idea Generator for Arcade Hub")
+    instrumentation.add_arguments(parser)
     parser.add_argument("--category", choices=["arcade", "puzzle", "strategy", "educational"],
                        help="Filter by game category")
     parser.add_argument("--complexity", choices=["simple", "medium", "complex"],
                        help="Filter by game complexity")
+    parser.add_argument("--tag", help="Filter by tag")
+    parser.add_argument("--seed", type=int, help="Seed for a reproducible idea")
     parser.add_argument("--output", "-o", help="Output filename (defaults to timestamp)")
     parser.add_argument("--print", "-p", action="store_true", help="Print proposal to console")
+    parser.add_argument("--count", "-n", type=int, default=1, help="Number of proposals to generate")
+    parser.add_argument("--output-dir", default="proposals", help="Directory to write proposals to")
+    parser.add_argument("--archive", help="Write all proposals to one .jsonl, .tar or .tar.gz archive")
+    parser.add_argument("--dedupe", action="store_true",
+                       help="Re-roll proposals that are near-duplicates of existing ones")
+    parser.add_argument("--similarity", type=float, default=DEFAULT_THRESHOLD,
+                       help="Similarity (0-1) at which a proposal counts as a duplicate")
+    parser.add_argument("--synthesize", action="store_true",
+                       help="Recombine mechanics of existing concepts into new ideas")
+    parser.add_argument("--workers", type=int, help="Worker processes for --synthesize")
     
     args = parser.parse_args()
     
+    if args.count < 1:
+        parser.error("--count must be at least 1")
+    
+    with instrumentation.instrument(args, "game_idea_generator", _instrumented_phases()):
+        run(args, parser)
+
+
+def run(args, parser):
+    """Generate and save proposals as selected on the command line."""
+    # Stream many proposals straight to disk
+    if args.count > 1 or args.archive or args.dedupe:
+        try:
+            stats = generate_proposals(args.count, args.category, args.complexity, args.tag, args.seed,
+                                       args.output_dir, args.archive, args.dedupe, args.similarity,
+                                       synthesize=args.synthesize, workers=args.workers)
+        except ValueError as e:
+            parser.error(str(e))
+        print(f"Generated {stats['count']} proposals in {stats['seconds']:.2f}s "
+              f"({stats['per_second']:.0f} proposals/s) -> {stats['destination']}")
+        if args.dedupe:
+            print(f"Rejected {stats['rejected']} near-duplicate proposals")
+            if stats["count"] < args.count:
+                print("! Stopped early: no new ideas left that are different enough from existing proposals")
+        return
+    
     # Generate a game idea
-    game_idea = generate_game_idea(args.category, args.complexity)
+    game_ideas = []
+    if args.synthesize:
+        game_ideas = synthesize_ideas(1, args.category, args.complexity, args.tag, args.seed, args.workers)
+    game_idea = game_ideas[0] if game_ideas else generate_game_idea(args.category, args.complexity, args.tag, args.seed)
     
     # Format the idea as a proposal
     proposal = format_game_proposal(game_idea)
@@ -221,7 +662,7 @@ def main():
         print(proposal)
     
     # Save the proposal to a file
-    filepath = save_proposal(proposal, args.output)
+    filepath = save_proposal(proposal, args.output, args.output_dir)
     print(f"Game proposal saved to: {filepath}")
     
     print("\nNOTE: This is a placeholder implementation. Future versions will use AI to generate more creative and detailed game ideas.")
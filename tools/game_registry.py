@@ -0,0 +1,1050 @@
+#!/usr/bin/env python
+"""
+Game Registry Store for Arcade Hub
+
+This module keeps the game catalog in an append-only JSONL sidecar with an
+id -> (offset, length) index, so a single game can be looked up, added,
+updated or removed without touching the rest of the catalog. The Alpine.js
+`games` array in index.html is regenerated from this store.
+"""
+
+import os
+import re
+import json
+import time
+import uuid
+import fcntl
+import itertools
+import tempfile
+from contextlib import contextmanager
+
+import prerender
+
+
+# Default locations, relative to the tools directory (like index.html)
+INDEX_HTML_PATH = os.path.join("..", "index.html")
+REGISTRY_PATH = os.path.join("..", "data", "registry.jsonl")
+
+# Field order used when rendering entries into index.html
+GAME_FIELDS = ["id", "title", "description", "image", "category", "tags"]
+
+# Compact the log once dead records outweigh live ones by this factor
+COMPACT_RATIO = 2.0
+COMPACT_MIN_BYTES = 64 * 1024
+
+# Rewrite the index checkpoint in full once it holds this many times more
+# records than there are live games
+CHECKPOINT_RATIO = 2.0
+CHECKPOINT_MIN_RECORDS = 1024
+
+GAMES_ARRAY_MARKER = "games: ["
+# Sentinels around the entries of the games array, and the comment that
+# starts each entry, so single entries can be found without parsing the page
+GAMES_BEGIN = "/* registry:games */"
+GAMES_END = "/* /registry:games */"
+ENTRY_INDENT = " " * 12
+# Commits touching more games than this re-render the whole array
+INCREMENTAL_LIMIT = 64
+
+# How long the outcome of a batch committed on another caller's behalf is kept
+OUTCOME_TTL = 3600
+
+_FIELD_PATTERN = re.compile(r"(\w+)\s*:\s*('(?:[^'\\]|\\.)*'|\[[^\]]*\])", re.S)
+_STRING_PATTERN = re.compile(r"'((?:[^'\\]|\\.)*)'", re.S)
+
+
+class RegistryError(Exception):
+    """Raised when the registry store or index.html cannot be processed."""
+
+
+def index_path_for(registry_path):
+    """Return the path of the offset index that belongs to a registry log."""
+    root, _ = os.path.splitext(registry_path)
+    return root + ".idx.json"
+
+
+def journal_path_for(registry_path):
+    """Return the path of the pending-registration journal of a registry log."""
+    root, _ = os.path.splitext(registry_path)
+    return root + ".journal.jsonl"
+
+
+def rejected_path_for(registry_path):
+    """Return where journal records that could not be applied are kept."""
+    root, _ = os.path.splitext(registry_path)
+    return root + ".journal.rejected.jsonl"
+
+
+def outcomes_path_for(registry_path):
+    """Return where the outcomes of batches committed by other callers are kept."""
+    root, _ = os.path.splitext(registry_path)
+    return root + ".journal.outcomes.json"
+
+
+def atomic_write(path, content):
+    """
+    Replace a file's contents atomically.
+
+    The content is written to a temporary file in the same directory and
+    renamed over the target, so readers never see a half-written file.
+    The file keeps the target's permissions; new files are made readable
+    by everyone (0644), like files created with open().
+
+    Args:
+        path (str): The file to write
+        content (str): The new contents
+    """
+    directory = os.path.dirname(path) or "."
+    fd, temp_path = tempfile.mkstemp(dir=directory, prefix=".tmp-", suffix=os.path.basename(path))
+    try:
+        with os.fdopen(fd, "w") as f:
+            f.write(content)
+            f.flush()
+            os.fsync(f.fileno())
+        if os.path.exists(path):
+            os.chmod(temp_path, os.stat(path).st_mode & 0o777)
+        else:
+            os.chmod(temp_path, 0o644)
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+
+@contextmanager
+def file_lock(lock_path):
+    """
+    Hold an exclusive advisory lock on a lock file.
+
+    Args:
+        lock_path (str): Path to the lock file (created if missing)
+    """
+    os.makedirs(os.path.dirname(lock_path) or ".", exist_ok=True)
+    with open(lock_path, "a") as f:
+        fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+
+def make_game_entry(game_id, title, description, category, tags=None, image=None):
+    """
+    Build a registry entry with the fields used by index.html.
+
+    Args:
+        game_id (str): The unique identifier for the game
+        title (str): The display title of the game
+        description (str): Short description of the game
+        category (str): The primary category
+        tags (list): List of tags for the game
+        image (str, optional): Thumbnail path (defaults to images/<game_id>.png, see thumbnail_generator.py)
+
+    Returns:
+        dict: The registry entry
+    """
+    return {
+        "id": game_id,
+        "title": title,
+        "description": description,
+        "image": image or f"images/{game_id}.png",
+        "category": category,
+        "tags": list(tags or []),
+    }
+
+
+def empty_counts():
+    """Return a zeroed tally of registry operation outcomes."""
+    return {"added": 0, "updated": 0, "removed": 0, "missing": 0}
+
+
+class GameRegistry:
+    """
+    Id-indexed game catalog backed by an append-only JSONL log.
+
+    Every upsert or removal is appended to the log as one JSON line and the
+    in-memory index maps each live game id to the byte offset and length of
+    its latest record, so lookups and updates are O(1) regardless of catalog
+    size. The index is checkpointed to a sidecar `.idx.json` file; on load
+    only the part of the log written after the checkpoint is replayed.
+
+    The checkpoint is itself append-only: each line is a segment
+    `[log_size, entries]` listing the games changed since the previous
+    segment, as `[id, offset, length]` or `[id]` for a removal. It is
+    rewritten in full only after compaction or once it has grown well past
+    the number of live games.
+    """
+
+    def __init__(self, path=REGISTRY_PATH):
+        self.path = path
+        self.index_path = index_path_for(path)
+        self._index = {}
+        self._log_size = 0
+        self._live_bytes = 0
+        # Games changed since the last checkpoint, mapped to whether they
+        # were removed (and so may have moved to the end of the catalog)
+        self._dirty = {}
+        self._checkpoint_size = 0
+        self._checkpoint_records = 0
+        self._rewrite_checkpoint = True
+        self._load()
+
+    def _read_checkpoint(self):
+        """
+        Load the index checkpoint into the in-memory index.
+
+        Returns:
+            int: The log size the checkpoint covers (0 if there is none)
+        """
+        if not os.path.exists(self.index_path):
+            return 0
+        try:
+            with open(self.index_path, "r") as f:
+                lines = f.read().split("\n")
+            first = json.loads(lines[0])
+            if isinstance(first, dict):
+                # Checkpoint written by an older version, a single object
+                segments = [[first["log_size"], first["entries"]]]
+            else:
+                segments = [first]
+                for line in lines[1:]:
+                    if not line.strip():
+                        continue
+                    try:
+                        segments.append(json.loads(line))
+                    except ValueError:
+                        # A segment cut short by a crash, the log covers it
+                        break
+                else:
+                    self._rewrite_checkpoint = False
+
+            # The first segment is a full snapshot of the index
+            checkpoint_size, entries = segments[0]
+            self._index = {game_id: (offset, length) for game_id, offset, length in entries}
+            self._live_bytes = sum(length for _, length in self._index.values())
+            self._checkpoint_records = len(entries)
+            for checkpoint_size, entries in segments[1:]:
+                for entry in entries:
+                    game_id = entry[0]
+                    if len(entry) == 1:
+                        self._forget(game_id)
+                    else:
+                        self._forget(game_id, keep_position=True)
+                        self._index[game_id] = (entry[1], entry[2])
+                        self._live_bytes += entry[2]
+                self._checkpoint_records += len(entries)
+            return checkpoint_size
+        except (ValueError, KeyError, TypeError, IndexError):
+            # A damaged checkpoint is not fatal, the log is the source of truth
+            self._index.clear()
+            self._live_bytes = 0
+            self._checkpoint_records = 0
+            self._rewrite_checkpoint = True
+            return 0
+
+    def _load(self):
+        """Load the index checkpoint and replay the log tail."""
+        checkpoint_size = self._read_checkpoint()
+        self._checkpoint_size = checkpoint_size
+
+        if not os.path.exists(self.path):
+            self._log_size = 0
+            return
+
+        log_size = os.path.getsize(self.path)
+        if checkpoint_size > log_size:
+            # The log was replaced behind our back, rebuild from scratch
+            self._index.clear()
+            self._live_bytes = 0
+            checkpoint_size = 0
+            self._rewrite_checkpoint = True
+
+        with open(self.path, "rb") as f:
+            f.seek(checkpoint_size)
+            offset = checkpoint_size
+            for line in f:
+                self._apply(line, offset)
+                offset += len(line)
+        self._log_size = offset
+
+    def _apply(self, line, offset):
+        """Apply one log record to the in-memory index."""
+        if not line.strip():
+            return
+        try:
+            record = json.loads(line)
+        except ValueError:
+            raise RegistryError(f"Corrupt registry record at byte {offset} of {self.path}")
+
+        if record.get("op") == "remove":
+            self._forget(record["id"])
+            self._touch(record["id"], removed=True)
+        else:
+            game_id = record["game"]["id"]
+            self._touch(game_id, appended=game_id not in self._index)
+            self._forget(game_id, keep_position=True)
+            self._index[game_id] = (offset, len(line))
+            self._live_bytes += len(line)
+
+    def _touch(self, game_id, removed=False, appended=False):
+        """
+        Note a change to a game for the next checkpoint.
+
+        Games that are removed or added to the end of the catalog move to
+        the end of the dirty list, so replaying it appends them in order.
+        """
+        if removed or appended:
+            removed = self._dirty.pop(game_id, False) or removed
+            self._dirty[game_id] = removed
+        else:
+            self._dirty.setdefault(game_id, False)
+
+    def _forget(self, game_id, keep_position=False):
+        """Drop a game from the live byte count (and optionally the index)."""
+        location = self._index.get(game_id)
+        if location is None:
+            return
+        self._live_bytes -= location[1]
+        if not keep_position:
+            del self._index[game_id]
+
+    def _append(self, records):
+        """Append records to the log in one write and apply them to the index."""
+        lines = [(json.dumps(record, ensure_ascii=False) + "\n").encode("utf-8") for record in records]
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        with open(self.path, "ab") as f:
+            f.write(b"".join(lines))
+        for line in lines:
+            self._apply(line, self._log_size)
+            self._log_size += len(line)
+
+    def __len__(self):
+        return len(self._index)
+
+    def __contains__(self, game_id):
+        return game_id in self._index
+
+    def ids(self):
+        """Return the live game ids in registration order."""
+        return list(self._index)
+
+    def newest(self, count):
+        """Return the ids of the `count` most recently added games, newest first."""
+        return list(itertools.islice(reversed(self._index), count))
+
+    def get(self, game_id):
+        """
+        Look up a single game by id.
+
+        Args:
+            game_id (str): The unique identifier for the game
+
+        Returns:
+            dict: The registry entry, or None if the game is not registered
+        """
+        location = self._index.get(game_id)
+        if location is None:
+            return None
+        offset, length = location
+        with open(self.path, "rb") as f:
+            f.seek(offset)
+            return json.loads(f.read(length))["game"]
+
+    def upsert(self, game):
+        """
+        Add a game or replace the existing entry with the same id.
+
+        Updated games keep their position in the catalog.
+
+        Args:
+            game (dict): The registry entry (must contain an "id")
+
+        Returns:
+            bool: True if the game was new, False if it replaced an entry
+        """
+        if not game.get("id"):
+            raise RegistryError("Registry entries must have an id")
+        is_new = game["id"] not in self._index
+        self._append([{"op": "upsert", "game": game}])
+        return is_new
+
+    def remove(self, game_id):
+        """
+        Remove a game from the catalog.
+
+        Args:
+            game_id (str): The unique identifier for the game
+
+        Returns:
+            bool: True if the game was registered, False otherwise
+        """
+        if game_id not in self._index:
+            return False
+        self._append([{"op": "remove", "id": game_id}])
+        return True
+
+    def apply(self, operations, outcomes=None):
+        """
+        Apply a batch of upsert/remove operations with a single log write.
+
+        An upserted game without an "image" keeps the image of the entry it
+        replaces, or gets the generated card images/<id>.png if it is new.
+
+        Args:
+            operations (list): Records of the form {"op": "upsert", "game": {...}}
+                or {"op": "remove", "id": "..."}
+            outcomes (list, optional): Receives the outcome of each operation
+                in order: "added", "updated", "removed" or "missing" (a
+                removal of a game that is not registered)
+
+        Returns:
+            dict: Counts of added, updated, removed and missing games
+        """
+        counts = empty_counts()
+        if outcomes is None:
+            outcomes = []
+        records = []
+        # Games this batch upserted (or None if removed), on top of the index
+        changed = {}
+        for operation in operations:
+            if operation.get("op") == "remove":
+                if changed.get(operation["id"], operation["id"] in self._index):
+                    changed[operation["id"]] = None
+                    records.append({"op": "remove", "id": operation["id"]})
+                    outcome = "removed"
+                else:
+                    outcome = "missing"
+            else:
+                game_id = operation["game"].get("id")
+                if not game_id:
+                    raise RegistryError("Registry entries must have an id")
+                present = changed[game_id] is not None if game_id in changed else game_id in self._index
+                game = operation["game"]
+                if "image" not in game:
+                    previous = (changed[game_id] if game_id in changed else self.get(game_id)) if present else None
+                    game = dict(game, image=(previous or {}).get("image") or f"images/{game_id}.png")
+                outcome = "updated" if present else "added"
+                changed[game_id] = game
+                records.append({"op": "upsert", "game": game})
+            counts[outcome] += 1
+            outcomes.append(outcome)
+        if records:
+            self._append(records)
+        return counts
+
+    def games(self, newest_first=True):
+        """
+        Iterate over all registered games.
+
+        Args:
+            newest_first (bool): Yield the most recently added games first,
+                matching the order of the games array in index.html
+
+        Yields:
+            dict: Registry entries
+        """
+        locations = sorted(self._index.values())
+        if not locations:
+            return
+        order = list(self._index)
+        if newest_first:
+            order.reverse()
+
+        # One sequential pass over the log instead of a seek per game
+        records = {}
+        with open(self.path, "rb") as f:
+            for offset, length in locations:
+                f.seek(offset)
+                game = json.loads(f.read(length))["game"]
+                records[game["id"]] = game
+        for game_id in order:
+            yield records[game_id]
+
+    def needs_compaction(self):
+        """Return True if the log carries enough dead records to rewrite it."""
+        dead_bytes = self._log_size - self._live_bytes
+        return dead_bytes > COMPACT_MIN_BYTES and dead_bytes > self._live_bytes * COMPACT_RATIO
+
+    def compact(self):
+        """Rewrite the log so it only contains the live records."""
+        games = list(self.games(newest_first=False))
+        lines = [
+            (json.dumps({"op": "upsert", "game": game}, ensure_ascii=False) + "\n").encode("utf-8")
+            for game in games
+        ]
+        atomic_write(self.path, b"".join(lines).decode("utf-8"))
+
+        self._index.clear()
+        self._log_size = 0
+        self._live_bytes = 0
+        for line in lines:
+            self._apply(line, self._log_size)
+            self._log_size += len(line)
+        # Every offset moved
+        self._rewrite_checkpoint = True
+
+    def checkpoint(self):
+        """
+        Persist the offset index so the next load skips the replay.
+
+        Only the games changed since the last checkpoint are written, as a
+        segment appended to the checkpoint file.
+        """
+        if self.needs_compaction():
+            self.compact()
+        if not self._rewrite_checkpoint and not os.path.exists(self.index_path):
+            self._rewrite_checkpoint = True
+        if not self._rewrite_checkpoint and self._checkpoint_records + len(self._dirty) > max(
+                CHECKPOINT_MIN_RECORDS, len(self._index) * CHECKPOINT_RATIO):
+            self._rewrite_checkpoint = True
+
+        if self._rewrite_checkpoint:
+            entries = [[game_id, offset, length] for game_id, (offset, length) in self._index.items()]
+            os.makedirs(os.path.dirname(self.index_path) or ".", exist_ok=True)
+            atomic_write(self.index_path, json.dumps([self._log_size, entries]) + "\n")
+            self._checkpoint_records = len(entries)
+        elif self._dirty or self._log_size != self._checkpoint_size:
+            entries = []
+            for game_id, removed in self._dirty.items():
+                location = self._index.get(game_id)
+                if removed or location is None:
+                    entries.append([game_id])
+                if location is not None:
+                    entries.append([game_id, location[0], location[1]])
+            with open(self.index_path, "a") as f:
+                f.write(json.dumps([self._log_size, entries]) + "\n")
+            self._checkpoint_records += len(entries)
+
+        self._dirty.clear()
+        self._checkpoint_size = self._log_size
+        self._rewrite_checkpoint = False
+
+
+_JS_ESCAPES = {"n": "\n", "r": "\r"}
+
+
+def _unescape_js_string(value):
+    """Decode the body of a single-quoted JS string literal."""
+    return re.sub(r"\\(.)", lambda match: _JS_ESCAPES.get(match.group(1), match.group(1)), value, flags=re.S)
+
+
+def _js_string(value):
+    """Encode a value as a single-quoted JS string safe inside an HTML attribute."""
+    value = str(value).replace("\\", "\\\\").replace("'", "\\'").replace("\n", "\\n").replace("\r", "\\r")
+    return "'" + value.replace('"', "&quot;") + "'"
+
+
+def _entry_marker(game_id):
+    """Return the comment line that starts a game's entry in the games array."""
+    # An id cannot end the comment early
+    safe_id = game_id.replace("*/", "*\\/")
+    return f"{ENTRY_INDENT}/* game:{safe_id} */\n"
+
+
+def _find_entries(content):
+    """
+    Locate the entries between the games array sentinels.
+
+    Returns:
+        tuple: (start, end) offsets of the entry lines, or None if the page
+            has no sentinels
+    """
+    begin = content.find(ENTRY_INDENT + GAMES_BEGIN + "\n")
+    if begin == -1:
+        return None
+    start = begin + len(ENTRY_INDENT + GAMES_BEGIN + "\n")
+    end = content.find("\n" + ENTRY_INDENT + GAMES_END + "\n", start - 1)
+    if end == -1:
+        return None
+    return start, end + 1
+
+
+def _find_entry(content, span, game_id):
+    """
+    Locate one game's entry among the entry lines of the games array.
+
+    Entries end where the next comment line starts; strings in the array
+    never contain a raw newline, so that cannot occur inside an entry.
+
+    Args:
+        content (str): The page
+        span (tuple): Offsets of the entry lines (see _find_entries)
+        game_id (str): The game to look for
+
+    Returns:
+        tuple: (start, end) offsets, or None if the game has no entry
+    """
+    start = content.find("\n" + _entry_marker(game_id), span[0] - 1, span[1]) + 1
+    if start == 0:
+        return None
+    # The end sentinel line also starts with a comment, so this always matches
+    return start, content.find("\n" + ENTRY_INDENT + "/* ", start) + 1
+
+
+def _find_games_array(content):
+    """
+    Locate the body of the Alpine.js games array.
+
+    Returns:
+        tuple: (start, end) offsets of the text between the brackets
+    """
+    entries = _find_entries(content)
+    if entries is not None:
+        start = content.rfind(GAMES_ARRAY_MARKER, 0, entries[0])
+        end = content.find("]", entries[1])
+        if start != -1 and end != -1:
+            return start + len(GAMES_ARRAY_MARKER), end
+
+    # Pages written before the sentinels existed
+    games_start = content.find(GAMES_ARRAY_MARKER)
+    if games_start == -1:
+        raise RegistryError("games array not found in index.html")
+
+    start = games_start + len(GAMES_ARRAY_MARKER)
+    depth = 1
+    quote = None
+    i = start
+    while i < len(content):
+        char = content[i]
+        if quote:
+            if char == "\\":
+                i += 1
+            elif char == quote:
+                quote = None
+        elif char in "'\"":
+            quote = char
+        elif char == "[":
+            depth += 1
+        elif char == "]":
+            depth -= 1
+            if depth == 0:
+                return start, i
+        i += 1
+    raise RegistryError("games array in index.html is not terminated")
+
+
+def parse_games_array(content):
+    """
+    Parse the games array of index.html into registry entries.
+
+    Args:
+        content (str): The contents of index.html
+
+    Returns:
+        list: Registry entries in the order they appear in the page
+    """
+    start, end = _find_games_array(content)
+    games = []
+    for block in re.finditer(r"\{(.*?)\}", content[start:end], re.S):
+        game = {}
+        for key, raw in _FIELD_PATTERN.findall(block.group(1)):
+            if raw.startswith("["):
+                game[key] = [_unescape_js_string(s) for s in _STRING_PATTERN.findall(raw)]
+            else:
+                game[key] = _unescape_js_string(raw[1:-1])
+        if "id" in game:
+            games.append(game)
+    return games
+
+
+def render_game_entry(game):
+    """Render one registry entry in the Alpine.js object format of index.html."""
+    lines = []
+    for key in GAME_FIELDS:
+        if key == "tags":
+            lines.append(f"                tags: [{', '.join(_js_string(t) for t in game.get('tags', []))}]")
+        elif key in game:
+            # Keep the spacing of the hand-written entries so diffs stay small
+            separator = ", " if key in ("id", "title", "description") else ","
+            lines.append(f"                {key}: {_js_string(game[key])}{separator}")
+    return "            { \n" + "\n".join(lines) + "\n            }"
+
+
+def _render_entry(game):
+    """Render one game's entry of the games array, with its marker comment."""
+    return _entry_marker(game["id"]) + render_game_entry(game) + ",\n"
+
+
+def render_games_array(games):
+    """
+    Render the body of the Alpine.js games array.
+
+    Args:
+        games (iterable): Registry entries in display order
+
+    Returns:
+        str: Text to place between the brackets of `games: [ ... ]`
+    """
+    entries = "".join(_render_entry(game) for game in games)
+    return f"\n{ENTRY_INDENT}{GAMES_BEGIN}\n{entries}{ENTRY_INDENT}{GAMES_END}\n        "
+
+
+def patch_games_array(content, registry, changes, rendered=None):
+    """
+    Update the entries of the changed games in place.
+
+    Only the changed entries are rendered; they are found by their marker
+    comments, so the cost does not grow with the size of the catalog.
+
+    Args:
+        content (str): The contents of index.html
+        registry (GameRegistry): The registry, with the changes applied
+        changes (list): (game id, outcome) pairs in the order they were
+            applied, as reported by GameRegistry.apply
+        rendered (list, optional): Receives the text of every entry rendered
+
+    Returns:
+        str: The new contents, or None if the page has to be re-rendered
+            in full (no sentinels, or entries out of step with the registry)
+    """
+    span = _find_entries(content)
+    if span is None:
+        return None
+    changed = {game_id for game_id, outcome in changes if outcome != "missing"}
+    # Added games go first, as they do in registry.games(); the newest games
+    # are cut and put back at the top in order
+    newest = registry.newest(sum(outcome == "added" for _, outcome in changes))
+
+    edits = {}
+    for game_id in changed | set(newest):
+        found = _find_entry(content, span, game_id)
+        if game_id in newest or game_id not in registry:
+            if found is not None:
+                edits[found[0]] = (found[1], "")
+        elif found is None:
+            return None
+        else:
+            edits[found[0]] = (found[1], _render_entry(registry.get(game_id)))
+    head = "".join(_render_entry(registry.get(game_id)) for game_id in newest)
+    if rendered is not None:
+        rendered.append(head)
+        rendered.extend(text for _, text in edits.values())
+
+    content, span = prerender.splice(content, span, head, edits)
+    if content.count("\n" + ENTRY_INDENT + "/* game:", span[0] - 1, span[1]) != len(registry):
+        return None
+    return content
+
+
+def load_registry(registry_path=REGISTRY_PATH, index_html_path=INDEX_HTML_PATH):
+    """
+    Open the registry store, importing it from index.html on first use.
+
+    Args:
+        registry_path (str): Path to the JSONL registry log
+        index_html_path (str): Path to index.html
+
+    Returns:
+        GameRegistry: The opened registry
+    """
+    if os.path.exists(registry_path):
+        return GameRegistry(registry_path)
+
+    with open(index_html_path, "r") as f:
+        games = parse_games_array(f.read())
+
+    registry = GameRegistry(registry_path)
+    # index.html lists the newest game first, the log is oldest first
+    registry.apply([{"op": "upsert", "game": game} for game in reversed(games)])
+    registry.checkpoint()
+    return registry
+
+
+def write_index_html(registry, index_html_path=INDEX_HTML_PATH, changes=None):
+    """
+    Regenerate the games array in index.html from the registry store.
+
+    When the changes of a commit are passed, only their entries are
+    re-rendered (see patch_games_array); otherwise the whole array is.
+    Pages with prerender markers also get the cards of their game grid
+    re-rendered the same way (see prerender.py). Their Tailwind stylesheet
+    is rebuilt when the new entries and cards use a utility it lacks, or,
+    after a full render, when the page's class names changed.
+
+    Args:
+        registry (GameRegistry): The registry to render
+        index_html_path (str): Path to index.html
+        changes (list, optional): (game id, outcome) pairs of the commit
+    """
+    with open(index_html_path, "r") as f:
+        content = f.read()
+    new_content = None
+    # Text of the entries and cards rendered incrementally, None after a full render
+    rendered = []
+    if changes is not None and len(changes) <= INCREMENTAL_LIMIT:
+        new_content = patch_games_array(content, registry, changes, rendered)
+    games = None
+    if new_content is None:
+        games = list(registry.games())
+        start, end = _find_games_array(content)
+        new_content = content[:start] + render_games_array(games) + content[end:]
+    prerendered = prerender.has_grid(new_content)
+    if prerendered:
+        patched = None if games is not None else prerender.patch_grid(new_content, registry, changes)
+        if patched is None:
+            if games is None:
+                games = list(registry.games())
+            new_content = prerender.replace_grid(new_content, games)
+            rendered = None
+        else:
+            new_content, cards = patched
+            rendered.append(cards)
+    atomic_write(index_html_path, new_content)
+    if prerendered:
+        site_root = os.path.dirname(os.path.abspath(index_html_path))
+        try:
+            if rendered is None or not prerender.stylesheet_covers("".join(rendered), site_root):
+                prerender.build_stylesheet(site_root)
+        except BaseException:
+            # Keep the page and its stylesheet in step
+            atomic_write(index_html_path, content)
+            raise
+
+
+def validate_operation(operation):
+    """
+    Check that an upsert/remove record can be applied.
+
+    Args:
+        operation (dict): {"op": "upsert", "game": {...}} or {"op": "remove", "id": "..."}
+
+    Raises:
+        RegistryError: If the record is malformed
+    """
+    if not isinstance(operation, dict):
+        raise RegistryError("Registry operations must be objects")
+    if operation.get("op") == "remove":
+        game_id = operation.get("id")
+    elif operation.get("op") == "upsert" and isinstance(operation.get("game"), dict):
+        game_id = operation["game"].get("id")
+    else:
+        raise RegistryError(f"Unknown registry operation: {json.dumps(operation, ensure_ascii=False)[:80]}")
+    if not game_id or not isinstance(game_id, str):
+        raise RegistryError("Registry entries must have an id")
+
+
+def enqueue_operations(operations, registry_path=REGISTRY_PATH):
+    """
+    Append registry operations to the pending-registration journal.
+
+    Every operation is validated first, so a bad record can never reach
+    the journal and block the commits after it. The operations are tagged
+    with a batch token so the caller can learn the outcome of a commit
+    that another process ran on its behalf (see commit_pending).
+
+    Args:
+        operations (list): Upsert/remove records (see GameRegistry.apply)
+        registry_path (str): Path to the JSONL registry log
+
+    Returns:
+        str: The batch token of the queued operations
+
+    Raises:
+        RegistryError: If any operation is malformed; nothing is queued then
+    """
+    for operation in operations:
+        validate_operation(operation)
+    batch = uuid.uuid4().hex
+    journal_path = journal_path_for(registry_path)
+    data = "".join(
+        json.dumps(dict(operation, batch=batch), ensure_ascii=False) + "\n" for operation in operations
+    )
+    with file_lock(journal_path + ".lock"):
+        with open(journal_path, "a") as f:
+            f.write(data)
+    return batch
+
+
+def _take_journal(journal_path):
+    """
+    Move the journal aside and return the operations it held.
+
+    A journal left behind by a crashed commit is picked up first; replaying
+    it is safe because upserts and removals are idempotent.
+    """
+    draining_path = journal_path + ".draining"
+    with file_lock(journal_path + ".lock"):
+        if os.path.exists(journal_path):
+            if os.path.exists(draining_path):
+                with open(journal_path, "r") as src, open(draining_path, "a") as dst:
+                    dst.write(src.read())
+                os.remove(journal_path)
+            else:
+                os.replace(journal_path, draining_path)
+
+    if not os.path.exists(draining_path):
+        return [], draining_path
+    with open(draining_path, "r") as f:
+        return [line for line in f if line.strip()], draining_path
+
+
+def _read_operations(lines, rejected_path):
+    """
+    Decode journal lines, moving records that cannot be applied aside.
+
+    Records queued by older versions, or written to the journal by hand,
+    are not validated on the way in. Instead of failing every commit, they
+    are appended to the rejected file for inspection and skipped.
+
+    Returns:
+        tuple: (operations, batches) - the valid operations in journal order
+            and the batch token of each (None for untagged records)
+    """
+    operations = []
+    batches = []
+    rejected = []
+    for line in lines:
+        try:
+            operation = json.loads(line)
+            validate_operation(operation)
+        except (ValueError, RegistryError):
+            rejected.append(line if line.endswith("\n") else line + "\n")
+        else:
+            batches.append(operation.pop("batch", None))
+            operations.append(operation)
+    if rejected:
+        with open(rejected_path, "a") as f:
+            f.write("".join(rejected))
+    return operations, batches
+
+
+def _load_outcomes(outcomes_path):
+    """Read the outcomes file, dropping entries older than OUTCOME_TTL."""
+    try:
+        with open(outcomes_path, "r") as f:
+            outcomes = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(outcomes, dict):
+        return {}
+    cutoff = time.time() - OUTCOME_TTL
+    return {
+        batch: outcome for batch, outcome in outcomes.items()
+        if isinstance(outcome, dict) and outcome.get("time", 0) >= cutoff
+    }
+
+
+def _record_outcomes(outcomes_path, batches, outcome_for):
+    """Store the outcome of batches committed on behalf of other callers."""
+    if not batches:
+        return
+    outcomes = _load_outcomes(outcomes_path)
+    for batch in batches:
+        outcomes[batch] = dict(outcome_for(batch), time=time.time())
+    atomic_write(outcomes_path, json.dumps(outcomes))
+
+
+def _pop_outcome(outcomes_path, batch):
+    """Remove and return the stored outcome of a batch, if any."""
+    if not os.path.exists(outcomes_path):
+        return None
+    outcomes = _load_outcomes(outcomes_path)
+    outcome = outcomes.pop(batch, None)
+    if outcome is not None:
+        atomic_write(outcomes_path, json.dumps(outcomes))
+    return outcome
+
+
+def _operation_id(operation):
+    """Return the game id an upsert/remove record is about."""
+    return operation["id"] if operation.get("op") == "remove" else operation["game"]["id"]
+
+
+def _rollback(registry_path, log_size):
+    """Cut records appended by a failed commit off the end of the log."""
+    if os.path.exists(registry_path) and os.path.getsize(registry_path) > log_size:
+        os.truncate(registry_path, log_size)
+
+
+def commit_pending(registry_path=REGISTRY_PATH, index_html_path=INDEX_HTML_PATH, batch=None):
+    """
+    Apply every queued operation and rewrite index.html once.
+
+    Commits are serialized with a lock file. Callers that queued their
+    operations while another commit was running find them already applied
+    when they get the lock, so concurrent registrations share rewrites.
+
+    Each caller gets the counts of its own batch, whether it ran the
+    commit itself or another process applied the batch first; the outcomes
+    of batches committed on behalf of other callers are kept in the
+    outcomes file until they collect them.
+
+    A commit either completes or is rolled back: if applying the operations
+    or rewriting index.html fails, the records it appended are cut off the
+    log, the drained operations are discarded and every other batch in
+    them is marked as failed, so its caller gets the error instead of
+    seeing the operations applied later by an unrelated commit.
+
+    Args:
+        registry_path (str): Path to the JSONL registry log
+        index_html_path (str): Path to index.html
+        batch (str, optional): Token returned by enqueue_operations
+
+    Returns:
+        dict: Counts of added, updated, removed and missing games, for the
+            given batch only if one is passed
+
+    Raises:
+        RegistryError: If the batch was committed by another process and failed
+    """
+    outcomes_path = outcomes_path_for(registry_path)
+    with file_lock(registry_path + ".lock"):
+        lines, draining_path = _take_journal(journal_path_for(registry_path))
+        operations, batches = _read_operations(lines, rejected_path_for(registry_path))
+        counts = empty_counts()
+        by_batch = {}
+        if operations:
+            registry = load_registry(registry_path, index_html_path)
+            log_size = os.path.getsize(registry_path) if os.path.exists(registry_path) else 0
+            try:
+                outcomes = []
+                counts = registry.apply(operations, outcomes)
+                changes = [(_operation_id(operation), outcome) for operation, outcome in zip(operations, outcomes)]
+                write_index_html(registry, index_html_path, changes)
+            except BaseException as e:
+                _rollback(registry_path, log_size)
+                os.remove(draining_path)
+                others = {token for token in batches if token and token != batch}
+                error = str(e) or type(e).__name__
+                _record_outcomes(outcomes_path, others, lambda token: {"error": error})
+                raise
+            try:
+                registry.checkpoint()
+            except OSError:
+                # The commit is already durable in the log; make the next
+                # load replay it instead of trusting a stale checkpoint
+                if os.path.exists(registry.index_path):
+                    os.remove(registry.index_path)
+            for token, outcome in zip(batches, outcomes):
+                by_batch.setdefault(token, empty_counts())[outcome] += 1
+            _record_outcomes(outcomes_path, {token for token in by_batch if token and token != batch},
+                             lambda token: {"counts": by_batch[token]})
+        if lines:
+            os.remove(draining_path)
+
+        if batch is None:
+            return counts
+        if batch in by_batch:
+            return by_batch[batch]
+        outcome = _pop_outcome(outcomes_path, batch)
+        if outcome and outcome.get("error"):
+            raise RegistryError(f"Registration failed in another commit: {outcome['error']}")
+        return dict(empty_counts(), **(outcome or {}).get("counts", {}))
+
+
+def register_games(operations, registry_path=REGISTRY_PATH, index_html_path=INDEX_HTML_PATH):
+    """
+    Queue registry operations and commit them together with any pending ones.
+
+    Args:
+        operations (list): Upsert/remove records (see GameRegistry.apply)
+        registry_path (str): Path to the JSONL registry log
+        index_html_path (str): Path to index.html
+
+    Returns:
+        dict: Counts of added, updated, removed and missing games among
+            these operations, even if another caller's commit applied them
+    """
+    batch = enqueue_operations(operations, registry_path)
+    return commit_pending(registry_path, index_html_path, batch)
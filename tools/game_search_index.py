@@ -0,0 +1,410 @@
+#!/usr/bin/env python
+"""
+Game Search Index for Arcade Hub
+
+Builds a static, sharded search index of the game registry in `search/`,
+so the home page can answer searches by loading a few small JSON files
+(see js/search.js) instead of scanning every game on each key press.
+
+The index holds:
+
+- grams/<key>.json: trigram -> postings, for queries of three or more
+  characters. Trigrams are taken from the lower-cased title, description
+  and each tag separately, and sharded by their first KEY_LENGTH
+  characters. A query loads the shards of its own trigrams, intersects
+  the postings and checks the candidates against the documents, so it
+  matches exactly the games a substring search would.
+- prefixes/<key>.json: one and two letter word prefix -> postings, for
+  shorter queries, which match the start of a word.
+- facets/categories.json and facets/tags/<key>.json: category and tag
+  postings.
+- docs/<n>.json: the games with document ids n * DOC_SHARD_SIZE and up.
+- meta.json: counts, shard names and a content hash per shard that
+  clients use to bust caches.
+
+Postings are sorted document ids, delta-encoded. Ids grow with the order
+games were added, so the newest games have the highest ids.
+
+Rebuilds are incremental: a state file records each game's document id
+and content hash, and only the shards touched by added, changed or removed
+games are rewritten. Ids of removed games are left unused until dead ids
+outnumber live ones, then the whole index is rebuilt.
+"""
+
+import os
+import re
+import sys
+import json
+import hashlib
+import argparse
+
+import game_registry
+
+
+SITE_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SEARCH_DIR = os.path.join(SITE_ROOT, "search")
+REGISTRY_PATH = os.path.join(SITE_ROOT, "data", "registry.jsonl")
+INDEX_VERSION = 1
+STATE_FILE = ".state.json"
+META_FILE = "meta.json"
+
+DOC_SHARD_SIZE = 256
+# Characters of a term that pick its shard; 2 gives at most ~1,300 gram shards
+KEY_LENGTH = 2
+GRAM_LENGTH = 3
+DEFAULT_LIMIT = 100
+
+# Fields stored for each game in the doc shards, in this order
+DOC_FIELDS = game_registry.GAME_FIELDS
+# Term kinds and the directory their shards live in
+SHARDED = {"grams": "grams", "prefixes": "prefixes", "tags": "facets/tags"}
+
+_WORD_PATTERN = re.compile(r"[a-z0-9]+")
+_KEY_PATTERN = re.compile(r"[^a-z0-9]")
+
+
+def shard_key(term):
+    """Return the shard a term lives in: its first KEY_LENGTH characters, with anything but a-z0-9 as "_"."""
+    return _KEY_PATTERN.sub("_", term[:KEY_LENGTH])
+
+
+def game_texts(game):
+    """Return the lower-cased texts a game is searched by: title, description and each tag."""
+    return [(game.get("title") or "").lower(), (game.get("description") or "").lower()] \
+        + [tag.lower() for tag in game.get("tags") or []]
+
+
+def game_terms(game):
+    """
+    Return the index terms of a game.
+
+    Returns:
+        dict: "grams", "prefixes", "tags" and "categories" -> set of terms
+    """
+    grams = set()
+    prefixes = set()
+    for text in game_texts(game):
+        grams.update(text[i:i + GRAM_LENGTH] for i in range(len(text) - GRAM_LENGTH + 1))
+        for word in _WORD_PATTERN.findall(text):
+            prefixes.update((word[:1], word[:2]))
+    return {
+        "grams": grams,
+        "prefixes": prefixes,
+        "tags": {tag.lower() for tag in game.get("tags") or []},
+        "categories": {game["category"]} if game.get("category") else set(),
+    }
+
+
+def encode_postings(ids):
+    """Delta-encode a sorted list of document ids."""
+    return [doc_id - previous for previous, doc_id in zip([0] + ids, ids)]
+
+
+def decode_postings(deltas):
+    """Undo encode_postings()."""
+    ids = []
+    total = 0
+    for delta in deltas:
+        total += delta
+        ids.append(total)
+    return ids
+
+
+def _record_hash(game):
+    return hashlib.sha256(json.dumps([game.get(field) for field in DOC_FIELDS]).encode("utf-8")).hexdigest()
+
+
+def _read_json(path, default=None):
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return default
+
+
+def _write_json(path, data):
+    """Write compact JSON atomically and return its short content hash."""
+    content = json.dumps(data, separators=(",", ":"), ensure_ascii=False, sort_keys=True)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    game_registry.atomic_write(path, content)
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()[:8]
+
+
+class _Index:
+    """The files of one search directory, loaded lazily and written back when changed."""
+
+    def __init__(self, directory, meta):
+        self.directory = directory
+        self.meta = meta
+        self.shards = {}   # (kind, key) -> {term: set of ids}
+        self.docs = {}     # shard number -> list of records
+        self.dirty = set()
+
+    def _path(self, kind, key):
+        if kind == "categories":
+            return os.path.join(self.directory, "facets", "categories.json")
+        if kind == "docs":
+            return os.path.join(self.directory, "docs", f"{key}.json")
+        return os.path.join(self.directory, SHARDED[kind], f"{key}.json")
+
+    def shard(self, kind, key):
+        if (kind, key) not in self.shards:
+            data = _read_json(self._path(kind, key), {}) if key in self.meta["shards"][kind] else {}
+            self.shards[kind, key] = {term: set(decode_postings(ids)) for term, ids in data.items()}
+        return self.shards[kind, key]
+
+    def doc_shard(self, number):
+        if number not in self.docs:
+            records = _read_json(self._path("docs", number), []) if str(number) in self.meta["shards"]["docs"] \
+                else []
+            self.docs[number] = records + [None] * (DOC_SHARD_SIZE - len(records))
+        return self.docs[number]
+
+    def get(self, doc_id):
+        record = self.doc_shard(doc_id // DOC_SHARD_SIZE)[doc_id % DOC_SHARD_SIZE]
+        return None if record is None else dict(zip(DOC_FIELDS, record))
+
+    def put(self, doc_id, game):
+        number = doc_id // DOC_SHARD_SIZE
+        self.doc_shard(number)[doc_id % DOC_SHARD_SIZE] = None if game is None \
+            else [game.get(field) for field in DOC_FIELDS]
+        self.dirty.add(("docs", number))
+
+    def update_terms(self, doc_id, old_terms, new_terms):
+        for kind in ("grams", "prefixes", "tags", "categories"):
+            old, new = old_terms.get(kind, set()), new_terms.get(kind, set())
+            for term in old - new:
+                key = "all" if kind == "categories" else shard_key(term)
+                postings = self.shard(kind, key)[term]
+                postings.discard(doc_id)
+                if not postings:
+                    del self.shards[kind, key][term]
+                self.dirty.add((kind, key))
+            for term in new - old:
+                key = "all" if kind == "categories" else shard_key(term)
+                self.shard(kind, key).setdefault(term, set()).add(doc_id)
+                self.dirty.add((kind, key))
+
+    def write(self):
+        """Write every changed shard, remove emptied ones and return the number written."""
+        shards = self.meta["shards"]
+        for kind, key in sorted(self.dirty, key=str):
+            path = self._path(kind, key)
+            name = str(key)
+            if kind == "docs":
+                records = self.docs[key]
+                while records and records[-1] is None:
+                    records.pop()
+                data = records
+            else:
+                data = {term: encode_postings(sorted(ids)) for term, ids in self.shards[kind, key].items()}
+            if data:
+                shards[kind][name] = _write_json(path, data)
+            else:
+                shards[kind].pop(name, None)
+                if os.path.exists(path):
+                    os.remove(path)
+        written = len(self.dirty)
+        self.dirty.clear()
+        return written
+
+
+def _empty_meta():
+    return {
+        "version": INDEX_VERSION,
+        "key_length": KEY_LENGTH,
+        "gram_length": GRAM_LENGTH,
+        "doc_shard_size": DOC_SHARD_SIZE,
+        "fields": DOC_FIELDS,
+        "count": 0,
+        "categories": {},
+        "shards": {"docs": {}, "grams": {}, "prefixes": {}, "tags": {}, "categories": {}},
+    }
+
+
+def _clear(directory):
+    """Remove the shards of a previous index."""
+    for subdirectory in ("docs", "grams", "prefixes", os.path.join("facets", "tags"), "facets"):
+        path = os.path.join(directory, subdirectory)
+        if os.path.isdir(path):
+            for name in os.listdir(path):
+                if name.endswith(".json"):
+                    os.remove(os.path.join(path, name))
+
+
+def build_index(games, directory=SEARCH_DIR, force=False):
+    """
+    Bring the search index in line with a list of games.
+
+    Args:
+        games (list): Registry entries, oldest first
+        directory (str): The search index directory
+        force (bool): Rebuild every shard from scratch
+
+    Returns:
+        dict: Counts of "added", "updated" and "removed" games, "shards"
+            written and whether it was a "full" rebuild
+    """
+    games = {game["id"]: game for game in games}
+    hashes = {game_id: _record_hash(game) for game_id, game in games.items()}
+    state = None if force else _read_json(os.path.join(directory, STATE_FILE))
+    meta = _read_json(os.path.join(directory, META_FILE))
+    usable = state and meta and state.get("version") == INDEX_VERSION and \
+        all(meta.get(name) == value for name, value in _empty_meta().items()
+            if name not in ("count", "categories", "shards"))
+
+    if usable:
+        ids = state["ids"]
+        removed = [game_id for game_id in ids if game_id not in games]
+        added = [game_id for game_id in games if game_id not in ids]
+        updated = [game_id for game_id in games if game_id in ids and state["hashes"][game_id] != hashes[game_id]]
+        dead = state["dead"] + len(removed)
+        full = dead > len(games)
+    else:
+        full = True
+
+    if full:
+        _clear(directory)
+        meta = _empty_meta()
+        ids, dead, next_id = {}, 0, 0
+        removed, updated, added = [], [], list(games)
+    else:
+        next_id = state["next_id"]
+        if not (removed or added or updated):
+            return {"added": 0, "updated": 0, "removed": 0, "shards": 0, "full": False}
+
+    index = _Index(directory, meta)
+    for game_id in removed:
+        doc_id = ids.pop(game_id)
+        old = index.get(doc_id)
+        index.update_terms(doc_id, game_terms(old) if old else {}, {})
+        index.put(doc_id, None)
+    for game_id in updated:
+        doc_id = ids[game_id]
+        old = index.get(doc_id)
+        index.update_terms(doc_id, game_terms(old) if old else {}, game_terms(games[game_id]))
+        index.put(doc_id, games[game_id])
+    for game_id in added:
+        ids[game_id] = next_id
+        index.update_terms(next_id, {}, game_terms(games[game_id]))
+        index.put(next_id, games[game_id])
+        next_id += 1
+
+    shards = index.write()
+    categories = {}
+    for game in games.values():
+        if game.get("category"):
+            categories[game["category"]] = categories.get(game["category"], 0) + 1
+    meta.update(count=len(games), next_id=next_id, categories=categories)
+    _write_json(os.path.join(directory, META_FILE), meta)
+    _write_json(os.path.join(directory, STATE_FILE), {
+        "version": INDEX_VERSION, "ids": ids, "hashes": hashes, "next_id": next_id, "dead": dead})
+    return {"added": len(added), "updated": len(updated), "removed": len(removed), "shards": shards, "full": full}
+
+
+def search(query, category=None, tag=None, limit=DEFAULT_LIMIT, directory=SEARCH_DIR):
+    """
+    Answer a query from the index files, the way js/search.js does.
+
+    Args:
+        query (str): Search text; three or more characters match anywhere in
+            the title, description or a tag, shorter queries match word starts
+        category (str, optional): Only games in this category
+        tag (str, optional): Only games with this tag
+        limit (int): Maximum number of games to return
+        directory (str): The search index directory
+
+    Returns:
+        list: Matching registry entries, newest first
+    """
+    meta = _read_json(os.path.join(directory, META_FILE))
+    if not meta:
+        return []
+    index = _Index(directory, meta)
+    query = query.strip().lower()
+
+    candidates = None
+    if len(query) >= GRAM_LENGTH:
+        terms = [("grams", query[i:i + GRAM_LENGTH]) for i in range(len(query) - GRAM_LENGTH + 1)]
+    elif query:
+        terms = [("prefixes", query)]
+    else:
+        terms = []
+    if category:
+        terms.append(("categories", category))
+    if tag:
+        terms.append(("tags", tag.lower()))
+    for kind, term in terms:
+        postings = index.shard(kind, "all" if kind == "categories" else shard_key(term)).get(term, set())
+        candidates = postings if candidates is None else candidates & postings
+        if not candidates:
+            return []
+
+    if candidates is None:
+        candidates = range(meta["next_id"])
+    results = []
+    for doc_id in sorted(candidates, reverse=True):
+        game = index.get(doc_id)
+        if game is None:
+            continue
+        # Trigrams can all occur without the query itself occurring
+        if len(query) > GRAM_LENGTH and not any(query in text for text in game_texts(game)):
+            continue
+        results.append(game)
+        if len(results) == limit:
+            break
+    return results
+
+
+def build_from_registry(registry_path=REGISTRY_PATH, directory=SEARCH_DIR, force=False):
+    """
+    Index every game in a registry.
+
+    Args:
+        registry_path (str): Path to the JSONL registry log
+        directory (str): The search index directory
+        force (bool): Rebuild every shard from scratch
+
+    Returns:
+        dict: The summary returned by build_index()
+    """
+    registry = game_registry.GameRegistry(registry_path)
+    return build_index(registry.games(newest_first=False), directory, force)
+
+
+def main():
+    """Main entry point for the script."""
+    parser = argparse.ArgumentParser(description="Build and query the Arcade Hub search index")
+    parser.add_argument("--directory", "-d", default=SEARCH_DIR, help="Search index directory")
+    subparsers = parser.add_subparsers(dest="command", help="Command to run")
+
+    build_parser = subparsers.add_parser("build", help="Update the index from the game registry")
+    build_parser.add_argument("--registry", default=REGISTRY_PATH, help="Path to the JSONL registry log")
+    build_parser.add_argument("--force", "-f", action="store_true", help="Rebuild every shard")
+
+    query_parser = subparsers.add_parser("query", help="Search the index")
+    query_parser.add_argument("query", nargs="*", help="Text to search for")
+    query_parser.add_argument("--category", "-c", help="Only games in this category")
+    query_parser.add_argument("--tag", "-t", help="Only games with this tag")
+    query_parser.add_argument("--limit", "-l", type=int, default=DEFAULT_LIMIT, help="Maximum number of results")
+    args = parser.parse_args()
+
+    if args.command == "build":
+        if not os.path.exists(args.registry):
+            print(f"Error: Registry '{args.registry}' not found")
+            sys.exit(1)
+        summary = build_from_registry(args.registry, args.directory, args.force)
+        kind = "Rebuilt" if summary["full"] else "Updated"
+        print(f"✓ {kind} the search index: {summary['added']} added, {summary['updated']} updated, "
+              f"{summary['removed']} removed, {summary['shards']} shard(s) written")
+    elif args.command == "query":
+        results = search(" ".join(args.query), args.category, args.tag, args.limit, args.directory)
+        print(f"{len(results)} matching games")
+        for game in results:
+            print(f"{game['id']}: {game['title']} ({game['category']})")
+    else:
+        parser.print_help()
+
+
+if __name__ == "__main__":
+    main()
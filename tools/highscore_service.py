@@ -0,0 +1,470 @@
+#!/usr/bin/env python
+"""
+High Score Service for Arcade Hub
+
+Server-side counterpart of `HighScores` in js/main.js, with the same API
+shape: saveScore / getScores / isHighScore per `gameId`, with initials
+cut to three upper-case characters.
+
+Each game's board is a bounded min-heap of its best scores. The lowest
+kept score sits at the root, so a submission is rejected in O(1), and an
+accepted one costs O(log n) for a board of n scores. Ties rank in
+submission order, as with the stable sort in the browser.
+
+Accepted scores are appended to a log. Writes are batched: the log is
+flushed and fsynced once per FSYNC_INTERVAL seconds or FSYNC_BATCH
+scores, whichever comes first, so a crash loses at most that window.
+When the log outgrows the last snapshot, the boards are written to a new
+snapshot and a new log generation is started. On start-up the snapshot
+is loaded and the logs written after it are replayed.
+
+Run `./highscore_service.py serve` for a small JSON HTTP API on top of it.
+"""
+
+import os
+import sys
+import json
+import time
+import heapq
+import argparse
+import tempfile
+import threading
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit, parse_qs, unquote
+
+
+DEFAULT_DIRECTORY = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "highscores")
+DEFAULT_MAX_SCORES = 10
+# Largest board a client can ask for with maxScores
+MAX_BOARD_SIZE = 1000
+
+FSYNC_INTERVAL = 0.05
+FSYNC_BATCH = 4096
+# Start a new snapshot once the log is this many times larger than the last one
+COMPACT_RATIO = 4
+COMPACT_MIN_BYTES = 1024 * 1024
+
+SNAPSHOT_FILE = "snapshot.json"
+LOG_PREFIX = "scores."
+LOG_SUFFIX = ".log"
+
+
+class HighScoreError(Exception):
+    """Raised when the high score store cannot be read."""
+
+
+def _timestamp():
+    """Current time in the format of JavaScript's Date.toISOString()."""
+    return datetime.now(timezone.utc).isoformat(timespec="milliseconds").replace("+00:00", "Z")
+
+
+def _is_number(value):
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+class Leaderboard:
+    """
+    The best scores of one game, in a bounded min-heap.
+
+    Heap entries are (score, -sequence, initials, date). The root is the
+    entry that would be dropped next: the lowest score, and among equal
+    scores the most recent one.
+
+    Args:
+        capacity (int): Number of scores to keep
+    """
+
+    __slots__ = ("capacity", "_heap", "_sequence", "_sorted")
+
+    def __init__(self, capacity=DEFAULT_MAX_SCORES):
+        self.capacity = capacity
+        self._heap = []
+        self._sequence = 0
+        self._sorted = None
+
+    def __len__(self):
+        return len(self._heap)
+
+    def qualifies(self, score, max_scores=None):
+        """Return True if a score would make it onto the top `max_scores`."""
+        max_scores = max_scores or self.capacity
+        if len(self._heap) < max_scores:
+            return True
+        if max_scores == len(self._heap):
+            lowest = self._heap[0][0]
+        else:
+            lowest = self.top(max_scores)[-1]["score"]
+        return score > lowest
+
+    def add(self, initials, score, date, sequence=None):
+        """
+        Add a score, dropping the lowest one when the board is full.
+
+        Returns:
+            bool: True if the score made it onto the board
+        """
+        if sequence is None:
+            sequence = self._sequence
+        self._sequence = max(self._sequence, sequence) + 1
+        entry = (score, -sequence, initials, date)
+        if len(self._heap) < self.capacity:
+            heapq.heappush(self._heap, entry)
+        elif entry > self._heap[0]:
+            heapq.heapreplace(self._heap, entry)
+        else:
+            return False
+        self._sorted = None
+        return True
+
+    def grow(self, capacity):
+        """Keep more scores from now on (boards never shrink)."""
+        self.capacity = max(self.capacity, capacity)
+
+    def top(self, limit=None):
+        """
+        Return the best scores, highest first, as the browser stores them.
+
+        Returns:
+            list: {"initials", "score", "date"} dicts
+        """
+        if self._sorted is None:
+            self._sorted = [{"initials": initials, "score": score, "date": date}
+                            for score, _, initials, date in sorted(self._heap, reverse=True)]
+        return self._sorted[:limit] if limit is not None else list(self._sorted)
+
+    def entries(self):
+        """Return the raw heap entries as (score, sequence, initials, date)."""
+        return [(score, -negative, initials, date) for score, negative, initials, date in self._heap]
+
+
+class HighScoreStore:
+    """
+    Persistent high score boards for every game.
+
+    Safe to share between threads.
+
+    Args:
+        directory (str): Where the snapshot and logs are kept
+        fsync_interval (float): Longest time an accepted score stays unsynced
+        fsync_batch (int): Most accepted scores kept unsynced
+    """
+
+    def __init__(self, directory=DEFAULT_DIRECTORY, fsync_interval=FSYNC_INTERVAL, fsync_batch=FSYNC_BATCH):
+        self.directory = directory
+        self.fsync_interval = fsync_interval
+        self.fsync_batch = fsync_batch
+        self.boards = {}
+        self._lock = threading.RLock()
+        self._pending = []
+        self._last_sync = time.monotonic()
+        self._generation = 0
+        self._snapshot_bytes = 0
+        self._log_bytes = 0
+        self._log = None
+        self._timer = None
+        os.makedirs(directory, exist_ok=True)
+        self._load()
+
+    def _log_path(self, generation):
+        return os.path.join(self.directory, f"{LOG_PREFIX}{generation:08d}{LOG_SUFFIX}")
+
+    def _log_generations(self):
+        generations = []
+        for name in os.listdir(self.directory):
+            if name.startswith(LOG_PREFIX) and name.endswith(LOG_SUFFIX):
+                try:
+                    generations.append(int(name[len(LOG_PREFIX):-len(LOG_SUFFIX)]))
+                except ValueError:
+                    continue
+        return sorted(generations)
+
+    def _board(self, game_id, capacity=DEFAULT_MAX_SCORES):
+        board = self.boards.get(game_id)
+        if board is None:
+            board = self.boards[game_id] = Leaderboard(capacity)
+        return board
+
+    def _load(self):
+        """Load the snapshot and replay the logs written after it."""
+        snapshot_path = os.path.join(self.directory, SNAPSHOT_FILE)
+        if os.path.exists(snapshot_path):
+            try:
+                with open(snapshot_path, "r") as f:
+                    snapshot = json.load(f)
+                self._generation = snapshot["generation"]
+                for game_id, data in snapshot["games"].items():
+                    board = self._board(game_id, data["capacity"])
+                    for score, sequence, initials, date in data["entries"]:
+                        board.add(initials, score, date, sequence)
+            except (ValueError, KeyError, TypeError):
+                raise HighScoreError(f"Corrupt high score snapshot {snapshot_path}")
+            self._snapshot_bytes = os.path.getsize(snapshot_path)
+
+        generations = [g for g in self._log_generations() if g >= self._generation]
+        for generation in generations:
+            self._replay(self._log_path(generation), generation == generations[-1])
+        if generations:
+            self._generation = generations[-1]
+        # Logs older than the snapshot were left behind by an interrupted compaction
+        for generation in self._log_generations():
+            if generation < self._generation:
+                os.remove(self._log_path(generation))
+
+        path = self._log_path(self._generation)
+        self._log = open(path, "ab")
+        self._log_bytes = self._log.tell()
+
+    def _replay(self, path, last):
+        with open(path, "rb") as f:
+            data = f.read()
+        offset = 0
+        for line in data.splitlines(keepends=True):
+            try:
+                record = json.loads(line)
+                board = self._board(record["g"], record["m"])
+                board.grow(record["m"])
+                board.add(record["i"], record["s"], record["d"])
+            except (ValueError, KeyError, TypeError):
+                if last and offset + len(line) == len(data):
+                    # Torn write at the end of the newest log: drop it
+                    with open(path, "r+b") as f:
+                        f.truncate(offset)
+                    return
+                raise HighScoreError(f"Corrupt high score record at byte {offset} of {path}")
+            offset += len(line)
+
+    def save_score(self, game_id, initials, score, max_scores=DEFAULT_MAX_SCORES):
+        """
+        Submit a score, like HighScores.saveScore.
+
+        Args:
+            game_id (str): The ID of the game
+            initials (str): Player's initials (cut to 3 upper-case characters)
+            score (int or float): The score achieved
+            max_scores (int): Number of scores the board keeps
+
+        Returns:
+            bool: False if the input is invalid, True otherwise (whether or
+            not the score made the board, as in the browser)
+        """
+        if not game_id or not isinstance(game_id, str) or not initials or not isinstance(initials, str) \
+                or not _is_number(score) or not isinstance(max_scores, int) or max_scores < 1:
+            return False
+        initials = initials.upper()[:3]
+        max_scores = min(max_scores, MAX_BOARD_SIZE)
+
+        with self._lock:
+            board = self._board(game_id, max_scores)
+            grown = max_scores > board.capacity
+            board.grow(max_scores)
+            date = _timestamp()
+            if board.add(initials, score, date) or grown:
+                self._pending.append(json.dumps({"g": game_id, "i": initials, "s": score, "d": date,
+                                                 "m": max_scores}, separators=(",", ":")).encode("utf-8") + b"\n")
+                self._schedule_sync()
+        return True
+
+    def get_scores(self, game_id, limit=None):
+        """Return a game's scores, highest first, like HighScores.getScores."""
+        with self._lock:
+            board = self.boards.get(game_id) if game_id else None
+            return board.top(limit) if board else []
+
+    def is_high_score(self, game_id, score, max_scores=DEFAULT_MAX_SCORES):
+        """Return True if a score qualifies, like HighScores.isHighScore."""
+        with self._lock:
+            board = self.boards.get(game_id)
+            return board is None or board.qualifies(score, max_scores)
+
+    def _schedule_sync(self):
+        """Flush now if the batch is full or overdue, else make sure a timer will."""
+        if len(self._pending) >= self.fsync_batch or time.monotonic() - self._last_sync >= self.fsync_interval:
+            self.flush()
+        elif self._timer is None:
+            self._timer = threading.Timer(self.fsync_interval, self.flush)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def flush(self):
+        """Write and fsync every pending score, compacting the log if it grew too large."""
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            self._last_sync = time.monotonic()
+            if self._write_pending() and \
+                    self._log_bytes > max(COMPACT_MIN_BYTES, COMPACT_RATIO * self._snapshot_bytes):
+                self.compact()
+
+    def _write_pending(self):
+        """Append the pending scores to the log and fsync it. Returns True if anything was written."""
+        if not self._pending or self._log is None:
+            return False
+        data = b"".join(self._pending)
+        self._pending.clear()
+        self._log.write(data)
+        self._log.flush()
+        os.fsync(self._log.fileno())
+        self._log_bytes += len(data)
+        return True
+
+    def compact(self):
+        """
+        Write every board to a new snapshot and start a new log generation.
+
+        The snapshot names the generation of the log that follows it, and is
+        renamed into place before the older logs are deleted, so a crash at
+        any point leaves a snapshot and logs that replay to the same boards.
+        """
+        with self._lock:
+            self._write_pending()
+            generation = self._generation + 1
+            snapshot = {
+                "generation": generation,
+                "games": {game_id: {"capacity": board.capacity, "entries": board.entries()}
+                          for game_id, board in self.boards.items()},
+            }
+            fd, temp_path = tempfile.mkstemp(dir=self.directory, prefix=".snapshot-")
+            with os.fdopen(fd, "w") as f:
+                json.dump(snapshot, f, separators=(",", ":"))
+                f.flush()
+                os.fsync(f.fileno())
+            snapshot_path = os.path.join(self.directory, SNAPSHOT_FILE)
+            os.replace(temp_path, snapshot_path)
+            self._snapshot_bytes = os.path.getsize(snapshot_path)
+
+            self._log.close()
+            self._log = open(self._log_path(generation), "ab")
+            self._log_bytes = 0
+            old = self._generation
+            self._generation = generation
+            for previous in self._log_generations():
+                if previous <= old:
+                    os.remove(self._log_path(previous))
+
+    def close(self):
+        """Flush pending scores and close the log."""
+        with self._lock:
+            self.flush()
+            if self._log is not None:
+                self._log.close()
+                self._log = None
+
+
+class HighScoreHandler(BaseHTTPRequestHandler):
+    """
+    JSON API over a HighScoreStore (set as the server's `store`).
+
+    GET  /api/highscores/<gameId>[?limit=N]                -> [{initials, score, date}, ...]
+    GET  /api/highscores/<gameId>/check?score=N[&maxScores=M] -> {"isHighScore": bool}
+    POST /api/highscores/<gameId>  {initials, score[, maxScores]}  -> {"saved": bool}
+    POST /api/highscores  [{gameId, initials, score[, maxScores]}, ...] -> {"saved": N, "invalid": M}
+    """
+
+    protocol_version = "HTTP/1.1"
+    server_version = "arcade-hub-highscores"
+
+    def log_message(self, format, *args):
+        if not getattr(self.server, "quiet", False):
+            super().log_message(format, *args)
+
+    def _send(self, status, payload):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Access-Control-Allow-Origin", "*")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _route(self):
+        parts = [unquote(part) for part in urlsplit(self.path).path.strip("/").split("/")]
+        if parts[:2] != ["api", "highscores"] or len(parts) > 4:
+            return None
+        return parts[2:]
+
+    def do_GET(self):
+        route = self._route()
+        query = {key: values[-1] for key, values in parse_qs(urlsplit(self.path).query).items()}
+        try:
+            if route and len(route) == 1:
+                limit = int(query["limit"]) if "limit" in query else None
+                return self._send(200, self.server.store.get_scores(route[0], limit))
+            if route and len(route) == 2 and route[1] == "check":
+                qualifies = self.server.store.is_high_score(route[0], float(query["score"]),
+                                                            int(query.get("maxScores", DEFAULT_MAX_SCORES)))
+                return self._send(200, {"isHighScore": qualifies})
+        except (KeyError, ValueError):
+            return self._send(400, {"error": "invalid query"})
+        self._send(404, {"error": "not found"})
+
+    def do_POST(self):
+        route = self._route()
+        try:
+            payload = json.loads(self.rfile.read(int(self.headers.get("Content-Length") or 0)) or b"null")
+        except ValueError:
+            return self._send(400, {"error": "invalid JSON"})
+        store = self.server.store
+        if route is not None and len(route) == 1 and isinstance(payload, dict):
+            saved = store.save_score(route[0], payload.get("initials"), payload.get("score"),
+                                     payload.get("maxScores", DEFAULT_MAX_SCORES))
+            return self._send(200 if saved else 400, {"saved": saved})
+        if route == [] and isinstance(payload, list):
+            saved = sum(1 for item in payload if isinstance(item, dict) and store.save_score(
+                item.get("gameId"), item.get("initials"), item.get("score"),
+                item.get("maxScores", DEFAULT_MAX_SCORES)))
+            return self._send(200, {"saved": saved, "invalid": len(payload) - saved})
+        self._send(404 if route is None else 400, {"error": "not found" if route is None else "invalid request"})
+
+
+def main():
+    """Main entry point for the script."""
+    parser = argparse.ArgumentParser(description="High Score Service for Arcade Hub")
+    parser.add_argument("--directory", default=DEFAULT_DIRECTORY, help="Where scores are stored")
+    subparsers = parser.add_subparsers(dest="command", help="Command to run")
+
+    serve_parser = subparsers.add_parser("serve", help="Serve the JSON API")
+    serve_parser.add_argument("--host", default="127.0.0.1", help="Address to listen on")
+    serve_parser.add_argument("--port", "-p", type=int, default=8889, help="Port (default: 8889)")
+    serve_parser.add_argument("--quiet", "-q", action="store_true", help="Don't log requests")
+
+    scores_parser = subparsers.add_parser("scores", help="Print a game's high scores")
+    scores_parser.add_argument("game_id", help="The ID of the game")
+
+    subparsers.add_parser("compact", help="Snapshot the boards and drop the replayed logs")
+
+    args = parser.parse_args()
+    try:
+        store = HighScoreStore(args.directory)
+    except (OSError, HighScoreError) as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+
+    try:
+        if args.command == "serve":
+            server = ThreadingHTTPServer((args.host, args.port), HighScoreHandler)
+            server.store = store
+            server.quiet = args.quiet
+            print(f"Serving high scores from {args.directory} at http://{args.host}:{args.port}/api/highscores/",
+                  flush=True)
+            try:
+                server.serve_forever()
+            except KeyboardInterrupt:
+                pass
+            finally:
+                server.server_close()
+        elif args.command == "scores":
+            for rank, entry in enumerate(store.get_scores(args.game_id), 1):
+                print(f"{rank:>3}. {entry['initials']:<3} {entry['score']:>10}  {entry['date']}")
+        elif args.command == "compact":
+            store.compact()
+            print(f"✓ Compacted {len(store.boards)} boards")
+        else:
+            parser.print_help()
+    finally:
+        store.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,222 @@
+#!/usr/bin/env python
+"""
+Profiling and Tracing for the Arcade Hub Tools
+
+Shared instrumentation for the command line entry points of the tools:
+
+- --profile: run under cProfile, dump the stats and print the top functions
+  (--profile-output FILE picks where the stats go)
+- --trace-memory: trace allocations with tracemalloc and print the peak and
+  the top allocating lines
+- --timings: print the wall time spent in each phase of the command
+- --metrics-json: write everything that was measured as JSON, for
+  aggregating across CI jobs
+
+Phases are functions named by the tool, such as "read registry" for
+game_registry.load_registry. They are only wrapped with timers while
+--timings or --metrics-json is in effect and restored afterwards, so the
+tools run their unmodified code when no flag is given. Time is attributed
+to the innermost phase, so phases never count the same second twice.
+
+Reports go to stderr, so commands that print JSON keep a clean stdout.
+"""
+
+import os
+import sys
+import json
+import time
+import pstats
+import cProfile
+import functools
+import threading
+import tracemalloc
+from contextlib import contextmanager
+
+
+DEFAULT_TOP = 15
+
+
+def add_arguments(parser):
+    """
+    Add the instrumentation flags to a tool's argument parser.
+
+    Args:
+        parser (argparse.ArgumentParser): The tool's top-level parser
+    """
+    group = parser.add_argument_group("instrumentation")
+    # A plain flag, so it cannot swallow the subcommand that follows it
+    group.add_argument("--profile", action="store_true",
+                       help="Profile the command with cProfile and dump the stats to <tool>.prof")
+    group.add_argument("--profile-output", metavar="FILE",
+                       help="Where to dump the profile stats (implies --profile)")
+    group.add_argument("--trace-memory", action="store_true",
+                       help="Trace allocations and report the peak and the top allocating lines")
+    group.add_argument("--timings", action="store_true", help="Report the wall time of each phase")
+    group.add_argument("--metrics-json", metavar="FILE", help="Write the measurements to a JSON file")
+    group.add_argument("--top", type=int, default=DEFAULT_TOP, metavar="N",
+                       help=f"Entries in the profile and memory summaries (default: {DEFAULT_TOP})")
+
+
+class PhaseTimer:
+    """
+    Wall time per phase, attributed to the innermost running phase.
+
+    Args:
+        phases (list): (name, owner, attribute) triples; owner.attribute is
+            the function whose calls make up the phase
+    """
+
+    def __init__(self, phases):
+        self.phases = phases
+        self.seconds = {}
+        self.calls = {}
+        self._originals = []
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def _wrap(self, name, function):
+        @functools.wraps(function)
+        def timed(*args, **kwargs):
+            stack = self._local.__dict__.setdefault("stack", [])
+            stack.append(0.0)
+            started = time.perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                elapsed = time.perf_counter() - started
+                nested = stack.pop()
+                if stack:
+                    stack[-1] += elapsed
+                with self._lock:
+                    self.seconds[name] = self.seconds.get(name, 0.0) + elapsed - nested
+                    self.calls[name] = self.calls.get(name, 0) + 1
+        return timed
+
+    def install(self):
+        """Wrap every phase function with a timer."""
+        for name, owner, attribute in self.phases:
+            # Class attributes are swapped raw, so static and class methods keep their kind
+            original = owner.__dict__[attribute] if isinstance(owner, type) else getattr(owner, attribute)
+            if isinstance(original, (staticmethod, classmethod)):
+                wrapped = type(original)(self._wrap(name, original.__func__))
+            else:
+                wrapped = self._wrap(name, original)
+            self._originals.append((owner, attribute, original))
+            setattr(owner, attribute, wrapped)
+
+    def uninstall(self):
+        """Put the original functions back."""
+        for owner, attribute, function in reversed(self._originals):
+            setattr(owner, attribute, function)
+        self._originals.clear()
+
+
+def _profile_summary(profiler, top):
+    """Return the functions with the most cumulative time."""
+    stats = pstats.Stats(profiler)
+    rows = []
+    for (filename, line, function), (_, calls, total, cumulative, _) in stats.stats.items():
+        rows.append({
+            "function": f"{os.path.basename(filename)}:{line}({function})" if line else function,
+            "calls": calls,
+            "total_seconds": total,
+            "cumulative_seconds": cumulative,
+        })
+    rows.sort(key=lambda row: row["cumulative_seconds"], reverse=True)
+    return rows[:top]
+
+
+def _memory_summary(snapshot, top):
+    """Return the source lines that hold the most traced memory."""
+    snapshot = snapshot.filter_traces([tracemalloc.Filter(False, tracemalloc.__file__),
+                                       tracemalloc.Filter(False, __file__)])
+    return [{
+        "location": f"{os.path.relpath(stat.traceback[0].filename)}:{stat.traceback[0].lineno}",
+        "bytes": stat.size,
+        "count": stat.count,
+    } for stat in snapshot.statistics("lineno")[:top]]
+
+
+def _report(metrics, out):
+    """Print the measurements in human readable form."""
+    sys.stdout.flush()
+    print(f"\n===== {metrics['tool']}: {metrics['wall_seconds']:.3f}s wall time =====", file=out)
+    if "phases" in metrics:
+        print("Phases:", file=out)
+        for name, phase in metrics["phases"].items():
+            print(f"  {phase['seconds']:9.3f}s  {phase['calls']:>7} calls  {name}", file=out)
+        print(f"  {metrics['unattributed_seconds']:9.3f}s  {'':>13}  other", file=out)
+    if "memory" in metrics:
+        print(f"Memory: peak {metrics['memory']['peak_bytes'] / 1024:.1f} KiB traced", file=out)
+        for row in metrics["memory"]["top"]:
+            print(f"  {row['bytes'] / 1024:9.1f} KiB  {row['count']:>7} blocks  {row['location']}", file=out)
+    if "profile" in metrics:
+        print(f"Profile: stats written to {metrics['profile']['path']}", file=out)
+        print(f"  {'cumulative':>10}  {'own':>9}  {'calls':>8}  function", file=out)
+        for row in metrics["profile"]["top"]:
+            print(f"  {row['cumulative_seconds']:9.3f}s  {row['total_seconds']:8.3f}s  {row['calls']:>8}  "
+                  f"{row['function']}", file=out)
+
+
+@contextmanager
+def instrument(args, tool, phases=()):
+    """
+    Measure the command run inside the block, as selected by the flags.
+
+    Without any instrumentation flag this does nothing at all.
+
+    Args:
+        args (argparse.Namespace): Parsed arguments (see add_arguments)
+        tool (str): Name of the tool, used in reports and file names
+        phases (list): (name, owner, attribute) triples for --timings
+    """
+    profile_output = getattr(args, "profile_output", None)
+    profile = getattr(args, "profile", False) or bool(profile_output)
+    trace_memory = getattr(args, "trace_memory", False)
+    metrics_path = getattr(args, "metrics_json", None)
+    timings = getattr(args, "timings", False) or bool(metrics_path)
+    if not (profile or trace_memory or timings):
+        yield
+        return
+
+    top = getattr(args, "top", DEFAULT_TOP)
+    timer = PhaseTimer(phases) if timings else None
+    profiler = cProfile.Profile() if profile else None
+    if timer:
+        timer.install()
+    if trace_memory:
+        tracemalloc.start()
+    started = time.perf_counter()
+    if profiler:
+        profiler.enable()
+    try:
+        yield
+    finally:
+        if profiler:
+            profiler.disable()
+        wall = time.perf_counter() - started
+        metrics = {"tool": tool, "argv": sys.argv[1:], "wall_seconds": wall}
+        if timer:
+            timer.uninstall()
+            metrics["phases"] = {name: {"seconds": timer.seconds[name], "calls": timer.calls[name]}
+                                 for name in sorted(timer.seconds, key=timer.seconds.get, reverse=True)}
+            metrics["unattributed_seconds"] = max(0.0, wall - sum(timer.seconds.values()))
+        if trace_memory:
+            peak = tracemalloc.get_traced_memory()[1]
+            snapshot = tracemalloc.take_snapshot()
+            tracemalloc.stop()
+            metrics["memory"] = {"peak_bytes": peak, "top": _memory_summary(snapshot, top)}
+        if profiler:
+            path = profile_output or f"{tool}.prof"
+            profiler.dump_stats(path)
+            metrics["profile"] = {"path": path, "top": _profile_summary(profiler, top)}
+
+        if getattr(args, "timings", False) or trace_memory or profile:
+            _report(metrics, sys.stderr)
+        if metrics_path:
+            try:
+                with open(metrics_path, "w") as f:
+                    json.dump(metrics, f, indent=2)
+                    f.write("\n")
+            except OSError as e:
+                print(f"Error: could not write metrics to {metrics_path}: {e}", file=sys.stderr)
@@ -0,0 +1,833 @@
+#!/usr/bin/env python
+"""
+Prerender for Arcade Hub
+
+Renders the game grid of index.html to static HTML and builds the Tailwind
+stylesheet the site uses, so the home page paints without any third-party
+script. Alpine.js still loads (deferred) and only shows and hides the
+prerendered cards for search and filtering.
+
+The grid is written between the `<!-- prerender:games -->` and
+`<!-- /prerender:games -->` markers of index.html, each card after a
+`<!-- game:<id> -->` comment. game_registry.py re-renders the cards of the
+games that change whenever the registry changes.
+
+css/tailwind.css is generated the way Tailwind's JIT compiler works, but
+offline and in Python: every token in index.html and js/*.js that names a
+Tailwind utility gets a rule, nothing else does. Only the utilities this
+site uses and their near neighbours are implemented (see UTILITIES); the
+build reports class names in index.html that are neither generated here
+nor defined in css/style.css.
+"""
+
+import os
+import re
+import sys
+import glob
+import html
+import json
+import hashlib
+import argparse
+
+
+SITE_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+INDEX_HTML_PATH = os.path.join(SITE_ROOT, "index.html")
+REGISTRY_PATH = os.path.join(SITE_ROOT, "data", "registry.jsonl")
+STYLESHEET = os.path.join("css", "tailwind.css")
+CUSTOM_STYLESHEET = os.path.join("css", "style.css")
+# The utilities in tailwind.css and a hash of the candidates they came from
+CLASS_CACHE = os.path.join("css", ".tailwind-classes.json")
+# Files scanned for class names, relative to the site root
+CONTENT_PATTERNS = ["index.html", os.path.join("js", "*.js")]
+
+GRID_BEGIN = "<!-- prerender:games -->"
+GRID_END = "<!-- /prerender:games -->"
+# Cards above the fold load their images eagerly
+EAGER_CARDS = 3
+CARD_INDENT = " " * 16
+
+# The theme of the old inline tailwind.config, on top of Tailwind's defaults
+THEME_COLORS = {"primary": "#6366F1", "secondary": "#EC4899", "dark": "#111827"}
+FONT_FAMILIES = {
+    "sans": "Inter, sans-serif",
+    "mono": 'ui-monospace, SFMono-Regular, Menlo, Monaco, Consolas, "Liberation Mono", "Courier New", monospace',
+}
+
+PALETTE = {
+    "gray": "f9fafb f3f4f6 e5e7eb d1d5db 9ca3af 6b7280 4b5563 374151 1f2937 111827",
+    "red": "fef2f2 fee2e2 fecaca fca5a5 f87171 ef4444 dc2626 b91c1c 991b1b 7f1d1d",
+    "yellow": "fefce8 fef9c3 fef08a fde047 facc15 eab308 ca8a04 a16207 854d0e 713f12",
+    "green": "f0fdf4 dcfce7 bbf7d0 86efac 4ade80 22c55e 16a34a 15803d 166534 14532d",
+    "blue": "eff6ff dbeafe bfdbfe 93c5fd 60a5fa 3b82f6 2563eb 1d4ed8 1e40af 1e3a8a",
+    "indigo": "eef2ff e0e7ff c7d2fe a5b4fc 818cf8 6366f1 4f46e5 4338ca 3730a3 312e81",
+    "purple": "faf5ff f3e8ff e9d5ff d8b4fe c084fc a855f7 9333ea 7e22ce 6b21a8 581c87",
+    "pink": "fdf2f8 fce7f3 fbcfe8 f9a8d4 f472b6 ec4899 db2777 be185d 9d174d 831843",
+}
+COLORS = {"white": "#ffffff", "black": "#000000", "transparent": "transparent", "current": "currentColor"}
+COLORS.update((f"{name}-{shade}", f"#{value}")
+              for name, values in PALETTE.items()
+              for shade, value in zip([50, 100, 200, 300, 400, 500, 600, 700, 800, 900], values.split()))
+COLORS.update(THEME_COLORS)
+
+SPACING = {"0": "0px", "px": "1px"}
+SPACING.update((f"{n:g}", f"{n / 4:g}rem") for n in [0.5, 1, 1.5, 2, 2.5, 3, 3.5] + list(range(4, 13))
+               + [14, 16, 20, 24, 28, 32, 36, 40, 44, 48, 52, 56, 60, 64, 72, 80, 96])
+FRACTIONS = {f"{a}/{b}": f"{a / b * 100:g}%" for b in (2, 3, 4) for a in range(1, b)}
+FRACTIONS["full"] = "100%"
+SCREENS = {"sm": "640px", "md": "768px", "lg": "1024px", "xl": "1280px", "2xl": "1536px"}
+# Pseudo-class variants, in the order their rules are emitted
+STATES = {"hover": ":hover", "focus": ":focus", "active": ":active", "disabled": ":disabled"}
+
+FONT_SIZES = {
+    "xs": ("0.75rem", "1rem"), "sm": ("0.875rem", "1.25rem"), "base": ("1rem", "1.5rem"),
+    "lg": ("1.125rem", "1.75rem"), "xl": ("1.25rem", "1.75rem"), "2xl": ("1.5rem", "2rem"),
+    "3xl": ("1.875rem", "2.25rem"), "4xl": ("2.25rem", "2.5rem"), "5xl": ("3rem", "1"), "6xl": ("3.75rem", "1"),
+}
+FONT_WEIGHTS = {"thin": 100, "extralight": 200, "light": 300, "normal": 400, "medium": 500,
+                "semibold": 600, "bold": 700, "extrabold": 800, "black": 900}
+RADII = {"none": "0px", "sm": "0.125rem", "": "0.25rem", "md": "0.375rem", "lg": "0.5rem",
+         "xl": "0.75rem", "2xl": "1rem", "3xl": "1.5rem", "full": "9999px"}
+SHADOWS = {
+    "sm": "0 1px 2px 0 rgb(0 0 0 / 0.05)",
+    "": "0 1px 3px 0 rgb(0 0 0 / 0.1), 0 1px 2px -1px rgb(0 0 0 / 0.1)",
+    "md": "0 4px 6px -1px rgb(0 0 0 / 0.1), 0 2px 4px -2px rgb(0 0 0 / 0.1)",
+    "lg": "0 10px 15px -3px rgb(0 0 0 / 0.1), 0 4px 6px -4px rgb(0 0 0 / 0.1)",
+    "xl": "0 20px 25px -5px rgb(0 0 0 / 0.1), 0 8px 10px -6px rgb(0 0 0 / 0.1)",
+    "2xl": "0 25px 50px -12px rgb(0 0 0 / 0.25)",
+    "none": "0 0 #0000",
+}
+MAX_WIDTHS = {"xs": "20rem", "sm": "24rem", "md": "28rem", "lg": "32rem", "xl": "36rem", "2xl": "42rem",
+              "3xl": "48rem", "4xl": "56rem", "5xl": "64rem", "6xl": "72rem", "7xl": "80rem",
+              "full": "100%", "none": "none"}
+LINE_HEIGHTS = {"none": "1", "tight": "1.25", "snug": "1.375", "normal": "1.5", "relaxed": "1.625", "loose": "2"}
+TRANSITIONS = {
+    "": "color, background-color, border-color, text-decoration-color, fill, stroke, opacity, box-shadow, "
+        "transform, filter, backdrop-filter",
+    "all": "all",
+    "colors": "color, background-color, border-color, text-decoration-color, fill, stroke",
+    "opacity": "opacity",
+    "shadow": "box-shadow",
+    "transform": "transform",
+}
+
+_TRANSFORM = ("translate(var(--tw-translate-x), var(--tw-translate-y)) rotate(var(--tw-rotate)) "
+              "scaleX(var(--tw-scale-x)) scaleY(var(--tw-scale-y))")
+_BOX_SHADOW = "var(--tw-ring-offset-shadow, 0 0 #0000), var(--tw-ring-shadow, 0 0 #0000), var(--tw-shadow)"
+_SIDES = {"": [""], "x": ["-left", "-right"], "y": ["-top", "-bottom"],
+          "t": ["-top"], "r": ["-right"], "b": ["-bottom"], "l": ["-left"]}
+_GRADIENT_SIDES = {"t": "top", "tr": "top right", "r": "right", "br": "bottom right",
+                   "b": "bottom", "bl": "bottom left", "l": "left", "tl": "top left"}
+
+PREFLIGHT = """*, ::before, ::after {
+  box-sizing: border-box; border-width: 0; border-style: solid; border-color: #e5e7eb;
+  --tw-translate-x: 0; --tw-translate-y: 0; --tw-rotate: 0; --tw-scale-x: 1; --tw-scale-y: 1;
+  --tw-ring-offset-width: 0px; --tw-ring-offset-color: #fff; --tw-ring-color: rgb(59 130 246 / 0.5);
+  --tw-ring-offset-shadow: 0 0 #0000; --tw-ring-shadow: 0 0 #0000; --tw-shadow: 0 0 #0000;
+}
+html { line-height: 1.5; -webkit-text-size-adjust: 100%%; tab-size: 4; font-family: %(sans)s; }
+body { margin: 0; line-height: inherit; }
+hr { height: 0; color: inherit; border-top-width: 1px; }
+h1, h2, h3, h4, h5, h6 { font-size: inherit; font-weight: inherit; }
+a { color: inherit; text-decoration: inherit; }
+b, strong { font-weight: bolder; }
+code, kbd, samp, pre { font-family: %(mono)s; font-size: 1em; }
+small { font-size: 80%%; }
+table { text-indent: 0; border-color: inherit; border-collapse: collapse; }
+button, input, optgroup, select, textarea {
+  font-family: inherit; font-size: 100%%; font-weight: inherit; line-height: inherit; color: inherit; margin: 0; padding: 0;
+}
+button, select { text-transform: none; }
+button, [type='button'], [type='reset'], [type='submit'] {
+  -webkit-appearance: button; background-color: transparent; background-image: none;
+}
+blockquote, dl, dd, h1, h2, h3, h4, h5, h6, hr, figure, p, pre { margin: 0; }
+fieldset { margin: 0; padding: 0; }
+ol, ul, menu { list-style: none; margin: 0; padding: 0; }
+textarea { resize: vertical; }
+input::placeholder, textarea::placeholder { opacity: 1; color: #9ca3af; }
+button, [role="button"] { cursor: pointer; }
+:disabled { cursor: default; }
+img, svg, video, canvas, audio, iframe, embed, object { display: block; vertical-align: middle; }
+img, video { max-width: 100%%; height: auto; }
+[hidden] { display: none; }
+[x-cloak] { display: none !important; }
+""" % FONT_FAMILIES
+
+_CANDIDATE_PATTERN = re.compile(r"""[^\s<>"'`=]+""")
+_CLASS_ATTRIBUTE_PATTERN = re.compile(r'\sclass="([^"]*)"')
+_CSS_CLASS_PATTERN = re.compile(r"\.((?:[\w-]|\\.)+)")
+
+
+def _color(name):
+    """Resolve `gray-100` or `white/20` to a CSS colour, or None."""
+    name, _, alpha = name.partition("/")
+    value = COLORS.get(name)
+    if value is None or not alpha:
+        return value
+    if not alpha.isdigit() or not value.startswith("#"):
+        return None
+    r, g, b = (int(value[i:i + 2], 16) for i in (1, 3, 5))
+    return f"rgb({r} {g} {b} / {int(alpha) / 100:g})"
+
+
+def _spacing(value, negative=False, extra=None):
+    result = SPACING.get(value) or (extra or {}).get(value)
+    if result is None:
+        return None
+    if negative:
+        return None if result in ("0px", "auto") else "-" + result
+    return result
+
+
+def _box(prefix, properties):
+    """Utilities like `mt-4` and `px-2`: one CSS property per side."""
+    def handler(name, negative):
+        match = re.fullmatch(prefix + r"([xytrbl]?)-(.+)", name)
+        if not match:
+            return None
+        extra = {"auto": "auto"} if prefix == "m" else None
+        value = _spacing(match.group(2), negative, extra)
+        if value is None or (negative and prefix == "p"):
+            return None
+        return [(properties + side, value) for side in _SIDES[match.group(1)]]
+    return handler
+
+
+def _keyword(table):
+    """Utilities whose whole name maps to fixed declarations."""
+    return lambda name, negative: None if negative else table.get(name)
+
+
+def _prefixed(prefix, table, build):
+    """Utilities `<prefix>-<key>` (or just `<prefix>` for the "" key) looked up in a table."""
+    def handler(name, negative):
+        if negative:
+            return None
+        if name == prefix and "" in table:
+            return build(table[""])
+        if name.startswith(prefix + "-") and name[len(prefix) + 1:] in table:
+            return build(table[name[len(prefix) + 1:]])
+        return None
+    return handler
+
+
+def _colored(prefix, build):
+    def handler(name, negative):
+        if negative or not name.startswith(prefix + "-"):
+            return None
+        value = _color(name[len(prefix) + 1:])
+        return None if value is None else build(value)
+    return handler
+
+
+def _sized(prefix, prop, extra):
+    def handler(name, negative):
+        if negative or not name.startswith(prefix + "-"):
+            return None
+        key = name[len(prefix) + 1:]
+        value = SPACING.get(key) or extra.get(key)
+        return None if value is None else [(prop, value)]
+    return handler
+
+
+def _inset(name, negative):
+    match = re.fullmatch(r"(inset|top|right|bottom|left)-(.+)", name)
+    if not match:
+        return None
+    value = _spacing(match.group(2), negative, dict(FRACTIONS, auto="auto"))
+    if value is None:
+        return None
+    return [(match.group(1), value)]
+
+
+def _translate(name, negative):
+    match = re.fullmatch(r"translate-([xy])-(.+)", name)
+    value = match and _spacing(match.group(2), negative, FRACTIONS)
+    if not value:
+        return None
+    return [(f"--tw-translate-{match.group(1)}", value), ("transform", _TRANSFORM)]
+
+
+def _scale(name, negative):
+    match = re.fullmatch(r"scale-(\d+)", name)
+    if negative or not match or match.group(1) not in ("0", "50", "75", "90", "95", "100", "105", "110", "125", "150"):
+        return None
+    value = f"{int(match.group(1)) / 100:g}"
+    return [("--tw-scale-x", value), ("--tw-scale-y", value), ("transform", _TRANSFORM)]
+
+
+def _space(name, negative):
+    match = re.fullmatch(r"space-([xy])-(.+)", name)
+    value = match and _spacing(match.group(2), negative)
+    if not value:
+        return None
+    side = "margin-left" if match.group(1) == "x" else "margin-top"
+    return [(side, value)], " > :not([hidden]) ~ :not([hidden])"
+
+
+def _grid(name, negative):
+    match = re.fullmatch(r"grid-cols-(\d+)", name)
+    if negative or not match or not 1 <= int(match.group(1)) <= 12:
+        return None
+    return [("grid-template-columns", f"repeat({match.group(1)}, minmax(0, 1fr))")]
+
+
+def _col_span(name, negative):
+    if name == "col-span-full":
+        return [("grid-column", "1 / -1")]
+    match = re.fullmatch(r"col-span-(\d+)", name)
+    if negative or not match or not 1 <= int(match.group(1)) <= 12:
+        return None
+    return [("grid-column", f"span {match.group(1)} / span {match.group(1)}")]
+
+
+def _z_index(name, negative):
+    match = re.fullmatch(r"z-(0|10|20|30|40|50|auto)", name)
+    if not match or (negative and match.group(1) in ("0", "auto")):
+        return None
+    return [("z-index", ("-" if negative else "") + match.group(1))]
+
+
+def _opacity(name, negative):
+    match = re.fullmatch(r"opacity-(\d+)", name)
+    if negative or not match or int(match.group(1)) > 100 or int(match.group(1)) % 5:
+        return None
+    return [("opacity", f"{int(match.group(1)) / 100:g}")]
+
+
+def _duration(name, negative):
+    match = re.fullmatch(r"duration-(75|100|150|200|300|500|700|1000)", name)
+    return None if negative or not match else [("transition-duration", match.group(1) + "ms")]
+
+
+def _border_width(name, negative):
+    match = re.fullmatch(r"border(?:-([xytrbl]))?(?:-(0|2|4|8))?", name)
+    if negative or not match:
+        return None
+    width = (match.group(2) or "1") + "px"
+    return [(f"border{side}-width", width) for side in _SIDES[match.group(1) or ""]]
+
+
+def _ring(name, negative):
+    match = re.fullmatch(r"ring(?:-(0|1|2|4|8))?", name)
+    if negative or not match:
+        return None
+    width = (match.group(1) or "3") + "px"
+    return [("--tw-ring-offset-shadow", "0 0 0 var(--tw-ring-offset-width) var(--tw-ring-offset-color)"),
+            ("--tw-ring-shadow", f"0 0 0 calc({width} + var(--tw-ring-offset-width)) var(--tw-ring-color)"),
+            ("box-shadow", "var(--tw-ring-offset-shadow), var(--tw-ring-shadow), var(--tw-shadow, 0 0 #0000)")]
+
+
+def _gradient_from(value):
+    transparent = "rgb(255 255 255 / 0)" if not value.startswith("#") else _color_alpha_zero(value)
+    return [("--tw-gradient-from", value), ("--tw-gradient-to", transparent),
+            ("--tw-gradient-stops", "var(--tw-gradient-from), var(--tw-gradient-to)")]
+
+
+def _color_alpha_zero(value):
+    r, g, b = (int(value[i:i + 2], 16) for i in (1, 3, 5))
+    return f"rgb({r} {g} {b} / 0)"
+
+
+def _container(name, negative):
+    if negative or name != "container":
+        return None
+    return [("width", "100%")], "", [(screen, [("max-width", width)]) for screen, width in SCREENS.items()]
+
+
+# Utility families in the order Tailwind emits them; later families win ties
+UTILITIES = [
+    _container,
+    _keyword({"sr-only": [("position", "absolute"), ("width", "1px"), ("height", "1px"), ("padding", "0"),
+                          ("margin", "-1px"), ("overflow", "hidden"), ("clip", "rect(0, 0, 0, 0)"),
+                          ("white-space", "nowrap"), ("border-width", "0")]}),
+    _keyword({name: [("position", name)] for name in ("static", "fixed", "absolute", "relative", "sticky")}),
+    _inset,
+    _z_index,
+    _col_span,
+    _box("m", "margin"),
+    _keyword({"block": [("display", "block")], "inline-block": [("display", "inline-block")],
+              "inline": [("display", "inline")], "flex": [("display", "flex")],
+              "inline-flex": [("display", "inline-flex")], "table": [("display", "table")],
+              "grid": [("display", "grid")], "hidden": [("display", "none")]}),
+    _sized("h", "height", dict(FRACTIONS, auto="auto", screen="100vh")),
+    _keyword({"min-h-screen": [("min-height", "100vh")], "min-h-full": [("min-height", "100%")]}),
+    _sized("w", "width", dict(FRACTIONS, auto="auto", screen="100vw")),
+    _prefixed("max-w", MAX_WIDTHS, lambda value: [("max-width", value)]),
+    _keyword({"flex-1": [("flex", "1 1 0%")], "flex-auto": [("flex", "1 1 auto")],
+              "flex-none": [("flex", "none")], "flex-shrink-0": [("flex-shrink", "0")],
+              "flex-grow": [("flex-grow", "1")]}),
+    _translate,
+    _scale,
+    _keyword({"transform": [("transform", _TRANSFORM)]}),
+    _keyword({"cursor-pointer": [("cursor", "pointer")], "cursor-not-allowed": [("cursor", "not-allowed")]}),
+    _keyword({"select-none": [("user-select", "none")]}),
+    _grid,
+    _keyword({"flex-row": [("flex-direction", "row")], "flex-col": [("flex-direction", "column")],
+              "flex-wrap": [("flex-wrap", "wrap")], "flex-nowrap": [("flex-wrap", "nowrap")]}),
+    _keyword({f"items-{name}": [("align-items", value)] for name, value in
+              [("start", "flex-start"), ("end", "flex-end"), ("center", "center"),
+               ("baseline", "baseline"), ("stretch", "stretch")]}),
+    _keyword({f"justify-{name}": [("justify-content", value)] for name, value in
+              [("start", "flex-start"), ("end", "flex-end"), ("center", "center"),
+               ("between", "space-between"), ("around", "space-around"), ("evenly", "space-evenly")]}),
+    _sized("gap", "gap", {}),
+    _sized("gap-x", "column-gap", {}),
+    _sized("gap-y", "row-gap", {}),
+    _space,
+    _keyword({f"overflow{axis}-{value}": [(f"overflow{axis}", value)]
+              for axis in ("", "-x", "-y") for value in ("auto", "hidden", "visible", "scroll")}),
+    _keyword({"truncate": [("overflow", "hidden"), ("text-overflow", "ellipsis"), ("white-space", "nowrap")],
+              "whitespace-nowrap": [("white-space", "nowrap")]}),
+    _prefixed("rounded", RADII, lambda value: [("border-radius", value)]),
+    _border_width,
+    _colored("border", lambda value: [("border-color", value)]),
+    _colored("bg", lambda value: [("background-color", value)]),
+    _keyword({f"bg-gradient-to-{side}": [("background-image", f"linear-gradient(to {direction}, "
+                                                             "var(--tw-gradient-stops))")]
+              for side, direction in _GRADIENT_SIDES.items()}),
+    _colored("from", _gradient_from),
+    _colored("via", lambda value: [("--tw-gradient-stops", f"var(--tw-gradient-from), {value}, "
+                                                           "var(--tw-gradient-to)")]),
+    _colored("to", lambda value: [("--tw-gradient-to", value)]),
+    _keyword({"object-cover": [("object-fit", "cover")], "object-contain": [("object-fit", "contain")]}),
+    _box("p", "padding"),
+    _keyword({f"text-{align}": [("text-align", align)] for align in ("left", "center", "right", "justify")}),
+    _prefixed("font", {name: family for name, family in FONT_FAMILIES.items()},
+              lambda value: [("font-family", value)]),
+    _prefixed("text", FONT_SIZES, lambda value: [("font-size", value[0]), ("line-height", value[1])]),
+    _prefixed("font", {name: str(weight) for name, weight in FONT_WEIGHTS.items()},
+              lambda value: [("font-weight", value)]),
+    _keyword({"uppercase": [("text-transform", "uppercase")], "lowercase": [("text-transform", "lowercase")],
+              "capitalize": [("text-transform", "capitalize")]}),
+    _prefixed("leading", LINE_HEIGHTS, lambda value: [("line-height", value)]),
+    _colored("text", lambda value: [("color", value)]),
+    _keyword({"underline": [("text-decoration-line", "underline")],
+              "no-underline": [("text-decoration-line", "none")]}),
+    _opacity,
+    _prefixed("shadow", SHADOWS, lambda value: [("--tw-shadow", value), ("box-shadow", _BOX_SHADOW)]),
+    _keyword({"outline-none": [("outline", "2px solid transparent"), ("outline-offset", "2px")]}),
+    _ring,
+    _colored("ring", lambda value: [("--tw-ring-color", value)]),
+    _prefixed("transition", TRANSITIONS, lambda value: [
+        ("transition-property", value), ("transition-timing-function", "cubic-bezier(0.4, 0, 0.2, 1)"),
+        ("transition-duration", "150ms")]),
+    _duration,
+]
+
+
+def extract_candidates(text):
+    """Return every token of a file that could be a class name, as Tailwind's content scanner does."""
+    return set(_CANDIDATE_PATTERN.findall(text))
+
+
+def resolve_utility(candidate):
+    """
+    Work out the CSS for one class name.
+
+    Args:
+        candidate (str): A class name such as `md:hover:bg-white/20`
+
+    Returns:
+        tuple: (screen, state, family, declarations, selector suffix, nested)
+            where nested lists per-screen declarations (used by `container`),
+            or None if the name is not a utility
+    """
+    *variants, name = candidate.split(":")
+    screen = state = None
+    for variant in variants:
+        if variant in SCREENS and screen is None:
+            screen = variant
+        elif variant in STATES and state is None:
+            state = variant
+        else:
+            return None
+    negative = name.startswith("-")
+    if negative:
+        name = name[1:]
+    if not name:
+        return None
+    for family, handler in enumerate(UTILITIES):
+        result = handler(name, negative)
+        if result:
+            if isinstance(result, list):
+                result = (result,)
+            declarations, suffix, nested = result + ("", [])[len(result) - 1:]
+            return screen, state, family, declarations, suffix, nested
+    return None
+
+
+def _escape(class_name):
+    return re.sub(r"([^\w-])", r"\\\1", class_name)
+
+
+def _rule(selector, declarations):
+    return f"{selector} {{ " + " ".join(f"{prop}: {value};" for prop, value in declarations) + " }"
+
+
+def generate_stylesheet(candidates):
+    """
+    Build the CSS for every candidate that names a utility.
+
+    Args:
+        candidates (iterable): Possible class names
+
+    Returns:
+        tuple: (CSS text, sorted list of the class names it styles)
+    """
+    screens = list(SCREENS)
+    states = [None] + list(STATES)
+    rules = []
+    for candidate in candidates:
+        resolved = resolve_utility(candidate)
+        if resolved is None:
+            continue
+        screen, state, family, declarations, suffix, nested = resolved
+        selector = "." + _escape(candidate) + (STATES[state] if state else "") + suffix
+        rules.append(((screens.index(screen) + 1 if screen else 0, states.index(state), family, candidate),
+                      candidate, screen, _rule(selector, declarations)))
+        for nested_screen, nested_declarations in nested:
+            rules.append(((screens.index(nested_screen) + 1, states.index(state), family, candidate),
+                          candidate, nested_screen, _rule(selector, nested_declarations)))
+    rules.sort()
+
+    lines = ["/* Generated by tools/prerender.py from the classes used in index.html and js/. Do not edit. */",
+             PREFLIGHT.rstrip()]
+    current_screen = None
+    for _, _, screen, rule in rules:
+        if screen != current_screen:
+            if current_screen:
+                lines.append("}")
+            if screen:
+                lines.append(f"@media (min-width: {SCREENS[screen]}) {{")
+            current_screen = screen
+        lines.append(("  " if screen else "") + rule)
+    if current_screen:
+        lines.append("}")
+    return "\n".join(lines) + "\n", sorted({candidate for _, candidate, _, _ in rules})
+
+
+def _read(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return f.read()
+
+
+def _load_class_cache(site_root):
+    """Return the recorded utilities and candidate hash of the stylesheet, or None."""
+    try:
+        cache = json.loads(_read(os.path.join(site_root, CLASS_CACHE)))
+    except (OSError, ValueError):
+        return None
+    if not isinstance(cache, dict) or not isinstance(cache.get("utilities"), list):
+        return None
+    return cache
+
+
+def _write(path, content):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    temp_path = path + ".tmp"
+    with open(temp_path, "w", encoding="utf-8") as f:
+        f.write(content)
+    os.replace(temp_path, path)
+
+
+def stylesheet_covers(text, site_root=SITE_ROOT):
+    """
+    Check whether css/tailwind.css already styles every utility in a text.
+
+    Used when cards are added to index.html: if the new markup brings no
+    utility the stylesheet lacks, it does not need rebuilding. Rules of
+    utilities no longer used are only dropped by the next full build.
+
+    Args:
+        text (str): New content, such as freshly rendered cards
+        site_root (str): Directory holding index.html, js/ and css/
+
+    Returns:
+        bool: True if no rebuild is needed
+    """
+    cache = _load_class_cache(site_root)
+    if cache is None or not os.path.exists(os.path.join(site_root, STYLESHEET)):
+        return False
+    utilities = set(cache["utilities"])
+    return all(candidate in utilities or resolve_utility(candidate) is None
+               for candidate in extract_candidates(text))
+
+
+def build_stylesheet(site_root=SITE_ROOT):
+    """
+    Regenerate css/tailwind.css from the site's content files.
+
+    The stylesheet is only generated again when the set of candidate class
+    names differs from the one it was last built from.
+
+    Args:
+        site_root (str): Directory holding index.html, js/ and css/
+
+    Returns:
+        dict: "path" of the stylesheet, number of "utilities", "changed"
+            and the "unknown" class names of index.html
+    """
+    candidates = set()
+    index_path = os.path.join(site_root, "index.html")
+    index_content = None
+    for pattern in CONTENT_PATTERNS:
+        for path in sorted(glob.glob(os.path.join(site_root, pattern))):
+            content = _read(path)
+            if path == index_path:
+                index_content = content
+            candidates |= extract_candidates(content)
+    digest = hashlib.sha256("\n".join(sorted(candidates)).encode("utf-8")).hexdigest()
+
+    path = os.path.join(site_root, STYLESHEET)
+    cache = _load_class_cache(site_root)
+    if cache is not None and cache.get("candidates") == digest and os.path.exists(path):
+        utilities = cache["utilities"]
+        changed = False
+    else:
+        css, utilities = generate_stylesheet(candidates)
+        changed = not os.path.exists(path) or _read(path) != css
+        if changed:
+            _write(path, css)
+        _write(os.path.join(site_root, CLASS_CACHE), json.dumps({"candidates": digest, "utilities": utilities}))
+
+    custom_path = os.path.join(site_root, CUSTOM_STYLESHEET)
+    custom = {re.sub(r"\\(.)", r"\1", name) for name in _CSS_CLASS_PATTERN.findall(_read(custom_path))} \
+        if os.path.exists(custom_path) else set()
+    used = set()
+    if index_content is not None:
+        for attribute in _CLASS_ATTRIBUTE_PATTERN.findall(index_content):
+            used.update(attribute.split())
+    unknown = sorted(used - set(utilities) - custom)
+    return {"path": path, "utilities": len(utilities), "changed": changed, "unknown": unknown}
+
+
+def _js_string(value):
+    """Encode a value as a single-quoted JS string safe inside an HTML attribute."""
+    value = str(value).replace("\\", "\\\\").replace("'", "\\'")
+    return "'" + html.escape(value, quote=False).replace('"', "&quot;") + "'"
+
+
+def render_card(game, eager=False):
+    """
+    Render one game card of the grid as static HTML.
+
+    Args:
+        game (dict): Registry entry
+        eager (bool): Load the image straight away instead of lazily
+
+    Returns:
+        str: The card markup, indented for the grid
+    """
+    game_id = html.escape(game["id"])
+    title = html.escape(game.get("title", ""))
+    image = game.get("image", "")
+    srcset = ""
+    if image.endswith(".png"):
+        base = html.escape(image[:-4])
+        srcset = f' srcset="{base}-200w.png 200w, {base}.png 400w, {base}-800w.png 800w"'
+    loading = "" if eager else 'loading="lazy" '
+    badge = "bg-blue-100 text-blue-800" if game.get("category") == "game" else "bg-green-100 text-green-800"
+    tags = "\n".join(f'        <span class="bg-gray-100 text-gray-800 text-xs px-2 py-1 rounded-full">'
+                     f'{html.escape(tag)}</span>' for tag in game.get("tags", []))
+    lines = [
+        f'<div x-show="shows({_js_string(game["id"])})" data-game-id="{game_id}"',
+        '    class="bg-white rounded-xl shadow-md overflow-hidden transform transition-all duration-300 '
+        'hover:shadow-lg hover:scale-105">',
+        '    <div class="relative pb-2/3">',
+        f'        <img src="{html.escape(image)}" alt="{title}"{srcset}',
+        '            sizes="(min-width: 1024px) 33vw, (min-width: 768px) 50vw, 100vw"',
+        f'            {loading}class="absolute h-full w-full object-cover">',
+        '    </div>',
+        '    <div class="p-6">',
+        '        <div class="flex justify-between items-start">',
+        f'            <h2 class="text-xl font-bold mb-2">{title}</h2>',
+        f'            <span class="{badge} text-xs px-2 py-1 rounded-full font-medium">'
+        f'{html.escape(game.get("category", ""))}</span>',
+        '        </div>',
+        f'        <p class="text-gray-600 mb-4">{html.escape(game.get("description", ""))}</p>',
+        '        <div class="flex flex-wrap gap-2 mb-4">',
+    ]
+    lines.extend("    " + line for line in tags.split("\n") if line)
+    lines += [
+        '        </div>',
+        f'        <a href="games/{game_id}/"',
+        '            class="block w-full bg-primary hover:bg-primary/90 text-white font-medium py-2 px-4 '
+        'rounded-lg text-center transition-colors duration-200">',
+        '            Play Now',
+        '        </a>',
+        '    </div>',
+        '</div>',
+    ]
+    return "\n".join(CARD_INDENT + line for line in lines)
+
+
+def _card_marker(game_id):
+    """Return the comment line that starts a game's card in the grid."""
+    # "--" may not appear inside an HTML comment
+    return f"{CARD_INDENT}<!-- game:{html.escape(game_id).replace('--', '-&#45;')} -->\n"
+
+
+def _render_block(game, eager):
+    return _card_marker(game["id"]) + render_card(game, eager) + "\n"
+
+
+def render_grid(games):
+    """
+    Render the cards of every game, in display order.
+
+    Args:
+        games (iterable): Registry entries, newest first
+
+    Returns:
+        str: Text to place between the grid markers
+    """
+    return "\n" + "".join(_render_block(game, i < EAGER_CARDS) for i, game in enumerate(games)) + CARD_INDENT
+
+
+def has_grid(content):
+    """Return True if a page has prerender markers for the game grid."""
+    return GRID_BEGIN in content and GRID_END in content
+
+
+def replace_grid(content, games):
+    """
+    Put freshly rendered cards between the grid markers of a page.
+
+    Args:
+        content (str): The page
+        games (iterable): Registry entries, newest first
+
+    Returns:
+        str: The page with the new grid
+    """
+    start = content.index(GRID_BEGIN) + len(GRID_BEGIN)
+    end = content.index(GRID_END, start)
+    return content[:start] + render_grid(games) + content[end:]
+
+
+def splice(content, span, head, edits):
+    """
+    Apply a set of edits to a region of a page in a single copy.
+
+    Args:
+        content (str): The page
+        span (tuple): (start, end) offsets of the region
+        head (str): Text to insert at the start of the region
+        edits (dict): Maps the start offset of each replaced stretch to
+            (end offset, replacement text)
+
+    Returns:
+        tuple: (new page, (start, end) offsets of the edited region)
+    """
+    pieces = [content[:span[0]], head]
+    position = span[0]
+    end = span[1] + len(head)
+    for start in sorted(edits):
+        stop, text = edits[start]
+        pieces.append(content[position:start])
+        pieces.append(text)
+        position = stop
+        end += len(text) - (stop - start)
+    pieces.append(content[position:])
+    return "".join(pieces), (span[0], end)
+
+
+def _find_card(content, start, end, game_id):
+    """
+    Locate one game's card between offsets of the grid.
+
+    A card ends where the next comment line starts (the next card's marker
+    or the end marker); card text is escaped, so it never contains "<!--".
+
+    Returns:
+        tuple: (start, end) offsets, or None if the game has no card
+    """
+    found = content.find("\n" + _card_marker(game_id), start - 1, end) + 1
+    if found == 0:
+        return None
+    return found, content.find("\n" + CARD_INDENT + "<!-- ", found) + 1
+
+
+def patch_grid(content, registry, changes):
+    """
+    Re-render the cards of the changed games in place.
+
+    Besides the changed cards, only the newest cards whose eager or lazy
+    image loading may have shifted are rendered again.
+
+    Args:
+        content (str): The page, with grid markers
+        registry: The game registry (a game_registry.GameRegistry)
+        changes (list): (game id, outcome) pairs, as reported by
+            GameRegistry.apply
+
+    Returns:
+        tuple: (new page, text of the rendered cards), or None if the grid
+            has to be rendered in full (no card markers or out of step)
+    """
+    start = content.find(GRID_BEGIN)
+    if start == -1:
+        return None
+    start = content.find("\n", start) + 1
+    end = content.find(GRID_END, start)
+    if start == 0 or end == -1:
+        return None
+
+    changed = {game_id for game_id, outcome in changes if outcome != "missing"}
+    # Cards added or removed move the ones after them, so the newest cards
+    # whose eager or lazy loading may flip are cut and put back at the top
+    shifted = sum(outcome in ("added", "removed") for _, outcome in changes)
+    newest = registry.newest(EAGER_CARDS + shifted)
+
+    edits = {}
+    for game_id in changed | set(newest):
+        found = _find_card(content, start, end, game_id)
+        if game_id in newest or game_id not in registry:
+            if found is not None:
+                edits[found[0]] = (found[1], "")
+        elif found is None:
+            return None
+        else:
+            edits[found[0]] = (found[1], _render_block(registry.get(game_id), eager=False))
+    head = "".join(_render_block(registry.get(game_id), eager=position < EAGER_CARDS)
+                   for position, game_id in enumerate(newest))
+    rendered = head + "".join(text for _, text in edits.values())
+
+    content, (start, end) = splice(content, (start, end), head, edits)
+    if content.count("\n" + CARD_INDENT + "<!-- game:", start - 1, end) != len(registry):
+        return None
+    return content, rendered
+
+
+def main():
+    """Main entry point for the script."""
+    # game_registry re-renders the grid through this module, so import it here
+    import game_registry
+
+    parser = argparse.ArgumentParser(description="Prerender the game grid and build the Tailwind stylesheet")
+    parser.add_argument("--registry", default=REGISTRY_PATH, help="Path to the JSONL registry log")
+    parser.add_argument("--index-html", default=INDEX_HTML_PATH, help="Path to index.html")
+    parser.add_argument("--css-only", action="store_true", help="Only rebuild css/tailwind.css")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.index_html):
+        print(f"Error: '{args.index_html}' not found")
+        sys.exit(1)
+    if not args.css_only:
+        if not has_grid(_read(args.index_html)):
+            print(f"Error: '{args.index_html}' has no {GRID_BEGIN} ... {GRID_END} markers")
+            sys.exit(1)
+        registry = game_registry.load_registry(args.registry, args.index_html)
+        game_registry.write_index_html(registry, args.index_html)
+        print(f"✓ Prerendered {len(registry)} games in {args.index_html}")
+
+    summary = build_stylesheet(os.path.dirname(os.path.abspath(args.index_html)))
+    print(f"✓ Built {summary['path']} ({summary['utilities']} utilities)")
+    if summary["unknown"]:
+        print("Warning: classes in index.html with no rule in tailwind.css or style.css: "
+              + ", ".join(summary["unknown"]))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,392 @@
+#!/usr/bin/env python
+"""
+Near-Duplicate Detection for Arcade Hub Game Proposals
+
+Each proposal is reduced to a MinHash signature over its word shingles.
+Signatures are split into bands and stored in locality-sensitive hashing
+(LSH) buckets, so a new proposal is only compared against the handful of
+existing proposals that share a bucket with it, not the whole directory.
+
+The signatures of a proposals directory are kept in an append-only binary
+file inside it (.minhash_index.bin), together with the size and mtime of
+each file. Syncing the index only reads new and changed proposal files;
+deleted ones get a tombstone record, and the file is compacted once dead
+records make up a quarter of it.
+"""
+
+import os
+import re
+import struct
+import random
+import hashlib
+import tempfile
+import argparse
+from array import array
+
+
+INDEX_FILE = ".minhash_index.bin"
+
+NUM_PERMUTATIONS = 128
+BANDS = 16
+ROWS_PER_BAND = NUM_PERMUTATIONS // BANDS
+SHINGLE_SIZE = 3
+DEFAULT_THRESHOLD = 0.8
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_WORD_PATTERN = re.compile(r"[a-z0-9]+")
+_MAGIC = b"MHI2"
+# Record kind, name length, file mtime (ns) and size; "add" records are
+# followed by the name and the signature, "remove" records by the name only
+_RECORD = struct.Struct("<BHqQ")
+_ADD, _REMOVE = 0, 1
+
+# Fixed permutation parameters, so signatures stay comparable across runs
+_rng = random.Random(0x5EED)
+_PERMUTATIONS = [(_rng.randrange(1, _MERSENNE_PRIME), _rng.randrange(0, _MERSENNE_PRIME))
+                 for _ in range(NUM_PERMUTATIONS)]
+del _rng
+
+
+def shingles(text, size=SHINGLE_SIZE):
+    """
+    Split text into a set of hashed word shingles.
+
+    Args:
+        text (str): The proposal text
+        size (int): Number of words per shingle
+
+    Returns:
+        set: 64-bit shingle hashes
+    """
+    words = _WORD_PATTERN.findall(text.lower())
+    if len(words) < size:
+        words = words + [""] * (size - len(words))
+    return {
+        int.from_bytes(hashlib.blake2b(" ".join(words[i:i + size]).encode("utf-8"), digest_size=8).digest(), "little")
+        for i in range(len(words) - size + 1)
+    }
+
+
+def minhash_signature(text):
+    """
+    Compute the MinHash signature of a proposal.
+
+    Args:
+        text (str): The proposal text
+
+    Returns:
+        array: NUM_PERMUTATIONS unsigned 64-bit minimums
+    """
+    values = shingles(text)
+    prime = _MERSENNE_PRIME
+    return array("Q", (min((a * x + b) % prime for x in values) for a, b in _PERMUTATIONS))
+
+
+def estimated_similarity(signature_a, signature_b):
+    """Estimate the Jaccard similarity of two proposals from their signatures."""
+    matches = sum(1 for a, b in zip(signature_a, signature_b) if a == b)
+    return matches / len(signature_a)
+
+
+def _band_keys(signature):
+    """Return one bucket key per band of a signature."""
+    return [(band, hash(tuple(signature[band * ROWS_PER_BAND:(band + 1) * ROWS_PER_BAND])))
+            for band in range(BANDS)]
+
+
+class ProposalIndex:
+    """
+    Persistent LSH index of proposal signatures for one directory.
+
+    Proposals get a new position every time they are (re)indexed; the
+    positions of changed or deleted files are marked dead and skipped.
+
+    Args:
+        directory (str): The proposals directory
+        persist (bool): Append new signatures to the index file
+    """
+
+    def __init__(self, directory="proposals", persist=True):
+        self.directory = directory
+        self.path = os.path.join(directory, INDEX_FILE)
+        self.persist = persist
+        self._reset()
+        self._load()
+
+    def _reset(self):
+        self._names = []
+        self._signatures = []
+        self._alive = bytearray()
+        self._buckets = {}
+        self._files = {}         # name -> (position, mtime_ns, size)
+        self.dead = 0
+        self._records = 0        # records in the index file, tombstones included
+        self._rewrite = True     # the index file is missing or unusable
+
+    def _load(self):
+        try:
+            with open(self.path, "rb") as f:
+                data = f.read()
+        except OSError:
+            return
+        if not data.startswith(_MAGIC):
+            # Older or foreign file; it is rewritten on the next change
+            return
+        self._rewrite = False
+        offset = len(_MAGIC)
+        record_size = NUM_PERMUTATIONS * 8
+        while offset + _RECORD.size <= len(data):
+            kind, length, mtime_ns, size = _RECORD.unpack_from(data, offset)
+            start = offset + _RECORD.size
+            end = start + length + (record_size if kind == _ADD else 0)
+            if end > len(data):
+                # Torn write at the end of the file, ignore the partial record
+                break
+            name = data[start:start + length].decode("utf-8")
+            if kind == _ADD:
+                signature = array("Q")
+                signature.frombytes(data[end - record_size:end])
+                self._add(name, signature, mtime_ns, size)
+            else:
+                self._remove(name)
+            self._records += 1
+            offset = end
+
+    def _add(self, name, signature, mtime_ns=0, size=0):
+        self._remove(name)
+        position = len(self._names)
+        self._names.append(name)
+        self._signatures.append(signature)
+        self._alive.append(1)
+        self._files[name] = (position, mtime_ns, size)
+        for key in _band_keys(signature):
+            self._buckets.setdefault(key, []).append(position)
+
+    def _remove(self, name):
+        known = self._files.pop(name, None)
+        if known is None:
+            return False
+        self._alive[known[0]] = 0
+        self.dead += 1
+        return True
+
+    def _append(self, records):
+        """Append encoded records to the index file."""
+        os.makedirs(self.directory, exist_ok=True)
+        with open(self.path, "wb" if self._rewrite else "ab") as f:
+            if self._rewrite:
+                f.write(_MAGIC)
+                self._records = 0
+            f.write(b"".join(records))
+        self._records += len(records)
+        self._rewrite = False
+
+    @staticmethod
+    def _encode(kind, name, mtime_ns=0, size=0, signature=None):
+        encoded = name.encode("utf-8")
+        record = _RECORD.pack(kind, len(encoded), mtime_ns, size) + encoded
+        return record + signature.tobytes() if signature is not None else record
+
+    def __len__(self):
+        return len(self._files)
+
+    def __contains__(self, name):
+        return name in self._files
+
+    def items(self):
+        """Iterate over (name, signature) pairs of the indexed proposals."""
+        return ((self._names[position], self._signatures[position]) for position, *_ in self._files.values())
+
+    def add(self, name, text=None, signature=None):
+        """
+        Add a proposal to the index, replacing an earlier version.
+
+        Args:
+            name (str): The proposal's file name
+            text (str, optional): The proposal text (if no signature is given)
+            signature (array, optional): A precomputed signature
+        """
+        if signature is None:
+            signature = minhash_signature(text)
+        try:
+            stat = os.stat(os.path.join(self.directory, name))
+            mtime_ns, size = stat.st_mtime_ns, stat.st_size
+        except OSError:
+            mtime_ns, size = 0, 0
+        self._add(name, signature, mtime_ns, size)
+        if self.persist:
+            self._append([self._encode(_ADD, name, mtime_ns, size, signature)])
+
+    def remove(self, name):
+        """
+        Drop a proposal from the index.
+
+        Returns:
+            bool: True if the proposal was indexed
+        """
+        if not self._remove(name):
+            return False
+        if self.persist:
+            self._append([self._encode(_REMOVE, name)])
+        return True
+
+    def compact(self):
+        """Drop dead signatures and rewrite the index file with the live ones."""
+        live = [(name, self._signatures[position], mtime_ns, size)
+                for name, (position, mtime_ns, size) in self._files.items()]
+        self._reset()
+        for name, signature, mtime_ns, size in live:
+            self._add(name, signature, mtime_ns, size)
+        if not self.persist:
+            return
+        os.makedirs(self.directory, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=self.directory, prefix=".tmp-")
+        with os.fdopen(fd, "wb") as f:
+            f.write(_MAGIC)
+            f.write(b"".join(self._encode(_ADD, name, mtime_ns, size, signature)
+                             for name, signature, mtime_ns, size in live))
+        os.replace(temp_path, self.path)
+        self._records = len(live)
+        self._rewrite = False
+
+    def sync(self):
+        """
+        Bring the index up to date with the proposal files.
+
+        New and changed files (by size and mtime) are (re)read, and the
+        signatures of deleted files are dropped.
+
+        Returns:
+            int: Number of files added or re-read
+        """
+        seen = set()
+        added = 0
+        if os.path.isdir(self.directory):
+            for entry in os.scandir(self.directory):
+                if not entry.name.endswith(".md") or not entry.is_file():
+                    continue
+                seen.add(entry.name)
+                stat = entry.stat()
+                known = self._files.get(entry.name)
+                if known and known[1] == stat.st_mtime_ns and known[2] == stat.st_size:
+                    continue
+                with open(entry.path, "r") as f:
+                    self.add(entry.name, f.read())
+                added += 1
+
+        for name in [name for name in self._files if name not in seen]:
+            self.remove(name)
+        if self.persist and self._records and (self._records - len(self._files)) * 4 >= self._records:
+            self.compact()
+        return added
+
+    def find_similar(self, text=None, threshold=DEFAULT_THRESHOLD, signature=None):
+        """
+        Find indexed proposals similar to a candidate.
+
+        Args:
+            text (str, optional): The candidate proposal
+            threshold (float): Minimum estimated Jaccard similarity
+            signature (array, optional): A precomputed signature for the candidate
+
+        Returns:
+            list: (name, similarity) pairs, most similar first
+        """
+        if signature is None:
+            signature = minhash_signature(text)
+        candidates = set()
+        for key in _band_keys(signature):
+            candidates.update(self._buckets.get(key, ()))
+
+        matches = []
+        for position in candidates:
+            if not self._alive[position]:
+                continue
+            similarity = estimated_similarity(signature, self._signatures[position])
+            if similarity >= threshold:
+                matches.append((self._names[position], similarity))
+        matches.sort(key=lambda match: match[1], reverse=True)
+        return matches
+
+    def is_duplicate(self, text=None, threshold=DEFAULT_THRESHOLD, signature=None):
+        """Return True if an indexed proposal is at least `threshold` similar."""
+        return bool(self.find_similar(text, threshold, signature))
+
+
+class DedupeFilter:
+    """
+    Pipeline stage that drops proposals too similar to indexed ones.
+
+    A rejected proposal is simply skipped, so the next idea from the
+    upstream generator acts as the re-roll. Accepted proposals must be
+    reported back through record() once they are written, which adds them
+    to the index under their final name.
+
+    Args:
+        index (ProposalIndex): The index to check against
+        threshold (float): Similarity at which a proposal counts as a duplicate
+        max_rerolls (int): Consecutive rejections after which the stream stops
+    """
+
+    def __init__(self, index, threshold=DEFAULT_THRESHOLD, max_rerolls=20):
+        self.index = index
+        self.threshold = threshold
+        self.max_rerolls = max_rerolls
+        self.rejected = 0
+        self.exhausted = False
+        self._pending = None
+
+    def filter(self, proposals, count):
+        """
+        Yield up to `count` non-duplicate (game idea, proposal) pairs.
+
+        Args:
+            proposals (iterable): (game idea, proposal) pairs, possibly unbounded
+            count (int): Number of unique proposals wanted
+        """
+        accepted = 0
+        streak = 0
+        for game_idea, proposal in proposals:
+            if accepted >= count:
+                return
+            signature = minhash_signature(proposal)
+            if self.index.is_duplicate(threshold=self.threshold, signature=signature):
+                self.rejected += 1
+                streak += 1
+                if streak > self.max_rerolls:
+                    self.exhausted = True
+                    return
+                continue
+            streak = 0
+            accepted += 1
+            self._pending = signature
+            yield game_idea, proposal
+
+    def record(self, name, game_idea=None, proposal=None):
+        """Add the proposal that was just written to the index."""
+        self.index.add(name, signature=self._pending)
+
+
+def main():
+    """Main entry point for the script."""
+    parser = argparse.ArgumentParser(description="Find near-duplicate game proposals")
+    parser.add_argument("directory", nargs="?", default="proposals", help="Proposals directory")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="Similarity at which proposals count as duplicates (0-1)")
+    args = parser.parse_args()
+
+    index = ProposalIndex(args.directory)
+    added = index.sync()
+    print(f"Indexed {added} new proposals ({len(index)} total)")
+
+    reported = set()
+    for name, signature in index.items():
+        for other, similarity in index.find_similar(threshold=args.threshold, signature=signature):
+            pair = tuple(sorted((name, other)))
+            if other != name and pair not in reported:
+                reported.add(pair)
+                print(f"{similarity:.2f}  {pair[0]}  {pair[1]}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,434 @@
+#!/usr/bin/env python
+"""
+Proposal Search for Arcade Hub
+
+Full-text and facet search over the markdown proposals written by the game
+idea generator. Proposals are parsed into their sections (title, overview,
+category, mechanics, tags) and added to an inverted index whose postings
+are compact integer arrays. Queries are ranked with BM25, title matches
+count extra, and results can be narrowed by category and tag facets.
+
+The index is cached as JSON in the proposals directory
+(.search_index.json); a cache that does not parse or does not fit together
+is ignored and rebuilt. Refreshing it only re-parses files whose size or modification time
+changed, and of those only the ones whose content hash differs.
+"""
+
+import os
+import re
+import math
+import json
+import heapq
+import hashlib
+import argparse
+import tempfile
+from array import array
+from collections import Counter
+
+
+INDEX_FILE = ".search_index.json"
+INDEX_VERSION = 2
+
+PROPOSAL_HEADING = "# Game Proposal:"
+TITLE_BOOST = 3
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+_TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+
+def tokenize(text):
+    """Split text into lowercase word tokens."""
+    return _TOKEN_PATTERN.findall(text.lower())
+
+
+def parse_proposal(text):
+    """
+    Parse a proposal in the layout written by format_game_proposal.
+
+    Args:
+        text (str): The markdown proposal
+
+    Returns:
+        dict: title, overview, category, mechanics and tags, or None if the
+        text is not a game proposal
+    """
+    lines = text.splitlines()
+    if not lines or not lines[0].startswith(PROPOSAL_HEADING):
+        return None
+
+    sections = {}
+    current = None
+    for line in lines[1:]:
+        if line.startswith("## "):
+            current = line[3:].strip().lower()
+            sections[current] = []
+        elif current is not None and line.strip():
+            sections[current].append(line.strip())
+
+    def items(name):
+        return [line[2:].strip() for line in sections.get(name, []) if line.startswith("- ")]
+
+    return {
+        "title": lines[0][len(PROPOSAL_HEADING):].strip(),
+        "overview": " ".join(sections.get("overview", [])),
+        "category": " ".join(sections.get("category", [])).strip().lower(),
+        "mechanics": items("core mechanics"),
+        "tags": [tag.strip().lower() for tag in ",".join(sections.get("tags", [])).split(",") if tag.strip()],
+    }
+
+
+class ProposalSearchIndex:
+    """
+    Inverted index over one proposals directory.
+
+    Documents get a new id every time they are (re)indexed; the ids of
+    changed or deleted files are marked dead and skipped, and the postings
+    are compacted once dead ids make up a quarter of the index.
+
+    Args:
+        directory (str): The proposals directory
+    """
+
+    def __init__(self, directory="proposals"):
+        self.directory = directory
+        self.path = os.path.join(directory, INDEX_FILE)
+        self._reset()
+
+    def _reset(self):
+        self.names = []
+        self.titles = []
+        self.categories = []
+        self.tags = []
+        self.lengths = array("I")
+        self.alive = bytearray()
+        self.files = {}          # name -> (doc id, mtime_ns, size, content hash)
+        self.postings = {}       # term -> (array of doc ids, array of term frequencies)
+        self.facets = {"category": {}, "tag": {}}   # facet -> value -> array of doc ids
+        self.total_length = 0
+        self.dead = 0
+
+    def __len__(self):
+        return len(self.files)
+
+    def load(self):
+        """
+        Load the cached index, if there is a usable one.
+
+        Returns:
+            bool: True if the cache was loaded
+        """
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            return False
+        if not isinstance(state, dict) or state.get("version") != INDEX_VERSION:
+            return False
+        try:
+            self._restore(state)
+        except (KeyError, TypeError, ValueError, OverflowError):
+            self._reset()
+            return False
+        return True
+
+    def _restore(self, state):
+        """Rebuild the index from a decoded cache, checking that its parts fit together."""
+        names = [str(name) for name in state["names"]]
+        count = len(names)
+        columns = [state["titles"], state["categories"], state["tags"], state["lengths"], state["alive"]]
+        if any(len(column) != count for column in columns):
+            raise ValueError("index columns differ in length")
+
+        def ids(values):
+            values = array("I", values)
+            if values and max(values) >= count:
+                raise ValueError("document id out of range")
+            return values
+
+        self.names = names
+        self.titles = [str(title) for title in state["titles"]]
+        self.categories = [str(category) for category in state["categories"]]
+        self.tags = [tuple(str(tag) for tag in tags) for tags in state["tags"]]
+        self.lengths = array("I", state["lengths"])
+        self.alive = bytearray(1 if alive else 0 for alive in state["alive"])
+        self.files = {}
+        for name, (doc_id, mtime_ns, size, digest) in state["files"].items():
+            if not -1 <= doc_id < count:
+                raise ValueError("document id out of range")
+            self.files[name] = (int(doc_id), int(mtime_ns), int(size), bytes.fromhex(digest))
+        self.postings = {}
+        for term, (doc_ids, frequencies) in state["postings"].items():
+            if len(doc_ids) != len(frequencies):
+                raise ValueError("postings differ in length")
+            self.postings[term] = (ids(doc_ids), array("H", frequencies))
+        self.facets = {facet: {value: ids(doc_ids) for value, doc_ids in state["facets"][facet].items()}
+                       for facet in ("category", "tag")}
+        self.total_length = int(state["total_length"])
+        self.dead = count - sum(self.alive)
+
+    def save(self):
+        """Write the index to its cache file atomically."""
+        state = {
+            "version": INDEX_VERSION,
+            "names": self.names,
+            "titles": self.titles,
+            "categories": self.categories,
+            "tags": self.tags,
+            "lengths": self.lengths.tolist(),
+            "alive": list(self.alive),
+            "files": {name: [doc_id, mtime_ns, size, digest.hex()]
+                      for name, (doc_id, mtime_ns, size, digest) in self.files.items()},
+            "postings": {term: [ids.tolist(), frequencies.tolist()]
+                         for term, (ids, frequencies) in self.postings.items()},
+            "facets": {facet: {value: ids.tolist() for value, ids in values.items()}
+                       for facet, values in self.facets.items()},
+            "total_length": self.total_length,
+        }
+        fd, temp_path = tempfile.mkstemp(dir=self.directory, prefix=".tmp-")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(state, f, separators=(",", ":"))
+        os.replace(temp_path, self.path)
+
+    def _add_document(self, name, proposal):
+        doc_id = len(self.names)
+        self.names.append(name)
+        self.titles.append(proposal["title"])
+        self.categories.append(proposal["category"])
+        self.tags.append(tuple(proposal["tags"]))
+        self.alive.append(1)
+
+        title_terms = tokenize(proposal["title"])
+        frequencies = Counter(title_terms * TITLE_BOOST)
+        frequencies.update(tokenize(proposal["overview"]))
+        frequencies.update(tokenize(" ".join(proposal["mechanics"])))
+        frequencies.update(tokenize(" ".join(proposal["tags"])))
+        frequencies.update(tokenize(proposal["category"]))
+
+        length = sum(frequencies.values())
+        self.lengths.append(length)
+        self.total_length += length
+        for term, count in frequencies.items():
+            entry = self.postings.get(term)
+            if entry is None:
+                entry = self.postings[term] = (array("I"), array("H"))
+            entry[0].append(doc_id)
+            entry[1].append(min(count, 0xFFFF))
+        for facet, values in (("category", [proposal["category"]]), ("tag", proposal["tags"])):
+            for value in dict.fromkeys(values):
+                self.facets[facet].setdefault(value, array("I")).append(doc_id)
+        return doc_id
+
+    def _remove_document(self, doc_id):
+        if self.alive[doc_id]:
+            self.alive[doc_id] = 0
+            self.total_length -= self.lengths[doc_id]
+            self.dead += 1
+
+    def compact(self):
+        """Drop dead documents and renumber the live ones."""
+        remap = array("i", [-1]) * len(self.names)
+        live = [doc_id for doc_id in range(len(self.names)) if self.alive[doc_id]]
+        for new_id, doc_id in enumerate(live):
+            remap[doc_id] = new_id
+
+        self.names = [self.names[i] for i in live]
+        self.titles = [self.titles[i] for i in live]
+        self.categories = [self.categories[i] for i in live]
+        self.tags = [self.tags[i] for i in live]
+        self.lengths = array("I", (self.lengths[i] for i in live))
+        self.alive = bytearray(b"\1") * len(live)
+        self.files = {
+            name: (remap[doc_id] if doc_id >= 0 else -1, *rest)
+            for name, (doc_id, *rest) in self.files.items()
+        }
+
+        for values in self.facets.values():
+            for value in list(values):
+                ids = array("I", (remap[doc_id] for doc_id in values[value] if remap[doc_id] >= 0))
+                if ids:
+                    values[value] = ids
+                else:
+                    del values[value]
+
+        postings = {}
+        for term, (ids, frequencies) in self.postings.items():
+            new_ids, new_frequencies = array("I"), array("H")
+            for doc_id, count in zip(ids, frequencies):
+                if remap[doc_id] >= 0:
+                    new_ids.append(remap[doc_id])
+                    new_frequencies.append(count)
+            if new_ids:
+                postings[term] = (new_ids, new_frequencies)
+        self.postings = postings
+        self.dead = 0
+
+    def refresh(self):
+        """
+        Bring the index up to date with the directory.
+
+        Returns:
+            dict: Number of added, updated, removed and unchanged proposals
+        """
+        stats = {"added": 0, "updated": 0, "removed": 0, "unchanged": 0}
+        seen = set()
+        if os.path.isdir(self.directory):
+            for entry in os.scandir(self.directory):
+                if not entry.name.endswith(".md") or not entry.is_file():
+                    continue
+                seen.add(entry.name)
+                stat = entry.stat()
+                known = self.files.get(entry.name)
+                if known and known[1] == stat.st_mtime_ns and known[2] == stat.st_size:
+                    stats["unchanged"] += 1
+                    continue
+
+                with open(entry.path, "rb") as f:
+                    data = f.read()
+                digest = hashlib.blake2b(data, digest_size=16).digest()
+                if known and known[3] == digest:
+                    # Touched but not changed, only remember the new mtime
+                    self.files[entry.name] = (known[0], stat.st_mtime_ns, stat.st_size, digest)
+                    stats["unchanged"] += 1
+                    continue
+
+                if known:
+                    self._remove_document(known[0])
+                proposal = parse_proposal(data.decode("utf-8", errors="replace"))
+                # Files that are not proposals (e.g. README.md) are tracked but not indexed
+                doc_id = self._add_document(entry.name, proposal) if proposal else -1
+                self.files[entry.name] = (doc_id, stat.st_mtime_ns, stat.st_size, digest)
+                stats["updated" if known else "added"] += 1
+
+        for name in [name for name in self.files if name not in seen]:
+            doc_id = self.files.pop(name)[0]
+            if doc_id >= 0:
+                self._remove_document(doc_id)
+            stats["removed"] += 1
+
+        if self.dead and self.dead * 4 >= len(self.names):
+            self.compact()
+        return stats
+
+    def _filter_ids(self, category, tag):
+        """Return the set of live doc ids matching the facet filters, or None for no filter."""
+        allowed = None
+        for facet, value in (("category", category), ("tag", tag)):
+            if value is None:
+                continue
+            ids = set(self.facets[facet].get(value.lower(), ()))
+            allowed = ids if allowed is None else allowed & ids
+        if allowed is not None:
+            alive = self.alive
+            allowed = {doc_id for doc_id in allowed if alive[doc_id]}
+        return allowed
+
+    def search(self, query="", category=None, tag=None, limit=10, facets=False):
+        """
+        Search the index.
+
+        Args:
+            query (str): Free-text query; empty to list everything matching the filters
+            category (str, optional): Only return proposals in this category
+            tag (str, optional): Only return proposals with this tag
+            limit (int): Maximum number of results
+            facets (bool): Also count categories and tags over all matches
+
+        Returns:
+            dict: "total" matches, "results" as (name, title, score) tuples,
+            best first, and "facets" when requested
+        """
+        allowed = self._filter_ids(category, tag)
+        terms = list(dict.fromkeys(tokenize(query)))
+        alive = self.alive
+
+        if terms:
+            live_count = len(self.names) - self.dead
+            average_length = self.total_length / live_count if live_count else 1.0
+            lengths = self.lengths
+            scores = {}
+            for term in terms:
+                entry = self.postings.get(term)
+                if entry is None:
+                    continue
+                # Dead ids stay in the postings until compaction, so only count live ones
+                live = [(doc_id, count) for doc_id, count in zip(*entry) if alive[doc_id]]
+                document_frequency = len(live)
+                idf = math.log(1 + (live_count - document_frequency + 0.5) / (document_frequency + 0.5))
+                norm = BM25_K1 * (1 - BM25_B)
+                per_length = BM25_K1 * BM25_B / average_length
+                for doc_id, count in live:
+                    if allowed is not None and doc_id not in allowed:
+                        continue
+                    score = idf * count * (BM25_K1 + 1) / (count + norm + per_length * lengths[doc_id])
+                    scores[doc_id] = scores.get(doc_id, 0.0) + score
+            matches = scores
+            top = heapq.nlargest(limit, scores.items(), key=lambda item: item[1])
+        else:
+            ids = allowed if allowed is not None else (i for i in range(len(self.names)) if alive[i])
+            matches = dict.fromkeys(ids, 0.0)
+            # Without a query, list the newest proposals (names start with a timestamp) first
+            top = [(doc_id, 0.0) for doc_id in heapq.nlargest(limit, matches, key=self.names.__getitem__)]
+
+        result = {
+            "total": len(matches),
+            "results": [(self.names[doc_id], self.titles[doc_id], score) for doc_id, score in top],
+        }
+        if facets:
+            categories, tags = Counter(), Counter()
+            for doc_id in matches:
+                categories[self.categories[doc_id]] += 1
+                tags.update(self.tags[doc_id])
+            result["facets"] = {"category": categories.most_common(), "tag": tags.most_common()}
+        return result
+
+
+def open_index(directory="proposals", refresh=True):
+    """
+    Load the cached index of a directory and bring it up to date.
+
+    Args:
+        directory (str): The proposals directory
+        refresh (bool): Check the directory for new, changed and deleted files
+
+    Returns:
+        ProposalSearchIndex: The index
+    """
+    index = ProposalSearchIndex(directory)
+    index.load()
+    if refresh:
+        stats = index.refresh()
+        if (stats["added"] or stats["updated"] or stats["removed"]
+                or not os.path.exists(index.path)) and os.path.isdir(directory):
+            index.save()
+    return index
+
+
+def main():
+    """Main entry point for the script."""
+    parser = argparse.ArgumentParser(description="Search game proposals")
+    parser.add_argument("query", nargs="*", help="Words to search for")
+    parser.add_argument("--category", "-c", help="Only show proposals in this category")
+    parser.add_argument("--tag", "-t", help="Only show proposals with this tag")
+    parser.add_argument("--limit", "-l", type=int, default=10, help="Maximum number of results")
+    parser.add_argument("--facets", "-f", action="store_true", help="Show category and tag counts")
+    parser.add_argument("--directory", "-d", default="proposals", help="Proposals directory")
+    parser.add_argument("--no-refresh", action="store_true",
+                        help="Use the cached index without checking for changed files")
+    args = parser.parse_args()
+
+    index = open_index(args.directory, refresh=not args.no_refresh)
+    result = index.search(" ".join(args.query), args.category, args.tag, args.limit, args.facets)
+
+    print(f"{result['total']} matching proposals")
+    for name, title, score in result["results"]:
+        print(f"{score:6.2f}  {title}  ({name})" if args.query else f"{title}  ({name})")
+    if args.facets:
+        for facet, counts in result["facets"].items():
+            print(f"\n{facet.capitalize()}:")
+            for value, count in counts:
+                print(f"  {value}: {count}")
+
+
+if __name__ == "__main__":
+    main()
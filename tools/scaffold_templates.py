@@ -0,0 +1,245 @@
+#!/usr/bin/env python
+"""
+Scaffold Template Packs for Arcade Hub
+
+Game scaffolds are rendered from template packs stored on disk under
+tools/templates. A pack is a directory holding any of the scaffold files
+(index.html, game.js, style.css); files a pack does not provide fall back
+to the "default" pack. Templates in "shared" are partials that every
+scaffold file can include by name, e.g. ${header} for shared/header.html.
+
+Each game created from a pack gets a .scaffold.json file recording what it
+was rendered from and the hash of every rendered file, which lets refresh
+re-render only the files whose output actually changed.
+"""
+
+import os
+import json
+import hashlib
+from string import Template
+from functools import lru_cache
+
+
+TEMPLATES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "templates")
+DEFAULT_PACK = "default"
+SHARED_DIR = "shared"
+
+SCAFFOLD_FILES = ["index.html", "game.js", "style.css"]
+METADATA_FILE = ".scaffold.json"
+
+
+class TemplatePackError(Exception):
+    """Raised when a template pack is missing or cannot be rendered."""
+
+
+def _read_template(path):
+    """Read a template file and compile it."""
+    with open(path, "r") as f:
+        return Template(f.read())
+
+
+@lru_cache(maxsize=None)
+def load_template_pack(pack=DEFAULT_PACK, templates_dir=TEMPLATES_DIR):
+    """
+    Load and compile a template pack.
+
+    Packs are cached, so every template is read and compiled once per process.
+
+    Args:
+        pack (str): Name of the pack directory
+        templates_dir (str): Directory containing the packs
+
+    Returns:
+        tuple: (templates, partials) dicts mapping names to compiled Templates
+    """
+    pack_dir = os.path.join(templates_dir, pack)
+    default_dir = os.path.join(templates_dir, DEFAULT_PACK)
+    if not os.path.isdir(pack_dir):
+        raise TemplatePackError(f"template pack '{pack}' not found in {templates_dir}")
+
+    templates = {}
+    for name in SCAFFOLD_FILES:
+        for directory in (pack_dir, default_dir):
+            path = os.path.join(directory, name)
+            if os.path.exists(path):
+                templates[name] = _read_template(path)
+                break
+        else:
+            raise TemplatePackError(f"template pack '{pack}' has no {name}")
+
+    partials = {}
+    shared_dir = os.path.join(templates_dir, SHARED_DIR)
+    if os.path.isdir(shared_dir):
+        for filename in sorted(os.listdir(shared_dir)):
+            name, _ = os.path.splitext(filename)
+            with open(os.path.join(shared_dir, filename), "r") as f:
+                # Partials are included inline, so drop the file's final newline
+                text = f.read()
+            partials[name] = Template(text[:-1] if text.endswith("\n") else text)
+
+    return templates, partials
+
+
+def pack_for_category(category, templates_dir=TEMPLATES_DIR):
+    """
+    Pick the template pack for a game category.
+
+    Args:
+        category (str): The game category
+        templates_dir (str): Directory containing the packs
+
+    Returns:
+        str: The category's own pack if there is one, otherwise the default pack
+    """
+    if category and os.path.isdir(os.path.join(templates_dir, category)):
+        return category
+    return DEFAULT_PACK
+
+
+def render_pack(pack, values, templates_dir=TEMPLATES_DIR):
+    """
+    Render every scaffold file of a pack.
+
+    Args:
+        pack (str): Name of the pack
+        values (dict): Template variables (game_id, title, created, ...)
+        templates_dir (str): Directory containing the packs
+
+    Returns:
+        dict: Mapping of file name to rendered contents
+    """
+    templates, partials = load_template_pack(pack, templates_dir)
+    context = dict(values)
+    try:
+        for name, partial in partials.items():
+            context[name] = partial.substitute(values)
+        return {name: template.substitute(context) for name, template in templates.items()}
+    except (KeyError, ValueError) as e:
+        raise TemplatePackError(f"template pack '{pack}' could not be rendered: {e}")
+
+
+def content_hash(content):
+    """Return the SHA-256 hex digest of a rendered file."""
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
+def read_metadata(game_dir):
+    """
+    Read a game's scaffold metadata.
+
+    Returns:
+        dict: The metadata, or None for games not created from a template pack
+    """
+    try:
+        with open(os.path.join(game_dir, METADATA_FILE), "r") as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return None
+
+
+def write_metadata(game_dir, values, pack, files):
+    """
+    Record what a scaffold was rendered from.
+
+    Args:
+        game_dir (str): The game directory
+        values (dict): Template variables used for rendering
+        pack (str): Name of the pack used
+        files (dict): Mapping of file name to rendered contents
+    """
+    metadata = dict(values)
+    metadata["pack"] = pack
+    metadata["files"] = {name: content_hash(content) for name, content in files.items()}
+    _save_metadata(game_dir, metadata)
+
+
+def _save_metadata(game_dir, metadata):
+    """Write a game's scaffold metadata file."""
+    with open(os.path.join(game_dir, METADATA_FILE), "w") as f:
+        json.dump(metadata, f, indent=2)
+        f.write("\n")
+
+
+def _file_hash(path):
+    """Return the hash of a file on disk, or None if it does not exist."""
+    try:
+        with open(path, "rb") as f:
+            return hashlib.sha256(f.read()).hexdigest()
+    except FileNotFoundError:
+        return None
+
+
+def refresh_game(game_dir, templates_dir=TEMPLATES_DIR, force=False):
+    """
+    Re-render one game's scaffold files from its template pack.
+
+    A file is only written when its content on disk differs from the newly
+    rendered content, so missing files are restored. Files that were edited
+    by hand since they were last rendered are left alone unless force is set.
+
+    Args:
+        game_dir (str): The game directory
+        templates_dir (str): Directory containing the packs
+        force (bool): Overwrite files that were edited by hand
+
+    Returns:
+        dict: Lists of written, unchanged and modified (skipped) file names,
+        or None if the game was not created from a template pack
+    """
+    metadata = read_metadata(game_dir)
+    if metadata is None:
+        return None
+
+    recorded = dict(metadata.get("files", {}))
+    values = {key: value for key, value in metadata.items() if key not in ("pack", "files")}
+    pack = metadata.get("pack", DEFAULT_PACK)
+    files = render_pack(pack, values, templates_dir)
+
+    result = {"written": [], "unchanged": [], "modified": []}
+    for name, content in files.items():
+        new_hash = content_hash(content)
+        path = os.path.join(game_dir, name)
+        on_disk = _file_hash(path)
+        if on_disk == new_hash:
+            result["unchanged"].append(name)
+        elif on_disk is not None and on_disk != recorded.get(name) and not force:
+            result["modified"].append(name)
+            continue
+        else:
+            with open(path, "w") as f:
+                f.write(content)
+            result["written"].append(name)
+        recorded[name] = new_hash
+
+    if recorded != metadata.get("files", {}):
+        metadata["files"] = recorded
+        _save_metadata(game_dir, metadata)
+    return result
+
+
+def refresh_games(games_dir="games", templates_dir=TEMPLATES_DIR, force=False):
+    """
+    Re-render every game in a directory that was created from a template pack.
+
+    Args:
+        games_dir (str): Directory containing the games
+        templates_dir (str): Directory containing the packs
+        force (bool): Overwrite files that were edited by hand
+
+    Returns:
+        dict: Summary of written, unchanged and modified files per game
+    """
+    summary = {"games": 0, "written": [], "unchanged": 0, "modified": [], "skipped": []}
+    for game_id in sorted(os.listdir(games_dir)):
+        game_dir = os.path.join(games_dir, game_id)
+        if not os.path.isdir(game_dir):
+            continue
+        result = refresh_game(game_dir, templates_dir, force)
+        if result is None:
+            summary["skipped"].append(game_id)
+            continue
+        summary["games"] += 1
+        summary["written"].extend(os.path.join(game_id, name) for name in result["written"])
+        summary["modified"].extend(os.path.join(game_id, name) for name in result["modified"])
+        summary["unchanged"] += len(result["unchanged"])
+    return summary
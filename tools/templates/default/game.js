@@ -0,0 +1,76 @@
+// ${title} Game
+// Created: ${created}
+
+// Game configuration
+const CONFIG = {
+    // Game-specific settings
+    gameId: '${game_id}',
+    title: '${title}',
+    difficulty: 'medium'
+};
+
+// Game state
+let gameState = {
+    // Variables to track game state
+    score: 0,
+    isRunning: false,
+    level: 1
+};
+
+// Game initialization
+function initGame() {
+    console.log('Initializing ${title}...');
+    // Setup code
+    
+    // Add event listeners
+    document.addEventListener('keydown', handleInput);
+    
+    // Start the game
+    startGame();
+}
+
+// Start the game
+function startGame() {
+    gameState.isRunning = true;
+    gameState.score = 0;
+    gameState.level = 1;
+    
+    // Start the game loop
+    requestAnimationFrame(gameLoop);
+}
+
+// Main game loop
+function gameLoop() {
+    if (!gameState.isRunning) return;
+    
+    update();
+    render();
+    
+    requestAnimationFrame(gameLoop);
+}
+
+// Update game state
+function update() {
+    // Update logic
+}
+
+// Render game
+function render() {
+    // Drawing code
+}
+
+// Event handlers
+function handleInput(event) {
+    // Input handling
+    console.log('Key pressed:', event.key);
+}
+
+// High score integration
+function checkHighScore(score) {
+    if (HighScores.isHighScore(CONFIG.gameId, score)) {
+        HighScores.showHighScoreForm(CONFIG.gameId, score);
+    }
+}
+
+// Initialize the game when the page loads
+window.addEventListener('load', initGame);
@@ -0,0 +1,552 @@
+#!/usr/bin/env python
+"""
+Thumbnail Generator for Arcade Hub
+
+Renders a card image for every game in the registry: a gradient in the
+colours of the game's category, a scatter of category-themed shapes, a
+pixel-art emblem and the title in a bitmap font. Everything is derived
+from the game's id, title and category, so the same game always gets the
+same card.
+
+Each card is written in several widths for `srcset`:
+images/<id>.png (400x300, the registry's `image`), images/<id>-200w.png
+and images/<id>-800w.png. Shapes are described once in 400x300 units and
+rasterized at each size, so the sizes match.
+
+Cards are drawn as horizontal spans with bytearray slice assignment, so
+the cost grows with the number of rows and shapes rather than pixels,
+and encoded with a minimal PNG writer on top of zlib. A state file next
+to the images records a hash of what each card was drawn from, so only
+new or renamed games are redrawn. Games are rendered in parallel with a
+process pool.
+"""
+
+import os
+import sys
+import json
+import math
+import zlib
+import random
+import struct
+import hashlib
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+
+import game_registry
+
+
+SITE_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+IMAGES_DIR = os.path.join(SITE_ROOT, "images")
+REGISTRY_PATH = os.path.join(SITE_ROOT, "data", "registry.jsonl")
+INDEX_HTML_PATH = os.path.join(SITE_ROOT, "index.html")
+STATE_FILE = ".thumbnails.json"
+
+# Widths written for every card; DEFAULT_WIDTH has no suffix in its file name
+WIDTHS = [200, 400, 800]
+DEFAULT_WIDTH = 400
+ASPECT = 3 / 4
+# Bump to redraw every card after changing how they look
+RENDER_VERSION = 1
+PNG_COMPRESSION = 6
+# Below this many cards to draw, a process pool costs more than it saves
+_PARALLEL_THRESHOLD = 8
+
+# Layout, in units of a 400x300 card
+UNIT_WIDTH = 400
+UNIT_HEIGHT = 300
+BAND_TOP = 190
+MARGIN = 16
+
+WHITE = (255, 255, 255)
+DARK = (17, 24, 39)  # "dark" in the site's Tailwind config
+
+THEMES = {
+    "arcade": {"top": (99, 102, 241), "bottom": (236, 72, 153), "motif": "blocks", "emblem": "invader"},
+    "puzzle": {"top": (16, 185, 129), "bottom": (14, 165, 233), "motif": "tiles", "emblem": "tiles"},
+    "strategy": {"top": (245, 158, 11), "bottom": (239, 68, 68), "motif": "stripes", "emblem": "castle"},
+    "educational": {"top": (250, 204, 21), "bottom": (132, 204, 22), "motif": "bubbles", "emblem": "bulb"},
+    "app": {"top": (71, 85, 105), "bottom": (15, 23, 42), "motif": "panels", "emblem": "window"},
+}
+# Registry categories that share a theme
+THEME_ALIASES = {"game": "arcade"}
+DEFAULT_THEME = "arcade"
+
+EMBLEMS = {
+    "invader": ["00100000100", "00010001000", "00111111100", "01101110110",
+                "11111111111", "10111111101", "10100000101", "00011011000"],
+    "tiles": ["1101100", "1101100", "0000011", "1101111", "1101100", "0001100"],
+    "castle": ["1010101", "1111111", "0111110", "0110110", "0110110", "0111110"],
+    "bulb": ["0011100", "0111110", "1111111", "1111111", "1111111", "0111110", "0011100", "0011100", "0001000"],
+    "window": ["1111111", "1010001", "1111111", "1000001", "1000001", "1111111"],
+}
+
+# 5x7 bitmap font: seven rows per glyph, one hex byte per row
+FONT = {
+    "A": "0E11111F111111", "B": "1E11111E11111E", "C": "0E11101010110E",
+    "D": "1C12111111121C", "E": "1F10101E10101F", "F": "1F10101E101010",
+    "G": "0E11101711110F", "H": "1111111F111111", "I": "0E04040404040E",
+    "J": "0702020202120C", "K": "11121418141211", "L": "1010101010101F",
+    "M": "111B1515111111", "N": "11111915131111", "O": "0E11111111110E",
+    "P": "1E11111E101010", "Q": "0E11111115120D", "R": "1E11111E141211",
+    "S": "0F10100E01011E", "T": "1F040404040404", "U": "1111111111110E",
+    "V": "11111111110A04", "W": "1111111515150A", "X": "11110A040A1111",
+    "Y": "1111110A040404", "Z": "1F01020408101F",
+    "0": "0E11131519110E", "1": "040C040404040E", "2": "0E11010204081F",
+    "3": "1F02040201110E", "4": "02060A121F0202", "5": "1F101E0101110E",
+    "6": "0608101E11110E", "7": "1F010204080808", "8": "0E11110E11110E",
+    "9": "0E11110F01020C", " ": "00000000000000", "-": "0000001F000000",
+    ".": "00000000000C0C", ",": "000000000C0408", "!": "04040404040004",
+    "?": "0E110102040004", "'": "04040800000000", ":": "000C0C000C0C00",
+    "&": "0C12140815120D", "/": "00010204081000", "+": "0004041F040400",
+}
+GLYPH_WIDTH = 5
+GLYPH_HEIGHT = 7
+
+
+def _glyph_runs():
+    """Turn FONT into, per character, a list of (row, start column, end column) runs."""
+    runs = {}
+    for char, rows in FONT.items():
+        glyph = []
+        for row, bits in enumerate(bytes.fromhex(rows)):
+            column = 0
+            while column < GLYPH_WIDTH:
+                if bits >> (GLYPH_WIDTH - 1 - column) & 1:
+                    start = column
+                    while column < GLYPH_WIDTH and bits >> (GLYPH_WIDTH - 1 - column) & 1:
+                        column += 1
+                    glyph.append((row, start, column))
+                column += 1
+        runs[char] = glyph
+    return runs
+
+
+GLYPH_RUNS = _glyph_runs()
+
+
+def _mix(a, b, t):
+    return tuple(round(x + (y - x) * t) for x, y in zip(a, b))
+
+
+class Canvas:
+    """
+    An RGB pixel buffer with a vertical gradient background.
+
+    Shapes are filled one horizontal span at a time. Translucent shapes are
+    blended with the background colour of each row, which is constant along
+    the row, so they still fill whole spans.
+    """
+
+    def __init__(self, width, height, top, bottom):
+        self.width = width
+        self.height = height
+        self.rows = [_mix(top, bottom, y / max(1, height - 1)) for y in range(height)]
+        self.pixels = bytearray(b"".join(bytes(color) * width for color in self.rows))
+
+    def _color(self, y, color, alpha):
+        return bytes(color if alpha >= 1 else _mix(self.rows[y], color, alpha))
+
+    def span(self, y, x0, x1, color):
+        """Fill pixels x0..x1 (exclusive) of row y with a colour given as bytes."""
+        x0 = max(0, x0)
+        x1 = min(self.width, x1)
+        if x1 > x0 and 0 <= y < self.height:
+            start = (y * self.width + x0) * 3
+            self.pixels[start:start + (x1 - x0) * 3] = color * (x1 - x0)
+
+    def rect(self, x0, y0, x1, y1, color, alpha=1.0):
+        x0 = max(0, x0)
+        count = min(self.width, x1) - x0
+        if count <= 0:
+            return
+        solid = bytes(color) * count if alpha >= 1 else None
+        for y in range(max(0, y0), min(self.height, y1)):
+            start = (y * self.width + x0) * 3
+            self.pixels[start:start + count * 3] = solid or self._color(y, color, alpha) * count
+
+    def circle(self, cx, cy, r, color, alpha=1.0):
+        for y in range(max(0, cy - r), min(self.height, cy + r + 1)):
+            dx = math.isqrt(max(0, r * r - (y - cy) ** 2))
+            self.span(y, cx - dx, cx + dx + 1, self._color(y, color, alpha))
+
+    def stripes(self, y0, y1, period, width, color, alpha=1.0):
+        """Diagonal stripes at 45 degrees between rows y0 and y1."""
+        for y in range(max(0, y0), min(self.height, y1)):
+            row_color = self._color(y, color, alpha)
+            for x in range(y % period - period, self.width, period):
+                self.span(y, x, x + width, row_color)
+
+    def bitmap(self, x, y, rows, pixel, color, alpha=1.0):
+        """Draw a bitmap given as strings of 0/1 with square pixels of `pixel` size."""
+        for row, bits in enumerate(rows):
+            column = 0
+            while column < len(bits):
+                if bits[column] == "1":
+                    start = column
+                    while column < len(bits) and bits[column] == "1":
+                        column += 1
+                    self.rect(x + start * pixel, y + row * pixel, x + column * pixel, y + (row + 1) * pixel,
+                              color, alpha)
+                column += 1
+
+    def text(self, x, y, text, scale, color, alpha=1.0):
+        """Draw one line of text in the bitmap font."""
+        for char in text:
+            for row, start, end in GLYPH_RUNS.get(char, GLYPH_RUNS["?"]):
+                self.rect(x + start * scale, y + row * scale, x + end * scale, y + (row + 1) * scale,
+                          color, alpha)
+            x += (GLYPH_WIDTH + 1) * scale
+
+    def png(self, level=PNG_COMPRESSION):
+        """Encode the canvas as an 8-bit RGB PNG."""
+        return encode_png(self.width, self.height, self.pixels, level)
+
+
+def _png_chunk(kind, data):
+    return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
+
+
+def encode_png(width, height, pixels, level=PNG_COMPRESSION):
+    """
+    Encode RGB pixels as a PNG file.
+
+    Args:
+        width (int): Width in pixels
+        height (int): Height in pixels
+        pixels (bytes): width * height * 3 bytes, row by row
+        level (int): zlib compression level
+
+    Returns:
+        bytes: The PNG file
+    """
+    stride = width * 3
+    raw = bytearray((stride + 1) * height)
+    view = memoryview(pixels)
+    for y in range(height):
+        # Filter type 0 (None): the rows are mostly flat colour already
+        raw[y * (stride + 1) + 1:(y + 1) * (stride + 1)] = view[y * stride:(y + 1) * stride]
+    header = struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0)
+    return (b"\x89PNG\r\n\x1a\n" + _png_chunk(b"IHDR", header)
+            + _png_chunk(b"IDAT", zlib.compress(bytes(raw), level)) + _png_chunk(b"IEND", b""))
+
+
+def theme_for(category):
+    """Return the theme for a registry category."""
+    category = (category or "").lower()
+    return THEMES.get(THEME_ALIASES.get(category, category), THEMES[DEFAULT_THEME])
+
+
+def card_hash(game):
+    """
+    Hash everything a card is drawn from.
+
+    Args:
+        game (dict): Registry entry with "id", "title" and "category"
+
+    Returns:
+        str: Hex digest that changes whenever the card would look different
+    """
+    key = json.dumps([RENDER_VERSION, WIDTHS, game["id"], game.get("title", ""), game.get("category", "")])
+    return hashlib.sha256(key.encode("utf-8")).hexdigest()
+
+
+def design_card(game):
+    """
+    Lay out a card in 400x300 units.
+
+    Args:
+        game (dict): Registry entry with "id", "title" and "category"
+
+    Returns:
+        dict: The theme, the shapes and the text of the card
+    """
+    theme = theme_for(game.get("category"))
+    rng = random.Random(card_hash(game))
+    motif = theme["motif"]
+    shapes = []
+    if motif == "blocks":
+        for _ in range(rng.randint(10, 16)):
+            size = rng.randint(10, 36)
+            x, y = rng.randint(-10, UNIT_WIDTH), rng.randint(-10, BAND_TOP)
+            shapes.append(("rect", x, y, x + size, y + size, WHITE, rng.uniform(0.12, 0.3)))
+    elif motif == "tiles":
+        size = rng.choice([36, 44, 52])
+        for row in range(BAND_TOP // size + 1):
+            for column in range(UNIT_WIDTH // size + 1):
+                if rng.random() < 0.45:
+                    x, y = column * size + 4, row * size + 4
+                    shapes.append(("rect", x, y, x + size - 8, y + size - 8, WHITE, rng.uniform(0.1, 0.25)))
+    elif motif == "stripes":
+        shapes.append(("stripes", 0, BAND_TOP, rng.choice([28, 36, 44]), rng.choice([8, 12]), WHITE, 0.15))
+    elif motif == "bubbles":
+        for _ in range(rng.randint(8, 14)):
+            shapes.append(("circle", rng.randint(0, UNIT_WIDTH), rng.randint(0, BAND_TOP), rng.randint(8, 40),
+                           WHITE, rng.uniform(0.12, 0.3)))
+    else:
+        for _ in range(rng.randint(4, 7)):
+            x, y = rng.randint(-20, UNIT_WIDTH - 40), rng.randint(-20, BAND_TOP - 30)
+            w, h = rng.randint(50, 140), rng.randint(30, 90)
+            shapes.append(("rect", x, y, x + w, y + h, WHITE, rng.uniform(0.08, 0.18)))
+
+    emblem = EMBLEMS[theme["emblem"]]
+    emblem_pixel = 80 // max(len(emblem[0]), len(emblem))
+    emblem_width = len(emblem[0]) * emblem_pixel
+    emblem_x = rng.randint(UNIT_WIDTH // 2, UNIT_WIDTH - MARGIN - emblem_width)
+    emblem_y = rng.randint(MARGIN + 24, BAND_TOP - len(emblem) * emblem_pixel - MARGIN)
+    return {
+        "theme": theme,
+        "shapes": shapes,
+        "emblem": (emblem_x, emblem_y, emblem, emblem_pixel),
+        "title": _clean_text(game.get("title") or game["id"]),
+        "category": _clean_text(game.get("category") or ""),
+    }
+
+
+def _clean_text(text):
+    return "".join(char if char in FONT else "?" for char in text.upper())
+
+
+def wrap_text(text, columns, max_lines):
+    """
+    Wrap text into lines of at most `columns` characters.
+
+    Words longer than a line are broken. If the text needs more than
+    `max_lines` lines, the last line ends with "...".
+
+    Returns:
+        list: The lines, or None if `columns` is too narrow for anything
+    """
+    if columns < 1:
+        return None
+    lines = []
+    line = ""
+    for word in text.split():
+        while len(word) > columns:
+            if line:
+                lines.append(line)
+                line = ""
+            lines.append(word[:columns])
+            word = word[columns:]
+        if not line:
+            line = word
+        elif len(line) + 1 + len(word) <= columns:
+            line += " " + word
+        else:
+            lines.append(line)
+            line = word
+    if line:
+        lines.append(line)
+    if len(lines) > max_lines:
+        lines = lines[:max_lines]
+        lines[-1] = lines[-1][:max(0, columns - 3)].rstrip() + "..."
+    return lines
+
+
+def _fit_title(title, width, height, max_scale):
+    """Pick the largest text scale at which the title fits in two lines."""
+    for scale in range(max_scale, 0, -1):
+        columns = (width + scale) // ((GLYPH_WIDTH + 1) * scale)
+        lines = wrap_text(title, columns, 2)
+        if lines and len(lines) * (GLYPH_HEIGHT + 2) * scale <= height:
+            if scale == 1 or len(wrap_text(title, columns, 99)) <= 2:
+                return lines, scale
+    return wrap_text(title, max(1, width // (GLYPH_WIDTH + 1)), 2), 1
+
+
+def render_card(design, width):
+    """
+    Rasterize a card design at a given width.
+
+    Args:
+        design (dict): The output of design_card()
+        width (int): Card width in pixels (the height follows ASPECT)
+
+    Returns:
+        Canvas: The drawn card
+    """
+    height = round(width * ASPECT)
+    u = width / UNIT_WIDTH
+
+    def px(value):
+        return round(value * u)
+
+    theme = design["theme"]
+    canvas = Canvas(width, height, theme["top"], theme["bottom"])
+    for shape in design["shapes"]:
+        kind, args = shape[0], shape[1:]
+        if kind == "rect":
+            x0, y0, x1, y1, color, alpha = args
+            canvas.rect(px(x0), px(y0), px(x1), px(y1), color, alpha)
+        elif kind == "circle":
+            cx, cy, r, color, alpha = args
+            canvas.circle(px(cx), px(cy), max(1, px(r)), color, alpha)
+        elif kind == "stripes":
+            y0, y1, period, stripe, color, alpha = args
+            canvas.stripes(px(y0), px(y1), max(2, px(period)), max(1, px(stripe)), color, alpha)
+
+    x, y, emblem, pixel = design["emblem"]
+    pixel = max(1, px(pixel))
+    canvas.bitmap(px(x) + max(1, px(3)), px(y) + max(1, px(3)), emblem, pixel, DARK, 0.35)
+    canvas.bitmap(px(x), px(y), emblem, pixel, WHITE, 0.92)
+
+    # Category pill in the top-left corner
+    if design["category"]:
+        scale = max(1, px(2))
+        pad = max(1, px(5))
+        text_width = len(design["category"]) * (GLYPH_WIDTH + 1) * scale - scale
+        canvas.rect(px(MARGIN), px(MARGIN), px(MARGIN) + text_width + 2 * pad,
+                    px(MARGIN) + GLYPH_HEIGHT * scale + 2 * pad, DARK, 0.45)
+        canvas.text(px(MARGIN) + pad, px(MARGIN) + pad, design["category"], scale, WHITE)
+
+    # Title on a dark band across the bottom
+    band_top = px(BAND_TOP)
+    canvas.rect(0, band_top, width, height, DARK, 0.72)
+    lines, scale = _fit_title(design["title"], width - 2 * px(MARGIN), height - band_top - 2 * px(MARGIN),
+                              max(1, px(5)))
+    line_height = (GLYPH_HEIGHT + 2) * scale
+    y = band_top + (height - band_top - len(lines) * line_height + 2 * scale) // 2
+    for line in lines:
+        shadow = max(1, scale // 2)
+        canvas.text(px(MARGIN) + shadow, y + shadow, line, scale, DARK, 0.6)
+        canvas.text(px(MARGIN), y, line, scale, WHITE)
+        y += line_height
+    return canvas
+
+
+def thumbnail_paths(game_id, images_dir=IMAGES_DIR):
+    """
+    Return the file of each card width.
+
+    Returns:
+        dict: Width -> path; DEFAULT_WIDTH is images/<id>.png, the others images/<id>-<width>w.png
+    """
+    return {width: os.path.join(images_dir, f"{game_id}.png" if width == DEFAULT_WIDTH
+                                else f"{game_id}-{width}w.png")
+            for width in WIDTHS}
+
+
+def write_thumbnails(game, images_dir=IMAGES_DIR):
+    """
+    Draw a game's card at every width and write the PNG files.
+
+    Args:
+        game (dict): Registry entry with "id", "title" and "category"
+        images_dir (str): Directory to write the images to
+
+    Returns:
+        int: Number of bytes written
+    """
+    design = design_card(game)
+    written = 0
+    for width, path in thumbnail_paths(game["id"], images_dir).items():
+        data = render_card(design, width).png()
+        with open(path, "wb") as f:
+            f.write(data)
+        written += len(data)
+    return written
+
+
+def _render_task(task):
+    game, images_dir = task
+    return game["id"], write_thumbnails(game, images_dir)
+
+
+def _load_state(images_dir):
+    try:
+        with open(os.path.join(images_dir, STATE_FILE)) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def generate_thumbnails(games, images_dir=IMAGES_DIR, workers=None, force=False, prune=False):
+    """
+    Draw the cards of every game whose card is missing or out of date.
+
+    Args:
+        games (list): Registry entries
+        images_dir (str): Directory to write the images to
+        workers (int, optional): Worker processes (defaults to the CPU count)
+        force (bool): Redraw every card
+        prune (bool): games is the whole registry; forget the card hashes of other games
+
+    Returns:
+        dict: Summary with "rendered", "skipped" and "bytes"
+    """
+    os.makedirs(images_dir, exist_ok=True)
+    state = _load_state(images_dir)
+    hashes = {game["id"]: card_hash(game) for game in games}
+    tasks = [(game, images_dir) for game in games
+             if force or state.get(game["id"]) != hashes[game["id"]]
+             or not all(os.path.exists(path) for path in thumbnail_paths(game["id"], images_dir).values())]
+
+    workers = workers or os.cpu_count() or 1
+    written = 0
+    if workers > 1 and len(tasks) >= _PARALLEL_THRESHOLD:
+        with ProcessPoolExecutor(workers) as pool:
+            results = list(pool.map(_render_task, tasks, chunksize=max(1, len(tasks) // (workers * 4))))
+    else:
+        results = [_render_task(task) for task in tasks]
+    for game_id, size in results:
+        state[game_id] = hashes[game_id]
+        written += size
+
+    stale = set(state) - set(hashes) if prune else set()
+    if tasks or stale:
+        state = {game_id: digest for game_id, digest in state.items() if game_id not in stale}
+        game_registry.atomic_write(os.path.join(images_dir, STATE_FILE), json.dumps(state, indent=1, sort_keys=True))
+    return {"rendered": len(tasks), "skipped": len(games) - len(tasks), "bytes": written}
+
+
+def missing_images(games, site_root=SITE_ROOT):
+    """
+    Find games whose registry image is missing or an empty placeholder.
+
+    Returns:
+        list: Upsert operations pointing those games at their generated card
+    """
+    operations = []
+    for game in games:
+        generated = f"images/{game['id']}.png"
+        path = os.path.join(site_root, game.get("image") or "")
+        if game.get("image") != generated and (not os.path.isfile(path) or os.path.getsize(path) == 0):
+            operations.append({"op": "upsert", "game": dict(game, image=generated)})
+    return operations
+
+
+def main():
+    """Main entry point for the script."""
+    parser = argparse.ArgumentParser(description="Generate game thumbnails for Arcade Hub")
+    parser.add_argument("game_ids", nargs="*", help="Only these games (default: every registered game)")
+    parser.add_argument("--registry", default=REGISTRY_PATH, help="Path to the JSONL registry log")
+    parser.add_argument("--index-html", default=INDEX_HTML_PATH, help="index.html to update with new image paths")
+    parser.add_argument("--images-dir", default=IMAGES_DIR, help="Where to write the images")
+    parser.add_argument("--workers", "-j", type=int, help="Worker processes (default: CPU count)")
+    parser.add_argument("--force", "-f", action="store_true", help="Redraw every card")
+    parser.add_argument("--no-update-registry", action="store_true",
+                        help="Don't point games with missing or empty images at their new card")
+    args = parser.parse_args()
+
+    registry = game_registry.load_registry(args.registry, args.index_html)
+    games = list(registry.games())
+    if args.game_ids:
+        unknown = set(args.game_ids) - set(registry.ids())
+        if unknown:
+            print(f"Error: Unknown game(s): {', '.join(sorted(unknown))}")
+            sys.exit(1)
+        games = [game for game in games if game["id"] in args.game_ids]
+
+    summary = generate_thumbnails(games, args.images_dir, args.workers, args.force, prune=not args.game_ids)
+    print(f"✓ Rendered {summary['rendered']} thumbnail(s) ({summary['bytes'] / 1024:.1f} KB), "
+          f"{summary['skipped']} up to date")
+
+    if not args.no_update_registry:
+        operations = missing_images(games, os.path.dirname(os.path.abspath(args.index_html)))
+        if operations:
+            game_registry.register_games(operations, args.registry, args.index_html)
+            for operation in operations:
+                print(f"✓ {operation['game']['id']} now uses {operation['game']['image']}")
+
+
+if __name__ == "__main__":
+    main()
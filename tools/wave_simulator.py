@@ -0,0 +1,522 @@
+#!/usr/bin/env python
+"""
+Wave Balance Simulator for Rhythm Defense
+
+Plays Rhythm Defense headlessly to tune its balance. The rules mirror
+games/rhythm-defense/game.js:
+
+- A wave has 5 + 2n enemies (getWaveEnemyCount), spawned 2 seconds apart.
+- From wave 3 every 5th enemy is a tank, and from wave 5 every 7th other
+  one is a flyer (getWaveConfig).
+- Enemies walk the path at their speed in cells per second. A shield
+  halves their speed, and an enemy that reaches the end costs a life.
+- Towers fire when their key (1-4) is pressed. The press is judged
+  against the beat (60000 / bpm ms): perfect doubles the damage, good
+  multiplies it by 1.5 and a miss halves it. Only the first four towers
+  have a key of their own, and boost towers do not change any stats.
+- A kill pays health / 10 resources, and clearing wave n pays n times
+  the wave bonus.
+
+Tower, enemy and CONFIG numbers are read from game.js, so the simulation
+follows edits to the game. The player is modelled by a build order,
+bought before each wave while affordable, how many keys they press per
+beat and how often they hit the beat. Presses after the first one in a
+beat count as misses, because the first press uses up the beat marker.
+
+Time advances a beat at a time instead of a frame at a time. Enemies
+only meet towers when a key is pressed, so this gives the same outcomes
+for far less work. Parameter sets are cartesian products of
+--sweep values. Each set is played for a number of seeded trials, and
+the sets are evaluated in batches across a process pool.
+"""
+
+import os
+import re
+import sys
+import json
+import math
+import time
+import random
+import argparse
+import itertools
+from concurrent.futures import ProcessPoolExecutor
+
+
+SITE_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+GAME_JS = os.path.join(SITE_ROOT, "games", "rhythm-defense", "game.js")
+DEFAULT_TRIALS = 20
+# Below this many parameter sets, a process pool costs more than it saves
+_PARALLEL_THRESHOLD = 8
+
+# Damage multipliers of activateTower, and the shield and miss timings
+TIMING_MULTIPLIERS = {"perfect": 2.0, "good": 1.5, "miss": 0.5}
+SHIELD_DURATION = 2000
+SLOW_FACTOR = 0.5
+ACTIVATION_KEYS = 4
+
+# Wave rules of WaveSystem, which are code rather than CONFIG values
+RULES = {
+    "base_enemies": 5,
+    "enemies_per_wave": 2,
+    "spawn_interval": 2000,
+    "tank_every": 5,
+    "tank_from": 3,
+    "flyer_every": 7,
+    "flyer_from": 5,
+    "wave_bonus": 10,
+    "reward_divisor": 10,
+}
+
+# The simulated player: towers bought in this order, keys pressed per
+# beat, and how often a press is perfect or good
+PLAYER = {
+    "layout": [["pulse", 2, 4], ["beam", 2, 5], ["beam", 6, 2], ["shield", 4, 4]],
+    "presses_per_beat": 1,
+    "perfect_rate": 0.4,
+    "good_rate": 0.4,
+}
+
+
+def _js_block(source, name):
+    """Return the text between the braces of `const <name> = {...}`."""
+    match = re.search(r"const\s+%s\s*=\s*\{" % re.escape(name), source)
+    if not match:
+        return None
+    depth = 1
+    for index in range(match.end(), len(source)):
+        if source[index] == "{":
+            depth += 1
+        elif source[index] == "}":
+            depth -= 1
+            if depth == 0:
+                return source[match.end():index]
+    return None
+
+
+def _numbers(text):
+    """Return the numeric `key: value` pairs of a JS object literal."""
+    return {key: float(value) if "." in value else int(value)
+            for key, value in re.findall(r"(\w+)\s*:\s*(-?\d+(?:\.\d+)?)\b(?!\s*[/*])", text)}
+
+
+def _snake_case(name):
+    return re.sub(r"([A-Z])", lambda m: "_" + m.group(1).lower(), name)
+
+
+def load_game_config(game_js=GAME_JS):
+    """
+    Read the balance numbers of Rhythm Defense from its game.js.
+
+    Args:
+        game_js (str): Path to games/rhythm-defense/game.js
+
+    Returns:
+        dict: Parameters with "bpm", "initial_resources", "max_waves" and
+            "lives", "towers" and "enemies" keyed by id, the enemy "path",
+            RULES and PLAYER, or None if the file cannot be read
+    """
+    try:
+        with open(game_js, "r") as f:
+            source = f.read()
+    except OSError:
+        return None
+
+    config = _js_block(source, "CONFIG")
+    towers = _js_block(source, "TOWER_TYPES")
+    enemies = _js_block(source, "ENEMY_TYPES")
+    path = re.search(r"gameState\.path\s*=\s*\[(.*?)\]", source, re.S)
+    lives = re.search(r"\blives\s*:\s*(\d+)", source)
+    if not (config and towers and enemies and path and lives):
+        return None
+
+    params = {_snake_case(key): value for key, value in _numbers(config).items()}
+    params["lives"] = int(lives.group(1))
+    for name, block, stats in (("towers", towers, ("cost", "damage", "range")),
+                               ("enemies", enemies, ("health", "speed"))):
+        params[name] = {}
+        for body in re.findall(r"\w+\s*:\s*\{([^{}]*)\}", block):
+            type_id = re.search(r"id\s*:\s*'([^']+)'", body)
+            values = _numbers(body)
+            if type_id and all(stat in values for stat in stats):
+                params[name][type_id.group(1)] = {stat: values[stat] for stat in stats}
+    params["path"] = [[int(x), int(y)] for x, y in
+                      re.findall(r"x\s*:\s*(\d+)\s*,\s*y\s*:\s*(\d+)", path.group(1))]
+    params.update(RULES)
+    params.update(PLAYER)
+    return params
+
+
+def wave_enemy_count(wave, params=RULES):
+    """Return the number of enemies in a wave, like getWaveEnemyCount."""
+    return params["base_enemies"] + wave * params["enemies_per_wave"]
+
+
+def wave_config(wave, params=RULES):
+    """
+    List the spawns of a wave, like getWaveConfig.
+
+    Args:
+        wave (int): Wave number, starting at 1
+        params (dict): Parameters with the wave rules
+
+    Returns:
+        list: (enemy id, delay in ms) tuples in spawn order
+    """
+    spawns = []
+    for i in range(wave_enemy_count(wave, params)):
+        if wave >= params["tank_from"] and i % params["tank_every"] == 0:
+            enemy = "tank"
+        elif wave >= params["flyer_from"] and i % params["flyer_every"] == 0:
+            enemy = "flyer"
+        else:
+            enemy = "runner"
+        spawns.append((enemy, i * params["spawn_interval"]))
+    return spawns
+
+
+def set_param(params, key, value):
+    """
+    Return a copy of params with one value replaced.
+
+    Args:
+        params (dict): Parameters from load_game_config
+        key (str): A top-level key such as "bpm", or "<tower or enemy id>.<stat>"
+            such as "beam.damage"
+        value: The new value
+
+    Returns:
+        dict: The updated parameters
+
+    Raises:
+        KeyError: If the key is unknown
+    """
+    params = dict(params)
+    if "." in key:
+        type_id, stat = key.split(".", 1)
+        for group in ("towers", "enemies"):
+            if stat in params[group].get(type_id, {}):
+                params[group] = dict(params[group])
+                params[group][type_id] = dict(params[group][type_id], **{stat: value})
+                return params
+        raise KeyError(key)
+    if key not in params or key in ("towers", "enemies", "path", "layout"):
+        raise KeyError(key)
+    params[key] = value
+    return params
+
+
+def parameter_grid(base, sweeps):
+    """
+    Expand sweeps into every combination of their values.
+
+    Args:
+        base (dict): Parameters shared by every set
+        sweeps (dict): Parameter key to the list of values to try
+
+    Returns:
+        list: (overrides, params) tuples, one per combination
+    """
+    keys = list(sweeps)
+    sets = []
+    for values in itertools.product(*(sweeps[key] for key in keys)):
+        params = base
+        for key, value in zip(keys, values):
+            params = set_param(params, key, value)
+        sets.append((dict(zip(keys, values)), params))
+    return sets
+
+
+class _Track:
+    """The enemy path as segments, to place an enemy by the distance it walked."""
+
+    def __init__(self, points):
+        self.segments = []
+        self.length = 0.0
+        for (x0, y0), (x1, y1) in zip(points, points[1:]):
+            length = math.hypot(x1 - x0, y1 - y0)
+            if length:
+                self.segments.append((self.length, length, x0, y0, x1 - x0, y1 - y0))
+                self.length += length
+
+    def position(self, distance):
+        for start, length, x, y, dx, dy in self.segments:
+            if distance < start + length:
+                progress = (distance - start) / length
+                return x + dx * progress, y + dy * progress
+        start, length, x, y, dx, dy = self.segments[-1]
+        return x + dx, y + dy
+
+
+def simulate(params, rng):
+    """
+    Play one game.
+
+    Args:
+        params (dict): Parameters from load_game_config
+        rng (random.Random): Source of the player's timing
+
+    Returns:
+        dict: "won", plus "waves" with the "lives_lost", the health
+            "leaked" past the towers, enemies "killed" and "resources"
+            (before the wave bonus) of every wave played
+    """
+    track = _Track(params["path"])
+    beat = 60000.0 / params["bpm"]
+    towers_by_id = params["towers"]
+    enemy_types = params["enemies"]
+    perfect = params["perfect_rate"]
+    good = perfect + params["good_rate"]
+    presses = params["presses_per_beat"]
+    divisor = params["reward_divisor"]
+    resources = params["initial_resources"]
+    lives = params["lives"]
+    layout = list(params["layout"])
+    built = []
+    waves = []
+
+    for wave in range(1, params["max_waves"] + 1):
+        # Buy towers in build order while affordable; only the first
+        # ACTIVATION_KEYS of them get a key that finds them
+        while layout and towers_by_id[layout[0][0]]["cost"] <= resources:
+            type_id, x, y = layout.pop(0)
+            resources -= towers_by_id[type_id]["cost"]
+            built.append((type_id, x, y, towers_by_id[type_id]))
+        keyed = built[:ACTIVATION_KEYS]
+
+        spawns = wave_config(wave, params)
+        next_spawn = 0
+        # Enemies as [distance, health, speed, slowed until, updated at, max health]
+        enemies = []
+        lost = leaked = killed = 0
+        key = 0
+        now = 0.0
+        while next_spawn < len(spawns) or enemies:
+            now += beat
+            while next_spawn < len(spawns) and spawns[next_spawn][1] <= now:
+                enemy_type = enemy_types[spawns[next_spawn][0]]
+                enemies.append([0.0, enemy_type["health"], enemy_type["speed"], 0.0,
+                                float(spawns[next_spawn][1]), enemy_type["health"]])
+                next_spawn += 1
+
+            alive = []
+            for enemy in enemies:
+                elapsed = now - enemy[4]
+                slowed = min(elapsed, max(0.0, enemy[3] - enemy[4]))
+                enemy[0] += enemy[2] * (elapsed - slowed * (1 - SLOW_FACTOR)) / 1000.0
+                enemy[4] = now
+                if enemy[0] >= track.length:
+                    lost += 1
+                    leaked += enemy[1]
+                else:
+                    alive.append(enemy)
+            enemies = alive
+            if lives - lost <= 0:
+                break
+
+            if not keyed or not enemies:
+                continue
+            for press in range(presses):
+                type_id, tx, ty, stats = keyed[key % len(keyed)]
+                key += 1
+                roll = rng.random() if press == 0 else 1.0
+                quality = "perfect" if roll < perfect else "good" if roll < good else "miss"
+                multiplier = TIMING_MULTIPLIERS[quality]
+                if type_id == "shield":
+                    until = now + SHIELD_DURATION * multiplier
+                    for enemy in enemies:
+                        x, y = track.position(enemy[0])
+                        if math.hypot(x - tx, y - ty) <= stats["range"]:
+                            enemy[3] = until
+                    continue
+                damage = stats["damage"] * multiplier
+                if not damage:
+                    continue
+                survivors = []
+                for enemy in enemies:
+                    x, y = track.position(enemy[0])
+                    if type_id == "beam":
+                        hit = y == ty and x > tx
+                    else:
+                        hit = math.hypot(x - tx, y - ty) <= stats["range"]
+                    if hit:
+                        enemy[1] -= damage
+                        if enemy[1] <= 0:
+                            killed += 1
+                            resources += enemy[5] // divisor
+                            continue
+                    survivors.append(enemy)
+                enemies = survivors
+
+        lives -= lost
+        waves.append({"lives_lost": lost, "leaked": leaked, "killed": killed, "resources": resources})
+        if lives <= 0:
+            return {"won": False, "waves": waves}
+        resources += wave * params["wave_bonus"]
+    return {"won": True, "waves": waves}
+
+
+def summarize(results, params):
+    """
+    Turn the games played with one parameter set into a win rate and a difficulty curve.
+
+    Args:
+        results (list): Results of simulate
+        params (dict): The parameters they were played with
+
+    Returns:
+        dict: "win_rate", mean "waves_cleared" and a "curve" with, per wave,
+            the share of games that "reached" it, the share of those that
+            "cleared" it, and the mean "lives_lost", "leaked" health and
+            "resources" of the games that reached it
+    """
+    trials = len(results)
+    curve = []
+    for index in range(params["max_waves"]):
+        played = [result for result in results if len(result["waves"]) > index]
+        if not played:
+            break
+        cleared = sum(1 for result in played if result["won"] or len(result["waves"]) > index + 1)
+        waves = [result["waves"][index] for result in played]
+        curve.append({
+            "wave": index + 1,
+            "enemies": wave_enemy_count(index + 1, params),
+            "reached": len(played) / trials,
+            "cleared": cleared / len(played),
+            "lives_lost": sum(wave["lives_lost"] for wave in waves) / len(played),
+            "leaked": sum(wave["leaked"] for wave in waves) / len(played),
+            "resources": sum(wave["resources"] for wave in waves) / len(played),
+        })
+    return {
+        "win_rate": sum(1 for result in results if result["won"]) / trials,
+        "waves_cleared": sum(len(result["waves"]) - (not result["won"]) for result in results) / trials,
+        "curve": curve,
+    }
+
+
+def _run_task(task):
+    index, params, trials, seed = task
+    # Trial t of every set gets the same timing rolls, so sets differ
+    # by their parameters rather than by luck
+    results = [simulate(params, random.Random(f"{seed}:{trial}")) for trial in range(trials)]
+    return index, summarize(results, params)
+
+
+def evaluate(param_sets, trials=DEFAULT_TRIALS, seed=0, workers=None):
+    """
+    Play every parameter set for a number of trials.
+
+    Args:
+        param_sets (list): (overrides, params) tuples from parameter_grid
+        trials (int): Games played per set
+        seed (int): Seed of the player's timing
+        workers (int, optional): Worker processes (defaults to the CPU count)
+
+    Returns:
+        list: One dict per set, in order, with its "overrides" and the
+            summary from summarize
+    """
+    tasks = [(index, params, trials, seed) for index, (overrides, params) in enumerate(param_sets)]
+    workers = workers or os.cpu_count() or 1
+    if workers > 1 and len(tasks) >= _PARALLEL_THRESHOLD:
+        with ProcessPoolExecutor(workers) as pool:
+            results = list(pool.map(_run_task, tasks, chunksize=max(1, len(tasks) // (workers * 4))))
+    else:
+        results = [_run_task(task) for task in tasks]
+    return [dict(summary, overrides=param_sets[index][0]) for index, summary in results]
+
+
+def _parse_value(text):
+    for convert in (int, float):
+        try:
+            return convert(text)
+        except ValueError:
+            pass
+    return text
+
+
+def _parse_assignment(text, option):
+    if "=" not in text:
+        print(f"Error: {option} expects KEY=VALUE, got '{text}'")
+        sys.exit(1)
+    key, value = text.split("=", 1)
+    return key.strip(), value
+
+
+def _describe(overrides):
+    return ", ".join(f"{key}={value}" for key, value in overrides.items()) or "(game.js values)"
+
+
+def main():
+    """Main entry point for the script."""
+    parser = argparse.ArgumentParser(description="Simulate Rhythm Defense to balance its waves")
+    parser.add_argument("--game-js", default=GAME_JS, help="Path to the Rhythm Defense game.js")
+    parser.add_argument("--set", "-s", action="append", default=[], metavar="KEY=VALUE",
+                        help="Change a parameter for every set, e.g. beam.cost=25 (repeatable)")
+    parser.add_argument("--sweep", "-w", action="append", default=[], metavar="KEY=V1,V2",
+                        help="Try every listed value of a parameter, e.g. bpm=90,120,150 (repeatable)")
+    parser.add_argument("--trials", "-t", type=int, default=DEFAULT_TRIALS, help="Games played per parameter set")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the simulated player's timing")
+    parser.add_argument("--workers", "-j", type=int, help="Worker processes (default: CPU count)")
+    parser.add_argument("--top", type=int, default=10, help="Number of parameter sets to list")
+    parser.add_argument("--target", type=float,
+                        help="List the sets whose win rate is closest to this one first (0-1)")
+    parser.add_argument("--json", help="Write every result to this JSON file")
+    args = parser.parse_args()
+
+    base = load_game_config(args.game_js)
+    if base is None:
+        print(f"Error: Could not read the game configuration from '{args.game_js}'")
+        sys.exit(1)
+    sweeps = {}
+    try:
+        for text in args.set:
+            key, value = _parse_assignment(text, "--set")
+            base = set_param(base, key, _parse_value(value))
+        for text in args.sweep:
+            key, values = _parse_assignment(text, "--sweep")
+            set_param(base, key, None)
+            sweeps[key] = [_parse_value(value) for value in values.split(",") if value]
+            if not sweeps[key]:
+                print(f"Error: --sweep {key} needs at least one value")
+                sys.exit(1)
+    except KeyError as e:
+        print(f"Error: Unknown parameter {e}")
+        sys.exit(1)
+    if args.trials < 1:
+        print("Error: --trials must be at least 1")
+        sys.exit(1)
+
+    param_sets = parameter_grid(base, sweeps)
+    started = time.time()
+    results = evaluate(param_sets, args.trials, args.seed, args.workers)
+    elapsed = time.time() - started
+    print(f"✓ Simulated {len(results)} parameter set(s) x {args.trials} games in {elapsed:.2f}s")
+    if not results:
+        print("Error: No parameter sets to simulate")
+        sys.exit(1)
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"✓ Wrote results to {args.json}")
+
+    if args.target is not None:
+        ranked = sorted(results, key=lambda result: abs(result["win_rate"] - args.target))
+    else:
+        ranked = sorted(results, key=lambda result: (-result["win_rate"], -result["waves_cleared"]))
+    print()
+    print(f"{'Win rate':>8}  {'Waves':>5}  Parameters")
+    for result in ranked[:args.top]:
+        print(f"{result['win_rate']:>8.0%}  {result['waves_cleared']:>5.1f}  {_describe(result['overrides'])}")
+
+    best = ranked[0]
+    print()
+    print(f"Difficulty curve for {_describe(best['overrides'])}:")
+    print(f"{'Wave':>4}  {'Enemies':>7}  {'Reached':>7}  {'Cleared':>7}  {'Lives lost':>10}  {'Leaked HP':>9}")
+    for point in best["curve"]:
+        print(f"{point['wave']:>4}  {point['enemies']:>7}  {point['reached']:>7.0%}  {point['cleared']:>7.0%}  "
+              f"{point['lives_lost']:>10.2f}  {point['leaked']:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()